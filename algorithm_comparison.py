@@ -17,7 +17,7 @@ from collections import defaultdict
 from sim.engine.simulator import Simulator
 from sim.env.environment import Environment
 from sim.io.layout_loader import LayoutLoader
-from sim.agents.agent import Agent, AgentState
+from sim.policy import GreedyNearestPolicy, StaticSequentialPolicy
 
 
 class StaticSequentialSimulator:
@@ -29,42 +29,14 @@ class StaticSequentialSimulator:
     def __init__(self, env, params):
         self.env = env
         self.params = params
-        
-        # Static room sequence
         self.room_sequence = ['O1', 'O2', 'O3', 'O4', 'O5', 'O6']
-        
-        # Create basic simulator to reuse infrastructure
-        self.sim = Simulator(env, params)
-        
+        self.sim = Simulator(env, params, policy=StaticSequentialPolicy(self.room_sequence))
+    
     def run(self):
         """Run simulation with static ordering"""
-        # Override agent behavior to use static sequence
-        sequence_idx = {a.id: 0 for a in self.sim.agent_manager.agents}
-        
         while not self.sim.complete and self.sim.tick < 10000:
-            # For each agent, if idle, assign next room in sequence
-            for agent in self.sim.agent_manager.agents:
-                if agent.state == AgentState.IDLE and not agent.is_dead and not agent.escaped:
-                    idx = sequence_idx[agent.id]
-                    if idx < len(self.room_sequence):
-                        target_room_id = self.room_sequence[idx]
-                        if target_room_id in self.env.rooms:
-                            target_room = self.env.rooms[target_room_id]
-                            
-                            # Use grid pathfinder to get to room
-                            if self.sim.grid_pathfinder:
-                                grid_path = self.sim.grid_pathfinder.find_path(
-                                    agent.x, agent.y, target_room.x, target_room.y,
-                                    avoid_danger=False
-                                )
-                                if grid_path and len(grid_path) > 1:
-                                    agent.target_room = target_room_id
-                                    agent.waypoints = grid_path
-                                    agent.current_waypoint = 0
-                                    agent.state = AgentState.MOVING
-                                    sequence_idx[agent.id] += 1
-            
             self.sim.step(fire_enabled=False)
+        self.sim.close()
         
         return self.sim.get_results()
 
@@ -78,40 +50,13 @@ class GreedyNearestSimulator:
     def __init__(self, env, params):
         self.env = env
         self.params = params
-        self.sim = Simulator(env, params)
-        
+        self.sim = Simulator(env, params, policy=GreedyNearestPolicy())
+    
     def run(self):
         """Run simulation with greedy nearest-neighbor"""
         while not self.sim.complete and self.sim.tick < 10000:
-            # For each idle agent, find nearest uncleared room
-            for agent in self.sim.agent_manager.agents:
-                if agent.state == AgentState.IDLE and not agent.is_dead and not agent.escaped:
-                    # Find nearest uncleared room
-                    uncleared = self.env.get_uncleared_rooms()
-                    if uncleared:
-                        nearest_room = None
-                        min_dist = float('inf')
-                        
-                        for room_id in uncleared:
-                            room = self.env.rooms[room_id]
-                            dist = abs(room.x - agent.x) + abs(room.y - agent.y)
-                            if dist < min_dist:
-                                min_dist = dist
-                                nearest_room = room_id
-                        
-                        if nearest_room and self.sim.grid_pathfinder:
-                            target_room = self.env.rooms[nearest_room]
-                            grid_path = self.sim.grid_pathfinder.find_path(
-                                agent.x, agent.y, target_room.x, target_room.y,
-                                avoid_danger=False
-                            )
-                            if grid_path and len(grid_path) > 1:
-                                agent.target_room = nearest_room
-                                agent.waypoints = grid_path
-                                agent.current_waypoint = 0
-                                agent.state = AgentState.MOVING
-            
             self.sim.step(fire_enabled=False)
+        self.sim.close()
         
         return self.sim.get_results()
 
@@ -148,6 +93,7 @@ class AlgorithmComparator:
         start = time.time()
         while not sim1.complete and sim1.tick < 10000:
             sim1.step(fire_enabled=False)
+        sim1.close()
         results['priority'] = {
             **sim1.get_results(),
             'real_time': time.time() - start,
@@ -15,9 +15,10 @@ from datetime import datetime
 from collections import defaultdict
 
 from sim.engine.simulator import Simulator
+from sim.engine.lockstep import LockstepRunner
 from sim.env.environment import Environment
 from sim.io.layout_loader import LayoutLoader
-from sim.agents.agent import Agent, AgentState
+from sim.policy import GreedyNearestPolicy, StaticSequentialPolicy
 
 
 class StaticSequentialSimulator:
@@ -27,35 +28,13 @@ class StaticSequentialSimulator:
         self.env = env
         self.params = params
         self.room_sequence = ['O1', 'O2', 'O3', 'O4', 'O5', 'O6']
-        self.sim = Simulator(env, params)
-        
+        self.sim = Simulator(env, params, policy=StaticSequentialPolicy(self.room_sequence))
+    
     def run(self):
         """Run simulation with static ordering"""
-        sequence_idx = {a.id: 0 for a in self.sim.agent_manager.agents}
-        
         while not self.sim.complete and self.sim.tick < 10000:
-            for agent in self.sim.agent_manager.agents:
-                if agent.state == AgentState.IDLE and not agent.is_dead and not agent.escaped:
-                    idx = sequence_idx[agent.id]
-                    if idx < len(self.room_sequence):
-                        target_room_id = self.room_sequence[idx]
-                        if target_room_id in self.env.rooms:
-                            target_room = self.env.rooms[target_room_id]
-                            
-                            if self.sim.grid_pathfinder:
-                                # Static doesn't avoid danger - just shortest path
-                                grid_path = self.sim.grid_pathfinder.find_path(
-                                    agent.x, agent.y, target_room.x, target_room.y,
-                                    avoid_danger=False
-                                )
-                                if grid_path and len(grid_path) > 1:
-                                    agent.target_room = target_room_id
-                                    agent.waypoints = grid_path
-                                    agent.current_waypoint = 0
-                                    agent.state = AgentState.MOVING
-                                    sequence_idx[agent.id] += 1
-            
             self.sim.step(fire_enabled=True)  # FIRE ON!
+        self.sim.close()
         
         return self.sim.get_results()
 
@@ -66,39 +45,13 @@ class GreedyNearestSimulator:
     def __init__(self, env, params):
         self.env = env
         self.params = params
-        self.sim = Simulator(env, params)
-        
+        self.sim = Simulator(env, params, policy=GreedyNearestPolicy())
+    
     def run(self):
         """Run simulation with greedy nearest-neighbor"""
         while not self.sim.complete and self.sim.tick < 10000:
-            for agent in self.sim.agent_manager.agents:
-                if agent.state == AgentState.IDLE and not agent.is_dead and not agent.escaped:
-                    uncleared = self.env.get_uncleared_rooms()
-                    if uncleared:
-                        nearest_room = None
-                        min_dist = float('inf')
-                        
-                        for room_id in uncleared:
-                            room = self.env.rooms[room_id]
-                            dist = abs(room.x - agent.x) + abs(room.y - agent.y)
-                            if dist < min_dist:
-                                min_dist = dist
-                                nearest_room = room_id
-                        
-                        if nearest_room and self.sim.grid_pathfinder:
-                            target_room = self.env.rooms[nearest_room]
-                            # Greedy doesn't avoid danger - just shortest path!
-                            grid_path = self.sim.grid_pathfinder.find_path(
-                                agent.x, agent.y, target_room.x, target_room.y,
-                                avoid_danger=False  # DANGEROUS!
-                            )
-                            if grid_path and len(grid_path) > 1:
-                                agent.target_room = nearest_room
-                                agent.waypoints = grid_path
-                                agent.current_waypoint = 0
-                                agent.state = AgentState.MOVING
-            
             self.sim.step(fire_enabled=True)  # FIRE ON!
+        self.sim.close()
         
         return self.sim.get_results()
 
@@ -124,80 +77,38 @@ class FireAlgorithmComparator:
         params['visualization']['enabled'] = False
         params['hazard']['enabled'] = True  # FIRE ON!
         
-        results = {}
+        # All three algorithms run in one tick loop on the same fire
+        runner = LockstepRunner(LayoutLoader.load(self.layout_path), params)
+        runner.add_policy('priority', Simulator)
+        runner.add_policy('static', StaticSequentialSimulator)
+        runner.add_policy('greedy', GreedyNearestSimulator)
         
-        # 1. Our Priority-Based Algorithm (considers danger)
-        print("\n[1/3] Running PRIORITY-BASED algorithm (danger-aware)...")
-        layout_data = LayoutLoader.load(self.layout_path)
-        env1 = Environment(layout_data, params)
-        sim1 = Simulator(env1, params)
-        
-        start = time.time()
-        while not sim1.complete and sim1.tick < 10000:
-            sim1.step(fire_enabled=True)
-        
-        num_alive = sum(1 for a in sim1.agent_manager.agents if not a.is_dead)
-        num_escaped = sum(1 for a in sim1.agent_manager.agents if a.escaped)
-        
-        results['priority'] = {
-            **sim1.get_results(),
-            'real_time': time.time() - start,
-            'algorithm': 'Priority-Based (TRP)',
-            'responders_alive': num_alive,
-            'responders_escaped': num_escaped,
-            'responder_deaths': num_responders - num_alive
-        }
-        print(f"  ✓ Time: {results['priority']['time']:.0f}s")
-        print(f"    Rescued: {results['priority']['evacuees_rescued']}/{results['priority']['total_evacuees']}")
-        print(f"    Responders: {num_alive} alive, {num_escaped} escaped, {num_responders - num_alive} died")
-        
-        # 2. Static Sequential
-        print("\n[2/3] Running STATIC SEQUENTIAL algorithm (no danger avoidance)...")
-        layout_data = LayoutLoader.load(self.layout_path)
-        env2 = Environment(layout_data, params)
-        
-        start = time.time()
-        static_sim = StaticSequentialSimulator(env2, params)
-        static_results = static_sim.run()
-        
-        num_alive = sum(1 for a in static_sim.sim.agent_manager.agents if not a.is_dead)
-        num_escaped = sum(1 for a in static_sim.sim.agent_manager.agents if a.escaped)
-        
-        results['static'] = {
-            **static_results,
-            'real_time': time.time() - start,
-            'algorithm': 'Static Sequential',
-            'responders_alive': num_alive,
-            'responders_escaped': num_escaped,
-            'responder_deaths': num_responders - num_alive
-        }
-        print(f"  ✓ Time: {results['static']['time']:.0f}s")
-        print(f"    Rescued: {results['static']['evacuees_rescued']}/{results['static']['total_evacuees']}")
-        print(f"    Responders: {num_alive} alive, {num_escaped} escaped, {num_responders - num_alive} died")
-        
-        # 3. Greedy Nearest (should be very dangerous!)
-        print("\n[3/3] Running GREEDY NEAREST algorithm (DANGER! No safety!)...")
-        layout_data = LayoutLoader.load(self.layout_path)
-        env3 = Environment(layout_data, params)
-        
-        start = time.time()
-        greedy_sim = GreedyNearestSimulator(env3, params)
-        greedy_results = greedy_sim.run()
-        
-        num_alive = sum(1 for a in greedy_sim.sim.agent_manager.agents if not a.is_dead)
-        num_escaped = sum(1 for a in greedy_sim.sim.agent_manager.agents if a.escaped)
-        
-        results['greedy'] = {
-            **greedy_results,
-            'real_time': time.time() - start,
-            'algorithm': 'Greedy Nearest',
-            'responders_alive': num_alive,
-            'responders_escaped': num_escaped,
-            'responder_deaths': num_responders - num_alive
+        print("\nRunning PRIORITY-BASED, STATIC SEQUENTIAL and GREEDY NEAREST on one shared fire...")
+        lockstep_results = runner.run(max_ticks=10000, fire_enabled=True)
+        
+        labels = {
+            'priority': 'Priority-Based (TRP)',
+            'static': 'Static Sequential',
+            'greedy': 'Greedy Nearest',
         }
-        print(f"  ✓ Time: {results['greedy']['time']:.0f}s")
-        print(f"    Rescued: {results['greedy']['evacuees_rescued']}/{results['greedy']['total_evacuees']}")
-        print(f"    Responders: {num_alive} alive, {num_escaped} escaped, {num_responders - num_alive} died")
+        results = {}
+        for i, (alg_name, label) in enumerate(labels.items(), 1):
+            controller = runner.controllers[alg_name]
+            agents = getattr(controller, 'sim', controller).agent_manager.agents
+            num_alive = sum(1 for a in agents if not a.is_dead)
+            num_escaped = sum(1 for a in agents if a.escaped)
+            
+            results[alg_name] = {
+                **lockstep_results[alg_name],
+                'algorithm': label,
+                'responders_alive': num_alive,
+                'responders_escaped': num_escaped,
+                'responder_deaths': num_responders - num_alive
+            }
+            print(f"\n[{i}/3] {label}")
+            print(f"  ✓ Time: {results[alg_name]['time']:.0f}s")
+            print(f"    Rescued: {results[alg_name]['evacuees_rescued']}/{results[alg_name]['total_evacuees']}")
+            print(f"    Responders: {num_alive} alive, {num_escaped} escaped, {num_responders - num_alive} died")
         
         return results
     
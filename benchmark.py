@@ -94,6 +94,7 @@ class BenchmarkRunner:
         
         elapsed_time = time.time() - start_time
         
+        sim.close()
         # Get results
         results = sim.get_results()
         
@@ -0,0 +1,165 @@
+"""
+Animator Benchmark - Frame rate of MatplotlibAnimator on the Agg backend
+
+Advances a fire scenario until cells are burning, then times:
+- the cell heatmap alone (legacy per-cell Rectangle patches vs single mesh)
+- animation frames, redrawing the whole figure vs blitting only the
+  animated artists over a cached background (what FuncAnimation(blit=True) does)
+
+Usage:
+    python benchmark_animator.py [--layout layouts/hospital_complex.json] [--warmup 200] [--frames 50]
+"""
+
+import os
+os.environ.setdefault('MPLBACKEND', 'Agg')  # Headless - must precede the animator import
+
+import argparse
+import json
+import time
+
+import matplotlib.patches as patches
+
+from sim.engine.simulator import Simulator
+from sim.env.environment import Environment
+from sim.io.layout_loader import LayoutLoader
+from sim.viz.matplotlib_animator import MatplotlibAnimator
+
+
+def legacy_draw_cell_heatmap(animator, drawn):
+    """Original heatmap: one Rectangle per danger cell plus a glow per burning cell
+
+    The colour gradient is simplified; patch counts match the old code.
+    """
+    for patch in drawn:
+        patch.remove()
+    drawn.clear()
+
+    sim = animator.sim
+    cells = sim.env.hazard_system.cells
+    res = animator.grid_resolution
+
+    zero_priority_rooms = set()
+    if sim.env.exits:
+        reference_room = sim.env.exits[0]
+        for room_id, room in sim.env.rooms.items():
+            if hasattr(room, 'type') and room.type == 'office':
+                if sim.decision_engine.calculate_priority_index(room_id, reference_room) == 0.0:
+                    zero_priority_rooms.add(room_id)
+
+    for (x, y), cell in cells.items():
+        room_at_cell = sim.env.rooms.get(cell.room_id)
+        if not room_at_cell or room_at_cell.floor != animator.current_floor:
+            continue
+
+        if cell.room_id in zero_priority_rooms and not cell.is_burning:
+            rect = patches.Rectangle((x - res/2, y - res/2), res, res,
+                                     facecolor='#C8E6C9', edgecolor='none', alpha=0.85, zorder=11)
+        elif cell.is_burning:
+            glow_size = res * 1.3
+            glow = patches.Rectangle((x - glow_size/2, y - glow_size/2), glow_size, glow_size,
+                                     facecolor='#FF6600', edgecolor='none', alpha=0.3, zorder=9)
+            drawn.append(glow)
+            animator.ax.add_patch(glow)
+            rect = patches.Rectangle((x - res/2, y - res/2), res, res,
+                                     facecolor='#FF0000', edgecolor='#FFAA00',
+                                     linewidth=0.5, alpha=1.0, zorder=10)
+        elif cell.danger_level > 0.001:
+            d = cell.danger_level
+            rect = patches.Rectangle((x - res/2, y - res/2), res, res,
+                                     facecolor=(1.0, max(0.0, 1.0 - d), 0.0),
+                                     edgecolor='none', alpha=0.5 + d * 0.5, zorder=10)
+        else:
+            continue
+        drawn.append(rect)
+        animator.ax.add_patch(rect)
+
+
+def time_frames(animator, n_frames: int, draw_heatmap):
+    """Seconds per frame for draw_heatmap() + a full canvas draw"""
+    canvas = animator.fig.canvas
+    start = time.perf_counter()
+    for _ in range(n_frames):
+        draw_heatmap()
+        canvas.draw()
+    return (time.perf_counter() - start) / n_frames
+
+
+def run_benchmark(layout_path: str, warmup: int, n_frames: int):
+    with open("params.json") as f:
+        params = json.load(f)
+    params['hazard']['enabled'] = True
+
+    env = Environment(LayoutLoader.load(layout_path), params)
+    sim = Simulator(env, params)
+    for _ in range(warmup):
+        if sim.complete:
+            break
+        sim.step(fire_enabled=True)
+
+    animator = MatplotlibAnimator(sim)
+    burning = sum(1 for c in env.hazard_system.cells.values() if c.is_burning)
+    print(f"Layout {layout_path}: {len(env.hazard_system.cells)} cells, "
+          f"{burning} burning after {sim.tick} ticks")
+
+    # Heatmap only - before: per-cell patches, after: single mesh
+    animator._remove_heatmap()
+    legacy_patches = []
+    legacy = time_frames(animator, n_frames, lambda: legacy_draw_cell_heatmap(animator, legacy_patches))
+    for patch in legacy_patches:
+        patch.remove()
+    current = time_frames(animator, n_frames, animator._draw_cell_heatmap)
+
+    print(f"{'heatmap':12} {'ms/frame':>10} {'fps':>8}")
+    print(f"{'before':12} {legacy * 1000:10.1f} {1 / legacy:8.1f}")
+    print(f"{'after':12} {current * 1000:10.1f} {1 / current:8.1f}")
+    print(f"Speedup: {legacy / current:.2f}x")
+
+    # Animation frames - the simulation keeps running so trails keep growing
+    animator.paused = False
+    animator.speed = 1
+    canvas = animator.fig.canvas
+    ax = animator.ax
+
+    start = time.perf_counter()
+    for frame in range(n_frames):
+        animator._update_frame(frame)
+        canvas.draw()
+    full = (time.perf_counter() - start) / n_frames
+
+    artists = animator._update_frame(0)
+    for artist in artists:
+        artist.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(ax.bbox)
+    frame_times = []
+    for frame in range(n_frames):
+        start = time.perf_counter()
+        canvas.restore_region(background)
+        for artist in sorted(animator._update_frame(frame), key=lambda a: a.get_zorder()):
+            artist.set_animated(True)
+            ax.draw_artist(artist)
+        canvas.blit(ax.bbox)
+        frame_times.append(time.perf_counter() - start)
+    blit = sum(frame_times) / n_frames
+    half = n_frames // 2
+    early = sum(frame_times[:half]) / max(half, 1)
+    late = sum(frame_times[half:]) / max(n_frames - half, 1)
+
+    print(f"{'frame':12} {'ms/frame':>10} {'fps':>8}")
+    print(f"{'full draw':12} {full * 1000:10.1f} {1 / full:8.1f}")
+    print(f"{'blitted':12} {blit * 1000:10.1f} {1 / blit:8.1f}")
+    print(f"Blitted frame time, first half vs second half: {early * 1000:.1f} / {late * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MatplotlibAnimator frame-rate benchmark")
+    parser.add_argument('--layout', default='layouts/hospital_complex.json', help='Layout JSON')
+    parser.add_argument('--warmup', type=int, default=200, help='Ticks simulated before timing')
+    parser.add_argument('--frames', type=int, default=50, help='Frames timed per variant')
+    args = parser.parse_args()
+
+    run_benchmark(args.layout, args.warmup, args.frames)
+
+
+if __name__ == "__main__":
+    main()
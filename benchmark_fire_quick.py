@@ -48,6 +48,7 @@ def run_fire_test(num_agents: int, evacuees_per_room: int, run_num: int):
         step_count += 1
     
     elapsed = time.time() - start_time
+    sim.close()
     results = sim.get_results()
     
     # Count deaths and retreats
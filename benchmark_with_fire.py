@@ -64,6 +64,7 @@ class FireBenchmarkRunner:
         params['agents']['count'] = num_agents
         params['visualization']['enabled'] = False  # Disable visualization for speed
         params['hazard']['enabled'] = True  # ENABLE FIRE!
+        params['simulation']['hazard_cache'] = 'outputs/hazard_cache'  # Same fire for every agent count
         
         # Load and modify layout
         layout_data = LayoutLoader.load(self.layout_path)
@@ -102,6 +103,7 @@ class FireBenchmarkRunner:
         
         elapsed_time = time.time() - start_time
         
+        sim.close()
         # Get results
         results = sim.get_results()
         
@@ -0,0 +1,222 @@
+"""
+Shared test fixtures
+
+The engine tests run on FakeEnvironment, a small stand-in with the parts
+of sim.env.environment.Environment the engine reads (rooms, room graph,
+0.5m hazard cells and update_hazards). Its fire spreads from one cell of
+the first office and draws from the global numpy RNG, like the hazard
+model it stands in for.
+"""
+
+import copy
+import json
+import sys
+import types
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).parent
+
+try:
+    import sim.env.environment  # noqa: F401
+except ImportError:
+    collect_ignore = ['test_acceptance.py', 'hospital_quick_test.py']  # Need the full environment package
+
+
+class FakeCell:
+    def __init__(self, room_id):
+        self.room_id = room_id
+        self.is_burning = False
+        self.danger_level = 0.0
+
+
+class FakeRoom:
+    def __init__(self, data):
+        self.id = data['id']
+        self.floor = data.get('floor', 0)
+        self.x, self.y = data['x'], data['y']
+        self.width, self.height = data['width'], data['height']
+        self.x1, self.y1 = self.x - self.width / 2, self.y - self.height / 2
+        self.x2, self.y2 = self.x + self.width / 2, self.y + self.height / 2
+        self.area = data.get('area', self.width * self.height)
+        self.evacuee_count = data.get('evacuees', 0)
+        self.evacuees_remaining = self.evacuee_count
+        self.is_exit = data.get('is_exit', False)
+        self.is_stair = data.get('is_stair', False)
+        self.type = data.get('type', 'office')
+        self.hazard = 0.0
+        self.cleared = self.evacuee_count == 0 and (self.is_exit or self.type == 'hallway')
+        self.discovered_evacuees = 0
+        self.cleared_tick = None
+
+    def discover_evacuees(self):
+        self.discovered_evacuees = self.evacuees_remaining
+        return self.evacuees_remaining
+
+    def rescue_evacuee(self):
+        self.evacuees_remaining -= 1
+
+    def get_evacuee_positions(self):
+        return [(self.x, self.y)] * self.evacuees_remaining
+
+    def mark_cleared(self, tick):
+        self.cleared = True
+        self.cleared_tick = tick
+
+
+class FakeHazardSystem:
+    """0.5m cells; fire spreads to neighbours with random ignition"""
+
+    def __init__(self, env, burning: bool):
+        self.env = env
+        self.cells = {}
+        for room in env.rooms.values():
+            for i in range(int(room.width / 0.5)):
+                for j in range(int(room.height / 0.5)):
+                    x = int((room.x1 + i * 0.5) / 0.5) * 0.5 + 0.25
+                    y = int((room.y1 + j * 0.5) / 0.5) * 0.5 + 0.25
+                    self.cells[(x, y)] = FakeCell(room.id)
+        self._neighbours = {
+            key: [(key[0] + dx, key[1] + dy) for dx, dy in ((0.5, 0), (-0.5, 0), (0, 0.5), (0, -0.5))
+                  if (key[0] + dx, key[1] + dy) in self.cells]
+            for key in self.cells}
+        if burning:
+            self.spawn_fire()
+
+    def spawn_fire(self):
+        offices = {r.id for r in self.env.rooms.values() if r.type == 'office' and not r.is_exit}
+        origin = [key for key, cell in self.cells.items() if cell.room_id in offices]
+        self.cells[origin[len(origin) // 2]].is_burning = True
+
+    def extinguish_fire(self):
+        for cell in self.cells.values():
+            cell.is_burning = False
+            cell.danger_level = 0.0
+        self._room_hazards()
+
+    def update(self):
+        for key in [key for key, cell in self.cells.items() if cell.is_burning]:
+            for neighbour in self._neighbours[key]:
+                cell = self.cells[neighbour]
+                if not cell.is_burning:
+                    cell.danger_level = min(1.0, cell.danger_level + 0.02 + 0.01 * np.random.random())
+                    if cell.danger_level > 0.5 and np.random.random() < 0.05:
+                        cell.is_burning = True
+        self._room_hazards()
+
+    def _room_hazards(self):
+        for room in self.env.rooms.values():
+            danger = [c.danger_level for c in self.cells.values() if c.room_id == room.id]
+            room.hazard = float(np.mean(danger)) if danger else 0.0
+
+    def get_max_hazard(self) -> float:
+        return max((c.danger_level for c in self.cells.values()), default=0.0)
+
+
+class FakeEnvironment:
+    """Environment stand-in built from a layout dict"""
+
+    def __init__(self, layout: dict, params: dict, burning: bool = True):
+        self.layout = layout
+        self.params = params
+        self.rooms = {data['id']: FakeRoom(data) for data in layout['rooms']}
+        self.exits = [room_id for room_id, room in self.rooms.items() if room.is_exit]
+        self.floors = {}
+        for room in self.rooms.values():
+            self.floors.setdefault(room.floor, []).append(room.id)
+        self.bounds = {floor: (min(self.rooms[r].x1 for r in ids), min(self.rooms[r].y1 for r in ids),
+                               max(self.rooms[r].x2 for r in ids), max(self.rooms[r].y2 for r in ids))
+                       for floor, ids in self.floors.items()}
+        self.agent_starts = [(a['x'], a['y'], a.get('floor', 0)) for a in layout.get('agent_starts', [])]
+        self.graph = nx.Graph()
+        for conn in layout['connections']:
+            stair = self.rooms[conn['from']].is_stair or self.rooms[conn['to']].is_stair
+            self.graph.add_edge(conn['from'], conn['to'], weight=conn.get('distance', 1),
+                                is_stair=conn.get('is_stair', stair))
+        self.hazard_system = FakeHazardSystem(self, burning)
+        self.update_calls = 0
+
+    def update_hazards(self, tick: int, dt: float, fire_enabled: bool = True):
+        self.update_calls += 1
+        if fire_enabled:
+            self.hazard_system.update()
+
+    def get_room_at_position(self, x, y, floor):
+        for room in self.rooms.values():
+            if room.floor == floor and room.x1 <= x <= room.x2 and room.y1 <= y <= room.y2:
+                return room
+        return None
+
+    def get_shortest_path(self, start, goal):
+        try:
+            return nx.shortest_path(self.graph, start, goal, weight='weight')
+        except (nx.NetworkXNoPath, nx.NodeNotFound):
+            return None
+
+    def get_path_length(self, start, goal=None):
+        if goal is None:
+            return len(start)
+        path = self.get_shortest_path(start, goal)
+        return float('inf') if path is None else float(len(path))
+
+    def get_nearest_exit(self, room_id):
+        return self.exits[0], self.get_shortest_path(room_id, self.exits[0])
+
+    def get_uncleared_rooms(self):
+        return [room_id for room_id, room in self.rooms.items()
+                if not room.cleared and not room.is_exit and not room.is_stair]
+
+    def get_remaining_evacuees(self):
+        return sum(room.evacuees_remaining for room in self.rooms.values())
+
+    def get_total_evacuees(self):
+        return sum(room.evacuee_count for room in self.rooms.values())
+
+
+@pytest.fixture
+def params():
+    """params.json with visualization off and a short time cap"""
+    with open(ROOT / 'params.json') as f:
+        p = json.load(f)
+    p['simulation']['time_cap'] = 400
+    p['visualization']['enabled'] = False
+    return p
+
+
+@pytest.fixture
+def make_env():
+    """Factory: make_env(params, layout_name='office_correct_dimensions.json', burning=True)"""
+    def make(p, layout_name='office_correct_dimensions.json', burning=True):
+        with open(ROOT / 'layouts' / layout_name) as f:
+            layout = json.load(f)
+        return FakeEnvironment(copy.deepcopy(layout), p, burning=burning)
+    return make
+
+
+@pytest.fixture
+def fake_environment_module(monkeypatch):
+    """Make `from sim.env.environment import Environment` give FakeEnvironment (LockstepRunner)"""
+    module = types.ModuleType('sim.env.environment')
+    module.Environment = FakeEnvironment
+    package = types.ModuleType('sim.env')
+    package.environment = module
+    monkeypatch.setitem(sys.modules, 'sim.env', package)
+    monkeypatch.setitem(sys.modules, 'sim.env.environment', module)
+
+
+def run_to_end(sim, fire_enabled=True, max_ticks=400, event_driven=False):
+    """Step (or advance) a simulator until it completes; returns its results"""
+    while not sim.complete and sim.tick < max_ticks:
+        if event_driven:
+            sim.advance(fire_enabled=fire_enabled, max_ticks=max_ticks)
+        else:
+            sim.step(fire_enabled=fire_enabled)
+    return sim.get_results()
+
+
+def trace(sim):
+    """Event log as comparable tuples"""
+    return [(e.tick, e.event_type.value, e.agent_id, e.room_id, str(e.data)) for e in sim.events]
@@ -2,6 +2,7 @@
 Agents module: Responder and Evacuee classes with movement logic
 """
 
+import numpy as np
 from typing import Tuple, Optional, List
 from src.environment import Environment, CellState
 from src.pathfinding import AStar, FlowField
@@ -108,16 +109,21 @@ class Responder(Agent):
         self.escort_target_exit = None  # Exit to escort to
         self.room_search_time = 0  # Time spent searching current room
         
-    def assign_room_task(self, room_info, env: Environment):
+    def assign_room_task(self, room_info, env: Environment,
+                         path: Optional[List[Tuple[int, int]]] = None):
         """
         Assign a room to clear (TRP optimization)
         
         Args:
             room_info: RoomInfo object with priority weight
             env: Environment
+            path: Precomputed path to the room center (computed with A* if None)
         """
         self.current_room_target = room_info
         self.room_search_time = 0  # Reset search time for new room
+        if path is not None:
+            self.current_path = path
+            return
         self.current_path = AStar.find_path(
             env, 
             self.get_position(), 
@@ -282,6 +288,217 @@ class Responder(Agent):
                 self.current_path = new_path
 
 
+class EvacueeCrowd:
+    """
+    Array-of-agents evacuee mode for crowd-scale scenarios
+    
+    Positions, speeds and active/found/unconscious/evacuated flags live in
+    NumPy arrays, and one vectorised step() advances every mobile evacuee one
+    cell along FlowField.direction_field. Unlike the static Evacuee model,
+    crowd evacuees walk to the exits themselves; responders can still find
+    and escort them through the matching Evacuee objects (see sync/write_back).
+    
+    Cell capacity: at most cell_capacity evacuees may share a non-exit cell.
+    Conflicts are resolved in passes, closest-to-exit first, so a queue can
+    advance into cells vacated earlier in the same step.
+    """
+    
+    def __init__(self, env: Environment, cell_capacity: int = 1,
+                 max_resolution_passes: int = 8):
+        self.env = env
+        self.cell_capacity = cell_capacity
+        self.max_resolution_passes = max_resolution_passes
+        
+        self.x = np.zeros(0, dtype=np.intp)
+        self.y = np.zeros(0, dtype=np.intp)
+        self.speed = np.zeros(0)
+        self.movement_accumulator = np.zeros(0)
+        self.active = np.zeros(0, dtype=bool)
+        self.found = np.zeros(0, dtype=bool)
+        self.unconscious = np.zeros(0, dtype=bool)
+        self.evacuated = np.zeros(0, dtype=bool)
+        self.danger_exposure_time = np.zeros(0, dtype=np.intp)
+        
+        # Rows changed by the last step (moved or evacuated) / exposure update
+        self.changed = np.zeros(0, dtype=np.intp)
+        self.exposure_changed = np.zeros(0, dtype=np.intp)
+    
+    @classmethod
+    def from_evacuees(cls, env: Environment, evacuees: List[Evacuee],
+                      cell_capacity: int = 1) -> 'EvacueeCrowd':
+        """Build a crowd mirroring a list of Evacuee objects (same row order)"""
+        crowd = cls(env, cell_capacity)
+        n = len(evacuees)
+        crowd.x = np.array([e.x for e in evacuees], dtype=np.intp).reshape(n)
+        crowd.y = np.array([e.y for e in evacuees], dtype=np.intp).reshape(n)
+        crowd.speed = np.array([e.speed for e in evacuees], dtype=float).reshape(n)
+        crowd.movement_accumulator = np.array([e.movement_accumulator for e in evacuees],
+                                              dtype=float).reshape(n)
+        crowd.danger_exposure_time = np.array([e.danger_exposure_time for e in evacuees],
+                                              dtype=np.intp).reshape(n)
+        crowd.sync(evacuees)
+        return crowd
+    
+    def add(self, positions: List[Tuple[int, int]], speed: float = 1.0):
+        """Append evacuees at the given positions"""
+        xy = np.asarray(positions, dtype=np.intp).reshape(-1, 2)
+        n = len(xy)
+        self.x = np.concatenate([self.x, xy[:, 0]])
+        self.y = np.concatenate([self.y, xy[:, 1]])
+        self.speed = np.concatenate([self.speed, np.full(n, speed)])
+        self.movement_accumulator = np.concatenate([self.movement_accumulator, np.zeros(n)])
+        self.active = np.concatenate([self.active, np.ones(n, dtype=bool)])
+        for name in ('found', 'unconscious', 'evacuated'):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(n, dtype=bool)]))
+        self.danger_exposure_time = np.concatenate([self.danger_exposure_time,
+                                                    np.zeros(n, dtype=np.intp)])
+    
+    def __len__(self) -> int:
+        return len(self.x)
+    
+    def sync(self, evacuees: List[Evacuee]):
+        """Pull flags changed outside the crowd (e.g. found/escorted by responders)"""
+        self.active = np.array([e.active for e in evacuees], dtype=bool)
+        self.found = np.array([e.found for e in evacuees], dtype=bool)
+        self.unconscious = np.array([e.unconscious for e in evacuees], dtype=bool)
+        self.evacuated = np.array([e.evacuated for e in evacuees], dtype=bool)
+        
+        # Found evacuees are escorted by responders, who move the objects
+        for i in np.flatnonzero(self.found).tolist():
+            self.x[i], self.y[i] = evacuees[i].x, evacuees[i].y
+    
+    def write_back(self, evacuees: List[Evacuee]):
+        """Push positions/flags of rows changed by the last step to Evacuee objects"""
+        rows = self.changed.tolist()
+        xs, ys = self.x[self.changed].tolist(), self.y[self.changed].tolist()
+        for i, x, y in zip(rows, xs, ys):
+            evacuee = evacuees[i]
+            evacuee.x, evacuee.y = x, y
+            evacuee.movement_accumulator = float(self.movement_accumulator[i])
+            evacuee.evacuated = bool(self.evacuated[i])
+            evacuee.active = bool(self.active[i])
+        
+        for i in self.exposure_changed.tolist():
+            evacuees[i].danger_exposure_time = int(self.danger_exposure_time[i])
+            evacuees[i].unconscious = bool(self.unconscious[i])
+    
+    def mobile_mask(self) -> np.ndarray:
+        """Evacuees that can still walk on their own"""
+        return self.active & ~self.evacuated & ~self.found & ~self.unconscious
+    
+    def update_exposure(self, env: Environment):
+        """Vectorised Evacuee.update: track danger exposure, mark unconscious"""
+        tracked = self.active & ~self.evacuated & ~self.found
+        danger = env.danger_grid[self.y, self.x]
+        
+        increment = (tracked & (danger >= 0.6)).astype(np.intp)
+        # High danger counts double
+        increment += 2 * (tracked & (danger >= Evacuee.DANGER_UNCONSCIOUS_THRESHOLD))
+        self.danger_exposure_time += increment
+        
+        self.unconscious |= tracked & (self.danger_exposure_time > 20)
+        self.exposure_changed = np.flatnonzero(increment)
+    
+    def step(self, env: Environment, flow_field: FlowField) -> int:
+        """
+        Advance every mobile evacuee one cell along the flow field
+        
+        Returns:
+            Number of evacuees that moved
+        """
+        self.changed = np.zeros(0, dtype=np.intp)
+        if len(self) == 0 or flow_field.direction_field is None:
+            return 0
+        
+        width, height = env.width, env.height
+        size = width * height
+        grid = env.grid.ravel()
+        
+        mobile = self.mobile_mask()
+        self.movement_accumulator[mobile] += self.speed[mobile]
+        ready = np.flatnonzero(mobile & (self.movement_accumulator >= 1.0))
+        if len(ready) == 0:
+            return 0
+        
+        # Target cell from the direction field
+        src = self.y[ready] * width + self.x[ready]
+        direction = flow_field.direction_field[self.y[ready], self.x[ready]].astype(np.intp)
+        tx = self.x[ready] + direction[:, 0]
+        ty = self.y[ready] + direction[:, 1]
+        target = ty * width + tx
+        
+        # Drop agents with no direction, or whose next cell has become unwalkable
+        target_state = grid[target]
+        valid = ((direction[:, 0] != 0) | (direction[:, 1] != 0)) & \
+                (target_state != CellState.WALL) & (target_state != CellState.DANGER)
+        ready, src, target = ready[valid], src[valid], target[valid]
+        
+        # Cell capacity: exits absorb any number of evacuees
+        capacity = np.full(size, self.cell_capacity, dtype=np.intp)
+        capacity[grid == CellState.EXIT] = len(self)
+        
+        present = self.active & ~self.evacuated
+        occupancy = np.bincount(self.y[present] * width + self.x[present], minlength=size)
+        
+        # Closest-to-exit agents claim contested cells first
+        priority = flow_field.distance_field.ravel()[src]
+        
+        moved = []
+        for _ in range(self.max_resolution_passes):
+            if len(ready) == 0:
+                break
+            order = np.lexsort((priority, target))
+            sorted_target = target[order]
+            group_start = np.flatnonzero(np.r_[True, sorted_target[1:] != sorted_target[:-1]])
+            group_sizes = np.diff(np.r_[group_start, len(order)])
+            rank = np.arange(len(order)) - np.repeat(group_start, group_sizes)
+            
+            accept_sorted = rank < (capacity[sorted_target] - occupancy[sorted_target])
+            if not accept_sorted.any():
+                break
+            accept = np.zeros(len(ready), dtype=bool)
+            accept[order[accept_sorted]] = True
+            
+            np.subtract.at(occupancy, src[accept], 1)
+            np.add.at(occupancy, target[accept], 1)
+            moved.append((ready[accept], target[accept]))
+            
+            keep = ~accept
+            ready, src, target, priority = ready[keep], src[keep], target[keep], priority[keep]
+        
+        rows = np.concatenate([m[0] for m in moved]) if moved else np.zeros(0, dtype=np.intp)
+        cells = np.concatenate([m[1] for m in moved]) if moved else np.zeros(0, dtype=np.intp)
+        
+        # Agents that did not move (no direction, unwalkable or full target)
+        # wait without banking extra movement
+        waiting = mobile.copy()
+        waiting[rows] = False
+        self.movement_accumulator[waiting] = np.minimum(self.movement_accumulator[waiting], 1.0)
+        
+        if not moved:
+            return 0
+        
+        self.x[rows] = cells % width
+        self.y[rows] = cells // width
+        self.movement_accumulator[rows] -= 1.0
+        
+        # Evacuees reaching an exit are safe
+        escaped = rows[grid[cells] == CellState.EXIT]
+        self.evacuated[escaped] = True
+        self.active[escaped] = False
+        
+        self.changed = rows
+        return len(rows)
+    
+    def count_evacuated(self) -> int:
+        """Count evacuees who reached exits"""
+        return int(self.evacuated.sum())
+    
+    def count_mobile(self) -> int:
+        """Count evacuees still walking toward an exit"""
+        return int(self.mobile_mask().sum())
+
+
 class AgentManager:
     """Manages all agents in the simulation"""
     
@@ -43,6 +43,8 @@ class Environment:
         self.width = width
         self.height = height
         self.grid = np.full((height, width), CellState.SAFE, dtype=int)
+        self.danger_grid = np.zeros((height, width))  # Mirrors Cell.danger_level for vectorised reads
+        self.grid_version = 0  # Bumped on every cell state change (cached cost grids key on it)
         self.cells = [[Cell(x, y) for x in range(width)] for y in range(height)]
         self.exits = []
         self.spawn_points = []
@@ -50,6 +52,8 @@ class Environment:
     def set_cell(self, x: int, y: int, state: CellState):
         """Set cell state"""
         if 0 <= x < self.width and 0 <= y < self.height:
+            if self.grid[y, x] != state:
+                self.grid_version += 1
             self.grid[y, x] = state
             self.cells[y][x].state = state
             
@@ -103,6 +107,7 @@ class Environment:
         if cell and cell.state != CellState.WALL and cell.state != CellState.EXIT:
             # Update danger level (take maximum if multiple hazards)
             cell.danger_level = max(cell.danger_level, danger_level)
+            self.danger_grid[y, x] = cell.danger_level
             
             # Mark as danger state if above threshold
             if cell.danger_level > 0.3:
@@ -117,6 +122,7 @@ class Environment:
         cell = self.get_cell(x, y)
         if cell:
             cell.danger_level = max(0.0, min(1.0, danger_level))
+            self.danger_grid[y, x] = cell.danger_level
             # Update grid state based on danger level
             if cell.danger_level > 0.3 and cell.state not in [CellState.WALL, CellState.EXIT]:
                 self.set_cell(x, y, CellState.DANGER)
@@ -190,6 +196,7 @@ class Environment:
         """Create a deep copy of the environment"""
         new_env = Environment(self.width, self.height)
         new_env.grid = self.grid.copy()
+        new_env.danger_grid = self.danger_grid.copy()
         new_env.exits = self.exits.copy()
         new_env.spawn_points = self.spawn_points.copy()
         # Deep copy cells
@@ -3,11 +3,66 @@ Pathfinding module: A* for responders and flow-field for evacuees
 """
 
 import heapq
+import weakref
 import numpy as np
 from typing import List, Tuple, Optional, Dict, Set
 from src.environment import Environment, CellState
 
 
+# Integer cost codes for the flat cost grid used by AStar and DijkstraFlood
+COST_BLOCKED = 0
+COST_NORMAL = 1
+COST_DANGER = 2
+
+
+def cost_code_grid(env: Environment, can_cross_danger: bool = True) -> np.ndarray:
+    """
+    Integer-coded, flattened (row-major) cost grid for the environment
+    
+    Returns:
+        int8 array of COST_BLOCKED / COST_NORMAL / COST_DANGER per cell
+    """
+    grid = env.grid.ravel()
+    codes = np.full(grid.shape, COST_NORMAL, dtype=np.int8)
+    codes[grid == CellState.DANGER] = COST_DANGER if can_cross_danger else COST_BLOCKED
+    codes[grid == CellState.WALL] = COST_BLOCKED
+    return codes
+
+
+# env -> {(can_cross_danger, hazard_penalty): (array, list)} for env.grid_version
+_step_cost_cache: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def step_cost_tables(env: Environment, can_cross_danger: bool = True,
+                     hazard_penalty: float = 5.0) -> Tuple[np.ndarray, List[float]]:
+    """
+    Per-cell cost of entering each flat cell index (inf = not walkable),
+    as a read-only array and as a list
+    
+    Built once per environment, settings and grid version: searches between
+    two cell state changes (mark_danger, doors, ...) share the same tables.
+    Grid changes must go through Environment.set_cell. The tables are
+    shared - do not modify them.
+    """
+    version, tables = _step_cost_cache.get(env, (None, None))
+    if version != env.grid_version:
+        tables = {}
+        _step_cost_cache[env] = (env.grid_version, tables)
+    key = (can_cross_danger, hazard_penalty)
+    if key not in tables:
+        table = np.array([np.inf, 1.0, 1.0 + hazard_penalty])
+        array = table[cost_code_grid(env, can_cross_danger)]
+        array.flags.writeable = False
+        tables[key] = (array, array.tolist())
+    return tables[key]
+
+
+def step_costs(env: Environment, can_cross_danger: bool = True,
+               hazard_penalty: float = 5.0) -> List[float]:
+    """Per-cell cost of entering each flat cell index (inf = not walkable; shared, see step_cost_tables)"""
+    return step_cost_tables(env, can_cross_danger, hazard_penalty)[1]
+
+
 class AStar:
     """A* pathfinding algorithm for responders"""
     
@@ -18,16 +73,22 @@ class AStar:
     
     @staticmethod
     def find_path(env: Environment, start: Tuple[int, int], goal: Tuple[int, int],
-                  can_cross_danger: bool = True, hazard_penalty: float = 5.0) -> Optional[List[Tuple[int, int]]]:
+                  can_cross_danger: bool = True, hazard_penalty: float = 5.0,
+                  stats: Optional[dict] = None) -> Optional[List[Tuple[int, int]]]:
         """
         Find path from start to goal using A*
         
+        Searches on flat cell indices with parent pointers and an integer-coded
+        cost grid; the path is only materialised once the goal is reached.
+        
         Args:
             env: Environment
             start: Starting position (x, y)
             goal: Goal position (x, y)
             can_cross_danger: Whether agent can traverse dangerous cells
             hazard_penalty: Additional cost for crossing dangerous cells
+            stats: Optional dict; stats['expanded'] is increased by the
+                number of nodes this search expanded (for benchmarking)
         
         Returns:
             List of (x, y) positions from start to goal, or None if no path exists
@@ -35,41 +96,68 @@ class AStar:
         if not env.is_walkable(goal[0], goal[1], can_cross_danger):
             return None
         
-        # Priority queue: (f_score, counter, position, path)
+        width, height = env.width, env.height
+        size = width * height
+        cost = step_costs(env, can_cross_danger, hazard_penalty)
+        
+        gx, gy = goal
+        start_idx = start[1] * width + start[0]
+        goal_idx = gy * width + gx
+        
+        g_score = [np.inf] * size
+        parent = [-1] * size
+        closed = [False] * size
+        g_score[start_idx] = 0.0
+        
+        # Priority queue: (f_score, counter, index)
         counter = 0
-        heap = [(0, counter, start, [start])]
-        visited = {start: 0}  # position -> g_score
+        heap = [(0, counter, start_idx)]
+        expanded = 0
         
         while heap:
-            f_score, _, current, path = heapq.heappop(heap)
+            _, _, current = heapq.heappop(heap)
             
-            if current == goal:
+            if current == goal_idx:
+                if stats is not None:
+                    stats['expanded'] += expanded
+                path = []
+                while current != -1:
+                    path.append((current % width, current // width))
+                    current = parent[current]
+                path.reverse()
                 return path
             
-            current_g = visited[current]
+            if closed[current]:
+                continue  # Stale heap entry
+            closed[current] = True
+            current_g = g_score[current]
+            expanded += 1
+            x = current % width
             
-            # Explore neighbors
-            for neighbor in env.get_neighbors(current[0], current[1], can_cross_danger):
-                # Calculate cost
-                move_cost = 1.0
-                
-                # Add penalty for dangerous cells
-                state = env.get_state(neighbor[0], neighbor[1])
-                if state == CellState.DANGER:
-                    move_cost += hazard_penalty
+            # Explore neighbors (same order as Environment.get_neighbors)
+            for neighbor, valid in ((current + width, current + width < size),
+                                    (current + 1, x + 1 < width),
+                                    (current - width, current >= width),
+                                    (current - 1, x > 0)):
+                if not valid or closed[neighbor]:
+                    continue
+                move_cost = cost[neighbor]
+                if move_cost == np.inf:
+                    continue
                 
                 new_g = current_g + move_cost
                 
                 # If we found a better path to this neighbor
-                if neighbor not in visited or new_g < visited[neighbor]:
-                    visited[neighbor] = new_g
-                    h = AStar.heuristic(neighbor, goal)
-                    new_f = new_g + h
+                if new_g < g_score[neighbor]:
+                    g_score[neighbor] = new_g
+                    parent[neighbor] = current
+                    h = abs(neighbor % width - gx) + abs(neighbor // width - gy)
                     
                     counter += 1
-                    new_path = path + [neighbor]
-                    heapq.heappush(heap, (new_f, counter, neighbor, new_path))
+                    heapq.heappush(heap, (new_g + h, counter, neighbor))
         
+        if stats is not None:
+            stats['expanded'] += expanded
         return None  # No path found
     
     @staticmethod
@@ -79,31 +167,156 @@ class AStar:
         """
         Find nearest reachable target from start position
         
+        Uses a single Dijkstra flood from start instead of one A* per target.
+        
         Returns:
             Nearest target position or None
         """
+        flood = DijkstraFlood(env, start, targets, can_cross_danger)
+        
         nearest = None
         min_distance = float('inf')
         
         for target in targets:
-            path = AStar.find_path(env, start, target, can_cross_danger)
-            if path and len(path) < min_distance:
-                min_distance = len(path)
+            distance = flood.get_travel_time(target)
+            if distance is not None and distance < min_distance:
+                min_distance = distance
                 nearest = target
         
         return nearest
 
 
+class DijkstraFlood:
+    """
+    Single-source, danger-weighted Dijkstra flood (one-to-many travel times)
+    
+    Uses the same step costs as AStar.find_path (1 per move, plus hazard_penalty
+    when entering a DANGER cell), so one flood replaces one A* call per target.
+    The flood stops early once every target has been settled; paths are only
+    reconstructed on request.
+    """
+    
+    def __init__(self, env: Environment, start: Tuple[int, int],
+                 targets: Optional[List[Tuple[int, int]]] = None,
+                 can_cross_danger: bool = True, hazard_penalty: float = 5.0):
+        self.env = env
+        self.start = start
+        width, height = env.width, env.height
+        size = width * height
+        
+        # Per-cell cost of entering that cell (inf = not walkable)
+        step_cost = step_costs(env, can_cross_danger, hazard_penalty)
+        
+        self.cost = [np.inf] * size
+        self.hops = [0] * size
+        self.parent = [-1] * size
+        self.settled = [False] * size
+        
+        # Targets still to settle (None = flood everything reachable)
+        pending = None
+        if targets is not None:
+            pending = {y * width + x for x, y in targets
+                       if 0 <= x < width and 0 <= y < height}
+        
+        start_idx = start[1] * width + start[0]
+        self.cost[start_idx] = 0.0
+        heap = [(0.0, start_idx)]
+        cost, hops, parent, settled = self.cost, self.hops, self.parent, self.settled
+        
+        while heap:
+            dist, current = heapq.heappop(heap)
+            if settled[current]:
+                continue
+            settled[current] = True
+            
+            if pending is not None:
+                pending.discard(current)
+                if not pending:
+                    break
+            
+            x = current % width
+            for neighbor, valid in ((current + width, current + width < size),
+                                    (current + 1, x + 1 < width),
+                                    (current - width, current >= width),
+                                    (current - 1, x > 0)):
+                if not valid or settled[neighbor]:
+                    continue
+                new_cost = dist + step_cost[neighbor]
+                if new_cost < cost[neighbor]:
+                    cost[neighbor] = new_cost
+                    hops[neighbor] = hops[current] + 1
+                    parent[neighbor] = current
+                    heapq.heappush(heap, (new_cost, neighbor))
+    
+    def _index(self, pos: Tuple[int, int]) -> Optional[int]:
+        x, y = pos
+        if 0 <= x < self.env.width and 0 <= y < self.env.height:
+            return y * self.env.width + x
+        return None
+    
+    def get_cost(self, target: Tuple[int, int]) -> float:
+        """Danger-weighted cost to reach target (inf if unreachable/unsettled)"""
+        idx = self._index(target)
+        if idx is None or not self.settled[idx]:
+            return np.inf
+        return self.cost[idx]
+    
+    def get_travel_time(self, target: Tuple[int, int]) -> Optional[int]:
+        """
+        Travel time to target in cells, i.e. len() of the path AStar would return
+        
+        Returns:
+            Number of cells on the path (including start), or None if unreachable
+        """
+        idx = self._index(target)
+        if idx is None or not self.settled[idx]:
+            return None
+        return self.hops[idx] + 1
+    
+    def get_path(self, target: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Reconstruct path from start to target via parent pointers"""
+        idx = self._index(target)
+        if idx is None or not self.settled[idx]:
+            return None
+        
+        width = self.env.width
+        path = []
+        while idx != -1:
+            path.append((idx % width, idx // width))
+            idx = self.parent[idx]
+        path.reverse()
+        return path
+
+
 class FlowField:
-    """Flow field pathfinding for evacuees (multi-source Dijkstra)"""
+    """
+    Flow field pathfinding for evacuees (multi-source Dijkstra)
+    
+    The field can be repaired incrementally: compute(..., incremental=True)
+    only re-settles cells whose shortest path to an exit went through a cell
+    that became DANGER/WALL (or that can now use a cell that became safe),
+    instead of rebuilding the whole field.
+    """
+    
+    # 4-neighbour offsets (dx, dy), same order as Environment.get_neighbors
+    NEIGHBOR_OFFSETS = ((0, 1), (1, 0), (0, -1), (-1, 0))
     
     def __init__(self, env: Environment):
         self.env = env
         self.distance_field = None
         self.direction_field = None
+        self.goals = []
+        self.avoid_danger = True
+        self.last_update_size = 0  # Cells re-settled by the last compute()
+        self._parent = None  # Flat index of next cell toward exit (-1 = none)
+        self._cost = None  # Flat per-cell entry cost the field was built with
         
+    def _step_costs(self, avoid_danger: bool) -> Tuple[np.ndarray, List[float]]:
+        """Entry cost per flat cell (array, list): DANGER is blocked when avoiding danger"""
+        return step_cost_tables(self.env, can_cross_danger=not avoid_danger, hazard_penalty=0.0)
+    
     def compute(self, goals: List[Tuple[int, int]], avoid_danger: bool = True,
-                density_penalty: float = 0.5):
+                density_penalty: float = 0.5, incremental: bool = False):
         """
         Compute flow field from multiple goal positions (exits)
         
@@ -111,50 +324,183 @@ class FlowField:
             goals: List of goal positions (exits)
             avoid_danger: Whether to avoid dangerous cells
             density_penalty: Penalty for cells with high evacuee density
+            incremental: Repair the previous field instead of rebuilding it
+                (falls back to a full rebuild if goals or settings changed)
         """
+        goals = [tuple(goal) for goal in goals]
+        cost, cost_list = self._step_costs(avoid_danger)
+        
+        if (incremental and self.distance_field is not None
+                and goals == self.goals and avoid_danger == self.avoid_danger
+                and self._goals_unchanged(cost)):
+            self._repair(cost, cost_list)
+            return
+        
+        self.goals = goals
+        self.avoid_danger = avoid_danger
+        self._full_compute(cost, cost_list)
+    
+    def _goals_unchanged(self, cost: np.ndarray) -> bool:
+        """Check that every goal is still seeded exactly as in the last build"""
+        width = self.env.width
+        for x, y in self.goals:
+            idx = y * width + x
+            if np.isinf(cost[idx]) != np.isinf(self._cost[idx]):
+                return False
+        return True
+    
+    def _full_compute(self, cost: np.ndarray, cost_list: List[float]):
+        """Rebuild the whole distance field with multi-source Dijkstra"""
         width, height = self.env.width, self.env.height
+        size = width * height
         
-        # Initialize distance field with infinity
-        self.distance_field = np.full((height, width), np.inf)
-        self.direction_field = np.zeros((height, width, 2))  # (dx, dy) for each cell
+        dist = np.full(size, np.inf)
+        parent = np.full(size, -1, dtype=np.intp)
         
         # Multi-source Dijkstra: start from all goals
         heap = []
-        for goal in goals:
-            if self.env.is_walkable(goal[0], goal[1], can_cross_danger=not avoid_danger):
-                self.distance_field[goal[1], goal[0]] = 0
-                heapq.heappush(heap, (0, goal))
+        for x, y in self.goals:
+            idx = y * width + x
+            if 0 <= x < width and 0 <= y < height and not np.isinf(cost[idx]):
+                dist[idx] = 0.0
+                heap.append((0.0, idx))
+        heapq.heapify(heap)
         
-        visited = set()
+        self._cost = cost
+        self.last_update_size = self._propagate(heap, dist, parent, cost_list)
+        self._parent = parent
+        self.distance_field = dist.reshape(height, width)
+        
+        self.direction_field = np.zeros((height, width, 2))  # (dx, dy) for each cell
+        self._update_directions(np.arange(size))
+    
+    def _repair(self, cost: np.ndarray, cost_list: List[float]):
+        """
+        Incremental (dynamic SSSP) repair after cell costs changed
+        
+        1. Cells whose cost increased, and every cell whose shortest-path tree
+           runs through them, are invalidated (set to infinity).
+        2. Invalidated cells and cells whose cost decreased are re-seeded from
+           their best neighbour.
+        3. Dijkstra propagates from the seeds; only the affected region is touched.
+        """
+        width = self.env.width
+        dist = self.distance_field.ravel()
+        parent = self._parent
+        old_cost = self._cost
+        self._cost = cost
+        if cost is old_cost:  # Same cached table: the grid has not changed
+            self.last_update_size = 0
+            return
+        
+        changed = np.flatnonzero(cost != old_cost)
+        if len(changed) == 0:
+            self.last_update_size = 0
+            return
+        
+        increased = changed[cost[changed] > old_cost[changed]]
+        decreased = changed[cost[changed] < old_cost[changed]]
+        
+        affected = self._descendants(increased)
+        dist[affected] = np.inf
+        parent[affected] = -1
+        
+        # Re-seed from the best neighbour outside the invalidated region
+        seeds = np.union1d(affected, decreased)
+        seeds = seeds[~np.isinf(cost[seeds]) & (dist[seeds] != 0.0)]
+        nbr = self._neighbor_indices(seeds)
+        nbr_dist = np.where(nbr >= 0, dist[np.maximum(nbr, 0)], np.inf)
+        best = np.argmin(nbr_dist, axis=1)
+        rows = np.arange(len(seeds))
+        candidate = nbr_dist[rows, best] + cost[seeds]
+        improved = candidate < dist[seeds]
+        
+        seeds, candidate = seeds[improved], candidate[improved]
+        dist[seeds] = candidate
+        parent[seeds] = nbr[rows[improved], best[improved]]
+        
+        heap = list(zip(candidate.tolist(), seeds.tolist()))
+        heapq.heapify(heap)
+        touched = []
+        self._propagate(heap, dist, parent, cost_list, touched)
+        
+        touched = np.union1d(affected, np.array(touched, dtype=np.intp))
+        self._update_directions(touched)
+        self.last_update_size = len(touched)
+    
+    def _propagate(self, heap: list, dist: np.ndarray, parent: np.ndarray,
+                   cost: List[float], touched: Optional[list] = None) -> int:
+        """Dijkstra relaxation from the heap; returns number of settled pops"""
+        width, height = self.env.width, self.env.height
+        size = width * height
+        settled = 0
         
         while heap:
-            dist, (x, y) = heapq.heappop(heap)
+            d, current = heapq.heappop(heap)
+            if d > dist[current]:
+                continue  # Stale entry
+            settled += 1
+            if touched is not None:
+                touched.append(current)
             
-            if (x, y) in visited:
-                continue
-            visited.add((x, y))
-            
-            # Explore neighbors
-            for nx, ny in self.env.get_neighbors(x, y, can_cross_danger=not avoid_danger):
-                if (nx, ny) in visited:
+            x = current % width
+            for neighbor, valid in ((current + width, current + width < size),
+                                    (current + 1, x + 1 < width),
+                                    (current - width, current >= width),
+                                    (current - 1, x > 0)):
+                if not valid:
                     continue
-                
-                # Calculate cost
-                move_cost = 1.0
-                
-                # Add penalty for dangerous cells
-                if avoid_danger:
-                    state = self.env.get_state(nx, ny)
-                    if state == CellState.DANGER:
-                        move_cost += 10.0  # High penalty to avoid danger
-                
-                new_dist = dist + move_cost
-                
-                if new_dist < self.distance_field[ny, nx]:
-                    self.distance_field[ny, nx] = new_dist
-                    # Direction points from (nx, ny) toward (x, y)
-                    self.direction_field[ny, nx] = [x - nx, y - ny]
-                    heapq.heappush(heap, (new_dist, (nx, ny)))
+                new_dist = d + cost[neighbor]
+                if new_dist < dist[neighbor]:
+                    dist[neighbor] = new_dist
+                    # Direction points from neighbor toward current
+                    parent[neighbor] = current
+                    heapq.heappush(heap, (new_dist, neighbor))
+        
+        return settled
+    
+    def _descendants(self, roots: np.ndarray) -> np.ndarray:
+        """All cells whose shortest-path tree passes through any root (inclusive)"""
+        if len(roots) == 0:
+            return roots
+        
+        parent = self._parent
+        has_parent = np.flatnonzero(parent >= 0)
+        children = has_parent[np.argsort(parent[has_parent], kind='stable')]
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(parent[has_parent],
+                                                             minlength=len(parent)))))
+        
+        seen = set(roots.tolist())
+        stack = list(seen)
+        while stack:
+            current = stack.pop()
+            for child in children[offsets[current]:offsets[current + 1]].tolist():
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        
+        return np.fromiter(seen, dtype=np.intp, count=len(seen))
+    
+    def _neighbor_indices(self, cells: np.ndarray) -> np.ndarray:
+        """(n, 4) flat neighbour indices of flat cells, -1 when out of bounds"""
+        width, height = self.env.width, self.env.height
+        xs, ys = cells % width, cells // width
+        offsets = np.array(self.NEIGHBOR_OFFSETS, dtype=np.intp)
+        nx = xs[:, None] + offsets[None, :, 0]
+        ny = ys[:, None] + offsets[None, :, 1]
+        valid = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+        return np.where(valid, ny * width + nx, -1)
+    
+    def _update_directions(self, cells: np.ndarray):
+        """Refresh direction_field (dx, dy toward parent) for the given flat cells"""
+        width = self.env.width
+        parent = self._parent[cells]
+        has_parent = parent >= 0
+        xs, ys = cells % width, cells // width
+        dx = np.where(has_parent, parent % width - xs, 0)
+        dy = np.where(has_parent, parent // width - ys, 0)
+        self.direction_field[ys, xs, 0] = dx
+        self.direction_field[ys, xs, 1] = dy
     
     def get_best_direction(self, x: int, y: int) -> Optional[Tuple[int, int]]:
         """
@@ -183,6 +529,47 @@ class FlowField:
         
         return best_neighbor
     
+    def get_best_directions(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorised get_best_direction for many agents at once
+        
+        Args:
+            positions: (n, 2) integer array of (x, y) positions
+        
+        Returns:
+            (next_positions, can_move): (n, 2) next positions (unchanged where
+            no move is possible) and a boolean mask of agents that can move
+        """
+        positions = np.asarray(positions, dtype=np.intp).reshape(-1, 2)
+        if self.distance_field is None or len(positions) == 0:
+            return positions.copy(), np.zeros(len(positions), dtype=bool)
+        
+        width = self.env.width
+        dist = self.distance_field.ravel()
+        grid = self.env.grid.ravel()
+        
+        cells = positions[:, 1] * width + positions[:, 0]
+        current_dist = dist[cells]
+        
+        # Neighbour distances; walls, danger and out-of-bounds count as infinite
+        nbr = self._neighbor_indices(cells)
+        safe_nbr = np.maximum(nbr, 0)
+        walkable = (nbr >= 0) & (grid[safe_nbr] != CellState.WALL) & (grid[safe_nbr] != CellState.DANGER)
+        nbr_dist = np.where(walkable, dist[safe_nbr], np.inf)
+        
+        # argmin picks the first neighbour on ties, matching get_best_direction
+        best = np.argmin(nbr_dist, axis=1)
+        rows = np.arange(len(cells))
+        best_dist = nbr_dist[rows, best]
+        
+        can_move = (current_dist != 0) & ~np.isinf(current_dist) & (best_dist < current_dist)
+        best_cell = nbr[rows, best]
+        
+        next_positions = positions.copy()
+        next_positions[can_move, 0] = best_cell[can_move] % width
+        next_positions[can_move, 1] = best_cell[can_move] // width
+        return next_positions, can_move
+    
     def get_distance(self, x: int, y: int) -> float:
         """Get distance value at position"""
         if self.distance_field is None:
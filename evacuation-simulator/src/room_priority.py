@@ -12,7 +12,7 @@ Responders optimize routes to visit rooms based on:
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from src.environment import Environment, Cell
+from src.environment import Environment, Cell, CellState
 
 
 @dataclass
@@ -28,6 +28,7 @@ class RoomInfo:
     
     # Time-varying
     avg_danger: float = 0.0  # Current average danger level
+    max_danger: float = 0.0  # Current peak danger level
     time_to_untenability: float = float('inf')  # Timesteps until uninhabitable
     
     def __hash__(self):
@@ -89,20 +90,107 @@ class RoomWeightCalculator:
             )
             
             self.rooms[room_id] = room_info
+        
+        self._build_room_index()
+    
+    def _build_room_index(self):
+        """
+        Precompute flat cell-index arrays used by update_room_states
+        
+        - room_labels: (height, width) array of room indices, -1 outside rooms
+        - per-room cell indices (row-major, same order as RoomInfo.cells)
+        - 8-neighbour boundary ring (with multiplicity, for adjacent danger)
+        - 4-neighbour boundary ring (for accessibility)
+        """
+        width, height = self.env.width, self.env.height
+        self._room_order = list(self.rooms.keys())
+        self._room_index = {room_id: i for i, room_id in enumerate(self._room_order)}
+        self.room_labels = np.full((height, width), -1, dtype=np.intp)
+        
+        cell_idx = []
+        ring8_idx, ring8_room = [], []
+        ring4_idx = []
+        offsets_8 = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+        offsets_4 = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+        
+        for i, room_id in enumerate(self._room_order):
+            xy = np.array(self.rooms[room_id].cells, dtype=np.intp)
+            self.room_labels[xy[:, 1], xy[:, 0]] = i
+            cell_idx.append(xy[:, 1] * width + xy[:, 0])
+        
+        labels_flat = self.room_labels.ravel()
+        for i, cells in enumerate(cell_idx):
+            xs, ys = cells % width, cells // width
+            for offsets, ring_idx, ring_room in ((offsets_8, ring8_idx, ring8_room),
+                                                 (offsets_4, ring4_idx, None)):
+                d = np.array(offsets, dtype=np.intp)
+                # (n_cells, n_offsets), flattened row-major: per cell, per neighbour
+                nx = (xs[:, None] + d[None, :, 0]).ravel()
+                ny = (ys[:, None] + d[None, :, 1]).ravel()
+                in_bounds = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+                flat = ny[in_bounds] * width + nx[in_bounds]
+                flat = flat[labels_flat[flat] != i]
+                ring_idx.append(flat)
+                if ring_room is not None:
+                    ring_room.append(np.full(len(flat), i, dtype=np.intp))
+        
+        def _concat(parts):
+            return np.concatenate(parts) if parts else np.zeros(0, dtype=np.intp)
+        
+        self._cell_idx = _concat(cell_idx)
+        self._ring8_idx = _concat(ring8_idx)
+        self._ring8_room = _concat(ring8_room)
+        self._ring4_idx = _concat(ring4_idx)
+        # Room i's slice of each concatenated array is [bounds[i], bounds[i + 1])
+        self._cell_bounds = np.cumsum([0] + [len(c) for c in cell_idx])
+        self._ring8_bounds = np.cumsum([0] + [len(r) for r in ring8_idx])
+        self._ring4_bounds = np.cumsum([0] + [len(r) for r in ring4_idx])
+        
+        # Snapshots of the last grid seen by update_room_states (None = refresh all)
+        self._danger_snapshot = None
+        self._state_snapshot = None
+    
+    def _get_dirty_rooms(self, env: Environment) -> np.ndarray:
+        """Boolean mask of rooms whose cells or boundary ring changed since last update"""
+        n_rooms = len(self._room_order)
+        danger = env.danger_grid.ravel()
+        state = env.grid.ravel()
+        
+        if self._danger_snapshot is None:
+            dirty = np.ones(n_rooms, dtype=bool)
+        else:
+            changed = (danger != self._danger_snapshot) | (state != self._state_snapshot)
+            dirty = np.zeros(n_rooms, dtype=bool)
+            if changed.any():
+                labels = self.room_labels.ravel()[changed]
+                dirty[labels[labels >= 0]] = True
+                dirty[self._ring8_room[changed[self._ring8_idx]]] = True
+        
+        self._danger_snapshot = danger.copy()
+        self._state_snapshot = state.copy()
+        return dirty
     
     def update_room_states(self, env: Environment, timestep: int):
-        """Update dynamic room properties (danger, time to untenability)"""
-        for room_id, room in self.rooms.items():
-            # a) Calculate average danger level
-            danger_sum = 0.0
-            max_danger = 0.0
-            
-            for x, y in room.cells:
-                danger = env.get_danger_level(x, y)
-                danger_sum += danger
-                max_danger = max(max_danger, danger)
+        """
+        Update dynamic room properties (danger, time to untenability)
+        
+        Only rooms whose cells (or boundary) changed since the last call are
+        refreshed, and only their own cells and boundary rings are read.
+        """
+        dirty = self._get_dirty_rooms(env)
+        danger = env.danger_grid.ravel()
+        bounds = self._cell_bounds
+        
+        for i in np.flatnonzero(dirty).tolist():
+            room = self.rooms[self._room_order[i]]
             
-            room.avg_danger = danger_sum / len(room.cells)
+            # a) Average and max danger over the room's cells
+            cell_danger = danger[self._cell_idx[bounds[i]:bounds[i + 1]]]
+            if len(cell_danger):
+                room.avg_danger = float(cell_danger.sum() / len(cell_danger))
+                room.max_danger = float(cell_danger.max())
+            else:
+                room.avg_danger = room.max_danger = 0.0
             
             # b) Estimate time to untenability
             # If danger is spreading, estimate when room becomes uninhabitable
@@ -128,30 +216,24 @@ class RoomWeightCalculator:
     
     def _get_adjacent_danger(self, room: RoomInfo, env: Environment) -> float:
         """Get average danger level of adjacent cells outside room"""
-        adjacent_danger = []
-        
-        for x, y in room.cells:
-            for nx, ny in env.get_neighbors_8(x, y, can_cross_danger=True):
-                if (nx, ny) not in room.cells:
-                    danger = env.get_danger_level(nx, ny)
-                    adjacent_danger.append(danger)
+        i = self._room_index[room.room_id]
+        ring = self._ring8_idx[self._ring8_bounds[i]:self._ring8_bounds[i + 1]]
+        ring = ring[env.grid.ravel()[ring] != CellState.WALL]
         
-        return np.mean(adjacent_danger) if adjacent_danger else 0.0
+        return np.mean(env.danger_grid.ravel()[ring]) if len(ring) else 0.0
     
     def _check_accessibility(self, room: RoomInfo, env: Environment) -> bool:
-        """Check if room is accessible (not completely surrounded by high danger)"""
-        # Room is accessible if there's at least one entry point with danger < 0.8
-        entry_points = []
-        
-        for x, y in room.cells:
-            for nx, ny in env.get_neighbors(x, y):
-                cell = env.get_cell(nx, ny)
-                if cell and cell.room_id != room.room_id:
-                    danger = env.get_danger_level(nx, ny)
-                    if danger < 0.8:  # Responders can traverse
-                        return True
-        
-        return False
+        """
+        Check if room is accessible (not completely surrounded by high danger)
+        
+        A room is accessible if at least one walkable entry cell outside it has
+        danger < 0.8 (responders can traverse).
+        """
+        i = self._room_index[room.room_id]
+        ring = self._ring4_idx[self._ring4_bounds[i]:self._ring4_bounds[i + 1]]
+        state = env.grid.ravel()[ring]
+        danger = env.danger_grid.ravel()[ring]
+        return bool(((state != CellState.WALL) & (state != CellState.DANGER) & (danger < 0.8)).any())
     
     def add_report(self, room_id: int, occupancy: int):
         """
@@ -261,27 +343,44 @@ class RoomWeightCalculator:
         Returns:
             Highest priority room to visit next
         """
+        best_room, _ = self.get_next_room_with_path(responder_pos, current_time)
+        return best_room
+    
+    def get_next_room_with_path(self, responder_pos: Tuple[int, int],
+                                current_time: int
+                                ) -> Tuple[Optional[RoomInfo], Optional[List[Tuple[int, int]]]]:
+        """
+        Get next room to visit and the path to its center
+        
+        Travel times to all candidate rooms come from one danger-weighted
+        Dijkstra flood from the responder (stopping once every candidate center
+        is settled); the path is only reconstructed for the chosen room.
+        
+        Returns:
+            (highest priority room, path to its center), or (None, None)
+        """
+        from src.pathfinding import DijkstraFlood
+        
+        candidates = [room for room in self.rooms.values()
+                      if not room.is_cleared and room.is_accessible]
+        if not candidates:
+            return None, None
+        
+        flood = DijkstraFlood(
+            self.env,
+            responder_pos,
+            [room.center for room in candidates],
+            can_cross_danger=True,
+            hazard_penalty=2.0
+        )
+        
         best_room = None
         best_weight = 0.0
         
-        from src.pathfinding import AStar
-        
-        for room in self.rooms.values():
-            if room.is_cleared or not room.is_accessible:
-                continue
-            
+        for room in candidates:
             # Calculate travel time to room
-            path = AStar.find_path(
-                self.env, 
-                responder_pos, 
-                room.center,
-                can_cross_danger=True,
-                hazard_penalty=2.0
-            )
-            
-            if path:
-                travel_time = len(path)
-            else:
+            travel_time = flood.get_travel_time(room.center)
+            if travel_time is None:
                 continue  # Can't reach
             
             # Calculate weight
@@ -291,7 +390,10 @@ class RoomWeightCalculator:
                 best_weight = weight
                 best_room = room
         
-        return best_room
+        if best_room is None:
+            return None, None
+        
+        return best_room, flood.get_path(best_room.center)
     
     def mark_room_cleared(self, room_id: int):
         """Mark a room as cleared/verified"""
@@ -5,7 +5,7 @@ Simulation module: Main simulation controller
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from src.environment import Environment
-from src.agents import AgentManager, Evacuee, Responder
+from src.agents import AgentManager, Evacuee, Responder, EvacueeCrowd
 from src.hazards import HazardManager
 from src.pathfinding import FlowField
 from src.room_priority import RoomWeightCalculator
@@ -31,6 +31,11 @@ class SimulationConfig:
         self.recompute_flow_interval = 5  # Recompute evacuee paths every N steps
         self.replan_responder_interval = 10  # Replan responder paths every N steps
         
+        # Crowd mode: evacuees walk to exits along the flow field, advanced
+        # in one vectorised step (EvacueeCrowd) instead of per-agent updates
+        self.crowd_mode = False
+        self.cell_capacity = 1  # Max evacuees per non-exit cell in crowd mode
+        
         # Success criteria
         self.min_evacuation_rate = 0.8  # Success if 80%+ evacuated
 
@@ -45,6 +50,8 @@ class Simulation:
         self.agent_manager = AgentManager()
         self.hazard_manager = HazardManager()
         self.room_calculator = RoomWeightCalculator(env)  # TRP optimization
+        self.flow_field = None  # Evacuee flow field (crowd mode only)
+        self.crowd = None  # Array-of-agents evacuees (crowd mode only)
         
         self.timestep = 0
         self.running = True
@@ -94,18 +101,25 @@ class Simulation:
             if cell:
                 evacuee.room_id = cell.room_id
         
+        # Crowd mode: evacuees follow a flow field toward the exits
+        if self.config.crowd_mode:
+            self.flow_field = FlowField(self.env)
+            self.flow_field.compute(self.env.exits)
+            self.crowd = EvacueeCrowd.from_evacuees(
+                self.env, self.agent_manager.evacuees, self.config.cell_capacity
+            )
+        
         # Update initial room states
         self.room_calculator.update_room_states(self.env, self.timestep)
         
         # Assign initial tasks to responders using TRP logic
         for responder in self.agent_manager.responders:
-            next_room = self.room_calculator.get_next_room_priority(
+            next_room, path = self.room_calculator.get_next_room_with_path(
                 responder.get_position(),
-                self.timestep,
-                None  # path_finder not needed, handled internally
+                self.timestep
             )
             if next_room:
-                responder.assign_room_task(next_room, self.env)
+                responder.assign_room_task(next_room, self.env, path)
     
     def step(self):
         """Execute one simulation timestep with TRP optimization"""
@@ -122,9 +136,12 @@ class Simulation:
         self.room_calculator.update_room_states(self.env, self.timestep)
         
         # 3. Update evacuees (static, but track danger exposure)
-        for evacuee in self.agent_manager.evacuees:
-            if evacuee.active and not evacuee.found:
-                evacuee.update(self.env)
+        if self.crowd is not None:
+            self._step_crowd()
+        else:
+            for evacuee in self.agent_manager.evacuees:
+                if evacuee.active and not evacuee.found:
+                    evacuee.update(self.env)
         
         # 4. Update responders using TRP optimization
         for responder in self.agent_manager.responders:
@@ -144,24 +161,22 @@ class Simulation:
                         responder.clear_room()
                     
                     # Assign new room using TRP weights
-                    next_room = self.room_calculator.get_next_room_priority(
+                    next_room, path = self.room_calculator.get_next_room_with_path(
                         responder.get_position(),
-                        self.timestep,
-                        None
+                        self.timestep
                     )
                     if next_room:
-                        responder.assign_room_task(next_room, self.env)
+                        responder.assign_room_task(next_room, self.env, path)
             
             # If finished escorting, return to room clearing
             elif responder.escorting is None and responder.current_room_target is None and len(responder.current_path) == 0:
                 # Assign new room
-                next_room = self.room_calculator.get_next_room_priority(
+                next_room, path = self.room_calculator.get_next_room_with_path(
                     responder.get_position(),
-                    self.timestep,
-                    None
+                    self.timestep
                 )
                 if next_room:
-                    responder.assign_room_task(next_room, self.env)
+                    responder.assign_room_task(next_room, self.env, path)
             
             # Replan if path blocked by hazards
             if self.timestep % self.config.replan_responder_interval == 0:
@@ -173,6 +188,19 @@ class Simulation:
         # 6. Check termination conditions
         self._check_termination()
     
+    def _step_crowd(self):
+        """Crowd mode: vectorised exposure tracking and flow-field movement"""
+        evacuees = self.agent_manager.evacuees
+        
+        # Hazards changed the grid: repair the flow field incrementally
+        if self.timestep % self.config.recompute_flow_interval == 0:
+            self.flow_field.compute(self.env.exits, incremental=True)
+        
+        self.crowd.sync(evacuees)
+        self.crowd.update_exposure(self.env)
+        self.crowd.step(self.env, self.flow_field)
+        self.crowd.write_back(evacuees)
+    
     def _record_frame(self):
         """Record current state for export"""
         # Create danger level heatmap
@@ -0,0 +1,101 @@
+"""EvacueeCrowd batched movement along the flow field"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.agents import Evacuee, EvacueeCrowd
+from src.environment import CellState, create_office_layout
+from src.pathfinding import FlowField
+
+
+def crowd_in_office(count, cell_capacity=1, seed=0, speed=1.0):
+    env = create_office_layout()
+    field = FlowField(env)
+    field.compute(env.exits)
+    cells = [c for c in env.get_all_safe_cells() if field.is_reachable(*c)]
+    positions = random.Random(seed).sample(cells, count)
+    crowd = EvacueeCrowd(env, cell_capacity)
+    crowd.add(positions * cell_capacity, speed)
+    return env, field, crowd
+
+
+def occupancy(env, crowd):
+    present = crowd.active & ~crowd.evacuated
+    counts = {}
+    for x, y in zip(crowd.x[present].tolist(), crowd.y[present].tolist()):
+        if env.get_state(x, y) != CellState.EXIT:
+            counts[(x, y)] = counts.get((x, y), 0) + 1
+    return counts
+
+
+@pytest.mark.parametrize('cell_capacity', [1, 2])
+def test_crowd_follows_the_field_within_capacity(cell_capacity):
+    env, field, crowd = crowd_in_office(150, cell_capacity)
+    for _ in range(200):
+        before_x, before_y = crowd.x.copy(), crowd.y.copy()
+        moved = crowd.step(env, field)
+        assert moved == len(crowd.changed)
+
+        still = np.ones(len(crowd), dtype=bool)
+        still[crowd.changed] = False
+        np.testing.assert_array_equal(crowd.x[still], before_x[still])
+        np.testing.assert_array_equal(crowd.y[still], before_y[still])
+        for i in crowd.changed.tolist():
+            dx, dy = field.direction_field[before_y[i], before_x[i]].astype(int)
+            assert (crowd.x[i], crowd.y[i]) == (before_x[i] + dx, before_y[i] + dy)
+
+        assert max(occupancy(env, crowd).values(), default=0) <= cell_capacity
+        if crowd.count_mobile() == 0:
+            break
+    assert crowd.count_evacuated() == len(crowd)
+    assert not crowd.active.any()
+
+
+def test_slow_evacuees_move_every_other_step():
+    env, field, crowd = crowd_in_office(1, speed=0.5)
+    moves = [crowd.step(env, field) for _ in range(6)]
+    assert moves == [0, 1, 0, 1, 0, 1]
+
+
+def test_blocked_evacuees_do_not_bank_movement():
+    env, field, crowd = crowd_in_office(1)
+    x, y = int(crowd.x[0]), int(crowd.y[0])
+    dx, dy = field.direction_field[y, x].astype(int)
+    crowd.add([(x + dx, y + dy)])
+    crowd.found[1] = True  # Escorted: holds its cell but does not walk
+
+    for _ in range(3):
+        assert crowd.step(env, field) == 0
+    assert crowd.movement_accumulator[0] == 1.0
+
+    crowd.found[1] = False
+    crowd.x[1], crowd.y[1] = env.exits[0]
+    crowd.evacuated[1] = True
+    assert crowd.step(env, field) == 1
+    assert crowd.movement_accumulator[0] == 1.0  # Spent 1.0 of the 2.0 it held
+
+
+def test_write_back_mirrors_changed_rows_only():
+    env, field, _ = crowd_in_office(0)
+    evacuees = [Evacuee(x, y) for x, y in random.Random(1).sample(
+        [c for c in env.get_all_safe_cells() if field.is_reachable(*c)], 20)]
+    evacuees[0].found = True
+    crowd = EvacueeCrowd.from_evacuees(env, evacuees)
+
+    crowd.step(env, field)
+    crowd.write_back(evacuees)
+    assert 0 not in crowd.changed.tolist()
+    for i, evacuee in enumerate(evacuees):
+        assert (evacuee.x, evacuee.y) == (crowd.x[i], crowd.y[i])
+        assert evacuee.evacuated == crowd.evacuated[i]
+
+    evacuees[3].found = True
+    evacuees[3].x, evacuees[3].y = env.exits[0]
+    crowd.sync(evacuees)
+    assert crowd.found[3] and (crowd.x[3], crowd.y[3]) == env.exits[0]
@@ -0,0 +1,100 @@
+"""FlowField incremental repair and batched direction lookup"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.environment import CellState, create_office_layout, create_school_layout
+from src.pathfinding import FlowField
+
+
+def assert_directions_descend(field):
+    """Every cell with a direction points at a neighbour exactly one step closer"""
+    dist = field.distance_field
+    height, width = dist.shape
+    for y in range(height):
+        for x in range(width):
+            dx, dy = (int(v) for v in field.direction_field[y, x])
+            if (dx, dy) == (0, 0):
+                assert dist[y, x] in (0.0, np.inf), (x, y)
+                continue
+            assert abs(dx) + abs(dy) == 1
+            assert dist[y + dy, x + dx] == dist[y, x] - 1.0, (x, y)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_incremental_repair_matches_a_full_rebuild(seed):
+    env = create_school_layout()
+    rng = random.Random(seed)
+    cells = env.get_all_safe_cells()
+    incremental = FlowField(env)
+    incremental.compute(env.exits)
+    full_size = incremental.last_update_size
+
+    burning = []
+    for t in range(12):
+        for x, y in rng.sample(cells, 6):  # Costs go up
+            env.mark_danger(x, y, 'fire', t, 0.8)
+            burning.append((x, y))
+        for x, y in rng.sample(burning, min(2, len(burning))):  # ... and come back down
+            env.set_danger_level(x, y, 0.0)
+
+        incremental.compute(env.exits, incremental=True)
+        rebuilt = FlowField(env)
+        rebuilt.compute(env.exits)
+        np.testing.assert_array_equal(incremental.distance_field, rebuilt.distance_field)
+        assert 0 < incremental.last_update_size < full_size
+        assert_directions_descend(incremental)
+
+
+def test_repair_without_grid_changes_touches_nothing():
+    env = create_office_layout()
+    field = FlowField(env)
+    field.compute(env.exits)
+    before = field.distance_field.copy()
+    field.compute(env.exits, incremental=True)
+    assert field.last_update_size == 0
+    np.testing.assert_array_equal(field.distance_field, before)
+
+
+def test_changed_goals_fall_back_to_a_full_rebuild():
+    env = create_office_layout()
+    field = FlowField(env)
+    field.compute(env.exits)
+    field.compute(env.exits[:1], incremental=True)
+    rebuilt = FlowField(env)
+    rebuilt.compute(env.exits[:1])
+    np.testing.assert_array_equal(field.distance_field, rebuilt.distance_field)
+
+
+def test_best_directions_match_the_scalar_lookup():
+    env = create_school_layout()
+    rng = random.Random(4)
+    for x, y in rng.sample(env.get_all_safe_cells(), 60):
+        env.mark_danger(x, y, 'fire', 0, 0.8)
+    field = FlowField(env)
+    field.compute(env.exits)
+
+    positions = np.array([(x, y) for y in range(env.height) for x in range(env.width)
+                          if env.get_state(x, y) != CellState.WALL])
+    next_positions, can_move = field.get_best_directions(positions)
+    assert can_move.any() and not can_move.all()
+    for (x, y), moved, nxt in zip(positions, can_move, next_positions):
+        expected = field.get_best_direction(x, y)
+        if expected is None:
+            assert not moved and tuple(nxt) == (x, y)
+        else:
+            assert moved and tuple(nxt) == expected
+
+
+def test_best_directions_before_compute():
+    field = FlowField(create_office_layout())
+    positions = np.array([[1, 1], [2, 3]])
+    next_positions, can_move = field.get_best_directions(positions)
+    np.testing.assert_array_equal(next_positions, positions)
+    assert not can_move.any()
@@ -0,0 +1,125 @@
+"""Grid searches in src.pathfinding against a plain reference Dijkstra"""
+
+import heapq
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.environment import CellState, create_office_layout, create_school_layout
+from src.pathfinding import AStar, DijkstraFlood, step_cost_tables, step_costs
+
+
+def reference_costs(env, start, can_cross_danger=True, hazard_penalty=5.0):
+    """(x, y) -> cheapest cost from start, via Environment.get_neighbors"""
+    best = {start: 0.0}
+    heap = [(0.0, start)]
+    while heap:
+        d, cell = heapq.heappop(heap)
+        if d > best[cell]:
+            continue
+        for nxt in env.get_neighbors(cell[0], cell[1], can_cross_danger):
+            step = 1.0 + (hazard_penalty if env.get_state(*nxt) == CellState.DANGER else 0.0)
+            if d + step < best.get(nxt, np.inf):
+                best[nxt] = d + step
+                heapq.heappush(heap, (d + step, nxt))
+    return best
+
+
+def path_cost(env, path, hazard_penalty=5.0):
+    return sum(1.0 + (hazard_penalty if env.get_state(x, y) == CellState.DANGER else 0.0)
+               for x, y in path[1:])
+
+
+def burning_school(seed=0, fires=80):
+    env = create_school_layout()
+    rng = random.Random(seed)
+    cells = env.get_all_safe_cells()
+    for x, y in rng.sample(cells, fires):
+        env.mark_danger(x, y, 'fire', 0, 0.8)
+    return env, rng
+
+
+@pytest.mark.parametrize('can_cross_danger', [True, False])
+def test_astar_paths_are_valid_and_shortest(can_cross_danger):
+    env, rng = burning_school()
+    cells = env.get_all_safe_cells()
+    floods = {start: reference_costs(env, start, can_cross_danger) for start in rng.sample(cells, 4)}
+    for start, goal in zip(list(floods) * 8, rng.sample(cells, 32)):
+        expected = floods[start].get(goal)
+        stats = {'expanded': 0}
+        path = AStar.find_path(env, start, goal, can_cross_danger, stats=stats)
+        if expected is None:
+            assert path is None
+            continue
+        assert path[0] == start and path[-1] == goal
+        for a, b in zip(path, path[1:]):
+            assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+            assert env.is_walkable(b[0], b[1], can_cross_danger)
+        assert path_cost(env, path) == expected
+
+
+def test_step_costs_are_cached_until_the_grid_changes():
+    env = create_office_layout()
+    costs = step_costs(env)
+    assert step_costs(env) is costs
+    assert step_costs(env, hazard_penalty=2.0) is not costs
+
+    x, y = env.get_all_safe_cells()[0]
+    idx = y * env.width + x
+    env.mark_danger(x, y, 'fire', 0, 0.2)  # Below the DANGER threshold: state unchanged
+    assert step_costs(env) is costs
+
+    env.mark_danger(x, y, 'fire', 0, 0.8)
+    changed = step_costs(env)
+    assert changed is not costs
+    assert changed[idx] == 6.0 and costs[idx] == 1.0
+    assert step_cost_tables(env, can_cross_danger=False)[1][idx] == np.inf
+
+    copy = env.copy()
+    assert step_costs(copy) == changed and step_costs(copy) is not changed
+
+
+def test_step_cost_arrays_are_read_only():
+    array, _ = step_cost_tables(create_office_layout())
+    with pytest.raises(ValueError):
+        array[0] = 0.0
+
+
+@pytest.mark.parametrize('can_cross_danger', [True, False])
+def test_dijkstra_flood_matches_reference(can_cross_danger):
+    env, rng = burning_school(seed=1)
+    cells = env.get_all_safe_cells()
+    start = rng.choice(cells)
+    reference = reference_costs(env, start, can_cross_danger, hazard_penalty=2.0)
+    flood = DijkstraFlood(env, start, can_cross_danger=can_cross_danger, hazard_penalty=2.0)
+
+    for target in rng.sample(cells, 60):
+        expected = reference.get(target)
+        if expected is None:
+            assert flood.get_cost(target) == np.inf
+            assert flood.get_path(target) is None and flood.get_travel_time(target) is None
+            continue
+        assert flood.get_cost(target) == expected
+        path = flood.get_path(target)
+        assert path[0] == start and path[-1] == target
+        assert path_cost(env, path, hazard_penalty=2.0) == expected
+        assert flood.get_travel_time(target) == len(path)
+
+
+def test_dijkstra_flood_stops_once_targets_are_settled():
+    env, rng = burning_school(seed=2)
+    cells = env.get_all_safe_cells()
+    start = rng.choice(cells)
+    targets = rng.sample(cells, 3)
+    full = DijkstraFlood(env, start)
+    partial = DijkstraFlood(env, start, targets)
+
+    assert sum(partial.settled) < sum(full.settled)
+    for target in targets:
+        assert partial.get_cost(target) == full.get_cost(target)
+        assert partial.get_travel_time(target) == full.get_travel_time(target)
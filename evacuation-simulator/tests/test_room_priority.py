@@ -0,0 +1,56 @@
+"""RoomWeightCalculator incremental room-state updates against a full recompute"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.environment import create_office_layout
+from src.hazards import Fire
+from src.room_priority import RoomWeightCalculator
+
+FIELDS = ('avg_danger', 'max_danger', 'time_to_untenability', 'is_accessible')
+
+
+def room_states(calculator):
+    return {room_id: tuple(getattr(room, f) for f in FIELDS)
+            for room_id, room in calculator.rooms.items()}
+
+
+def test_incremental_updates_match_a_full_recompute():
+    random.seed(3)
+    np.random.seed(3)
+    env = create_office_layout()
+    x, y = env.get_all_safe_cells()[len(env.get_all_safe_cells()) // 2]
+    fire = Fire((x, y), spread_prob=0.4)
+    env.mark_danger(x, y, 'fire', 0)
+
+    incremental = RoomWeightCalculator(env)
+    incremental.update_room_states(env, 0)
+    refreshed = 0
+    for t in range(1, 20):
+        before = room_states(incremental)
+        fire.spread(env, t)
+        incremental.update_room_states(env, t)
+        after = room_states(incremental)
+        refreshed += sum(before[r] != after[r] for r in after)
+
+        full = RoomWeightCalculator(env)  # Fresh snapshot: every room refreshed
+        full.update_room_states(env, t)
+        for room_id, state in room_states(full).items():
+            assert after[room_id] == pytest.approx(state, rel=1e-12), (t, room_id)
+    assert refreshed > 0
+
+
+def test_unchanged_grid_refreshes_nothing():
+    env = create_office_layout()
+    calculator = RoomWeightCalculator(env)
+    calculator.update_room_states(env, 0)
+    room = next(iter(calculator.rooms.values()))
+    room.avg_danger = -1.0  # Would be overwritten by a refresh
+    calculator.update_room_states(env, 1)
+    assert room.avg_danger == -1.0
@@ -36,6 +36,7 @@ def run_hospital_sim(num_responders: int, with_fire: bool = False):
         sim.step(fire_enabled=with_fire)
     
     elapsed = time.time() - start
+    sim.close()
     results = sim.get_results()
     
     # Responder stats
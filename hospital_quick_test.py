@@ -31,6 +31,7 @@ def run_hospital_test(num_responders: int, with_fire: bool = False):
         sim.step(fire_enabled=with_fire)
     
     elapsed = time.time() - start
+    sim.close()
     results = sim.get_results()
     
     # Count responder stats
@@ -8,6 +8,8 @@ Usage:
     python main.py --layout layouts/office_3f.json
     python main.py --agents 4 --hazard-spread 0.05
     python main.py --no-viz                 # Headless mode
+    python main.py --no-viz --save-video    # Headless, rendered to video afterwards
+    python main.py --no-viz --live-view     # Headless, watched from a browser
 """
 
 import argparse
@@ -17,6 +19,7 @@ from pathlib import Path
 
 from sim.env.environment import Environment
 from sim.engine.simulator import Simulator
+from sim.engine.event_table import EventTable
 from sim.viz.charts import ChartGenerator
 from sim.io.layout_loader import LayoutLoader
 from sim.io.logger import SimulationLogger
@@ -90,6 +93,10 @@ Examples:
                        help='Run headless (no visualization)')
     parser.add_argument('--save-video', action='store_true',
                        help='Save video of simulation')
+    parser.add_argument('--live-view', action='store_true',
+                       help='Serve a live browser view of a headless run')
+    parser.add_argument('--live-port', type=int, default=8765,
+                       help='Port for --live-view')
     
     # Quick scenarios
     parser.add_argument('--scenario', type=str, choices=['simple', 'office', 'stress'],
@@ -122,6 +129,10 @@ def apply_cli_overrides(params: dict, args) -> dict:
         params['visualization']['save_video'] = True
         params['output']['save_video'] = True
     
+    if args.live_view:
+        params['output']['live_view'] = True
+        params['output']['live_port'] = args.live_port
+    
     return params
 
 
@@ -209,6 +220,8 @@ def run_simulation(layout_path: str, params: dict, output_dir: str = None):
     # Create logger
     logger = SimulationLogger(output_dir)
     sim.add_event_callback(logger.log_event)
+    event_table = EventTable()
+    sim.add_event_callback(event_table.append)
     print(f"  Output directory: {logger.output_dir}")
     
     # Run simulation
@@ -230,11 +243,35 @@ def run_simulation(layout_path: str, params: dict, output_dir: str = None):
             print(f"Error: Visualization requires matplotlib. Install with: pip install matplotlib")
             print(f"Running in headless mode instead...")
             sim.run()
+    elif params.get('output', {}).get('live_view', False):
+        print("\nRunning simulation (headless mode, live view)...")
+        from sim.viz.live_server import LiveViewServer
+        server = LiveViewServer(sim, port=params['output'].get('live_port', 8765),
+                                max_fps=params['visualization'].get('fps_target', 10))
+        server.start()
+        try:
+            server.run(tick_rate=params['visualization'].get('live_tick_rate', 10))
+        finally:
+            server.stop()
+        print("Simulation complete!")
+    elif params.get('output', {}).get('save_video', False):
+        print("\nRunning simulation (headless mode, recording)...")
+        from sim.viz.batch_renderer import RunRecorder, BatchRenderer
+        recorder = RunRecorder(sim)
+        recorder.run()
+        print("Simulation complete!")
+        
+        print(f"Rendering {len(recorder.frames)} frames...")
+        renderer = BatchRenderer(recorder, fps=params['output'].get('video_fps', 30))
+        video_path = renderer.render(str(logger.get_output_path('run.mp4')))
+        print(f"Video saved to {video_path}")
     else:
         print("\nRunning simulation (headless mode)...")
         sim.run()
         print("Simulation complete!")
     
+    sim.close()
+    
     # Get results
     results = sim.get_results()
     
@@ -248,7 +285,7 @@ def run_simulation(layout_path: str, params: dict, output_dir: str = None):
     if params.get('output', {}).get('save_charts', True):
         print("\nGenerating charts...")
         chart_gen = ChartGenerator(str(logger.output_dir))
-        chart_gen.generate_summary_charts(sim.events, results)
+        chart_gen.generate_summary_charts(event_table, results)
         chart_gen.generate_hazard_heatmap(env)
     
     print(f"\nAll outputs saved to: {logger.output_dir}")
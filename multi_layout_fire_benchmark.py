@@ -25,6 +25,7 @@ def run_fire_simulation(layout_path: str, num_agents: int, evacuees_per_room: in
     params['agents']['count'] = num_agents
     params['visualization']['enabled'] = False
     params['hazard']['enabled'] = True  # Enable fire
+    params['simulation']['hazard_cache'] = 'outputs/hazard_cache'  # Same fire for every agent count
     
     # Load and modify layout
     layout_data = LayoutLoader.load(layout_path)
@@ -46,6 +47,7 @@ def run_fire_simulation(layout_path: str, num_agents: int, evacuees_per_room: in
         step_count += 1
     
     elapsed = time.time() - start_time
+    sim.close()
     results = sim.get_results()
     
     # Count deaths and survival
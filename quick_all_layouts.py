@@ -30,8 +30,9 @@ def run_quick_sim(layout_path: str, num_responders: int):
     
     start = time.time()
     while not sim.complete and sim.tick < 15000:
-        sim.step(fire_enabled=False)
+        sim.advance(fire_enabled=False, max_ticks=15000)
     
+    sim.close()
     results = sim.get_results()
     
     return {
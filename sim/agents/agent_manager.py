@@ -1,14 +1,16 @@
 """Agent manager for coordinating multiple agents"""
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, TYPE_CHECKING
 from .agent import Agent, AgentState
-from ..env.environment import Environment
+
+if TYPE_CHECKING:
+    from ..env.environment import Environment
 
 
 class AgentManager:
     """Manages all firefighter agents"""
     
-    def __init__(self, environment: Environment, params: dict):
+    def __init__(self, environment: 'Environment', params: dict):
         """
         Initialize agent manager
         
@@ -24,6 +26,10 @@ class AgentManager:
         self.stair_queues: Dict[str, List[int]] = {}  # stair_id -> agent_ids waiting
         self.stair_occupancy: Dict[str, Optional[int]] = {}  # stair_id -> agent_id or None
         
+        # Status counts, kept by mark_dead / mark_escaped
+        self.num_dead = 0
+        self.num_escaped = 0
+        
         self._initialize_agents()
     
     def _initialize_agents(self):
@@ -108,6 +114,36 @@ class AgentManager:
         if agent:
             agent.state = AgentState.QUEUED
     
+    def mark_dead(self, agent: Agent):
+        """Agent died"""
+        if not agent.is_dead:
+            agent.is_dead = True
+            self.num_dead += 1
+    
+    def mark_escaped(self, agent: Agent):
+        """Agent reached an exit while escaping"""
+        if not agent.escaped:
+            agent.escaped = True
+            self.num_escaped += 1
+    
+    def all_dead(self) -> bool:
+        """True if every agent has died"""
+        return self.num_dead == len(self.agents)
+    
+    def get_active_count(self) -> int:
+        """Agents still in play (neither dead nor escaped)"""
+        return len(self.agents) - self.num_dead - self.num_escaped
+    
+    def check_counts(self):
+        """Recount agent status; raises RuntimeError on any mismatch"""
+        dead = sum(1 for a in self.agents if a.is_dead)
+        escaped = sum(1 for a in self.agents if a.escaped)
+        active = sum(1 for a in self.agents if not a.is_dead and not a.escaped)
+        if (dead, escaped, active) != (self.num_dead, self.num_escaped, self.get_active_count()):
+            raise RuntimeError(f'Agent counts out of sync: dead {self.num_dead}/{dead}, '
+                               f'escaped {self.num_escaped}/{escaped}, '
+                               f'active {self.get_active_count()}/{active}')
+    
     def get_total_rooms_cleared(self) -> int:
         """Get total rooms cleared by all agents"""
         return sum(a.rooms_cleared for a in self.agents)
@@ -1,6 +1,13 @@
 """Simulation engine - Main tick loop and event system"""
 
 from .simulator import Simulator, SimulationEvent, EventType
+from .event_table import EventTable
+from .hazard_timeline import HazardTimeline, HazardTimelineCache
+from .latency import MessageBus
+from .room_tally import RoomTally
+from .lockstep import LockstepRunner
 
-__all__ = ['Simulator', 'SimulationEvent', 'EventType']
+__all__ = ['Simulator', 'SimulationEvent', 'EventType', 'EventTable',
+           'HazardTimeline', 'HazardTimelineCache', 'MessageBus', 'RoomTally',
+           'LockstepRunner']
 
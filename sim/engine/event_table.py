@@ -0,0 +1,121 @@
+"""Columnar event log - one NumPy array per field"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .simulator import SimulationEvent, EventType
+
+
+class EventTable:
+    """
+    Simulation events stored as columns instead of SimulationEvent objects
+
+    Event types are stored as integer codes (position in EventType), agents
+    as their id (-1 for none) and rooms as an index into `room_ids` (-1 for
+    none). `append` matches the event callback signature, so a table can be
+    filled live with ``simulator.add_event_callback(table.append)``.
+    Per-event `data` dicts are not kept.
+    """
+
+    EVENT_TYPES: List[EventType] = list(EventType)
+    TYPE_CODES: Dict[EventType, int] = {t: i for i, t in enumerate(EVENT_TYPES)}
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize an empty table
+
+        Args:
+            capacity: Initial row capacity (grows by doubling)
+        """
+        self.size = 0
+        self.room_ids: List[str] = []
+        self._room_index: Dict[str, int] = {}
+        self._type = np.empty(capacity, dtype=np.int8)
+        self._tick = np.empty(capacity, dtype=np.int64)
+        self._time = np.empty(capacity, dtype=np.float64)
+        self._agent = np.empty(capacity, dtype=np.int32)
+        self._room = np.empty(capacity, dtype=np.int32)
+
+    @classmethod
+    def from_events(cls, events: Iterable[SimulationEvent]) -> 'EventTable':
+        """Build a table from SimulationEvent objects in one pass"""
+        events = list(events)
+        table = cls(max(len(events), 1))
+        n = len(events)
+        codes = cls.TYPE_CODES
+        table._type[:n] = np.fromiter((codes[e.event_type] for e in events), dtype=np.int8, count=n)
+        table._tick[:n] = np.fromiter((e.tick for e in events), dtype=np.int64, count=n)
+        table._time[:n] = np.fromiter((e.time for e in events), dtype=np.float64, count=n)
+        table._agent[:n] = np.fromiter((-1 if e.agent_id is None else e.agent_id for e in events),
+                                       dtype=np.int32, count=n)
+        table._room[:n] = np.fromiter((table._room_code(e.room_id) for e in events),
+                                      dtype=np.int32, count=n)
+        table.size = n
+        return table
+
+    def _room_code(self, room_id: Optional[str]) -> int:
+        """Index of room_id in room_ids, adding it if new"""
+        if room_id is None:
+            return -1
+        code = self._room_index.get(room_id)
+        if code is None:
+            code = self._room_index[room_id] = len(self.room_ids)
+            self.room_ids.append(room_id)
+        return code
+
+    def append(self, event: SimulationEvent):
+        """Add one event (usable as a Simulator event callback)"""
+        if self.size == len(self._type):
+            for name in ('_type', '_tick', '_time', '_agent', '_room'):
+                column = getattr(self, name)
+                grown = np.empty(len(column) * 2, dtype=column.dtype)
+                grown[:self.size] = column[:self.size]
+                setattr(self, name, grown)
+
+        i = self.size
+        self._type[i] = self.TYPE_CODES[event.event_type]
+        self._tick[i] = event.tick
+        self._time[i] = event.time
+        self._agent[i] = -1 if event.agent_id is None else event.agent_id
+        self._room[i] = self._room_code(event.room_id)
+        self.size += 1
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def type_codes(self) -> np.ndarray:
+        """EventType codes"""
+        return self._type[:self.size]
+
+    @property
+    def ticks(self) -> np.ndarray:
+        """Tick of each event"""
+        return self._tick[:self.size]
+
+    @property
+    def times(self) -> np.ndarray:
+        """Simulation time of each event"""
+        return self._time[:self.size]
+
+    @property
+    def agents(self) -> np.ndarray:
+        """Agent id of each event (-1 = none)"""
+        return self._agent[:self.size]
+
+    @property
+    def rooms(self) -> np.ndarray:
+        """Index into room_ids of each event (-1 = none)"""
+        return self._room[:self.size]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Columns tick, time, type (code), agent and room (index)"""
+        return pd.DataFrame({
+            'tick': self.ticks,
+            'time': self.times,
+            'type': self.type_codes,
+            'agent': self.agents,
+            'room': self.rooms,
+        })
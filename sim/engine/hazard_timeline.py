@@ -0,0 +1,393 @@
+"""Hazard timelines - record fire evolution once, replay it in later runs"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+
+class HazardRNG:
+    """
+    Random stream of the hazard model, separate from the agents' one
+
+    The hazard model draws from numpy's global RNG. Running its calls
+    inside `with rng:` swaps this stream in and the caller's back out, so
+    the fire only depends on the seed (not on how many draws agents,
+    policies or rollouts made) and a recorded fire can be rebuilt exactly
+    from `initial_state`. Nested use is allowed.
+    """
+
+    def __init__(self, seed: int):
+        """
+        Initialize stream
+
+        Args:
+            seed: Seed (simulation.random_seed)
+        """
+        outer = np.random.get_state()
+        np.random.seed(seed)
+        self.initial_state = np.random.get_state()
+        np.random.set_state(outer)
+        self.state = self.initial_state
+        self._outer = None
+        self._depth = 0
+
+    def __enter__(self) -> 'HazardRNG':
+        if self._depth == 0:
+            self._outer = np.random.get_state()
+            np.random.set_state(self.state)
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            self.state = np.random.get_state()
+            np.random.set_state(self._outer)
+            self._outer = None
+
+    def reset(self):
+        """Back to the seeded state (before the first hazard update)"""
+        self.state = self.initial_state
+
+
+class HazardTimeline:
+    """
+    Per-tick hazard state of one fire scenario, stored as sparse deltas
+
+    Tick t holds the cells whose danger or burning state changed during
+    update_hazards(t) (indices into the cell order at recording time), the
+    hazard of every room and get_max_hazard() after the update. The state
+    before tick 0 is kept too, including the hazard RNG state, so the fire
+    can be rebuilt from scratch.
+    """
+
+    def __init__(self, env, rng_state: tuple):
+        """
+        Initialize an empty timeline from an environment's current hazard state
+
+        Args:
+            env: Environment before its first hazard update
+            rng_state: HazardRNG.initial_state of the recording run
+        """
+        self.n_ticks = 0
+        self.rng_state = rng_state
+        danger, burning = _read_cells(_cell_list(env))
+        self.initial_danger = danger
+        self.initial_burning = burning
+        self.initial_room_hazard = _read_rooms(env)
+
+        self._ptr: List[int] = [0]
+        self._idx: List[np.ndarray] = []
+        self._danger: List[np.ndarray] = []
+        self._burning: List[np.ndarray] = []
+        self._room_hazard: List[np.ndarray] = []
+        self._max_hazard: List[float] = []
+        self._last = (danger, burning)
+
+    def record(self, env):
+        """Append the state after the next tick's hazard update"""
+        danger, burning = _read_cells(_cell_list(env))
+        last_danger, last_burning = self._last
+        changed = np.flatnonzero((danger != last_danger) | (burning != last_burning))
+
+        self._idx.append(changed.astype(np.int32))
+        self._danger.append(danger[changed])
+        self._burning.append(burning[changed])
+        self._ptr.append(self._ptr[-1] + len(changed))
+        self._room_hazard.append(_read_rooms(env))
+        self._max_hazard.append(float(env.hazard_system.get_max_hazard()))
+        self._last = (danger, burning)
+        self.n_ticks += 1
+
+    def apply(self, tick: int, cells: list, rooms: list):
+        """
+        Write the state after tick `tick` into cells and rooms
+
+        Args:
+            tick: Recorded tick (must follow the previously applied one)
+            cells: Hazard cells in recording order
+            rooms: Rooms in env.rooms order
+        """
+        self._compact()
+        start, end = self._ptr[tick], self._ptr[tick + 1]
+        for i, danger, burning in zip(self._idx[start:end].tolist(),
+                                      self._danger[start:end].tolist(),
+                                      self._burning[start:end].tolist()):
+            cell = cells[i]
+            cell.danger_level = danger
+            cell.is_burning = burning
+        for room, hazard in zip(rooms, self._room_hazard[tick].tolist()):
+            room.hazard = hazard
+
+    def reset(self, cells: list, rooms: list):
+        """Restore the state before tick 0"""
+        for cell, danger, burning in zip(cells, self.initial_danger.tolist(),
+                                         self.initial_burning.tolist()):
+            cell.danger_level = danger
+            cell.is_burning = burning
+        for room, hazard in zip(rooms, self.initial_room_hazard.tolist()):
+            room.hazard = hazard
+
+    def max_hazard(self, tick: int) -> float:
+        """get_max_hazard() recorded after tick `tick`"""
+        self._compact()
+        return float(self._max_hazard[tick])
+
+    def _compact(self):
+        """Join recorded per-tick chunks into flat arrays"""
+        if isinstance(self._idx, list):
+            self._ptr = np.array(self._ptr, dtype=np.int64)
+            self._idx = np.concatenate(self._idx) if self._idx else np.empty(0, np.int32)
+            self._danger = np.concatenate(self._danger) if self._danger else np.empty(0)
+            self._burning = np.concatenate(self._burning) if self._burning else np.empty(0, bool)
+            self._room_hazard = (np.stack(self._room_hazard) if self._room_hazard
+                                 else np.empty((0, len(self.initial_room_hazard))))
+            self._max_hazard = np.array(self._max_hazard, dtype=np.float64)
+
+    def _expand(self):
+        """Back to per-tick chunks so recording can continue"""
+        if not isinstance(self._idx, list):
+            ptr = self._ptr
+            self._idx = [self._idx[ptr[t]:ptr[t + 1]] for t in range(self.n_ticks)]
+            self._danger = [self._danger[ptr[t]:ptr[t + 1]] for t in range(self.n_ticks)]
+            self._burning = [self._burning[ptr[t]:ptr[t + 1]] for t in range(self.n_ticks)]
+            self._room_hazard = list(self._room_hazard)
+            self._max_hazard = self._max_hazard.tolist()
+            self._ptr = ptr.tolist()
+
+    def continue_recording(self, env):
+        """Prepare to append ticks after the environment has been caught up live"""
+        self._expand()
+        self._last = _read_cells(_cell_list(env))
+
+    def save(self, path: Path):
+        """Write to a compressed .npz (atomically, so parallel runs can share a cache)"""
+        self._compact()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.stem}.{os.getpid()}.tmp.npz')
+        np.savez_compressed(tmp, ptr=self._ptr, idx=self._idx, danger=self._danger,
+                            burning=self._burning, room_hazard=self._room_hazard,
+                            max_hazard=self._max_hazard, initial_danger=self.initial_danger,
+                            initial_burning=self.initial_burning,
+                            initial_room_hazard=self.initial_room_hazard,
+                            rng_keys=self.rng_state[1],
+                            rng_params=np.array(self.rng_state[2:], dtype=np.float64))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'HazardTimeline':
+        """Read a timeline written by save()"""
+        timeline = cls.__new__(cls)
+        with np.load(path) as data:
+            timeline._ptr = data['ptr']
+            timeline._idx = data['idx']
+            timeline._danger = data['danger']
+            timeline._burning = data['burning']
+            timeline._room_hazard = data['room_hazard']
+            timeline._max_hazard = data['max_hazard']
+            timeline.initial_danger = data['initial_danger']
+            timeline.initial_burning = data['initial_burning']
+            timeline.initial_room_hazard = data['initial_room_hazard']
+            pos, has_gauss, gauss = data['rng_params'].tolist()
+            timeline.rng_state = ('MT19937', data['rng_keys'], int(pos), int(has_gauss), gauss)
+        timeline.n_ticks = len(timeline._max_hazard)
+        timeline._last = None
+        return timeline
+
+
+class HazardTimelineCache:
+    """Directory of hazard timelines keyed by everything the fire depends on"""
+
+    def __init__(self, directory: str):
+        """
+        Initialize cache
+
+        Args:
+            directory: Where timelines are stored (created on first save)
+        """
+        self.directory = Path(directory)
+
+    # Layout fields the fire does not depend on (agent count and evacuees
+    # do not either: the fire draws from its own HazardRNG stream)
+    IGNORED_ROOM_FIELDS = ('evacuees', 'evacuee_count')
+    IGNORED_LAYOUT_FIELDS = ('agent_starts', 'name', 'description')
+    RNG_SCHEME = 'hazard-stream'  # Timelines recorded on the shared global RNG are not reused
+
+    @classmethod
+    def key(cls, env, params: dict) -> str:
+        """Hash of layout geometry, hazard/environment params, seed, tick duration and RNG scheme"""
+        layout = dict(getattr(env, 'layout', None) or {})
+        for field in cls.IGNORED_LAYOUT_FIELDS:
+            layout.pop(field, None)
+        layout['rooms'] = [{k: v for k, v in room.items() if k not in cls.IGNORED_ROOM_FIELDS}
+                           for room in layout.get('rooms', [])]
+
+        simulation = params.get('simulation', {})
+        source = json.dumps({
+            'layout': layout,
+            'hazard': params.get('hazard', {}),
+            'environment': params.get('environment', {}),
+            'seed': simulation.get('random_seed', 42),
+            'dt': simulation.get('tick_duration', 1.0),
+            'rng': cls.RNG_SCHEME,
+        }, sort_keys=True, default=str)
+        return hashlib.sha1(source.encode()).hexdigest()[:16]
+
+    def path(self, key: str) -> Path:
+        return self.directory / f'hazard_{key}.npz'
+
+    def load(self, key: str) -> Optional[HazardTimeline]:
+        """Cached timeline, or None if missing or unreadable"""
+        path = self.path(key)
+        if not path.exists():
+            return None
+        try:
+            return HazardTimeline.load(path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, key: str, timeline: HazardTimeline):
+        timeline.save(self.path(key))
+
+
+class TimelineHazards:
+    """
+    Drives an environment's hazards from a cached timeline when possible
+
+    Ticks covered by the cached timeline are replayed; otherwise
+    env.update_hazards runs and, while the fire is untouched, its results
+    are recorded to extend the timeline. Replay falls back to live updates
+    when a tick runs with fire disabled, the timeline runs out, or the fire
+    is changed through spawn_fire / extinguish_fire. Going live rebuilds
+    the fire from tick 0 with the hazard RNG reset to its recorded initial
+    state, so the live hazard model's state (and its random stream) is
+    exactly that of a run that never replayed.
+    """
+
+    def __init__(self, env, cache: HazardTimelineCache, key: str, rng: HazardRNG):
+        """
+        Initialize driver (before the first hazard update)
+
+        Args:
+            env: Environment whose hazards are driven
+            cache: Timeline cache
+            key: Cache key of this fire scenario
+            rng: Hazard model's random stream (not drawn from yet)
+        """
+        self.env = env
+        self.cache = cache
+        self.key = key
+        self.rng = rng
+        self._cells = _cell_list(env)
+        self._rooms = list(env.rooms.values())
+
+        # Only replay onto the exact starting state the timeline was recorded from
+        timeline = cache.load(key)
+        if timeline is not None:
+            danger, burning = _read_cells(self._cells)
+            if not (np.array_equal(danger, timeline.initial_danger)
+                    and np.array_equal(burning, timeline.initial_burning)
+                    and np.array_equal(_read_rooms(env), timeline.initial_room_hazard)
+                    and _same_rng_state(rng.initial_state, timeline.rng_state)):
+                timeline = None
+        self.replaying = timeline is not None
+        self.recording = timeline is None
+        self.timeline = timeline if timeline is not None else HazardTimeline(env, rng.initial_state)
+        self._dirty = False
+        self._last_tick = -1
+        self._dt = 1.0
+        self.read_only = False  # Never record or save (pickled copies)
+
+    def spawn_fire(self):
+        """env.hazard_system.spawn_fire(); the timeline stops here"""
+        self._modify('spawn_fire')
+
+    def extinguish_fire(self):
+        """env.hazard_system.extinguish_fire(); the timeline stops here"""
+        self._modify('extinguish_fire')
+
+    def _modify(self, name: str):
+        if self.replaying:
+            self.resume_live()
+        self.recording = False
+        with self.rng:
+            getattr(self.env.hazard_system, name)()
+
+    def update(self, tick: int, dt: float, fire_enabled: bool = True):
+        """Hazard update for one tick (replaces env.update_hazards)"""
+        self._dt = dt
+        if self.replaying:
+            if fire_enabled and tick == self._last_tick + 1 and tick < self.timeline.n_ticks:
+                self.timeline.apply(tick, self._cells, self._rooms)
+                self._last_tick = tick
+                return
+            self.resume_live()
+
+        with self.rng:
+            self.env.update_hazards(tick, dt, fire_enabled=fire_enabled)
+        self._last_tick = tick
+        if self.recording:
+            if fire_enabled and tick == self.timeline.n_ticks:
+                self.timeline.record(self.env)
+                self._dirty = True
+            else:
+                self.recording = False
+
+    def resume_live(self):
+        """Stop replaying: rebuild the fire live up to the last replayed tick"""
+        if not self.replaying:
+            return
+        self.replaying = False
+        self.timeline.reset(self._cells, self._rooms)
+        self.rng.reset()
+        with self.rng:
+            for tick in range(self._last_tick + 1):
+                self.env.update_hazards(tick, self._dt, fire_enabled=True)
+
+        # Extend the cached timeline if it simply ran out
+        self.recording = not self.read_only and self._last_tick + 1 == self.timeline.n_ticks
+        if self.recording:
+            self.timeline.continue_recording(self.env)
+
+    def __getstate__(self):
+        """Pickled copies (simulator forks) replay or run live but never record or save"""
+        state = self.__dict__.copy()
+        state.update(read_only=True, recording=False, _dirty=False)
+        return state
+
+    def get_max_hazard(self) -> float:
+        """env.hazard_system.get_max_hazard(), from the timeline while replaying"""
+        if self.replaying and self._last_tick >= 0:
+            return self.timeline.max_hazard(self._last_tick)
+        return self.env.hazard_system.get_max_hazard()
+
+    def close(self):
+        """Save the timeline if this run recorded new ticks"""
+        if self._dirty:
+            self.cache.save(self.key, self.timeline)
+            self._dirty = False
+
+
+def _cell_list(env) -> list:
+    cells = getattr(env.hazard_system, 'cells', {})
+    return list(cells.values())
+
+
+def _read_cells(cells: list):
+    n = len(cells)
+    danger = np.fromiter((c.danger_level for c in cells), dtype=np.float64, count=n)
+    burning = np.fromiter((c.is_burning for c in cells), dtype=bool, count=n)
+    return danger, burning
+
+
+def _same_rng_state(a: tuple, b: tuple) -> bool:
+    return a[0] == b[0] and np.array_equal(a[1], b[1]) and tuple(a[2:]) == tuple(b[2:])
+
+
+def _read_rooms(env) -> np.ndarray:
+    return np.array([room.hazard for room in env.rooms.values()], dtype=np.float64)
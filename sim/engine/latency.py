@@ -0,0 +1,119 @@
+"""Communication latency - agent observations reach the decision engine late"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Message:
+    """One observation in flight"""
+    sent: float
+    deliver: float
+    kind: str  # 'room' (cleared, evacuees_remaining) or 'hazard'
+    agent_id: Optional[int]
+    room_id: str
+    value: Any
+
+
+class MessageBus:
+    """
+    Timed message queue (binary heap on delivery time)
+
+    send and each delivered message cost O(log n) in the number of
+    messages in flight; messages with equal delivery times come out in
+    send order.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Message]] = []
+        self._seq = 0
+        self.sent = 0
+        self.delivered = 0
+
+    def send(self, message: Message):
+        heapq.heappush(self._heap, (message.deliver, self._seq, message))
+        self._seq += 1
+        self.sent += 1
+
+    def deliver(self, now: float) -> List[Message]:
+        """Pop every message due by `now`, in delivery order"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        self.delivered += len(due)
+        return due
+
+    def next_delivery(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class ObservedRoom:
+    """
+    A room as the decision engine knows it
+
+    cleared, evacuees_remaining and hazard are the last delivered
+    observations; everything else (geometry, type, evacuee_count) is read
+    from the real room.
+    """
+
+    def __init__(self, room):
+        self._room = room
+        self.cleared = room.cleared
+        self.evacuees_remaining = room.evacuees_remaining
+        self.hazard = room.hazard
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._room, name)
+
+
+class ObservedEnvironment:
+    """
+    Environment view of the decision engine under communication latency
+
+    Rooms are ObservedRooms updated by delivered messages. An observation
+    only replaces an older one (messages can overtake each other). All
+    other attributes and methods (graph, paths, hazard cells, exits) are
+    the real environment's.
+    """
+
+    def __init__(self, env):
+        """
+        Initialize from the environment's current state
+
+        Args:
+            env: Real environment
+        """
+        self._env = env
+        self.rooms: Dict[str, ObservedRoom] = {room_id: ObservedRoom(room)
+                                               for room_id, room in env.rooms.items()}
+        self._observed_at: Dict[Tuple[str, str], float] = {}
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._env, name)
+
+    def apply(self, message: Message) -> bool:
+        """Update the room from a delivered message (False if it was stale)"""
+        key = (message.kind, message.room_id)
+        if self._observed_at.get(key, float('-inf')) > message.sent:
+            return False
+        self._observed_at[key] = message.sent
+
+        room = self.rooms[message.room_id]
+        if message.kind == 'room':
+            room.cleared, room.evacuees_remaining = message.value
+        elif message.kind == 'hazard':
+            room.hazard = message.value
+        return True
+
+    def get_uncleared_rooms(self) -> List[str]:
+        """Rooms not yet reported cleared (exits and stairs excluded)"""
+        return [room_id for room_id, room in self.rooms.items()
+                if not room.cleared and not room.is_exit and not room.is_stair]
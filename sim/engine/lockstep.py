@@ -0,0 +1,168 @@
+"""Lockstep runner - several policies advanced tick by tick on one shared fire"""
+
+import copy
+import time
+from typing import Callable, Dict, List, Optional
+
+from .hazard_timeline import HazardRNG, TimelineHazards
+
+
+class SharedHazardField:
+    """
+    One hazard evolution driving several environments
+
+    The first environment (the leader) runs update_hazards; the others
+    share its hazard system (cells) and get their room hazards copied after
+    every update. Installed as `hazard_driver` on every Simulator, so
+    whichever simulator steps first in a tick advances the fire and the
+    rest see the same field.
+    """
+
+    def __init__(self, leader, followers: list, rng: HazardRNG,
+                 inner: Optional[TimelineHazards] = None):
+        """
+        Initialize shared field
+
+        Args:
+            leader: Environment whose hazard model is run
+            followers: Environments sharing the leader's hazard system
+            rng: Hazard random stream of the leader's simulator
+            inner: Optional driver for the leader (e.g. a cached timeline)
+        """
+        self.leader = leader
+        self.rng = rng
+        self.inner = inner
+        self._leader_rooms = list(leader.rooms.values())
+        self._follower_rooms = [[env.rooms[room.id] for room in self._leader_rooms]
+                                for env in followers]
+        self._last_tick = -1
+
+    def update(self, tick: int, dt: float, fire_enabled: bool = True):
+        """Advance the fire once per tick, however many simulators ask"""
+        if tick == self._last_tick:
+            return
+        self._last_tick = tick
+
+        if self.inner is not None:
+            self.inner.update(tick, dt, fire_enabled=fire_enabled)
+        else:
+            with self.rng:
+                self.leader.update_hazards(tick, dt, fire_enabled=fire_enabled)
+        self._copy_room_hazards()
+
+    def spawn_fire(self):
+        self._modify('spawn_fire')
+
+    def extinguish_fire(self):
+        self._modify('extinguish_fire')
+
+    def _modify(self, name: str):
+        if self.inner is not None:
+            getattr(self.inner, name)()
+        else:
+            with self.rng:
+                getattr(self.leader.hazard_system, name)()
+        self._copy_room_hazards()
+
+    def _copy_room_hazards(self):
+        hazards = [room.hazard for room in self._leader_rooms]
+        for rooms in self._follower_rooms:
+            for room, hazard in zip(rooms, hazards):
+                room.hazard = hazard
+
+    def get_max_hazard(self) -> float:
+        if self.inner is not None:
+            return self.inner.get_max_hazard()
+        return self.leader.hazard_system.get_max_hazard()
+
+    def resume_live(self):
+        if self.inner is not None:
+            self.inner.resume_live()
+
+    def close(self):
+        if self.inner is not None:
+            self.inner.close()
+
+
+class LockstepRunner:
+    """
+    Runs several policies side by side on one shared hazard evolution
+
+    Every policy gets its own environment (rooms, evacuees) and agents, but
+    the fire is computed once per tick and seen identically by all of them
+    (common random numbers), so policy comparisons need no duplicated
+    hazard work and differ only by the policy.
+    """
+
+    def __init__(self, layout: dict, params: dict):
+        """
+        Initialize runner
+
+        Args:
+            layout: Building layout (copied for every policy)
+            params: Simulation parameters shared by all policies
+        """
+        self.layout = layout
+        self.params = params
+        self.policies: Dict[str, Callable] = {}
+        self.controllers: Dict[str, object] = {}
+
+    def add_policy(self, name: str, factory: Callable):
+        """
+        Register a policy
+
+        Args:
+            name: Key of the policy in the results
+            factory: factory(env, params) returning a Simulator, or a
+                controller with a `sim` attribute and an
+                `assign_idle_agents()` method run before every step
+        """
+        self.policies[name] = factory
+
+    def run(self, max_ticks: int = 10000, fire_enabled: bool = True) -> Dict[str, dict]:
+        """
+        Run all policies to completion in the same tick loop
+
+        Args:
+            max_ticks: Tick limit per policy
+            fire_enabled: Passed to every step
+
+        Returns:
+            Per-policy Simulator results, plus 'real_time' spent stepping it
+        """
+        from ..env.environment import Environment
+        envs = [Environment(copy.deepcopy(self.layout), self.params) for _ in self.policies]
+        leader = envs[0]
+        for env in envs[1:]:
+            env.hazard_system = leader.hazard_system
+
+        # Only the leader may own a cached timeline (it drives the shared hazard system)
+        follower_params = copy.deepcopy(self.params)
+        follower_params.setdefault('simulation', {})['hazard_cache'] = None
+
+        self.controllers = {}
+        for i, (name, factory) in enumerate(self.policies.items()):
+            self.controllers[name] = factory(envs[i], self.params if i == 0 else follower_params)
+        sims = [getattr(c, 'sim', c) for c in self.controllers.values()]
+
+        field = SharedHazardField(leader, envs[1:], sims[0].hazard_rng, inner=sims[0].hazard_driver)
+        for sim in sims:
+            sim.hazard_driver = field
+
+        entries = [(name, getattr(c, 'sim', c), getattr(c, 'assign_idle_agents', None))
+                   for name, c in self.controllers.items()]
+        real_time = {name: 0.0 for name in self.controllers}
+        active: List[tuple] = [e for e in entries if not e[1].complete and e[1].tick < max_ticks]
+        while active:
+            for name, sim, assign in active:
+                start = time.perf_counter()
+                if assign is not None:
+                    assign()
+                sim.step(fire_enabled=fire_enabled)
+                real_time[name] += time.perf_counter() - start
+            active = [e for e in active if not e[1].complete and e[1].tick < max_ticks]
+        for sim in sims:
+            sim.close()
+
+        return {name: {**sim.get_results(), 'real_time': real_time[name]}
+                for name, sim, _ in entries}
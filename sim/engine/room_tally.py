@@ -0,0 +1,75 @@
+"""Running room aggregates - remaining evacuees, cleared rooms, uncleared order"""
+
+from typing import Dict, List, Optional, Tuple
+
+
+class RoomTally:
+    """
+    Room counts kept up to date on room transitions
+
+    Built once from the environment's own queries; afterwards the simulator
+    calls update(room) after each transition (discover_evacuees,
+    rescue_evacuee, mark_cleared) and only that room's change is applied.
+    Reads are O(1) (the uncleared list is rebuilt only after a room is
+    cleared). check() recounts everything through the environment.
+
+    This assumes the environment's queries are plain sums over its rooms
+    (get_remaining_evacuees() is the sum of evacuees_remaining, and so on)
+    and that rooms only change through the simulator. The simulator
+    confirms the count with env.get_remaining_evacuees() before ending a
+    run as all rescued.
+    """
+
+    def __init__(self, env):
+        """
+        Initialize from an environment's current state
+
+        Args:
+            env: Environment whose rooms are tallied
+        """
+        self.total_evacuees = env.get_total_evacuees()
+        self.remaining_evacuees = env.get_remaining_evacuees()
+        self.total_rooms = sum(1 for r in env.rooms.values() if not r.is_exit and not r.is_stair)
+        self.cleared_rooms = sum(1 for r in env.rooms.values() if r.cleared)
+        self._uncleared = dict.fromkeys(env.get_uncleared_rooms())
+        self._uncleared_list: Optional[List[str]] = None
+        self._rooms: Dict[str, Tuple[bool, int]] = {
+            room_id: (room.cleared, room.evacuees_remaining) for room_id, room in env.rooms.items()}
+
+    def update(self, room):
+        """Apply the changes of one room since its last update"""
+        cleared, remaining = self._rooms[room.id]
+        self.remaining_evacuees += room.evacuees_remaining - remaining
+        if room.cleared != cleared:
+            if room.cleared:
+                self.cleared_rooms += 1
+                self._uncleared.pop(room.id, None)
+            else:
+                self.cleared_rooms -= 1
+                self._uncleared[room.id] = None
+            self._uncleared_list = None
+        self._rooms[room.id] = (room.cleared, room.evacuees_remaining)
+
+    def uncleared_rooms(self) -> List[str]:
+        """env.get_uncleared_rooms() (shared list - do not modify)"""
+        if self._uncleared_list is None:
+            self._uncleared_list = list(self._uncleared)
+        return self._uncleared_list
+
+    def check(self, env):
+        """Recount through the environment; raises RuntimeError on any mismatch"""
+        expected = {
+            'total_evacuees': env.get_total_evacuees(),
+            'remaining_evacuees': env.get_remaining_evacuees(),
+            'cleared_rooms': sum(1 for r in env.rooms.values() if r.cleared),
+            'uncleared_rooms': env.get_uncleared_rooms(),
+        }
+        actual = {
+            'total_evacuees': self.total_evacuees,
+            'remaining_evacuees': self.remaining_evacuees,
+            'cleared_rooms': self.cleared_rooms,
+            'uncleared_rooms': self.uncleared_rooms(),
+        }
+        wrong = {key: (actual[key], value) for key, value in expected.items() if actual[key] != value}
+        if wrong:
+            raise RuntimeError(f'Room tally out of sync (tally, recount): {wrong}')
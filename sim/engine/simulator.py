@@ -1,15 +1,26 @@
 """Main simulation engine with tick loop"""
 
+import math
+import pickle
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Optional, Callable
+from typing import Dict, List, Optional, Callable, TYPE_CHECKING
 import numpy as np
 
-from ..env.environment import Environment
 from ..agents.agent_manager import AgentManager
 from ..agents.agent import Agent, AgentState
 from ..policy.decision_engine import DecisionEngine
+from ..policy.base import Policy, RoomState
+from ..policy.priority import PriorityPolicy
+from ..policy.rollout import RolloutPolicy
 from ..pathfinding.grid_astar import GridPathfinder
+from .hazard_timeline import (HazardRNG, HazardTimelineCache, TimelineHazards, _cell_list,
+                              _read_cells, _read_rooms, _same_rng_state)
+from .latency import Message, MessageBus, ObservedEnvironment
+from .room_tally import RoomTally
+
+if TYPE_CHECKING:
+    from ..env.environment import Environment
 
 
 class EventType(Enum):
@@ -43,20 +54,43 @@ class SimulationEvent:
 class Simulator:
     """Main simulation engine"""
     
-    def __init__(self, environment: Environment, params: dict):
+    def __init__(self, environment: 'Environment', params: dict, policy: Optional[Policy] = None):
         """
         Initialize simulator
         
         Args:
             environment: Building environment
             params: Full simulation parameters
+            policy: Assigns idle agents to rooms (default PriorityPolicy, or
+                RolloutPolicy if policy.rollout.enabled is set)
         """
         self.env = environment
         self.params = params
+        if policy is None:
+            rollout = params.get('policy', {}).get('rollout', {})
+            policy = RolloutPolicy.from_params(rollout) if rollout.get('enabled') else PriorityPolicy()
+        self.policy = policy
+        
+        # Latency parameters
+        latency = params.get('latency', {})
+        self.latency_enabled = latency.get('enabled', False)
+        self.comm_delay_mean = latency.get('comm_delay_mean', 1.0)
+        self.comm_delay_std = latency.get('comm_delay_std', 0.5)
+        self.sensing_delay_mean = latency.get('sensing_delay_mean', 0.5)
+        self.sensing_delay_std = latency.get('sensing_delay_std', 0.2)
+        
+        # With latency, decisions see rooms only through delayed agent reports
+        self.message_bus: Optional[MessageBus] = None
+        self.observed_env: Optional[ObservedEnvironment] = None
+        self._last_reported: Dict[tuple, object] = {}
+        if self.latency_enabled:
+            self.message_bus = MessageBus()
+            self.observed_env = ObservedEnvironment(environment)
+            self._latency_rng = np.random.default_rng(params.get('simulation', {}).get('random_seed', 42))
         
         # Core components
         self.agent_manager = AgentManager(environment, params.get('agents', {}))
-        self.decision_engine = DecisionEngine(environment, params.get('policy', {}))
+        self.decision_engine = DecisionEngine(self.observed_env or environment, params.get('policy', {}))
         self.decision_engine.set_agent_params(params.get('agents', {}))
         
         # Grid-based pathfinding (avoids walls and danger)
@@ -64,6 +98,7 @@ class Simulator:
             self.grid_pathfinder = GridPathfinder(environment, environment.hazard_system)
         else:
             self.grid_pathfinder = None
+        self._path_cache: Dict[tuple, Optional[list]] = {}
         
         # Simulation state
         self.tick = 0
@@ -72,19 +107,37 @@ class Simulator:
         self.time_cap = params.get('simulation', {}).get('time_cap', 600)
         self.running = False
         self.complete = False
+        self.event_driven = params.get('simulation', {}).get('event_driven', False)
+        self.debug_checks = params.get('simulation', {}).get('debug_checks', False)
+        self.room_tally = RoomTally(environment)
+        self._hazards_frozen = False
+        self._hazards_steady = False  # Fire on, but its last update changed nothing
+        self._watch_hazards = False  # Agents are stalled: check whether the fire still changes
+        self._last_hazards: Optional[tuple] = None
+        self._events_at_tick_start = 0
+        self._states_at_tick_start: List[AgentState] = []
+        self._bulk_assigned: set = set()  # Agents given to a joint policy this tick
+        self._agent_turn = 0  # Index of the agent being processed
         
         # Event log
         self.events: List[SimulationEvent] = []
         self.event_callbacks: List[Callable[[SimulationEvent], None]] = []
         
-        # Random seed
+        # Random seed (the hazard model draws from its own stream)
         seed = params.get('simulation', {}).get('random_seed', 42)
         np.random.seed(seed)
+        self.hazard_rng = HazardRNG(seed)
         
-        # Latency parameters
-        self.latency_enabled = params.get('latency', {}).get('enabled', False)
-        self.comm_delay_mean = params.get('latency', {}).get('comm_delay_mean', 1.0)
-        self.comm_delay_std = params.get('latency', {}).get('comm_delay_std', 0.5)
+        # Hazard driver replacing env.update_hazards (update / get_max_hazard /
+        # spawn_fire / extinguish_fire / resume_live / close): a cached
+        # timeline, or a field shared by a LockstepRunner. None = update the
+        # environment directly.
+        self.hazard_driver: Optional[TimelineHazards] = None
+        hazard_cache = params.get('simulation', {}).get('hazard_cache')
+        if hazard_cache and hasattr(environment.hazard_system, 'cells'):
+            self.hazard_driver = TimelineHazards(
+                environment, HazardTimelineCache(hazard_cache),
+                HazardTimelineCache.key(environment, params), self.hazard_rng)
     
     def add_event_callback(self, callback: Callable[[SimulationEvent], None]):
         """Register callback for events"""
@@ -114,19 +167,80 @@ class Simulator:
         Args:
             fire_enabled: If True, fire spreads and hazards update. If False, fire is frozen.
         """
+        # Start-of-tick state for stall detection
+        was_frozen = self._hazards_frozen
+        self._hazards_frozen = not fire_enabled or not self.params.get('hazard', {}).get('enabled', True)
+        # Grid paths stay valid while the danger field is unchanged (a fire
+        # toggle between ticks spawns or extinguishes fire, so keep them only
+        # across two frozen ticks)
+        if not (was_frozen and self._hazards_frozen):
+            self._path_cache.clear()
+        self._events_at_tick_start = len(self.events)
+        self._states_at_tick_start = [a.state for a in self.agent_manager.agents]
+        self._agent_turn = 0
+        
         # 1. Update hazards (only if fire enabled)
-        self.env.update_hazards(self.tick, self.dt, fire_enabled=fire_enabled)
+        if self._watch_hazards and self.hazard_driver is not None:
+            self.hazard_driver.resume_live()  # Replay does not show the hazard RNG
+        if self.hazard_driver is not None:
+            self.hazard_driver.update(self.tick, self.dt, fire_enabled=fire_enabled)
+        else:
+            with self.hazard_rng:
+                self.env.update_hazards(self.tick, self.dt, fire_enabled=fire_enabled)
+        self._hazards_steady = False
+        if self._watch_hazards and not self._hazards_frozen:
+            self._hazards_steady = self._hazards_unchanged()
+        self.decision_engine.refresh_routes()  # Doors or edges may have changed
         
         # 2. Check agent safety (d_c > 0.95 = death)
         self._check_agent_safety()
+        if self.message_bus is not None:
+            self._deliver_messages()
         
-        # 3. Process each agent
-        for agent in self.agent_manager.agents:
+        # 3. Process each agent. Idle agents are assigned at their turn, so
+        # they see rooms cleared by the agents before them; a joint policy
+        # assigns all of them first instead
+        self._bulk_assigned = set()
+        if self._joint_assignment():
+            idle = [a for a in self.agent_manager.agents
+                    if a.state == AgentState.IDLE and not a.is_dead and not a.escaped]
+            self._bulk_assigned = {a.id for a in idle}
+            if idle:
+                self._assign_idle_agents(idle)
+        self._finish_tick(self._bulk_assigned)
+    
+    def _finish_tick(self, assigned: set, start: int = 0):
+        """
+        Rest of the current tick after hazards, safety checks and bulk
+        assignment: agent phase, reports, completion check and time step
+        
+        Args:
+            assigned: Ids of agents already assigned this tick (they only
+                accumulate exposure, unless their room was cleared meanwhile)
+            start: Index of the first agent still to process (forks taken
+                during the agent phase resume at `_agent_turn`)
+        """
+        agents = self.agent_manager.agents
+        for i in range(start, len(agents)):
+            self._agent_turn = i
+            agent = agents[i]
             if not agent.is_dead and not agent.escaped:  # Don't process dead or escaped agents
-                self._process_agent(agent)
+                if agent.id in assigned:
+                    self._reassign_if_cleared(agent)
+                    self._accumulate_exposure(agent)  # Assigned this tick, moves next tick
+                else:
+                    self._process_agent(agent)
+        if self.message_bus is not None:
+            self._send_observations()
+        
+        if self.debug_checks:
+            self.room_tally.check(self.env)
+            self.agent_manager.check_counts()
         
         # 4. Check completion
         self._check_completion()
+        if self.complete:
+            self.close()
         
         # 5. Increment time
         self.tick += 1
@@ -146,17 +260,11 @@ class Simulator:
                 if agent.is_dead or agent.escaped:
                     continue
                 
-                # Find cell at agent's position (cells centered at 0.25, 0.75, 1.25, etc.)
-                cell_x = int(agent.x / 0.5) * 0.5 + 0.25
-                cell_y = int(agent.y / 0.5) * 0.5 + 0.25
-                cell_pos = (cell_x, cell_y)
-                
-                if cell_pos in self.env.hazard_system.cells:
-                    cell = self.env.hazard_system.cells[cell_pos]
-                    
+                cell = self._agent_cell(agent)
+                if cell is not None:
                     # DEATH: danger > 0.95 OR in burning cell
                     if cell.danger_level > danger_death_threshold or cell.is_burning:
-                        agent.is_dead = True
+                        self.agent_manager.mark_dead(agent)
                         agent.state = AgentState.IDLE  # Stop moving
                         print(f'💀 [DEATH] Agent {agent.id} died at ({agent.x:.1f}, {agent.y:.1f}) - d_c={cell.danger_level:.2f}, burning={cell.is_burning}')
                         self.log_event(EventType.SIMULATION_END, agent.id, agent.current_room,
@@ -178,12 +286,70 @@ class Simulator:
                         # Initiate escape
                         self._assign_escape_route(agent)
     
+    def _send_observations(self):
+        """
+        Agents report their current room over the latency channel
+        
+        A report goes out when the room's cleared flag / evacuee count
+        (comm delay) or hazard (sensing delay) differs from the last report
+        about that room. Delays are normal samples clipped at 0.
+        """
+        reports = []
+        for agent in self.agent_manager.agents:
+            if agent.is_dead or agent.escaped:
+                continue
+            room = self.env.rooms[agent.current_room]
+            for kind, value in (('room', (room.cleared, room.evacuees_remaining)), ('hazard', room.hazard)):
+                if self._last_reported.get((kind, room.id)) != value:
+                    self._last_reported[(kind, room.id)] = value
+                    reports.append((kind, agent.id, room.id, value))
+        if not reports:
+            return
+        
+        comm = np.array([kind == 'room' for kind, _, _, _ in reports])
+        delays = np.maximum(0.0, np.where(
+            comm,
+            self._latency_rng.normal(self.comm_delay_mean, self.comm_delay_std, len(reports)),
+            self._latency_rng.normal(self.sensing_delay_mean, self.sensing_delay_std, len(reports))))
+        spike = np.where(comm, self.comm_delay_mean + 2 * self.comm_delay_std,
+                         self.sensing_delay_mean + 2 * self.sensing_delay_std)
+        
+        for (kind, agent_id, room_id, value), delay, limit in zip(reports, delays.tolist(), spike.tolist()):
+            self.message_bus.send(Message(self.time, self.time + delay, kind, agent_id, room_id, value))
+            if delay > limit:
+                self.log_event(EventType.LATENCY_SPIKE, agent_id, room_id,
+                               {'message': kind, 'delay': delay})
+    
+    def _deliver_messages(self):
+        """Apply agent reports that have arrived to the decision engine's view"""
+        for message in self.message_bus.deliver(self.time):
+            self.observed_env.apply(message)
+    
+    def _agent_cell(self, agent: Agent):
+        """Hazard cell at the agent's position (cells centered at 0.25, 0.75, 1.25, etc.)"""
+        cell_x = int(agent.x / 0.5) * 0.5 + 0.25
+        cell_y = int(agent.y / 0.5) * 0.5 + 0.25
+        return self.env.hazard_system.cells.get((cell_x, cell_y))
+    
+    def _is_agent_safe(self, agent: Agent) -> bool:
+        """True if _check_agent_safety would leave the agent alone this tick"""
+        if not hasattr(self.env.hazard_system, 'cells'):
+            return True
+        cell = self._agent_cell(agent)
+        if cell is None:
+            return True
+        hazard_params = self.params.get('hazard', {})
+        if cell.danger_level > hazard_params.get('danger_death_threshold', 0.95) or cell.is_burning:
+            return False
+        return not (cell.danger_level > hazard_params.get('danger_escape_threshold', 0.70)
+                    and agent.state != AgentState.ESCAPING)
+    
     def _process_agent(self, agent: Agent):
         """Process one agent for this tick"""
         
         if agent.state == AgentState.IDLE:
             # Agent needs new assignment
-            self._assign_agent_target(agent)
+            self._assign_idle_agents([agent])
         
         elif agent.state == AgentState.MOVING:
             # Agent is moving to next room in path
@@ -205,53 +371,110 @@ class Simulator:
             # Agent is escaping to exit - process like MOVING
             self._process_movement(agent)
         
-        # Accumulate hazard exposure
+        self._accumulate_exposure(agent)
+    
+    def _accumulate_exposure(self, agent: Agent):
+        """Accumulate hazard exposure of the agent's current room"""
         current_room = self.env.rooms[agent.current_room]
         agent.accumulate_hazard_exposure(current_room.hazard, self.dt)
     
-    def _assign_agent_target(self, agent: Agent):
-        """Assign next target room to idle agent using grid pathfinding"""
-        # Use grid pathfinding to find safe path to highest priority room
-        if self.grid_pathfinder:
-            uncleared_rooms = self.env.get_uncleared_rooms()
-            
-            best_room = None
-            best_priority = -1
-            best_path = None
-            
-            for room_id in uncleared_rooms:
-                priority = self.decision_engine.calculate_priority_index(room_id, agent.current_room)
-                if priority > best_priority:
-                    target_room = self.env.rooms[room_id]
-                    # Find grid path avoiding danger
-                    grid_path = self.grid_pathfinder.find_path(
-                        agent.x, agent.y, target_room.x, target_room.y,
-                        avoid_danger=True, danger_threshold=0.6  # More cautious pathfinding
-                    )
-                    if grid_path and len(grid_path) > 1:
-                        best_priority = priority
-                        best_room = room_id
-                        best_path = grid_path
-            
-            # Assign target if valid room found
-            if best_room and best_path and best_priority > 0:
-                agent.target_room = best_room
-                agent.waypoints = best_path
-                agent.current_waypoint = 0
-                agent.state = AgentState.MOVING
-                self.log_event(EventType.AGENT_MOVE, agent.id, agent.current_room,
-                             {'target': best_room, 'priority': best_priority})
-            else:
+    def _joint_assignment(self) -> bool:
+        """True if the policy chooses rooms for all of a tick's idle agents together"""
+        return getattr(self.policy, 'joint', False) or self.decision_engine.assignment == 'hungarian'
+    
+    def _reassign_if_cleared(self, agent: Agent):
+        """Re-assign a jointly assigned agent whose room an earlier agent cleared this tick"""
+        if agent.state == AgentState.MOVING and agent.target_room is not None \
+                and self.decision_engine.env.rooms[agent.target_room].cleared:
+            agent.clear_target()
+            self._assign_idle_agents([agent])
+    
+    def _assign_idle_agents(self, agents: List[Agent]):
+        """Ask the policy for targets of idle agents; the rest head for an exit"""
+        if self.observed_env is None:
+            rooms = RoomState(self.env, self.room_tally.uncleared_rooms())
+        else:
+            rooms = RoomState(self.observed_env)
+        assignments = self.policy.assign(self, agents, rooms)
+        for agent in agents:
+            assignment = assignments.get(agent.id)
+            if assignment is None:
                 # No rescuable rooms - try to escape!
-                if not agent.escaped and agent.state != AgentState.ESCAPING:
-                    self._assign_escape_route(agent)
+                self._assign_escape_route(agent)
+            else:
+                self.apply_assignment(agent, assignment)
+    
+    def apply_assignment(self, agent: Agent, assignment):
+        """Send an agent to a policy's target and log the move"""
+        if assignment.waypoints is not None:
+            agent.target_room = assignment.room_id
+            agent.waypoints = assignment.waypoints
+            agent.current_waypoint = 0
+            agent.state = AgentState.MOVING
+        else:
+            agent.set_target(assignment.room_id, assignment.path)
+        self.log_event(EventType.AGENT_MOVE, agent.id, agent.current_room,
+                       assignment.data or {'target': assignment.room_id})
+    
+    def fork_state(self) -> bytes:
+        """
+        Pickled copy of the current state for lookahead rollouts
+        
+        The copy has no event history or callbacks, assigns with
+        PriorityPolicy and never writes to the hazard cache. Taken by a
+        policy during step(), it is mid-tick: the copy completes that tick
+        with _finish_tick(..., start=_agent_turn) before stepping on, so
+        its time stays tick * dt.
+        """
+        # A shared hazard field is replaced by its leader's own driver (or
+        # live updates on the field's random stream); the copy owns its
+        # hazard system
+        driver = self.hazard_driver
+        rng = getattr(driver, 'rng', self.hazard_rng)
+        if driver is not None and getattr(driver, 'leader', self.env) is not self.env:
+            driver = None
+        driver = getattr(driver, 'inner', driver)
+        
+        saved = (self.events, self.event_callbacks, self.policy, self.hazard_driver, self.hazard_rng)
+        self.events, self.event_callbacks, self.policy = [], [], PriorityPolicy()
+        self.hazard_driver, self.hazard_rng = driver, rng
+        try:
+            return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            self.events, self.event_callbacks, self.policy, self.hazard_driver, self.hazard_rng = saved
+    
+    def spawn_fire(self):
+        """Start a fire through the hazard driver (ends timeline replay)"""
+        self._modify_fire('spawn_fire')
+    
+    def extinguish_fire(self):
+        """Put the fire out through the hazard driver (ends timeline replay)"""
+        self._modify_fire('extinguish_fire')
+    
+    def _modify_fire(self, name: str):
+        if self.hazard_driver is not None:
+            getattr(self.hazard_driver, name)()
         else:
-            # Fallback to room-based
-            room_score = self.decision_engine.select_next_room(agent)
-            if room_score:
-                agent.set_target(room_score.room_id, room_score.path)
-                self.log_event(EventType.AGENT_MOVE, agent.id, agent.current_room,
-                             {'target': room_score.room_id, 'score': room_score.score})
+            with self.hazard_rng:
+                getattr(self.env.hazard_system, name)()
+    
+    def fork(self) -> 'Simulator':
+        """Independent copy of the current state (see fork_state)"""
+        return pickle.loads(self.fork_state())
+    
+    def find_path(self, start_x: float, start_y: float, goal_x: float, goal_y: float,
+                  avoid_danger: bool = True, danger_threshold: float = 0.8):
+        """
+        GridPathfinder.find_path, cached while the danger field is unchanged
+        
+        Callers must not modify the returned waypoint list.
+        """
+        key = (start_x, start_y, goal_x, goal_y, avoid_danger, danger_threshold)
+        if key not in self._path_cache:
+            self._path_cache[key] = self.grid_pathfinder.find_path(
+                start_x, start_y, goal_x, goal_y,
+                avoid_danger=avoid_danger, danger_threshold=danger_threshold)
+        return self._path_cache[key]
     
     def _assign_escape_route(self, agent: Agent):
         """Route agent to nearest exit when no more rescues possible"""
@@ -267,7 +490,7 @@ class Simulator:
             for exit_id in self.env.exits:
                 exit_room = self.env.rooms[exit_id]
                 # Try to find path to exit
-                grid_path = self.grid_pathfinder.find_path(
+                grid_path = self.find_path(
                     agent.x, agent.y, exit_room.x, exit_room.y,
                     avoid_danger=(danger_threshold < 1.0),
                     danger_threshold=danger_threshold
@@ -398,7 +621,7 @@ class Simulator:
         
         # Check if agent is escaping and reached an exit
         if agent.state == AgentState.ESCAPING and target_room.is_exit:
-            agent.escaped = True
+            self.agent_manager.mark_escaped(agent)
             agent.state = AgentState.IDLE  # Mark as safe/idle
             agent.clear_target()
             self.log_event(EventType.AGENT_MOVE, agent.id, agent.target_room,
@@ -484,7 +707,7 @@ class Simulator:
                     
                     if nearest_exit:
                         exit_room = self.env.rooms[nearest_exit]
-                        grid_path = self.grid_pathfinder.find_path(
+                        grid_path = self.find_path(
                             agent.x, agent.y, exit_room.x, exit_room.y,
                             avoid_danger=True, danger_threshold=0.6  # Safer routes when carrying evacuees
                         )
@@ -503,6 +726,8 @@ class Simulator:
                 room.mark_cleared(self.tick)
                 print(f'[ROOM] {agent.current_room} cleared - empty room')
                 agent.state = AgentState.IDLE
+            
+            self.room_tally.update(room)
     
     def _process_dragging(self, agent: Agent):
         """Process agent dragging evacuee to exit"""
@@ -517,8 +742,11 @@ class Simulator:
     def _check_completion(self):
         """Check if simulation should end"""
         # All evacuees rescued - SUCCESS!
-        remaining_evac = self.env.get_remaining_evacuees()
-        if remaining_evac == 0:
+        if self.room_tally.remaining_evacuees == 0:
+            remaining = self.env.get_remaining_evacuees()
+            if remaining != 0:
+                raise RuntimeError(f'Room tally counts no evacuees left but the environment has {remaining} '
+                                   '(rooms changed outside the simulator?)')
             self.complete = True
             self.running = False
             self.log_event(EventType.SIMULATION_END, None, None,
@@ -526,8 +754,7 @@ class Simulator:
             return
         
         # All agents dead - FAILURE!
-        all_dead = all(a.is_dead for a in self.agent_manager.agents)
-        if all_dead:
+        if self.agent_manager.all_dead():
             self.complete = True
             self.running = False
             self.log_event(EventType.SIMULATION_END, None, None,
@@ -540,40 +767,406 @@ class Simulator:
             self.running = False
             self.log_event(EventType.SIMULATION_END, None, None,
                          {'reason': 'time_limit', 'time': self.time})
+            return
+        
+        # Nothing can change any more - STALLED
+        if self._is_stalled():
+            self.complete = True
+            self.running = False
+            self.log_event(EventType.SIMULATION_END, None, None,
+                         {'reason': 'stalled', 'time': self.time,
+                          'active_agents': self.agent_manager.get_active_count()})
     
-    def run(self, max_ticks: Optional[int] = None):
+    def _is_stalled(self) -> bool:
+        """
+        True if no further state change is possible
+        
+        Either no agent is left in play (all escaped or dead), whatever the
+        hazards do, or the tick just run logged no events, every agent still
+        in play was and still is IDLE (no reachable target or exit) or
+        QUEUED, and the hazards are frozen: fire off, hazards disabled, or a
+        steady fire. The next tick would then repeat the same decisions on
+        the same state forever.
+        
+        A fire counts as steady once an update left every cell, every room
+        hazard and the hazard RNG as they were after the previous one (a
+        model that still draws random numbers can still change). This is
+        only checked while the agents are stalled.
+        """
+        if self.agent_manager.get_active_count() == 0:
+            return True
+        
+        stalled = (len(self.events) == self._events_at_tick_start
+                   and not (self.message_bus is not None and len(self.message_bus)))  # Reports in flight
+        for agent, state in zip(self.agent_manager.agents, self._states_at_tick_start):
+            if not stalled:
+                break
+            if agent.is_dead or agent.escaped:
+                continue
+            if agent.state != state or state not in (AgentState.IDLE, AgentState.QUEUED):
+                stalled = False
+        
+        self._watch_hazards = stalled and not self._hazards_frozen
+        if not self._watch_hazards:
+            self._last_hazards = None
+        return stalled and (self._hazards_frozen or self._hazards_steady)
+    
+    def _hazards_unchanged(self) -> bool:
+        """True if the hazard update just run left the hazards as the previous one did"""
+        rng = getattr(self.hazard_driver, 'rng', self.hazard_rng)
+        (danger, burning), rooms = _read_cells(_cell_list(self.env)), _read_rooms(self.env)
+        last, self._last_hazards = self._last_hazards, (danger, burning, rooms, rng.state)
+        return (last is not None and np.array_equal(danger, last[0]) and np.array_equal(burning, last[1])
+                and np.array_equal(rooms, last[2]) and _same_rng_state(rng.state, last[3]))
+    
+    def advance(self, fire_enabled=True, max_ticks: Optional[int] = None) -> int:
+        """
+        Next-event time advance: skip ahead to the next tick where anything can change
+        
+        With fire disabled the hazard field is frozen, so ticks in which every
+        agent is mid-search, walking towards a waypoint or room, or waiting
+        for a stair (and nobody is in danger) only count down timers, move
+        agents and accumulate exposure. Those ticks are jumped over at once
+        (see _skip_quiet_ticks); the tick where something happens is then run
+        as a normal step. Results, event ticks and times are those of calling
+        step() once per tick; positions, distances and exposure are computed
+        in closed form rather than summed tick by tick, so they can differ
+        from per-tick stepping in the last bits.
+        
+        Args:
+            fire_enabled: As for step(); with fire on this is exactly one step
+            max_ticks: Tick count that must not be passed (None = use time_cap)
+            
+        Returns:
+            Number of ticks advanced
+        """
+        start = self.tick
+        if not fire_enabled:
+            if max_ticks is None:
+                max_ticks = int(self.time_cap / self.dt) + 1
+            self._skip_quiet_ticks(max_ticks - 1 - self.tick)
+        self.step(fire_enabled=fire_enabled)
+        return self.tick - start
+    
+    def _skip_quiet_ticks(self, limit: int) -> int:
+        """
+        Jump over up to `limit` ticks in which no event can occur (fire frozen)
+        
+        Every agent in play gets the number of ticks before its next possible
+        event: a search completing, reaching its last waypoint or the next
+        room, stepping towards an unsafe cell, entering a room it would
+        report on (latency) or a stair it does not hold. The run jumps by the
+        smallest of these (and the ticks left before the time cap) in one
+        go. Reports falling due meanwhile are delivered by the next step()
+        (the decision engine's view is not read before then).
+        
+        The skipped ticks' env.update_hazards(fire_enabled=False) calls are
+        assumed to change nothing. With simulation.debug_checks the first
+        one is run, and a changed hazard field or hazard RNG raises
+        RuntimeError.
+        
+        Returns:
+            Number of ticks skipped
+        """
+        if limit <= 0 or self.time >= self.time_cap:
+            return 0
+        if self.room_tally.remaining_evacuees == 0 or self.agent_manager.all_dead():
+            return 0  # Completion fires on the next step
+        
+        span = limit
+        plans = []
+        for agent in self.agent_manager.agents:
+            if agent.is_dead or agent.escaped:
+                continue
+            if not self._is_agent_safe(agent):
+                return 0
+            ticks, plan = self._quiet_ticks(agent, span)
+            if ticks <= 0:
+                return 0
+            span = min(span, ticks)
+            plans.append((agent, plan))
+        if all(plan is None for _, plan in plans):
+            return 0  # Only queued agents - the next step stalls the run
+        
+        # Time is summed one tick at a time, as step() does, so timestamps
+        # and the time cap tick match per-tick stepping exactly
+        time = self.time
+        for ticks in range(span):
+            if time >= self.time_cap:
+                span = ticks
+                break
+            time += self.dt
+        if span == 0:
+            return 0
+        
+        if self.debug_checks:
+            self._check_hazards_frozen()
+        
+        for agent, plan in plans:
+            if plan is None:  # Queued: exposure only
+                agent.accumulate_hazard_exposure(self.env.rooms[agent.current_room].hazard,
+                                                 span * self.dt)
+            else:
+                plan(span)
+        self.tick += span
+        self.time = time
+        self._hazards_frozen = True
+        return span
+    
+    def _quiet_ticks(self, agent: Agent, limit: int):
+        """
+        Ticks (at most `limit`) before the agent's next possible event
+        
+        Returns:
+            (ticks, plan): plan(k) applies k of those ticks to the agent
+            (None for a queued agent, which only accumulates exposure)
+        """
+        if agent.state == AgentState.QUEUED:
+            return limit, None
+        if agent.state == AgentState.SEARCHING:
+            # The search completes in the tick that takes the timer to <= 0
+            hazard = self.env.rooms[agent.current_room].hazard
+            ticks = math.ceil(agent.time_remaining_action / self.dt) - 1
+            tie = _near_integer(agent.time_remaining_action / self.dt)
+            if tie:
+                # Whether the last decrement lands on 0 depends on rounding:
+                # count the decrements exactly as _process_searching makes them
+                remaining, ticks = agent.time_remaining_action - self.dt, 0
+                while remaining > 0:
+                    remaining -= self.dt
+                    ticks += 1
+            
+            def search(k: int):
+                if tie:
+                    for _ in range(k):
+                        agent.time_remaining_action -= self.dt
+                else:
+                    agent.time_remaining_action -= k * self.dt
+                agent.time_in_current_state += k * self.dt
+                agent.accumulate_hazard_exposure(hazard, k * self.dt)
+            return min(limit, ticks), search
+        if agent.state not in (AgentState.MOVING, AgentState.ESCAPING, AgentState.DRAGGING):
+            return 0, None  # Idle agents are assigned on the next step
+        
+        speed = agent.speed_drag if agent.carrying_evacuee else agent.speed_hall
+        # Legs: (x0, y0, x1, y1, distance, moves, exact positions or None,
+        # ticks, room after reaching x1, y1)
+        legs = []
+        if agent.waypoints and self.grid_pathfinder:
+            # Each waypoint takes its moves plus one tick snapping onto it
+            x, y, room_id = agent.x, agent.y, agent.current_room
+            ticks = 0
+            for tx, ty in agent.waypoints[agent.current_waypoint:]:
+                if ticks == limit or not self._is_segment_safe(x, y, tx, ty, agent.state):
+                    break
+                distance, moves, exact = self._straight_moves(x, y, tx, ty, speed)
+                room = self.env.get_room_at_position(tx, ty, agent.floor)
+                next_room = room.id if room else room_id
+                if next_room != room_id and self._would_report(next_room):
+                    take = min(moves, limit - ticks)  # Stop before the report goes out
+                    legs.append((x, y, tx, ty, distance, moves, exact, take, next_room))
+                    ticks += take
+                    break
+                take = min(moves + 1, limit - ticks)
+                legs.append((x, y, tx, ty, distance, moves, exact, take, next_room))
+                ticks += take
+                x, y, room_id = tx, ty, next_room
+            # (After the last waypoint the next tick handles the arrival)
+        elif agent.path and agent.path_index < len(agent.path):
+            # Reaching the next room logs an event, so only its moves are quiet
+            next_room_id = agent.path[agent.path_index]
+            if self.env.graph.has_edge(agent.current_room, next_room_id) \
+                    and self.env.graph[agent.current_room][next_room_id].get('is_stair', False):
+                stair_id = (agent.current_room if self.env.rooms[agent.current_room].is_stair
+                            else next_room_id)
+                if self.agent_manager.stair_occupancy.get(stair_id) != agent.id:
+                    return 0, None  # Queues for or takes the stair on the next step
+                speed = agent.speed_stairs
+            if agent.moving_to_room:
+                tx, ty = agent.target_x, agent.target_y
+            else:
+                tx, ty = self.env.rooms[next_room_id].x, self.env.rooms[next_room_id].y
+            if not self._is_segment_safe(agent.x, agent.y, tx, ty, agent.state):
+                return 0, None
+            distance, moves, exact = self._straight_moves(agent.x, agent.y, tx, ty, speed)
+            ticks = min(moves, limit)
+            legs.append((agent.x, agent.y, tx, ty, distance, moves, exact, ticks, None))
+        else:
+            return 0, None  # Arrives on the next step
+        
+        def walk(k: int):
+            if not agent.waypoints or not self.grid_pathfinder:
+                agent.target_x, agent.target_y = legs[0][2], legs[0][3]
+                agent.moving_to_room = True
+            self._walk(agent, legs, k, speed * self.dt)
+        return ticks, walk
+    
+    def _straight_moves(self, x0: float, y0: float, x1: float, y1: float, speed: float):
+        """
+        Agent.move_towards from (x0, y0) to (x1, y1) until it snaps on
+        
+        Returns:
+            (distance, moves before the snap, positions after each move if
+            the count sits on a rounding tie, else None)
+        """
+        distance = ((x1 - x0) ** 2 + (y1 - y0) ** 2) ** 0.5
+        if distance < 0.1:
+            return distance, 0, None
+        step = speed * self.dt
+        if not _near_integer((distance - 0.1) / step):
+            return distance, int((distance - 0.1) // step) + 1, None
+        
+        # Whether the last move ends inside the 10cm snap radius depends on
+        # rounding: make the moves exactly as move_towards does
+        positions = []
+        x, y = x0, y0
+        while True:
+            dx, dy = x1 - x, y1 - y
+            left = (dx * dx + dy * dy) ** 0.5
+            if left < 0.1:
+                return distance, len(positions), positions
+            move = min(step, left)
+            x += (dx / left) * move
+            y += (dy / left) * move
+            positions.append((x, y))
+    
+    def _walk(self, agent: Agent, legs: list, k: int, step: float):
+        """Apply k ticks of the legs from _quiet_ticks: position, distance, history, exposure"""
+        rooms = self.env.rooms
+        room_id = agent.current_room
+        exposure = 0.0
+        moved = []  # (leg, moves made) for the position history
+        for leg in legs:
+            if k == 0:
+                break
+            x0, y0, x1, y1, distance, moves, exact, ticks, next_room = leg
+            done = min(k, ticks)
+            n = min(done, moves)
+            k -= done
+            agent.total_distance_traveled += min(n * step, distance)
+            exposure += rooms[room_id].hazard * n
+            moved.append((leg, n))
+            if done > moves:  # Snapped onto the waypoint
+                agent.x, agent.y = x1, y1
+                agent.current_waypoint += 1
+                room_id = next_room
+                exposure += rooms[room_id].hazard
+            elif n:
+                agent.x, agent.y = _leg_position(leg, n, step)
+        agent.current_room = room_id
+        agent.accumulate_hazard_exposure(exposure, self.dt)
+        
+        # Positions after each move, only as many as the history keeps
+        tail = []
+        for leg, n in reversed(moved):
+            need = agent.max_history_length - len(tail)
+            if need <= 0:
+                break
+            for i in range(n, max(n - need, 0), -1):
+                tail.append(_leg_position(leg, i, step) + (agent.floor,))
+        if tail:
+            history = agent.position_history + tail[::-1]
+            agent.position_history = history[-agent.max_history_length:]
+    
+    def _is_segment_safe(self, x0: float, y0: float, x1: float, y1: float,
+                         state: AgentState) -> bool:
+        """True if every cell overlapping the segment's bounding box is safe to stand in"""
+        cells = getattr(self.env.hazard_system, 'cells', None)
+        if not cells:
+            return True
+        hazard_params = self.params.get('hazard', {})
+        death = hazard_params.get('danger_death_threshold', 0.95)
+        escape = hazard_params.get('danger_escape_threshold', 0.70)
+        i0, i1 = sorted((int(x0 / 0.5), int(x1 / 0.5)))
+        j0, j1 = sorted((int(y0 / 0.5), int(y1 / 0.5)))
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = cells.get((i * 0.5 + 0.25, j * 0.5 + 0.25))
+                if cell is None:
+                    continue
+                if cell.danger_level > death or cell.is_burning:
+                    return False
+                if cell.danger_level > escape and state != AgentState.ESCAPING:
+                    return False
+        return True
+    
+    def _would_report(self, room_id: str) -> bool:
+        """True if an agent entering the room would send a report (latency)"""
+        if self.message_bus is None:
+            return False
+        room = self.env.rooms[room_id]
+        return (self._last_reported.get(('room', room_id)) != (room.cleared, room.evacuees_remaining)
+                or self._last_reported.get(('hazard', room_id)) != room.hazard)
+    
+    def _check_hazards_frozen(self):
+        """Run the first skipped tick's fire-disabled hazard update and check it changed nothing"""
+        cells = list(getattr(self.env.hazard_system, 'cells', {}).values())
+        before = (_read_cells(cells), _read_rooms(self.env), self.hazard_rng.state)
+        if self.hazard_driver is not None:
+            self.hazard_driver.update(self.tick, self.dt, fire_enabled=False)
+        else:
+            with self.hazard_rng:
+                self.env.update_hazards(self.tick, self.dt, fire_enabled=False)
+        after = (_read_cells(cells), _read_rooms(self.env), self.hazard_rng.state)
+        (danger, burning), rooms, rng = before
+        (danger2, burning2), rooms2, rng2 = after
+        if not (np.array_equal(danger, danger2) and np.array_equal(burning, burning2)
+                and np.array_equal(rooms, rooms2) and _same_rng_state(rng, rng2)):
+            raise RuntimeError(f'Hazard update with fire disabled changed the hazards at tick {self.tick}; '
+                               'quiet ticks cannot be skipped')
+    
+    def run(self, max_ticks: Optional[int] = None, fire_enabled: bool = True):
         """
         Run simulation to completion
         
         Args:
             max_ticks: Maximum ticks to run (None = use time_cap)
+            fire_enabled: Passed to step(); with fire disabled and
+                simulation.event_driven set, quiet ticks are skipped (see advance)
         """
         self.running = True
         
         if max_ticks is None:
             max_ticks = int(self.time_cap / self.dt) + 1
         
-        while self.running and self.tick < max_ticks:
-            self.step()
+        try:
+            while self.running and self.tick < max_ticks:
+                if self.event_driven:
+                    self.advance(fire_enabled=fire_enabled, max_ticks=max_ticks)
+                else:
+                    self.step(fire_enabled=fire_enabled)
+        finally:
+            self.close()
         
         return self.get_results()
     
+    def close(self):
+        """
+        Release run resources: save a newly recorded hazard timeline and
+        shut down policy workers (rollout processes)
+        
+        Called when the run completes; loops that stop stepping early
+        (tick caps) call it themselves. Safe to call more than once.
+        """
+        if self.hazard_driver is not None:
+            self.hazard_driver.close()
+        if hasattr(self.policy, 'close'):
+            self.policy.close()
+    
     def get_results(self) -> dict:
         """Get simulation results and metrics"""
-        total_evac = self.env.get_total_evacuees()
-        rescued = total_evac - self.env.get_remaining_evacuees()
+        total_evac = self.room_tally.total_evacuees
+        rescued = total_evac - self.room_tally.remaining_evacuees
         
-        total_rooms = len([r for r in self.env.rooms.values() 
-                          if not r.is_exit and not r.is_stair])
-        cleared_rooms = len([r for r in self.env.rooms.values() 
-                            if r.cleared])
+        total_rooms = self.room_tally.total_rooms
+        cleared_rooms = self.room_tally.cleared_rooms
         
         # Calculate SUCCESS RATE using CORRECT formula:
         # SR = (Survivors × Avg_Priority) / (Time × Responders)
         num_agents = self.params.get('agents', {}).get('count', 2)
         
         # Calculate responder survival rate
-        num_alive = sum(1 for a in self.agent_manager.agents if not a.is_dead)
+        num_alive = len(self.agent_manager.agents) - self.agent_manager.num_dead
         responder_survival_pct = (num_alive / num_agents * 100) if num_agents > 0 else 100.0
         
         # SUCCESS SCORE formula: (Occupants Rescued × % Responders Alive) / (Time × Responders)
@@ -599,7 +1192,8 @@ class Simulator:
             'responder_survival_pct': responder_survival_pct,  # For displaying formula
             'num_responders': num_agents,
             'avg_hazard_exposure': self.agent_manager.get_average_hazard_exposure(),
-            'max_hazard': self.env.hazard_system.get_max_hazard(),
+            'max_hazard': (self.hazard_driver.get_max_hazard() if self.hazard_driver is not None
+                           else self.env.hazard_system.get_max_hazard()),
             'agents': self.agent_manager.get_all_stats()
         }
     
@@ -610,6 +1204,13 @@ class Simulator:
         self.running = False
         self.complete = False
         self.events.clear()
+        self._path_cache.clear()
+        
+        # Hazards are not rewound, so stop replaying and continue live from here
+        if self.hazard_driver is not None:
+            self.hazard_driver.resume_live()
+            self.hazard_driver.close()
+            self.hazard_driver = None
         
         # Reset environment
         for room in self.env.rooms.values():
@@ -620,4 +1221,24 @@ class Simulator:
         
         # Recreate agents
         self.agent_manager = AgentManager(self.env, self.params.get('agents', {}))
+        self.room_tally = RoomTally(self.env)
+        
+        # Drop reports in flight; the decision engine starts from the reset rooms
+        if self.message_bus is not None:
+            self.message_bus = MessageBus()
+            self.observed_env = ObservedEnvironment(self.env)
+            self.decision_engine.env = self.observed_env
+            self._last_reported.clear()
+
+
+def _near_integer(value: float) -> bool:
+    return abs(value - round(value)) < 1e-9
+
 
+def _leg_position(leg: tuple, moves: int, step: float) -> tuple:
+    """Position after `moves` moves along a _quiet_ticks leg"""
+    x0, y0, x1, y1, distance, _, exact, _, _ = leg
+    if exact is not None:
+        return exact[moves - 1]
+    left = max(distance - moves * step, 0.0)
+    return x1 - (x1 - x0) / distance * left, y1 - (y1 - y0) / distance * left
@@ -1,6 +1,11 @@
 """Policy module - Decision engine for room selection"""
 
 from .decision_engine import DecisionEngine, RoomScore
+from .base import Assignment, Policy, RoomState
+from .room_queue import RoomQueue
+from .priority import PriorityPolicy
+from .baselines import GreedyNearestPolicy, StaticSequentialPolicy
+from .rollout import RolloutPolicy
 
-__all__ = ['DecisionEngine', 'RoomScore']
-
+__all__ = ['DecisionEngine', 'RoomScore', 'Assignment', 'Policy', 'RoomState', 'RoomQueue',
+           'PriorityPolicy', 'GreedyNearestPolicy', 'StaticSequentialPolicy', 'RolloutPolicy']
@@ -0,0 +1,84 @@
+"""Policy interface - bulk assignment of idle agents to rooms"""
+
+from typing import Dict, List, NamedTuple, Optional, Protocol, Tuple
+
+import numpy as np
+
+
+class Assignment(NamedTuple):
+    """Target chosen for one idle agent"""
+    room_id: str
+    waypoints: Optional[List[Tuple[float, float]]] = None  # Grid path (grid pathfinding)
+    path: Optional[List[str]] = None  # Room path (room-graph fallback)
+    data: Optional[dict] = None  # Extra fields of the AGENT_MOVE event
+
+
+class RoomState:
+    """
+    Array view of the rooms at the start of a tick's agent phase
+
+    All arrays are in `room_ids` (env.rooms) order; `uncleared` holds the
+    indices of env.get_uncleared_rooms(), in that order.
+    """
+
+    def __init__(self, env, uncleared: Optional[List[str]] = None):
+        """
+        Initialize from an environment
+
+        Args:
+            env: Environment whose rooms are read
+            uncleared: env.get_uncleared_rooms() if already known
+        """
+        rooms = list(env.rooms.values())
+        n = len(rooms)
+        self.room_ids: List[str] = [room.id for room in rooms]
+        self.index: Dict[str, int] = {room_id: i for i, room_id in enumerate(self.room_ids)}
+        self.x = np.fromiter((r.x for r in rooms), dtype=float, count=n)
+        self.y = np.fromiter((r.y for r in rooms), dtype=float, count=n)
+        self.floor = np.fromiter((r.floor for r in rooms), dtype=int, count=n)
+        self.area = np.fromiter((r.area for r in rooms), dtype=float, count=n)
+        self.evacuees = np.fromiter((r.evacuees_remaining for r in rooms), dtype=float, count=n)
+        self.hazard = np.fromiter((r.hazard for r in rooms), dtype=float, count=n)
+        self.cleared = np.fromiter((r.cleared for r in rooms), dtype=bool, count=n)
+        self.is_exit = np.fromiter((r.is_exit for r in rooms), dtype=bool, count=n)
+        self.is_stair = np.fromiter((r.is_stair for r in rooms), dtype=bool, count=n)
+        if uncleared is None:
+            uncleared = env.get_uncleared_rooms()
+        self.uncleared = np.array([self.index[room_id] for room_id in uncleared], dtype=np.int64)
+
+    def uncleared_ids(self) -> List[str]:
+        """Room ids of env.get_uncleared_rooms()"""
+        return [self.room_ids[i] for i in self.uncleared.tolist()]
+
+
+class Policy(Protocol):
+    """
+    Room assignment policy
+
+    Policies get the simulator (for `find_path`, which caches grid paths
+    within a tick, and the decision engine) and a RoomState, and return a
+    target for each agent they assign. Agents left out are sent to the
+    nearest exit.
+
+    By default each idle agent is assigned on its own at its turn in the
+    agent loop, so it sees rooms cleared earlier in the same tick. A policy
+    with `joint = True` is called once per tick with every idle agent
+    before the loop (an agent whose room is cleared later in that tick is
+    re-assigned alone at its turn).
+    """
+
+    joint: bool = False
+
+    def assign(self, sim, agents: list, rooms: RoomState) -> Dict[int, Assignment]:
+        """
+        Choose targets for idle agents
+
+        Args:
+            sim: Simulator
+            agents: Idle agents (alive, not escaped)
+            rooms: Room arrays for this tick
+
+        Returns:
+            Agent id -> Assignment
+        """
+        ...
@@ -0,0 +1,82 @@
+"""Baseline policies for algorithm comparisons (neither avoids danger)"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .base import Assignment, Policy, RoomState
+from .priority import PriorityPolicy
+
+
+class _FallbackPolicy:
+    """Hands the agents a policy could not assign to another policy"""
+
+    def __init__(self, fallback: Optional[Policy] = None):
+        self.fallback = fallback if fallback is not None else PriorityPolicy()
+
+    def _with_fallback(self, sim, agents: list, rooms: RoomState,
+                       assignments: Dict[int, Assignment]) -> Dict[int, Assignment]:
+        rest = [agent for agent in agents if agent.id not in assignments]
+        if rest and self.fallback is not None:
+            assignments.update(self.fallback.assign(sim, rest, rooms))
+        return assignments
+
+
+class StaticSequentialPolicy(_FallbackPolicy):
+    """Every agent visits the rooms of a fixed sequence in order"""
+
+    def __init__(self, room_sequence: List[str], fallback: Optional[Policy] = None):
+        """
+        Initialize policy
+
+        Args:
+            room_sequence: Room visiting order (shared by all agents)
+            fallback: Policy for agents without a next room or path
+                (default PriorityPolicy)
+        """
+        super().__init__(fallback)
+        self.room_sequence = room_sequence
+        self.sequence_idx: Dict[int, int] = {}
+
+    def assign(self, sim, agents: list, rooms: RoomState) -> Dict[int, Assignment]:
+        """Choose targets for idle agents (see Policy.assign)"""
+        assignments: Dict[int, Assignment] = {}
+        if sim.grid_pathfinder is not None:
+            for agent in agents:
+                idx = self.sequence_idx.get(agent.id, 0)
+                if idx >= len(self.room_sequence) or self.room_sequence[idx] not in sim.env.rooms:
+                    continue
+                target = sim.env.rooms[self.room_sequence[idx]]
+                # Static doesn't avoid danger - just shortest path
+                grid_path = sim.find_path(agent.x, agent.y, target.x, target.y, avoid_danger=False)
+                if grid_path and len(grid_path) > 1:
+                    assignments[agent.id] = Assignment(target.id, waypoints=grid_path,
+                                                       data={'target': target.id})
+                    self.sequence_idx[agent.id] = idx + 1
+        return self._with_fallback(sim, agents, rooms, assignments)
+
+
+class GreedyNearestPolicy(_FallbackPolicy):
+    """Every agent goes to the nearest uncleared room (Manhattan distance)"""
+
+    def assign(self, sim, agents: list, rooms: RoomState) -> Dict[int, Assignment]:
+        """Choose targets for idle agents (see Policy.assign)"""
+        assignments: Dict[int, Assignment] = {}
+        if sim.grid_pathfinder is not None and len(rooms.uncleared):
+            room_x = rooms.x[rooms.uncleared]
+            room_y = rooms.y[rooms.uncleared]
+            agent_x = np.array([agent.x for agent in agents], dtype=float)
+            agent_y = np.array([agent.y for agent in agents], dtype=float)
+            # (agents, rooms) distances; argmin keeps the first room on ties
+            dist = (np.abs(room_x[None, :] - agent_x[:, None])
+                    + np.abs(room_y[None, :] - agent_y[:, None]))
+            nearest = rooms.uncleared[np.argmin(dist, axis=1)]
+
+            for agent, room_idx in zip(agents, nearest.tolist()):
+                target = sim.env.rooms[rooms.room_ids[room_idx]]
+                # Greedy doesn't avoid danger - just shortest path!
+                grid_path = sim.find_path(agent.x, agent.y, target.x, target.y, avoid_danger=False)
+                if grid_path and len(grid_path) > 1:
+                    assignments[agent.id] = Assignment(target.id, waypoints=grid_path,
+                                                       data={'target': target.id})
+        return self._with_fallback(sim, agents, rooms, assignments)
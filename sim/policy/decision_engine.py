@@ -1,11 +1,15 @@
 """Decision engine implementing weighted greedy TRP-inspired policy"""
 
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 import numpy as np
+from scipy.optimize import linear_sum_assignment
 
-from ..env.environment import Environment
 from ..agents.agent import Agent, AgentState
+from .room_queue import RoomQueue
+
+if TYPE_CHECKING:
+    from ..env.environment import Environment
 
 
 @dataclass
@@ -27,7 +31,7 @@ class RoomScore:
 class DecisionEngine:
     """Implements the weighted greedy sweep algorithm"""
     
-    def __init__(self, environment: Environment, params: dict):
+    def __init__(self, environment: 'Environment', params: dict):
         """
         Initialize decision engine
         
@@ -45,8 +49,22 @@ class DecisionEngine:
         self.evacuee_weight = params.get('evacuee_weight', 1.0)
         self.distance_weight = params.get('distance_weight', 1.0)
         
+        # Multi-agent assignment: 'greedy' (one agent at a time) or 'hungarian'
+        self.assignment = params.get('assignment', 'greedy')
+        
         # Agent parameters for time calculation
         self.agent_params = None
+        
+        # (from, to) -> (path, distance, flat distance, stair distance) or None,
+        # valid while the room graph keeps the signature it was built under
+        self._routes: Dict[Tuple[str, str], Optional[tuple]] = {}
+        self._graph_signature: Optional[tuple] = None
+        
+        # room -> door position of its first connection with one (layout is static)
+        self._doors: Optional[Dict[str, Tuple[float, float]]] = None
+        
+        # Uncleared rooms by priority index, rescored only when their inputs change
+        self.room_queue = RoomQueue(self)
     
     def set_agent_params(self, agent_params: dict):
         """Set agent parameters for movement time calculations"""
@@ -82,35 +100,14 @@ class DecisionEngine:
         area_factor = 0.5 + (room.area / 200.0) * 0.5
         
         # A_i(t): Accessibility (1 if accessible, 0 if not)
-        path = self.env.get_shortest_path(agent_position, room_id)
-        A_i = 1.0 if path is not None else 0.0
+        A_i = 1.0 if self._route(agent_position, room_id) is not None else 0.0
         
         if A_i == 0.0:
             return 0.0
         
         # Check if door is on fire (CRITICAL: can't enter if door is burning!)
-        if hasattr(self.env, 'hazard_system') and self.env.hazard_system:
-            # Get actual door position from layout connections
-            door_pos = None
-            if hasattr(self.env, 'layout') and 'connections' in self.env.layout:
-                for conn in self.env.layout['connections']:
-                    if conn['from'] == room_id and 'door_pos' in conn:
-                        door_pos = (conn['door_pos']['x'], conn['door_pos']['y'])
-                        break
-            
-            if door_pos:
-                # Check if door cells are burning (1.5m door = 3 cells wide)
-                # Also check cells on both sides (in room and in hallway)
-                for dx in [-0.5, 0.0, 0.5]:  # Check 3 cells (1.5m) door width
-                    for dy in [-0.5, 0.0, 0.5]:  # Check in front, at, and behind door
-                        door_x = door_pos[0] + dx * 0.5
-                        door_y = door_pos[1] + dy * 0.5
-                        door_cell_key = (round(door_x / 0.5) * 0.5 + 0.25, round(door_y / 0.5) * 0.5 + 0.25)
-                        if door_cell_key in self.env.hazard_system.cells:
-                            door_cell = self.env.hazard_system.cells[door_cell_key]
-                            # Lower threshold - block faster!
-                            if door_cell.is_burning or door_cell.danger_level > 0.7:
-                                return 0.0  # Door blocked by fire!
+        if self._is_door_blocked(room_id):
+            return 0.0  # Door blocked by fire!
         
         # D_i(t): Average danger level [0, 1]
         D_i = room.hazard
@@ -139,6 +136,78 @@ class DecisionEngine:
         
         return priority
     
+    def _is_door_blocked(self, room_id: str) -> bool:
+        """True if the cells around the room's door are burning or too dangerous"""
+        if not (hasattr(self.env, 'hazard_system') and self.env.hazard_system):
+            return False
+        
+        # Get actual door position from layout connections
+        if self._doors is None:
+            self._doors = {}
+            if hasattr(self.env, 'layout') and 'connections' in self.env.layout:
+                for conn in self.env.layout['connections']:
+                    if 'door_pos' in conn:
+                        self._doors.setdefault(conn['from'], (conn['door_pos']['x'], conn['door_pos']['y']))
+        door_pos = self._doors.get(room_id)
+        
+        if door_pos:
+            # Check if door cells are burning (1.5m door = 3 cells wide)
+            # Also check cells on both sides (in room and in hallway)
+            for dx in [-0.5, 0.0, 0.5]:  # Check 3 cells (1.5m) door width
+                for dy in [-0.5, 0.0, 0.5]:  # Check in front, at, and behind door
+                    door_x = door_pos[0] + dx * 0.5
+                    door_y = door_pos[1] + dy * 0.5
+                    door_cell_key = (round(door_x / 0.5) * 0.5 + 0.25, round(door_y / 0.5) * 0.5 + 0.25)
+                    if door_cell_key in self.env.hazard_system.cells:
+                        door_cell = self.env.hazard_system.cells[door_cell_key]
+                        # Lower threshold - block faster!
+                        if door_cell.is_burning or door_cell.danger_level > 0.7:
+                            return True
+        return False
+    
+    def calculate_priority_indices(self, room_ids: List[str], agent_position: str) -> np.ndarray:
+        """
+        calculate_priority_index for many rooms at once
+        
+        The formula runs on arrays; the accessibility and door checks only
+        run for rooms that still have evacuees. Values are identical to the
+        per-room version.
+        
+        Args:
+            room_ids: Rooms to evaluate
+            agent_position: Current agent room
+            
+        Returns:
+            (rooms,) priority indices
+        """
+        rooms = [self.env.rooms[room_id] for room_id in room_ids]
+        n = len(rooms)
+        E = np.fromiter((float(r.evacuees_remaining) for r in rooms), dtype=float, count=n)
+        area = np.fromiter((r.area for r in rooms), dtype=float, count=n)
+        D = np.fromiter((r.hazard for r in rooms), dtype=float, count=n)
+        x = np.fromiter((r.x for r in rooms), dtype=float, count=n)
+        y = np.fromiter((r.y for r in rooms), dtype=float, count=n)
+        
+        # A_i(t) and door check, only where E_i > 0
+        open_rooms = E != 0
+        for i in np.flatnonzero(open_rooms):
+            if (self._route(agent_position, room_ids[i]) is None
+                    or self._is_door_blocked(room_ids[i])):
+                open_rooms[i] = False
+        
+        if agent_position in self.env.rooms:
+            agent_room = self.env.rooms[agent_position]
+            distance = np.abs(x - agent_room.x) + np.abs(y - agent_room.y)
+        else:
+            distance = np.zeros(n)
+        distance = np.maximum(distance, 5.0)
+        
+        area_factor = 0.5 + (area / 200.0) * 0.5
+        lambda_val = 10.0  # Danger weight (as in calculate_priority_index)
+        numerator = E * area_factor * (10.0 + lambda_val * D)
+        priority = numerator / (distance / 10.0)
+        return np.where(open_rooms, priority, 0.0)
+    
     def calculate_room_weight(self, room_id: str, distance: float) -> float:
         """
         Calculate room weight: w_i = (A_i × E_i) / (D_i + ε)
@@ -254,12 +323,10 @@ class DecisionEngine:
             return None
         
         # Get path from agent's current room to target
-        path = self.env.get_shortest_path(agent.current_room, room_id)
-        if not path:
+        route = self._route(agent.current_room, room_id)
+        if route is None:
             return None
-        
-        # Calculate distance
-        distance = self.env.get_path_length(agent.current_room, room_id)
+        path, distance = route[0], route[1]
         
         # Calculate components
         weight = self.calculate_room_weight(room_id, distance)
@@ -313,16 +380,20 @@ class DecisionEngine:
         
         return best_score
     
-    def select_rooms_for_all_agents(self, agents: List[Agent]) -> dict:
+    def select_rooms_for_all_agents(self, agents: List[Agent], method: Optional[str] = None) -> dict:
         """
         Select best rooms for multiple agents (coordination)
         
         Args:
             agents: List of idle agents needing assignments
+            method: 'greedy' or 'hungarian' (default from policy params)
         
         Returns:
             Dictionary mapping agent_id -> RoomScore
         """
+        if (method or self.assignment) == 'hungarian':
+            return self._select_rooms_hungarian(agents)
+        
         assignments = {}
         assigned_rooms = set()
         
@@ -351,6 +422,144 @@ class DecisionEngine:
         
         return assignments
     
+    def refresh_routes(self) -> bool:
+        """
+        Drop cached routes if the room graph changed (doors or edges added,
+        removed or re-weighted) since they were computed
+        
+        Called by the simulator once per tick, after the hazard update.
+        Room queue regions are rebuilt too, as their accessibility comes
+        from the routes.
+        
+        Returns:
+            True if the caches were dropped
+        """
+        graph = self.env.graph
+        signature = (graph.number_of_nodes(),
+                     tuple((a, b, tuple(data.items())) for a, b, data in graph.edges(data=True)))
+        if signature == self._graph_signature:
+            return False
+        self._graph_signature = signature
+        self._routes.clear()
+        self.room_queue.invalidate()
+        return True
+    
+    def _route(self, from_id: str, to_id: str) -> Optional[tuple]:
+        """
+        Cached (path, distance, flat distance, stair distance) between two rooms
+        
+        The one source of accessibility for priorities, scores and the room
+        queue (see refresh_routes).
+        """
+        key = (from_id, to_id)
+        if key not in self._routes:
+            path = self.env.get_shortest_path(from_id, to_id)
+            if not path:
+                self._routes[key] = None
+            else:
+                flat = stair = 0.0
+                for a, b in zip(path, path[1:]):
+                    if self.env.graph.has_edge(a, b):
+                        edge = self.env.graph[a][b]
+                        if edge.get('is_stair', False):
+                            stair += edge.get('distance', 10.0)
+                        else:
+                            flat += edge.get('distance', 10.0)
+                    else:
+                        flat += self.env.rooms[a].distance_to(self.env.rooms[b])
+                self._routes[key] = (path, self.env.get_path_length(from_id, to_id), flat, stair)
+        return self._routes[key]
+    
+    def score_matrix(self, agents: List[Agent], room_ids: List[str]) -> Tuple[np.ndarray, list]:
+        """
+        score_room for every (agent, room) pair in one vectorised pass
+        
+        Route lengths come from the route cache, so each pair costs one
+        dictionary lookup after the first time it is seen. Travel times sum
+        flat and stair distances per route rather than per edge, so scores
+        can differ from score_room in the last bits.
+        
+        Args:
+            agents: Agents (rows)
+            room_ids: Candidate rooms (columns)
+        
+        Returns:
+            ((agents, rooms) scores, NaN where unreachable; routes per pair)
+        """
+        rooms = [self.env.rooms[room_id] for room_id in room_ids]
+        routes = [[self._route(agent.current_room, room_id) for room_id in room_ids]
+                  for agent in agents]
+        shape = (len(agents), len(rooms))
+        reachable = np.array([[r is not None for r in row] for row in routes], dtype=bool).reshape(shape)
+        distance, flat, stair = (
+            np.array([[r[k] if r is not None else 0.0 for r in row] for row in routes],
+                     dtype=float).reshape(shape)
+            for k in (1, 2, 3))
+        
+        # calculate_room_weight
+        area = np.array([r.area for r in rooms], dtype=float)
+        evacuees = np.array([r.evacuee_count + 1 for r in rooms], dtype=float)
+        hazard = np.array([r.hazard for r in rooms], dtype=float)
+        weight = ((area * self.area_weight) * (evacuees * self.evacuee_weight)
+                  / (distance * self.distance_weight + self.epsilon))
+        weight *= np.maximum(0.1, 1.0 - hazard * 0.5)
+        
+        # estimate_travel_time + estimate_service_time
+        speed_flat = np.array([a.get_current_speed(False) for a in agents], dtype=float)[:, None]
+        speed_stair = np.array([a.get_current_speed(True) for a in agents], dtype=float)[:, None]
+        travel_time = flat / speed_flat + stair / speed_stair
+        service_time = np.array([self.estimate_service_time(room_id) for room_id in room_ids], dtype=float)
+        total_time = np.maximum(travel_time + service_time, 0.1)
+        
+        return np.where(reachable, weight / total_time, np.nan), routes
+    
+    def _select_rooms_hungarian(self, agents: List[Agent]) -> dict:
+        """
+        Joint assignment maximising the total score (Hungarian algorithm)
+        
+        Every agent gets a distinct room while there are enough reachable
+        rooms; agents left over (more agents than rooms) share their best
+        scoring room.
+        """
+        room_ids = [rid for rid in self.env.get_uncleared_rooms()
+                    if not self.env.rooms[rid].is_exit and not self.env.rooms[rid].is_stair]
+        if not agents or not room_ids:
+            return {}
+        
+        sorted_agents = sorted(agents, key=lambda a: a.id)
+        scores, routes = self.score_matrix(sorted_agents, room_ids)
+        reachable = ~np.isnan(scores)
+        
+        def room_score(i: int, j: int) -> RoomScore:
+            agent = sorted_agents[i]
+            path, distance, flat, stair = routes[i][j]
+            return RoomScore(
+                room_id=room_ids[j],
+                weight=self.calculate_room_weight(room_ids[j], distance),
+                travel_time=flat / agent.get_current_speed(False) + stair / agent.get_current_speed(True),
+                service_time=self.estimate_service_time(room_ids[j]),
+                score=float(scores[i, j]),
+                path=path
+            )
+        
+        # Unreachable pairs get a big-M penalty (more than any two totals of reachable
+        # scores differ by), so the solver first maximises the number of reachable matches;
+        # they are dropped after solving
+        floor = -(2.0 * np.nansum(np.abs(scores)) + 1.0) if reachable.any() else 0.0
+        rows, cols = linear_sum_assignment(np.where(reachable, scores, floor), maximize=True)
+        
+        assignments = {}
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            if reachable[i, j]:
+                assignments[sorted_agents[i].id] = room_score(i, j)
+        
+        # More agents than rooms (or no distinct reachable room): best room, shared
+        for i, agent in enumerate(sorted_agents):
+            if agent.id not in assignments and reachable[i].any():
+                assignments[agent.id] = room_score(i, int(np.nanargmax(scores[i])))
+        
+        return assignments
+    
     def get_path_to_exit(self, from_room_id: str) -> Tuple[Optional[str], Optional[List[str]]]:
         """
         Get path to nearest exit
@@ -0,0 +1,89 @@
+"""Default policy - highest priority index room with a safe grid path"""
+
+from typing import Dict
+
+from .base import Assignment, RoomState
+
+
+class PriorityPolicy:
+    """
+    Weighted greedy TRP policy (the simulator's default)
+
+    Each idle agent takes the highest priority index room that has a safe
+    grid path (danger < 0.6). Rooms come from the decision engine's
+    RoomQueue (refreshed once per tick) in descending priority order, and
+    grid paths are only searched until one is found.
+    Without grid pathfinding, falls back to DecisionEngine.select_next_room.
+
+    With policy "assignment": "hungarian", rooms are instead chosen jointly
+    for all idle agents (DecisionEngine.select_rooms_for_all_agents); in grid
+    mode an agent whose joint room has no safe grid path takes its highest
+    priority room as above.
+    """
+
+    danger_threshold = 0.6  # More cautious pathfinding
+
+    def assign(self, sim, agents: list, rooms: RoomState) -> Dict[int, Assignment]:
+        """Choose targets for idle agents (see Policy.assign)"""
+        engine = sim.decision_engine
+        assignments: Dict[int, Assignment] = {}
+        joint = engine.select_rooms_for_all_agents(agents) if engine.assignment == 'hungarian' else None
+
+        if sim.grid_pathfinder is None:
+            if joint is not None:
+                room_scores = joint
+            else:
+                room_scores = {agent.id: engine.select_next_room(agent) for agent in agents}
+            for agent in agents:
+                room_score = room_scores.get(agent.id)
+                if room_score:
+                    assignments[agent.id] = Assignment(
+                        room_score.room_id, path=room_score.path,
+                        data={'target': room_score.room_id, 'score': room_score.score})
+            return assignments
+
+        engine.room_queue.refresh(rooms.uncleared_ids())
+        for agent in agents:
+            room_score = joint.get(agent.id) if joint is not None else None
+            if room_score:
+                target = sim.env.rooms[room_score.room_id]
+                grid_path = sim.find_path(agent.x, agent.y, target.x, target.y,
+                                          avoid_danger=True, danger_threshold=self.danger_threshold)
+                if grid_path and len(grid_path) > 1:
+                    assignments[agent.id] = Assignment(
+                        target.id, waypoints=grid_path,
+                        data={'target': target.id, 'score': room_score.score})
+                    continue
+            candidates = self.candidates(sim, agent, 1)
+            if candidates:
+                assignments[agent.id] = candidates[0]
+        return assignments
+
+    def candidates(self, sim, agent, k: int) -> list:
+        """
+        Up to k grid-path Assignments for an agent, best priority first
+
+        The decision engine's room_queue must have been refreshed with this
+        tick's uncleared rooms.
+
+        Args:
+            sim: Simulator (grid pathfinding required)
+            agent: Idle agent
+            k: Number of candidates
+
+        Returns:
+            Assignments with positive priority and a safe grid path
+        """
+        candidates = []
+        # Ties go to the first room in uncleared order
+        for room_id, priority in sim.decision_engine.room_queue.ranked(agent.current_room):
+            if len(candidates) == k:
+                break
+            target = sim.env.rooms[room_id]
+            grid_path = sim.find_path(agent.x, agent.y, target.x, target.y,
+                                      avoid_danger=True, danger_threshold=self.danger_threshold)
+            if grid_path and len(grid_path) > 1:
+                candidates.append(Assignment(
+                    target.id, waypoints=grid_path,
+                    data={'target': target.id, 'priority': float(priority)}))
+        return candidates
@@ -0,0 +1,196 @@
+"""Receding-horizon policy - picks rooms by short rollouts of forked simulators"""
+
+import contextlib
+import io
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..agents.agent import AgentState
+from .base import Assignment, RoomState
+from .priority import PriorityPolicy
+
+
+class RolloutPolicy:
+    """
+    Lookahead over the top-k priority rooms
+
+    For every idle agent, the k highest priority rooms (PriorityPolicy
+    candidates) are each tried in a fork of the simulator: the agent is
+    sent to the candidate, everyone else follows PriorityPolicy and the
+    fork runs `horizon` ticks with the hazards stepping forward. All
+    rollouts start from the same random state (common random numbers) and
+    the candidate with the best rollout value wins.
+
+    Rollouts run in a process pool (or in-process with workers=0) and stop
+    at a per-decision deadline; rollouts that have not finished by then
+    are ignored (counted in `timeouts`; rollouts that raise are reported
+    and counted in `failures`), and an agent without any finished rollout
+    takes the top priority room. With a tight budget the choice therefore depends on
+    machine speed. Stepping the fire dominates rollout cost; with a hazard
+    cache (simulation.hazard_cache) forks replay the timeline instead.
+    """
+
+    joint = True  # One fork per tick for all idle agents
+
+    # Rollout value weights
+    rescue_weight = 1.0
+    clear_weight = 0.25
+    death_penalty = 5.0
+    exposure_weight = 0.01
+
+    def __init__(self, horizon: int = 60, top_k: int = 3, time_budget: float = 0.5,
+                 workers: Optional[int] = 2):
+        """
+        Initialize policy
+
+        Args:
+            horizon: Rollout length in ticks
+            top_k: Candidate rooms per agent
+            time_budget: Wall-clock seconds per decision (one assign call)
+            workers: Rollout processes (0 = run in-process, None = CPU count)
+        """
+        self.horizon = horizon
+        self.top_k = top_k
+        self.time_budget = time_budget
+        self.workers = workers
+        self.base = PriorityPolicy()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.timeouts = 0  # Rollouts not finished by their deadline
+        self.failures = 0  # Rollouts that raised
+
+    @classmethod
+    def from_params(cls, params: dict) -> 'RolloutPolicy':
+        """Build from the policy.rollout section of params.json"""
+        return cls(horizon=params.get('horizon', 60), top_k=params.get('top_k', 3),
+                   time_budget=params.get('time_budget', 0.5), workers=params.get('workers', 2))
+
+    def assign(self, sim, agents: list, rooms: RoomState) -> Dict[int, Assignment]:
+        """Choose targets for idle agents (see Policy.assign)"""
+        deadline = time.time() + self.time_budget
+        if sim.grid_pathfinder is None:
+            return self.base.assign(sim, agents, rooms)
+
+        sim.decision_engine.room_queue.refresh(rooms.uncleared_ids())
+        candidates = {agent.id: self.base.candidates(sim, agent, self.top_k)
+                      for agent in agents}
+        assignments = {agent_id: options[0] for agent_id, options in candidates.items() if options}
+        jobs = [(agent_id, option) for agent_id, options in candidates.items()
+                if len(options) > 1 for option in options]
+        if not jobs:
+            return assignments
+
+        args = (sim.fork_state(), self.horizon, not sim._hazards_frozen,
+                np.random.get_state(), self._weights(), deadline)
+        if time.time() >= deadline:
+            return assignments
+
+        values = self._run(jobs, args, deadline, sim.debug_checks)
+        best: Dict[int, float] = {}
+        for (agent_id, option), value in zip(jobs, values):
+            if value is not None and value > best.get(agent_id, -np.inf):
+                best[agent_id] = value
+                assignments[agent_id] = option._replace(data={**(option.data or {}),
+                                                              'rollout_value': value})
+        return assignments
+
+    def _run(self, jobs: list, args: tuple, deadline: float,
+             debug: bool = False) -> List[Optional[float]]:
+        """
+        Rollout values in job order (None = not finished by the deadline, or failed)
+
+        Failed rollouts are reported and counted in `failures` (re-raised
+        with debug set); unfinished ones are counted in `timeouts`.
+        """
+        if self.workers == 0:
+            rng_state = np.random.get_state()
+            values = []
+            try:
+                for agent_id, option in jobs:
+                    value = None
+                    if time.time() < deadline:
+                        try:
+                            value = _rollout(agent_id, option, *args)
+                        except Exception as e:
+                            self._failed(e, debug)
+                            values.append(None)
+                            continue
+                    if value is None:
+                        self.timeouts += 1
+                    values.append(value)
+                return values
+            finally:
+                np.random.set_state(rng_state)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [self._pool.submit(_rollout, agent_id, option, *args) for agent_id, option in jobs]
+        pending = set(futures)
+        while pending and time.time() < deadline:
+            _, pending = wait(pending, timeout=max(0.0, deadline - time.time()),
+                              return_when=FIRST_COMPLETED)
+        for future in pending:
+            future.cancel()  # Running rollouts stop themselves at the deadline
+
+        values = []
+        for future in futures:
+            value = None
+            if future.done() and not future.cancelled():
+                if future.exception() is not None:
+                    self._failed(future.exception(), debug)
+                    values.append(None)
+                    continue
+                value = future.result()
+            if value is None:
+                self.timeouts += 1
+            values.append(value)
+        return values
+
+    def _failed(self, error: BaseException, debug: bool):
+        """Count a failed rollout and report it (raise it under debug checks)"""
+        self.failures += 1
+        if debug:
+            raise error
+        print(f'[ROLLOUT] Rollout failed ({self.failures} so far): {error!r}')
+
+    def _weights(self) -> tuple:
+        return (self.rescue_weight, self.clear_weight, self.death_penalty, self.exposure_weight)
+
+    def close(self):
+        """Shut down the rollout processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def _rollout(agent_id: int, option: Assignment, state: bytes, horizon: int,
+             fire_enabled: bool, rng_state: tuple, weights: tuple,
+             deadline: float) -> Optional[float]:
+    """Value of sending one agent to `option` in a fork (None if the deadline passed)"""
+    sim = pickle.loads(state)
+    np.random.set_state(rng_state)
+    with contextlib.redirect_stdout(io.StringIO()):
+        # The fork was taken inside step() (after the hazard update); finish
+        # that tick from the current agent's turn with the agent assigned.
+        # Other agents of the bulk assignment that got no target yet are
+        # assigned by PriorityPolicy at their turn.
+        agent = next(a for a in sim.agent_manager.agents if a.id == agent_id)
+        sim.apply_assignment(agent, option)
+        assigned = {a.id for a in sim.agent_manager.agents
+                    if a.id in sim._bulk_assigned and a.state != AgentState.IDLE}
+        end = sim.tick + horizon
+        sim._finish_tick(assigned | {agent_id}, start=sim._agent_turn)
+        while not sim.complete and sim.tick < end:
+            if time.time() >= deadline:
+                return None
+            sim.step(fire_enabled=fire_enabled)
+
+    rescue_weight, clear_weight, death_penalty, exposure_weight = weights
+    tally = sim.room_tally
+    rescued = tally.total_evacuees - tally.remaining_evacuees
+    exposure = sum(a.cumulative_hazard_exposure for a in sim.agent_manager.agents)
+    return (rescue_weight * rescued + clear_weight * tally.cleared_rooms
+            - death_penalty * sim.agent_manager.num_dead - exposure_weight * exposure)
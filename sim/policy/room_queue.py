@@ -0,0 +1,226 @@
+"""Room priority queues - per-region indexed heaps with lazy rescoring"""
+
+import heapq
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class IndexedHeap:
+    """
+    Binary min-heap of items with updatable keys
+
+    Every item's heap position is tracked, so set (insert or change key)
+    and discard cost O(log n). Keys must be unique (ties are broken inside
+    the key).
+    """
+
+    def __init__(self, entries: Optional[List[tuple]] = None):
+        """
+        Initialize heap
+
+        Args:
+            entries: Initial (key, item) pairs
+        """
+        self._heap: List[tuple] = list(entries or [])
+        heapq.heapify(self._heap)
+        self._pos: Dict[str, int] = {item: i for i, (_, item) in enumerate(self._heap)}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item) -> bool:
+        return item in self._pos
+
+    def set(self, item, key):
+        """Insert item or change its key"""
+        i = self._pos.get(item)
+        if i is None:
+            self._heap.append((key, item))
+            self._pos[item] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+        else:
+            self._heap[i] = (key, item)
+            self._sift_down(self._sift_up(i))
+
+    def discard(self, item):
+        """Remove item if present"""
+        i = self._pos.pop(item, None)
+        if i is None:
+            return
+        last = self._heap.pop()
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._pos[last[1]] = i
+            self._sift_down(self._sift_up(i))
+
+    def peek(self) -> Optional[tuple]:
+        """Smallest (key, item), or None if empty"""
+        return self._heap[0] if self._heap else None
+
+    def ordered(self) -> Iterator[tuple]:
+        """
+        (key, item) pairs in key order without modifying the heap
+
+        Each pair costs O(log k) for the k-th pair (a frontier heap over
+        the children of pairs already yielded).
+        """
+        heap = self._heap
+        frontier = [(heap[0][0], 0)] if heap else []
+        while frontier:
+            _, i = heapq.heappop(frontier)
+            yield heap[i]
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], child))
+
+    def _sift_up(self, i: int) -> int:
+        heap, pos = self._heap, self._pos
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not entry[0] < heap[parent][0]:
+                break
+            heap[i] = heap[parent]
+            pos[heap[i][1]] = i
+            i = parent
+        heap[i] = entry
+        pos[entry[1]] = i
+        return i
+
+    def _sift_down(self, i: int) -> int:
+        heap, pos = self._heap, self._pos
+        entry = heap[i]
+        n = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if not heap[child][0] < entry[0]:
+                break
+            heap[i] = heap[child]
+            pos[heap[i][1]] = i
+            i = child
+        heap[i] = entry
+        pos[entry[1]] = i
+        return i
+
+
+class RoomQueue:
+    """
+    Uncleared rooms ranked by priority index, one indexed heap per region
+
+    A region is the room an agent stands in: calculate_priority_indices
+    measures distance from that room's centre, so within a region only a
+    room's evacuee count, hazard and door state can change its priority
+    (accessibility comes from the engine's routes, and
+    DecisionEngine.refresh_routes invalidates every region when the room
+    graph changes). refresh() reads those inputs once per tick and logs
+    the rooms whose inputs changed
+    (or that were cleared); a region's heap only rescores the logged rooms
+    when it is next used. Regions that fell too far behind the log are
+    rebuilt instead.
+
+    Only rooms with positive priority are queued. Keys are (-priority,
+    env.rooms position), so the order matches a stable descending sort of
+    calculate_priority_indices over env.get_uncleared_rooms().
+    """
+
+    lambda_val = 10.0  # Danger weight (as in calculate_priority_index)
+
+    def __init__(self, engine):
+        """
+        Initialize queue
+
+        Args:
+            engine: DecisionEngine (rooms, door checks and routes are read through it)
+        """
+        self.engine = engine
+        self._order: Dict[str, int] = {}
+        self._inputs: Dict[str, Tuple[float, float, bool]] = {}  # room -> (E, D, door blocked)
+        self._log: List[str] = []  # Rooms whose inputs changed, oldest first
+        self._log_start = 0  # Log position of _log[0]
+        self._regions: Dict[str, Tuple[IndexedHeap, int]] = {}  # region -> (heap, log position)
+
+    def refresh(self, room_ids: List[str]):
+        """
+        Read the current inputs of the candidate rooms
+
+        Args:
+            room_ids: env.get_uncleared_rooms()
+        """
+        engine = self.engine
+        rooms = engine.env.rooms
+        if len(self._order) != len(rooms):
+            self._order = {room_id: i for i, room_id in enumerate(rooms)}
+
+        inputs = {}
+        for room_id in room_ids:
+            room = rooms[room_id]
+            E = float(room.evacuees_remaining)
+            inputs[room_id] = (E, room.hazard, E != 0 and engine._is_door_blocked(room_id))
+        changed = [room_id for room_id, value in inputs.items() if self._inputs.get(room_id) != value]
+        changed.extend(room_id for room_id in self._inputs if room_id not in inputs)
+        self._inputs = inputs
+        self._log.extend(changed)
+
+        # Regions behind the dropped half are rebuilt on next use
+        if len(self._log) > 4 * len(self._order):
+            drop = len(self._log) // 2
+            del self._log[:drop]
+            self._log_start += drop
+
+    def invalidate(self):
+        """Rebuild every region on next use (accessibility changed)"""
+        self._regions.clear()
+
+    def ranked(self, region: str) -> Iterator[Tuple[str, float]]:
+        """
+        (room id, priority) in descending priority order, positive only
+
+        Args:
+            region: Agent's current room
+
+        Returns:
+            Iterator over the rooms of the last refresh
+        """
+        heap = self._sync(region)
+        for (key, _), room_id in heap.ordered():
+            yield room_id, -key
+
+    def priority(self, room_id: str, region: str) -> float:
+        """calculate_priority_index of a refreshed room from the region"""
+        E, D, blocked = self._inputs[room_id]
+        if E == 0 or blocked or self.engine._route(region, room_id) is None:
+            return 0.0
+
+        rooms = self.engine.env.rooms
+        room = rooms[room_id]
+        if region in rooms:
+            distance = abs(room.x - rooms[region].x) + abs(room.y - rooms[region].y)
+        else:
+            distance = 0.0
+        distance = max(distance, 5.0)
+        area_factor = 0.5 + (room.area / 200.0) * 0.5
+        return E * area_factor * (10.0 + self.lambda_val * D) / (distance / 10.0)
+
+    def _sync(self, region: str) -> IndexedHeap:
+        """Region heap rescored up to the end of the log"""
+        end = self._log_start + len(self._log)
+        heap, position = self._regions.get(region, (None, -1))
+        if heap is None or position < self._log_start or end - position > len(self._inputs):
+            entries = []
+            for room_id in self._inputs:
+                priority = self.priority(room_id, region)
+                if priority > 0:
+                    entries.append(((-priority, self._order[room_id]), room_id))
+            heap = IndexedHeap(entries)
+        else:
+            for room_id in dict.fromkeys(self._log[position - self._log_start:]):
+                priority = self.priority(room_id, region) if room_id in self._inputs else 0.0
+                if priority > 0:
+                    heap.set(room_id, (-priority, self._order[room_id]))
+                else:
+                    heap.discard(room_id)
+        self._regions[region] = (heap, end)
+        return heap
@@ -0,0 +1,385 @@
+"""Offline video rendering of a recorded run - Agg backend, parallel workers"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from ..agents.agent import AgentState
+from .video import VideoWriter
+
+
+class FrameRecord(NamedTuple):
+    """State of one recorded tick, as compact arrays"""
+    tick: int
+    time: float
+    agent_xy: np.ndarray          # (agents, 2) float32
+    agent_floor: np.ndarray       # (agents,) int16
+    agent_status: np.ndarray      # (agents,) int8 - 0 active, 1 escaping, 2 escaped, 3 dead
+    room_cleared: np.ndarray      # (rooms,) bool
+    room_remaining: np.ndarray    # (rooms,) int16
+    cell_danger: np.ndarray       # (cells,) float16
+    cell_burning: np.ndarray      # (cells,) bool
+    rescued: int
+    total_evacuees: int
+
+
+class RunRecorder:
+    """
+    Records the trajectory and hazard history of a Simulator run
+
+    Static geometry (rooms, hazard cell positions, layout) is captured once;
+    each capture() appends one FrameRecord. The recorder holds only plain
+    arrays, so it pickles cheaply into BatchRenderer's worker processes.
+    """
+
+    def __init__(self, simulator, every: int = 1):
+        """
+        Initialize recorder from the simulator's static geometry
+
+        Args:
+            simulator: Simulator to record
+            every: Keep one frame every N ticks
+        """
+        self.sim = simulator
+        self.every = max(1, every)
+        env = simulator.env
+
+        self.layout = env.layout
+        self.bounds = dict(env.bounds)
+        self.room_ids = list(env.rooms.keys())
+        self.rooms = [
+            {
+                'id': room.id, 'floor': room.floor,
+                'x': room.x, 'y': room.y, 'x1': room.x1, 'y1': room.y1,
+                'width': room.width, 'height': room.height,
+                'type': getattr(room, 'type', None),
+                'is_exit': room.is_exit, 'is_stair': room.is_stair,
+            }
+            for room in env.rooms.values()
+        ]
+
+        cells = getattr(env.hazard_system, 'cells', {})
+        self._cell_keys = list(cells.keys())
+        self.cell_xy = np.array(self._cell_keys, dtype=float).reshape(-1, 2)
+        self.cell_floor = np.array(
+            [env.rooms[cells[k].room_id].floor if cells[k].room_id in env.rooms else -1
+             for k in self._cell_keys], dtype=np.int16)
+        self.grid_resolution = simulator.params.get('hazard', {}).get('grid_resolution', 0.5)
+
+        self.agent_ids = [agent.id for agent in simulator.agent_manager.agents]
+        self.total_evacuees = env.get_total_evacuees()
+        self.frames: List[FrameRecord] = []
+
+    def capture(self, force: bool = False):
+        """Append the current tick (honours `every` unless forced)"""
+        sim = self.sim
+        if not force and sim.tick % self.every != 0:
+            return
+        if self.frames and self.frames[-1].tick == sim.tick:
+            return
+
+        env = sim.env
+        agents = sim.agent_manager.agents
+        status = [3 if a.is_dead else 2 if a.escaped
+                  else 1 if a.state == AgentState.ESCAPING else 0 for a in agents]
+        rooms = [env.rooms[room_id] for room_id in self.room_ids]
+        remaining = np.fromiter((r.evacuees_remaining for r in rooms), dtype=np.int16,
+                                count=len(rooms))
+
+        cells = getattr(env.hazard_system, 'cells', {})
+        n = len(self._cell_keys)
+        frame_cells = [cells[k] for k in self._cell_keys]
+
+        self.frames.append(FrameRecord(
+            tick=sim.tick,
+            time=sim.time,
+            agent_xy=np.array([(a.x, a.y) for a in agents], dtype=np.float32).reshape(-1, 2),
+            agent_floor=np.array([a.floor for a in agents], dtype=np.int16),
+            agent_status=np.array(status, dtype=np.int8),
+            room_cleared=np.fromiter((r.cleared for r in rooms), dtype=bool, count=len(rooms)),
+            room_remaining=remaining,
+            cell_danger=np.fromiter((c.danger_level for c in frame_cells), dtype=np.float16, count=n),
+            cell_burning=np.fromiter((c.is_burning for c in frame_cells), dtype=bool, count=n),
+            rescued=self.total_evacuees - int(remaining.sum()),
+            total_evacuees=self.total_evacuees,
+        ))
+
+    def run(self, max_ticks: Optional[int] = None, fire_enabled: bool = True) -> dict:
+        """
+        Run the simulation to completion while recording (same loop as Simulator.run)
+
+        Returns:
+            Simulator results
+        """
+        sim = self.sim
+        sim.running = True
+        if max_ticks is None:
+            max_ticks = int(sim.time_cap / sim.dt) + 1
+
+        self.capture(force=True)
+        while sim.running and sim.tick < max_ticks:
+            sim.step(fire_enabled=fire_enabled)
+            self.capture()
+        self.capture(force=True)
+        sim.close()
+
+        return sim.get_results()
+
+    def __getstate__(self):
+        # The live simulator stays in the parent process
+        state = self.__dict__.copy()
+        state['sim'] = None
+        state['_cell_keys'] = None
+        return state
+
+
+# Per-process renderer, built once by the pool initializer
+_worker_canvas = None
+
+
+class _FrameCanvas:
+    """Agg figure with the static floor drawn once and per-frame artists updated in place"""
+
+    STATUS_COLORS = np.array([
+        (0x19, 0x76, 0xD2), (0xFB, 0x8C, 0x00), (0x43, 0xA0, 0x47), (0x21, 0x21, 0x21)
+    ]) / 255.0
+
+    def __init__(self, recording: RunRecorder, floor: int, width: int, height: int,
+                 dpi: int, trail_length: int):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import LineCollection
+        import matplotlib.patches as patches
+        from .wall_renderer import WallRenderer
+
+        self.rec = recording
+        self.floor = floor
+        self.trail_length = trail_length
+
+        self.fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi, facecolor='#FAFAFA')
+        self.canvas = FigureCanvasAgg(self.fig)
+        ax = self.fig.add_axes([0.04, 0.04, 0.92, 0.88])
+        ax.set_facecolor('#FFFFFF')
+        ax.set_aspect('equal')
+        ax.set_autoscale_on(False)
+        if floor in recording.bounds:
+            x_min, y_min, x_max, y_max = recording.bounds[floor]
+            ax.set_xlim(x_min, x_max)
+            ax.set_ylim(y_max, y_min)  # y grows downwards, as in the animator
+        self.ax = ax
+        self.title = self.fig.suptitle('', fontsize=14, fontweight='bold', color='#212121')
+
+        # Hazard cells of this floor as one mesh, coloured per frame
+        self.cell_mask = recording.cell_floor == floor
+        self.mesh = None
+        if self.cell_mask.any():
+            res = recording.grid_resolution
+            xy = recording.cell_xy[self.cell_mask]
+            cols = np.floor(xy[:, 0] / res).astype(int)
+            rows = np.floor(xy[:, 1] / res).astype(int)
+            col0, row0 = cols.min(), rows.min()
+            self.cols, self.rows = cols - col0, rows - row0
+            self.shape = (rows.max() - row0 + 1, cols.max() - col0 + 1)
+            self.mesh = ax.pcolormesh(
+                np.linspace(col0 * res, (cols.max() + 1) * res, self.shape[1] + 1),
+                np.linspace(row0 * res, (rows.max() + 1) * res, self.shape[0] + 1),
+                np.zeros(self.shape), shading='flat', edgecolors='none', zorder=10)
+            self.mesh.set_array(None)
+
+        # Rooms: outlines are static, office fills follow cleared state
+        self.room_index = [i for i, room in enumerate(recording.rooms) if room['floor'] == floor]
+        self.room_patches = []
+        for i in self.room_index:
+            room = recording.rooms[i]
+            rect = patches.Rectangle((room['x1'], room['y1']), room['width'], room['height'],
+                                     linewidth=1.5, edgecolor='#2E7D32' if room['is_exit'] else '#000000',
+                                     facecolor='none', zorder=15)
+            ax.add_patch(rect)
+            self.room_patches.append(rect)
+            ax.text(room['x'], room['y'], room['id'], ha='center', va='center',
+                    fontsize=7, color='#757575', zorder=2)
+
+        WallRenderer(ax, recording.layout, floor, recording.grid_resolution).draw_walls()
+
+        self.trails = LineCollection([], linewidths=1.5, alpha=0.5, zorder=25)
+        ax.add_collection(self.trails, autolim=False)
+        self.agents = ax.scatter([], [], s=80, edgecolors='white', linewidths=1.5, zorder=30)
+
+    def _cell_colors(self, frame: FrameRecord) -> np.ndarray:
+        """Per-face RGBA (same white -> red gradient as the animator's heatmap)"""
+        d = frame.cell_danger[self.cell_mask].astype(float)
+        burning = frame.cell_burning[self.cell_mask]
+        rgba = np.zeros((len(d), 4))
+        rgba[:, 0] = np.where(d < 0.75, 1.0, 0.9 + d * 0.1)
+        rgba[:, 1] = np.select([d < 0.25, d < 0.5, d < 0.75],
+                               [1.0, 0.95 - (d - 0.25) * 2.0, 0.45 - (d - 0.5)],
+                               0.1 - d * 0.1)
+        rgba[:, 2] = np.where(d < 0.25, 0.95 - d * 0.6, 0.0)
+        rgba[:, 3] = np.where(d > 0.001, 0.5 + d * 0.5, 0.0)
+        rgba[burning] = (1.0, 0.0, 0.0, 1.0)
+
+        colors = np.zeros(self.shape + (4,))
+        colors[self.rows, self.cols] = rgba
+        return colors.reshape(-1, 4)
+
+    def render(self, index: int) -> bytes:
+        """Draw recorded frame `index` and return its RGB24 pixels"""
+        frames = self.rec.frames
+        frame = frames[index]
+
+        if self.mesh is not None:
+            self.mesh.set_facecolor(self._cell_colors(frame))
+
+        for rect, i in zip(self.room_patches, self.room_index):
+            room = self.rec.rooms[i]
+            if frame.room_cleared[i] or (room['type'] == 'office' and frame.room_remaining[i] == 0):
+                rect.set_facecolor((0.506, 0.780, 0.518, 0.6))
+            else:
+                rect.set_facecolor('none')
+
+        on_floor = frame.agent_floor == self.floor
+        self.agents.set_offsets(frame.agent_xy[on_floor])
+        self.agents.set_facecolor(self.STATUS_COLORS[frame.agent_status[on_floor]])
+
+        # Trails come from the preceding recorded frames, skipping floor changes
+        start = max(0, index - self.trail_length + 1)
+        history = np.stack([f.agent_xy for f in frames[start:index + 1]], axis=1)
+        floors = np.stack([f.agent_floor for f in frames[start:index + 1]], axis=1)
+        self.trails.set_segments([xy[fl == self.floor] for xy, fl in zip(history, floors)
+                                  if (fl == self.floor).sum() > 1])
+
+        self.title.set_text(f"Floor {self.floor + 1}  |  t = {frame.time:.0f}s  |  "
+                            f"Rescued {frame.rescued}/{frame.total_evacuees}")
+
+        self.canvas.draw()
+        return np.asarray(self.canvas.buffer_rgba())[..., :3].tobytes()
+
+
+def _init_worker(recording: RunRecorder, floor: int, width: int, height: int,
+                 dpi: int, trail_length: int):
+    """Pool initializer: receive the recording once and build the figure"""
+    global _worker_canvas
+    _worker_canvas = _FrameCanvas(recording, floor, width, height, dpi, trail_length)
+
+
+def _render_chunk(start: int, stop: int, segment_path: str, fps: int,
+                  ffmpeg: Optional[str]) -> str:
+    """Render frames [start, stop) and encode them into one segment"""
+    canvas = _worker_canvas
+    width, height = canvas.canvas.get_width_height()
+    with VideoWriter(segment_path, width, height, fps=fps, ffmpeg=ffmpeg) as video:
+        for index in range(start, stop):
+            video.write(canvas.render(index))
+    return str(video.output_path)
+
+
+class BatchRenderer:
+    """
+    Renders a RunRecorder to MP4/GIF without a display
+
+    Frames are split into chunks; each worker process renders its chunks with
+    the Agg backend and encodes them into a short segment, and the segments
+    are joined at the end (stream copy for MP4). Without ffmpeg the segments
+    are PNG archives, merged into a single <name>.frames.zip.
+    """
+
+    def __init__(self, recording: RunRecorder, floor: int = 0, fps: int = 10,
+                 width: int = 1280, height: int = 720, dpi: int = 100,
+                 workers: Optional[int] = None, chunk_size: int = 60,
+                 trail_length: int = 20):
+        """
+        Initialize renderer
+
+        Args:
+            recording: Recorded run
+            floor: Floor to render
+            fps: Playback frame rate
+            width, height: Frame size in pixels
+            dpi: Figure DPI (sets text and line scale)
+            workers: Worker processes (default: CPU count)
+            chunk_size: Frames per encoded segment
+            trail_length: Recorded frames shown in each agent trail
+        """
+        self.recording = recording
+        self.floor = floor
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.dpi = dpi
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.trail_length = trail_length
+
+    def render(self, output_path: str) -> Path:
+        """
+        Render all recorded frames
+
+        Args:
+            output_path: Video to create (.mp4 or .gif)
+
+        Returns:
+            Path actually written (a .frames.zip when ffmpeg is missing)
+        """
+        n_frames = len(self.recording.frames)
+        if n_frames == 0:
+            raise ValueError("Recording has no frames")
+
+        output = Path(output_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        ffmpeg = shutil.which('ffmpeg')
+        chunks = [(start, min(start + self.chunk_size, n_frames))
+                  for start in range(0, n_frames, self.chunk_size)]
+
+        with tempfile.TemporaryDirectory(prefix='segments_', dir=output.parent) as tmp:
+            init_args = (self.recording, self.floor, self.width, self.height,
+                         self.dpi, self.trail_length)
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks)),
+                                     initializer=_init_worker, initargs=init_args) as pool:
+                futures = [pool.submit(_render_chunk, start, stop,
+                                       str(Path(tmp) / f'segment_{i:05d}.mp4'), self.fps, ffmpeg)
+                           for i, (start, stop) in enumerate(chunks)]
+                segments = [Path(f.result()) for f in futures]
+
+            if ffmpeg:
+                return self._concat_segments(ffmpeg, segments, output)
+            return self._merge_archives(segments, output, n_frames)
+
+    def _concat_segments(self, ffmpeg: str, segments: List[Path], output: Path) -> Path:
+        """Join encoded segments with ffmpeg's concat demuxer"""
+        listing = segments[0].parent / 'segments.txt'
+        listing.write_text(''.join(f"file '{s.resolve()}'\n" for s in segments))
+
+        codec = [] if output.suffix.lower() == '.gif' else ['-c', 'copy']
+        result = subprocess.run(
+            [ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+             '-i', str(listing)] + codec + [str(output)],
+            capture_output=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg concat failed: {result.stderr.decode(errors='replace').strip()}")
+        return output
+
+    def _merge_archives(self, segments: List[Path], output: Path, n_frames: int) -> Path:
+        """Renumber the per-chunk PNG archives into one archive"""
+        merged_path = output.with_suffix('.frames.zip')
+        index = 0
+        with zipfile.ZipFile(merged_path, 'w', zipfile.ZIP_STORED) as merged:
+            for segment in segments:
+                with zipfile.ZipFile(segment) as part:
+                    for name in sorted(n for n in part.namelist() if n.endswith('.png')):
+                        merged.writestr(f'frame_{index:06d}.png', part.read(name))
+                        index += 1
+            merged.writestr('manifest.json', json.dumps({
+                'width': self.width, 'height': self.height,
+                'fps': self.fps, 'frames': n_frames,
+                'pattern': 'frame_%06d.png',
+            }))
+        return merged_path
@@ -3,11 +3,53 @@
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 
 from ..engine.simulator import SimulationEvent, EventType
+from ..engine.event_table import EventTable
+from .geometry import FloorGeometry, LayoutGeometry
+
+HEATMAP_DPI = 150
+HEATMAP_PANEL_SIZE = (6, 5)  # Inches per floor
+
+
+def _render_floor_panel(floor_geometry: FloorGeometry, hazards: np.ndarray) -> np.ndarray:
+    """Draw one floor of the hazard heatmap and return its RGBA pixels
+    
+    Module-level so it can run in a worker process.
+    """
+    fig = Figure(figsize=HEATMAP_PANEL_SIZE, dpi=HEATMAP_DPI)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    
+    # Color by hazard level
+    rooms = PolyCollection(floor_geometry.room_vertices, facecolors=plt.cm.YlOrRd(hazards),
+                           edgecolors='black', linewidths=0.5)
+    ax.add_collection(rooms)
+    
+    # Add labels
+    sizes = floor_geometry.rects[:, 2:] - floor_geometry.rects[:, :2]
+    for (x, y), (w, h), hazard in zip(floor_geometry.centers, sizes, hazards):
+        if w > 10 and h > 10:
+            ax.text(x, y, f"{hazard:.2f}", ha='center', va='center', fontsize=8)
+    
+    ax.autoscale_view()
+    ax.set_aspect('equal')
+    ax.set_title(f'Floor {floor_geometry.floor + 1}')
+    ax.set_xlabel('X (m)')
+    ax.set_ylabel('Y (m)')
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
 
 
 class ChartGenerator:
@@ -23,13 +65,13 @@ class ChartGenerator:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    def generate_summary_charts(self, events: List[SimulationEvent], 
+    def generate_summary_charts(self, events: Union[EventTable, List[SimulationEvent]], 
                                results: dict, filename: str = "summary.png"):
         """
         Generate comprehensive summary chart
         
         Args:
-            events: List of simulation events
+            events: EventTable, or list of simulation events
             results: Results dictionary
             filename: Output filename
         """
@@ -37,15 +79,14 @@ class ChartGenerator:
         fig, axes = plt.subplots(2, 2, figsize=(14, 10))
         fig.suptitle('Simulation Summary', fontsize=16, fontweight='bold')
         
-        # Convert events to DataFrame
-        df = self._events_to_dataframe(events)
+        table = events if isinstance(events, EventTable) else EventTable.from_events(events)
+        df = table.to_dataframe()
+        progress = self._cumulative_counts(df, [EventType.ROOM_CLEARED, EventType.EVACUEE_RESCUED])
         
         # 1. Cumulative rooms cleared over time
         ax1 = axes[0, 0]
-        cleared_events = df[df['event_type'] == 'room_cleared']
-        if not cleared_events.empty:
-            cleared_times = cleared_events['time'].values
-            cleared_counts = range(1, len(cleared_times) + 1)
+        cleared_times, cleared_counts = progress[EventType.ROOM_CLEARED]
+        if len(cleared_times):
             ax1.plot(cleared_times, cleared_counts, 'g-', linewidth=2, label='Rooms Cleared')
             ax1.axhline(y=results['total_rooms'], color='gray', linestyle='--', 
                        label='Total Rooms')
@@ -57,10 +98,8 @@ class ChartGenerator:
         
         # 2. Cumulative evacuees rescued over time
         ax2 = axes[0, 1]
-        rescued_events = df[df['event_type'] == 'evacuee_rescued']
-        if not rescued_events.empty:
-            rescued_times = rescued_events['time'].values
-            rescued_counts = range(1, len(rescued_times) + 1)
+        rescued_times, rescued_counts = progress[EventType.EVACUEE_RESCUED]
+        if len(rescued_times):
             ax2.plot(rescued_times, rescued_counts, 'r-', linewidth=2, label='Rescued')
             ax2.axhline(y=results['total_evacuees'], color='gray', linestyle='--',
                        label='Total Evacuees')
@@ -70,21 +109,10 @@ class ChartGenerator:
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         
-        # 3. Agent activity timeline
+        # 3. Agent activity - event counts per agent
         ax3 = axes[1, 0]
-        agent_events = df[df['agent_id'].notna()]
-        if not agent_events.empty:
-            for agent_id in agent_events['agent_id'].unique():
-                agent_df = agent_events[agent_events['agent_id'] == agent_id]
-                event_types = agent_df['event_type'].values
-                times = agent_df['time'].values
-                
-                # Count events by type over time bins
-                bins = range(0, int(max(times)) + 10, 10)
-                hist, _ = pd.cut(times, bins=bins, retbins=True)
-                
-            # Simplified: show event counts per agent
-            event_counts = agent_events.groupby('agent_id').size()
+        event_counts = df.loc[df['agent'] >= 0].groupby('agent').size()
+        if not event_counts.empty:
             ax3.bar(event_counts.index, event_counts.values, color='steelblue')
             ax3.set_xlabel('Agent ID')
             ax3.set_ylabel('Total Events')
@@ -112,77 +140,76 @@ class ChartGenerator:
             ax4.text(bar.get_x() + bar.get_width()/2., height,
                     f'{height:.1f}', ha='center', va='bottom')
         
+        # tight_layout already fits the labels; bbox_inches='tight' would
+        # cost another full draw of the figure
         plt.tight_layout()
         
         output_path = self.output_dir / filename
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
+        plt.savefig(output_path, dpi=150)
         plt.close()
         
         print(f"Summary charts saved to {output_path}")
     
-    def generate_hazard_heatmap(self, env, filename: str = "hazard_final.png"):
+    def generate_hazard_heatmap(self, env, filename: str = "hazard_final.png",
+                                geometry: Optional[LayoutGeometry] = None,
+                                workers: Optional[int] = None):
         """
         Generate final hazard distribution heatmap
         
+        Each floor is drawn as a separate panel - in its own worker process
+        when there are several floors - and the panels are placed side by
+        side under a shared title.
+        
         Args:
             env: Environment with final hazard state
             filename: Output filename
+            geometry: Precomputed floor geometry (built from env if None)
+            workers: Worker processes for multi-floor layouts (default: one per floor)
         """
-        fig, axes = plt.subplots(1, len(env.floors), figsize=(6 * len(env.floors), 5))
-        
-        if len(env.floors) == 1:
-            axes = [axes]
-        
-        fig.suptitle('Final Hazard Distribution by Floor', fontsize=14, fontweight='bold')
-        
-        for idx, (floor, room_ids) in enumerate(sorted(env.floors.items())):
-            ax = axes[idx]
-            
-            # Get room positions and hazards
-            rooms = [env.rooms[rid] for rid in room_ids]
-            
-            for room in rooms:
-                x1, y1 = room.x1, room.y1
-                w, h = room.width, room.height
-                
-                # Color by hazard level
-                color = plt.cm.YlOrRd(room.hazard)
-                rect = plt.Rectangle((x1, y1), w, h, facecolor=color, 
-                                   edgecolor='black', linewidth=0.5)
-                ax.add_patch(rect)
-                
-                # Add label
-                if w > 10 and h > 10:
-                    ax.text(room.x, room.y, f"{room.hazard:.2f}", 
-                           ha='center', va='center', fontsize=8)
-            
-            ax.set_aspect('equal')
-            ax.set_title(f'Floor {floor + 1}')
-            ax.set_xlabel('X (m)')
-            ax.set_ylabel('Y (m)')
-            ax.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
+        geometry = geometry or LayoutGeometry(env)
+        floors = [geometry.floor(f) for f in sorted(geometry.floors)]
+        if not floors:
+            return
+        hazards = [np.array([env.rooms[room_id].hazard for room_id in fg.room_ids], dtype=float)
+                   for fg in floors]
+        
+        if len(floors) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=min(len(floors), workers or len(floors))) as pool:
+                panels = list(pool.map(_render_floor_panel, floors, hazards))
+        else:
+            panels = [_render_floor_panel(fg, h) for fg, h in zip(floors, hazards)]
+        
+        width_in = HEATMAP_PANEL_SIZE[0] * len(floors)
+        title_fig = Figure(figsize=(width_in, 0.5), dpi=HEATMAP_DPI)
+        title_canvas = FigureCanvasAgg(title_fig)
+        title_fig.text(0.5, 0.5, 'Final Hazard Distribution by Floor', ha='center', va='center',
+                       fontsize=14, fontweight='bold')
+        title_canvas.draw()
+        title = np.asarray(title_canvas.buffer_rgba())
         
         output_path = self.output_dir / filename
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        plt.imsave(output_path, np.vstack([title, np.hstack(panels)]), dpi=HEATMAP_DPI)
         
         print(f"Hazard heatmap saved to {output_path}")
     
-    def _events_to_dataframe(self, events: List[SimulationEvent]) -> pd.DataFrame:
-        """Convert events list to pandas DataFrame"""
-        data = []
-        for event in events:
-            row = {
-                'tick': event.tick,
-                'time': event.time,
-                'event_type': event.event_type.value,
-                'agent_id': event.agent_id,
-                'room_id': event.room_id
-            }
-            row.update(event.data)
-            data.append(row)
-        
-        return pd.DataFrame(data)
-
+    def _cumulative_counts(self, df: pd.DataFrame, 
+                           event_types: List[EventType]) -> Dict[EventType, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Running count of each event type over time, in one groupby pass
+        
+        Args:
+            df: EventTable.to_dataframe() output
+            event_types: Types to count
+            
+        Returns:
+            Dict of event type -> (times, cumulative counts)
+        """
+        codes = [EventTable.TYPE_CODES[t] for t in event_types]
+        selected = df.loc[df['type'].isin(codes), ['type', 'time']]
+        counts = selected.assign(n=1).groupby('type')['n'].cumsum()
+        
+        series = {}
+        for event_type, code in zip(event_types, codes):
+            rows = (selected['type'] == code).to_numpy()
+            series[event_type] = (selected['time'].to_numpy()[rows], counts.to_numpy()[rows])
+        return series
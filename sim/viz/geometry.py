@@ -0,0 +1,210 @@
+"""Static per-floor geometry shared by the renderers"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class ScreenTransform(NamedTuple):
+    """World metres -> screen pixels: screen = offset + world * scale"""
+    scale: float
+    offset_x: float
+    offset_y: float
+
+    def to_screen(self, x: float, y: float) -> Tuple[int, int]:
+        """Screen position of a world point"""
+        return int(self.offset_x + x * self.scale), int(self.offset_y + y * self.scale)
+
+    def rects_to_screen(self, rects: np.ndarray) -> np.ndarray:
+        """(N, 4) world x1, y1, x2, y2 -> (N, 4) integer screen x, y, w, h"""
+        x1 = (self.offset_x + rects[:, 0] * self.scale).astype(int)
+        y1 = (self.offset_y + rects[:, 1] * self.scale).astype(int)
+        x2 = (self.offset_x + rects[:, 2] * self.scale).astype(int)
+        y2 = (self.offset_y + rects[:, 3] * self.scale).astype(int)
+        return np.stack([x1, y1, x2 - x1, y2 - y1], axis=1)
+
+    def points_to_screen(self, points: np.ndarray) -> np.ndarray:
+        """(N, 2) world points -> (N, 2) integer screen points"""
+        return np.stack([(self.offset_x + points[:, 0] * self.scale).astype(int),
+                         (self.offset_y + points[:, 1] * self.scale).astype(int)], axis=1)
+
+
+def rect_vertices(rects: np.ndarray) -> np.ndarray:
+    """(N, 4) x1, y1, x2, y2 -> (N, 4, 2) corner vertices"""
+    x1, y1, x2, y2 = rects.T
+    return np.stack([np.stack([x1, y1], 1), np.stack([x2, y1], 1),
+                     np.stack([x2, y2], 1), np.stack([x1, y2], 1)], axis=1)
+
+
+class FloorGeometry:
+    """
+    Everything about one floor that does not change during a run
+
+    Room rectangles and centres are arrays in `room_ids` order; walls are
+    0.5m cells (lower-left corners) with gaps left for doors, as drawn by
+    WallRenderer. Screen transforms are cached per target rect and zoom.
+    """
+
+    def __init__(self, floor: int, rooms: list, layout: Optional[dict],
+                 bounds: Optional[tuple], grid_resolution: float = 0.5):
+        """
+        Initialize floor geometry
+
+        Args:
+            floor: Floor number
+            rooms: Room objects on this floor
+            layout: Layout dict (source of walls and doors), or None
+            bounds: (x_min, y_min, x_max, y_max) of the floor, or None
+            grid_resolution: Wall cell size in metres
+        """
+        self.floor = floor
+        self.bounds = tuple(bounds) if bounds is not None else None
+        self.grid_resolution = grid_resolution
+
+        self.room_ids: List[str] = [room.id for room in rooms]
+        self.room_index: Dict[str, int] = {room_id: i for i, room_id in enumerate(self.room_ids)}
+        self.rects = np.array([(r.x1, r.y1, r.x2, r.y2) for r in rooms], dtype=float).reshape(-1, 4)
+        self.centers = np.array([(r.x, r.y) for r in rooms], dtype=float).reshape(-1, 2)
+        self.is_exit = np.array([r.is_exit for r in rooms], dtype=bool)
+        self.is_stair = np.array([r.is_stair for r in rooms], dtype=bool)
+        self.types: List[Optional[str]] = [getattr(r, 'type', None) for r in rooms]
+
+        self.wall_cells, self.doors = build_walls(layout or {}, floor, grid_resolution)
+
+        self._transforms: Dict[tuple, Tuple[ScreenTransform, np.ndarray, np.ndarray]] = {}
+
+    @property
+    def room_vertices(self) -> np.ndarray:
+        """(rooms, 4, 2) room corner vertices"""
+        return rect_vertices(self.rects)
+
+    @property
+    def wall_vertices(self) -> np.ndarray:
+        """(cells, 4, 2) wall cell corner vertices"""
+        res = self.grid_resolution
+        return rect_vertices(np.concatenate([self.wall_cells, self.wall_cells + res], axis=1))
+
+    def fit(self, rect: Tuple[int, int, int, int], zoom: float = 1.0):
+        """
+        Transform fitting the floor into a screen rect, with room rects/centres in pixels
+
+        Args:
+            rect: Target (x, y, width, height) in pixels
+            zoom: Extra zoom factor
+
+        Returns:
+            (ScreenTransform, (rooms, 4) screen x/y/w/h, (rooms, 2) screen centres)
+        """
+        key = (tuple(rect), zoom)
+        cached = self._transforms.get(key)
+        if cached is not None:
+            return cached
+
+        x_min, y_min, x_max, y_max = self.bounds
+        rx, ry, rw, rh = rect
+        world_width = x_max - x_min
+        world_height = y_max - y_min
+        scale_x = rw / world_width if world_width > 0 else 1
+        scale_y = rh / world_height if world_height > 0 else 1
+        scale = min(scale_x, scale_y) * 0.9 * zoom
+
+        transform = ScreenTransform(scale,
+                                    rx + rw / 2 - (x_min + x_max) / 2 * scale,
+                                    ry + rh / 2 - (y_min + y_max) / 2 * scale)
+        cached = (transform, transform.rects_to_screen(self.rects),
+                  transform.points_to_screen(self.centers))
+        self._transforms[key] = cached
+        return cached
+
+
+class LayoutGeometry:
+    """FloorGeometry for every floor of an environment, built once per layout"""
+
+    def __init__(self, env, grid_resolution: float = 0.5):
+        """
+        Initialize from an environment (or FrameSnapshot)
+
+        Args:
+            env: Source of rooms, floors, bounds and layout
+            grid_resolution: Wall cell size in metres
+        """
+        layout = getattr(env, 'layout', None)
+        self.floors: Dict[int, FloorGeometry] = {
+            floor: FloorGeometry(floor, [env.rooms[room_id] for room_id in room_ids],
+                                 layout, env.bounds.get(floor), grid_resolution)
+            for floor, room_ids in env.floors.items()
+        }
+
+    def floor(self, floor: int) -> Optional[FloorGeometry]:
+        """Geometry of one floor (None if the floor does not exist)"""
+        return self.floors.get(floor)
+
+
+def _wall_line(start: float, end: float, res: float) -> np.ndarray:
+    """Cell start positions covering [start, end) in steps of res"""
+    return start + np.arange(max(0, int(np.ceil((end - start) / res - 1e-9)))) * res
+
+
+def build_walls(layout: dict, floor: int, res: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Wall cells and door gaps of one floor
+
+    Offices get walls on all four sides; the side facing a connected
+    hallway gets a 1.5m door gap in the middle. Hallways and exits have no
+    walls.
+
+    Returns:
+        ((cells, 2) lower-left corners of wall cells,
+         (doors, 4) door gap segments x1, y1, x2, y2)
+    """
+    rooms = {r['id']: r for r in layout.get('rooms', []) if r.get('floor', 0) == floor}
+    door_width_cells = 3  # 1.5m door = 3 cells of 0.5m
+
+    cells = []
+    doors = []
+
+    def horizontal(x_start, x_end, y):
+        xs = _wall_line(x_start, x_end, res)
+        cells.append(np.stack([xs, np.full_like(xs, y - res / 2)], axis=1))
+
+    def vertical(x, y_start, y_end):
+        ys = _wall_line(y_start, y_end, res)
+        cells.append(np.stack([np.full_like(ys, x - res / 2), ys], axis=1))
+
+    for room_id, room in rooms.items():
+        if room.get('type', 'office') == 'hallway' or room.get('is_exit'):
+            continue
+
+        x_center, y_center = room['x'], room['y']
+        w, h = room['width'], room['height']
+        x1, y1 = x_center - w / 2, y_center - h / 2
+        x2, y2 = x_center + w / 2, y_center + h / 2
+
+        # Door location (which wall faces the hallway)
+        door_on_top = False
+        door_on_bottom = False
+        for conn in layout.get('connections', []):
+            if room_id in [conn['from'], conn['to']]:
+                other = conn['to'] if conn['from'] == room_id else conn['from']
+                other_room = rooms.get(other)
+                if other_room and other_room.get('type') == 'hallway':
+                    if other_room['y'] < y_center:
+                        door_on_top = True
+                    else:
+                        door_on_bottom = True
+
+        door_start = x_center - door_width_cells * res / 2
+        door_end = x_center + door_width_cells * res / 2
+        for y, has_door in ((y1, door_on_top), (y2, door_on_bottom)):
+            if has_door:
+                horizontal(x1, door_start, y)
+                horizontal(door_end, x2, y)
+                doors.append((door_start, y, door_end, y))
+            else:
+                horizontal(x1, x2, y)
+
+        vertical(x1, y1, y2)
+        vertical(x2, y1, y2)
+
+    wall_cells = np.concatenate(cells) if cells else np.empty((0, 2))
+    return wall_cells, np.array(doors, dtype=float).reshape(-1, 4)
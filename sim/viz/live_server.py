@@ -0,0 +1,431 @@
+"""Live view over HTTP - binary delta frames for a browser viewer
+
+Headless runs can be watched from a browser: the simulation thread encodes
+compact delta frames, and an asyncio HTTP server (stdlib only, run on its
+own thread) hands them to viewers via long-polling.
+
+Endpoints:
+    GET /                  Minimal canvas viewer
+    GET /layout            Static geometry as JSON (rooms, hazard cells, event types)
+    GET /frames?after=SEQ  Frames newer than SEQ, blocking until one exists
+
+Frame format (little-endian), each frame prefixed by its u32 byte length:
+    header   4s magic 'EVF1', u32 seq, u32 tick, f32 time, u8 flags
+             (1 = keyframe, 2 = complete), u16 agents, u32 cells, u16 events
+    agents   u16 id, u8 floor, u8 status (0 active, 1 escaping, 2 escaped,
+             3 dead), f32 x, f32 y
+    cells    u32 index[cells] then u8 value[cells]; value bit 7 = burning,
+             bits 0-6 = danger * 127
+    events   u8 type, i16 agent (-1 = none), i16 room (-1 = none)
+
+Only cells whose quantised value changed since the previous frame are sent,
+and frames are produced at most `max_fps` times per second of wall time, so
+bandwidth stays bounded however fast the simulation runs. Viewers that fall
+behind the frame history get a keyframe instead.
+"""
+
+import asyncio
+import json
+import struct
+import threading
+import time
+from collections import deque
+from typing import List, NamedTuple, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from ..agents.agent import AgentState
+from ..engine.simulator import SimulationEvent, EventType
+
+MAGIC = b'EVF1'
+HEADER = struct.Struct('<4sIIfBHIH')
+FLAG_KEYFRAME = 1
+FLAG_COMPLETE = 2
+AGENT_DTYPE = np.dtype([('id', '<u2'), ('floor', 'u1'), ('status', 'u1'),
+                        ('x', '<f4'), ('y', '<f4')])
+EVENT_DTYPE = np.dtype([('type', 'u1'), ('agent', '<i2'), ('room', '<i2')])
+EVENT_TYPES = list(EventType)
+
+
+class _PublishedState(NamedTuple):
+    """Full state as of the last frame, used to build keyframes"""
+    seq: int
+    tick: int
+    time: float
+    complete: bool
+    agents: bytes
+    cells: np.ndarray
+
+
+def _pack_frame(seq: int, tick: int, sim_time: float, flags: int, agents: bytes,
+                n_agents: int, indices: np.ndarray, values: np.ndarray, events: bytes,
+                n_events: int) -> bytes:
+    """Serialise one frame, length-prefixed"""
+    body = b''.join([
+        HEADER.pack(MAGIC, seq, tick, sim_time, flags, n_agents, len(indices), n_events),
+        agents,
+        indices.astype('<u4').tobytes(),
+        values.astype('u1').tobytes(),
+        events,
+    ])
+    return struct.pack('<I', len(body)) + body
+
+
+class LiveViewServer:
+    """
+    Streams a running Simulator to browsers as delta frames
+
+    Call publish() after every Simulator.step (or use run()); events are
+    collected through Simulator.add_event_callback. The HTTP server runs on
+    a background thread started by start().
+    """
+
+    def __init__(self, simulator, host: str = '127.0.0.1', port: int = 8765,
+                 max_fps: float = 10.0, history: int = 64):
+        """
+        Initialize server
+
+        Args:
+            simulator: Simulator to stream
+            host: Interface to bind (localhost by default)
+            port: TCP port (0 = pick a free one)
+            max_fps: Maximum frames produced per second of wall time
+            history: Frames kept for viewers to catch up from
+        """
+        self.sim = simulator
+        self.host = host
+        self.port = port
+        self.max_fps = max_fps
+
+        env = simulator.env
+        self.room_ids = list(env.rooms.keys())
+        self._room_index = {room_id: i for i, room_id in enumerate(self.room_ids)}
+        cells = getattr(env.hazard_system, 'cells', {})
+        self._cell_keys = list(cells.keys())
+        self._layout_json = self._build_layout_json()
+
+        self._cells = np.zeros(len(self._cell_keys), dtype=np.uint8)
+        self._pending_events: List[tuple] = []
+        self._seq = 0
+        self._last_publish = 0.0
+        self._frames: deque = deque(maxlen=history)  # (seq, bytes)
+        self._state: Optional[_PublishedState] = None
+        self._lock = threading.Lock()
+
+        self.bytes_published = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._new_frame: Optional[asyncio.Event] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+        simulator.add_event_callback(self._on_event)
+
+    def _build_layout_json(self) -> bytes:
+        """Static geometry sent once per viewer"""
+        env = self.sim.env
+        rooms = [
+            {'id': r.id, 'floor': r.floor, 'x1': r.x1, 'y1': r.y1, 'x2': r.x2, 'y2': r.y2,
+             'is_exit': r.is_exit, 'is_stair': r.is_stair}
+            for r in (env.rooms[room_id] for room_id in self.room_ids)
+        ]
+        cells = getattr(env.hazard_system, 'cells', {})
+        cell_floor = [env.rooms[cells[k].room_id].floor if cells[k].room_id in env.rooms else -1
+                      for k in self._cell_keys]
+        return json.dumps({
+            'rooms': rooms,
+            'bounds': {str(f): b for f, b in env.bounds.items()},
+            'cell_xy': [round(v, 3) for xy in self._cell_keys for v in xy],
+            'cell_floor': cell_floor,
+            'cell_size': self.sim.params.get('hazard', {}).get('grid_resolution', 0.5),
+            'event_types': [t.value for t in EVENT_TYPES],
+        }).encode()
+
+    def _on_event(self, event: SimulationEvent):
+        """Queue an event for the next frame"""
+        with self._lock:
+            self._pending_events.append((
+                EVENT_TYPES.index(event.event_type),
+                -1 if event.agent_id is None else event.agent_id,
+                self._room_index.get(event.room_id, -1),
+            ))
+
+    def _agent_blob(self) -> bytes:
+        """Current agent records"""
+        agents = self.sim.agent_manager.agents
+        records = np.zeros(len(agents), dtype=AGENT_DTYPE)
+        for i, a in enumerate(agents):
+            status = (3 if a.is_dead else 2 if a.escaped
+                      else 1 if a.state == AgentState.ESCAPING else 0)
+            records[i] = (a.id, a.floor, status, a.x, a.y)
+        return records.tobytes()
+
+    def _quantise_cells(self) -> np.ndarray:
+        """Hazard cells as u8 (bit 7 burning, bits 0-6 danger)"""
+        cells = self.sim.env.hazard_system.cells if self._cell_keys else {}
+        frame_cells = [cells[k] for k in self._cell_keys]
+        n = len(frame_cells)
+        danger = np.fromiter((c.danger_level for c in frame_cells), dtype=np.float32, count=n)
+        burning = np.fromiter((c.is_burning for c in frame_cells), dtype=bool, count=n)
+        values = (np.clip(danger, 0.0, 1.0) * 127).round().astype(np.uint8)
+        values[burning] |= 0x80
+        return values
+
+    def publish(self, force: bool = False) -> bool:
+        """
+        Encode a delta frame of the current tick, unless rate limited
+
+        Args:
+            force: Ignore the rate limit (e.g. final frame)
+
+        Returns:
+            True if a frame was produced
+        """
+        sim = self.sim
+        now = time.perf_counter()
+        if not force and not sim.complete and now - self._last_publish < 1.0 / self.max_fps:
+            return False
+        self._last_publish = now
+
+        cells = self._quantise_cells()
+        changed = np.flatnonzero(cells != self._cells)
+        agents = self._agent_blob()
+        n_agents = len(sim.agent_manager.agents)
+
+        with self._lock:
+            events, self._pending_events = self._pending_events, []
+            self._seq += 1
+            seq = self._seq
+            flags = FLAG_COMPLETE if sim.complete else 0
+            frame = _pack_frame(seq, sim.tick, sim.time, flags, agents, n_agents,
+                                changed, cells[changed],
+                                np.array(events, dtype=EVENT_DTYPE).tobytes(), len(events))
+            self._frames.append((seq, frame))
+            self._state = _PublishedState(seq, sim.tick, sim.time, sim.complete, agents, cells)
+            self.bytes_published += len(frame)
+        self._cells = cells
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake_viewers)
+        return True
+
+    def _keyframe(self) -> Optional[bytes]:
+        """Full frame of the last published state"""
+        state = self._state
+        if state is None:
+            return None
+        flags = FLAG_KEYFRAME | (FLAG_COMPLETE if state.complete else 0)
+        indices = np.arange(len(state.cells))
+        return _pack_frame(state.seq, state.tick, state.time, flags, state.agents,
+                           len(state.agents) // AGENT_DTYPE.itemsize, indices, state.cells,
+                           b'', 0)
+
+    def frames_after(self, seq: int) -> bytes:
+        """Frames newer than seq; a keyframe when seq fell out of the history"""
+        with self._lock:
+            frames = list(self._frames)
+            if not frames or frames[-1][0] <= seq:
+                return b''
+            if seq < frames[0][0] - 1:
+                return self._keyframe()
+            return b''.join(frame for frame_seq, frame in frames if frame_seq > seq)
+
+    def run(self, tick_rate: Optional[float] = None, max_ticks: Optional[int] = None,
+            fire_enabled: bool = True) -> dict:
+        """
+        Run the simulation to completion while publishing frames
+
+        Args:
+            tick_rate: Ticks per second of wall time (None = as fast as possible)
+            max_ticks: Maximum ticks (None = use time_cap)
+            fire_enabled: Passed to Simulator.step
+
+        Returns:
+            Simulator results
+        """
+        sim = self.sim
+        sim.running = True
+        if max_ticks is None:
+            max_ticks = int(sim.time_cap / sim.dt) + 1
+
+        start = time.perf_counter()
+        self.publish(force=True)
+        while sim.running and sim.tick < max_ticks:
+            sim.step(fire_enabled=fire_enabled)
+            self.publish()
+            if tick_rate:
+                delay = start + sim.tick / tick_rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        self.publish(force=True)
+        sim.close()
+
+        return sim.get_results()
+
+    # --- HTTP side (runs on the server thread) ---
+
+    def start(self):
+        """Start the HTTP server on a background thread"""
+        self._thread = threading.Thread(target=self._serve, name='live-view', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        print(f"Live view at http://{self.host}:{self.port}/")
+
+    def stop(self):
+        """Stop the HTTP server"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _serve(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._new_frame = asyncio.Event()
+        self._server = loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+    def _wake_viewers(self):
+        """Release every waiting long-poll request"""
+        self._new_frame.set()
+        self._new_frame = asyncio.Event()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass  # Headers are not needed
+            parts = request_line.decode('latin-1').split()
+            url = urlparse(parts[1] if len(parts) > 1 else '/')
+
+            if url.path == '/':
+                await self._respond(writer, VIEWER_HTML.encode(), 'text/html; charset=utf-8')
+            elif url.path == '/layout':
+                await self._respond(writer, self._layout_json, 'application/json')
+            elif url.path == '/frames':
+                after = int(parse_qs(url.query).get('after', ['0'])[0])
+                body = self.frames_after(after)
+                if not body:
+                    waiter = self._new_frame
+                    try:
+                        await asyncio.wait_for(waiter.wait(), timeout=25.0)
+                    except asyncio.TimeoutError:
+                        pass
+                    body = self.frames_after(after)
+                await self._respond(writer, body, 'application/octet-stream')
+            else:
+                await self._respond(writer, b'not found', 'text/plain', status='404 Not Found')
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, body: bytes, content_type: str,
+                       status: str = '200 OK'):
+        writer.write((f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n'
+                      f'Content-Length: {len(body)}\r\nCache-Control: no-store\r\n'
+                      f'Connection: close\r\n\r\n').encode() + body)
+        await writer.drain()
+
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Evacuation live view</title>
+<style>body{margin:0;font:13px sans-serif;background:#fafafa}#info{padding:6px 10px}
+canvas{display:block;margin:0 10px;background:#fff;border:1px solid #ddd}</style></head>
+<body><div id="info">connecting...
+ <select id="floor"></select></div><canvas id="map" width="1200" height="720"></canvas>
+<script>
+const AGENT_COLORS = ['#1976D2', '#F57C00', '#7B1FA2', '#00897B', '#C62828', '#5E35B1'];
+let layout, cells, agents = [], tick = 0, simTime = 0, seq = 0, complete = false, log = [];
+const canvas = document.getElementById('map'), ctx = canvas.getContext('2d');
+const floorSelect = document.getElementById('floor');
+
+function applyFrames(buf) {
+  const view = new DataView(buf);
+  let off = 0;
+  while (off < buf.byteLength) {
+    const len = view.getUint32(off, true); off += 4;
+    let p = off + 4;
+    seq = view.getUint32(p, true); tick = view.getUint32(p + 4, true);
+    simTime = view.getFloat32(p + 8, true);
+    const flags = view.getUint8(p + 12), nAgents = view.getUint16(p + 13, true);
+    const nCells = view.getUint32(p + 15, true), nEvents = view.getUint16(p + 19, true);
+    p += 21;
+    complete = (flags & 2) !== 0;
+    agents = [];
+    for (let i = 0; i < nAgents; i++, p += 12)
+      agents.push({id: view.getUint16(p, true), floor: view.getUint8(p + 2),
+                   status: view.getUint8(p + 3), x: view.getFloat32(p + 4, true),
+                   y: view.getFloat32(p + 8, true)});
+    const idx = p; p += 4 * nCells;
+    for (let i = 0; i < nCells; i++) cells[view.getUint32(idx + 4 * i, true)] = view.getUint8(p + i);
+    p += nCells;
+    for (let i = 0; i < nEvents; i++, p += 5) {
+      const room = view.getInt16(p + 3, true);
+      log.unshift(`t=${simTime.toFixed(0)}s ${layout.event_types[view.getUint8(p)]}` +
+                  (room >= 0 ? ' ' + layout.rooms[room].id : ''));
+    }
+    log.length = Math.min(log.length, 8);
+    off += len;
+  }
+}
+
+function draw() {
+  const floor = floorSelect.value, b = layout.bounds[floor];
+  if (!b) return;
+  const s = Math.min(canvas.width / (b[2] - b[0]), canvas.height / (b[3] - b[1])) * 0.95;
+  const X = x => (x - b[0]) * s + 10, Y = y => (y - b[1]) * s + 10;
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  const cs = layout.cell_size * s;
+  for (let i = 0; i < cells.length; i++) {
+    const v = cells[i];
+    if (!v || layout.cell_floor[i] != floor) continue;
+    const d = (v & 127) / 127;
+    ctx.fillStyle = (v & 128) ? 'rgb(255,0,0)' : `rgba(255,${Math.round(255 * (1 - d))},0,${0.3 + d * 0.6})`;
+    ctx.fillRect(X(layout.cell_xy[2 * i]) - cs / 2, Y(layout.cell_xy[2 * i + 1]) - cs / 2, cs, cs);
+  }
+  ctx.strokeStyle = '#37474F';
+  for (const r of layout.rooms) {
+    if (r.floor != floor) continue;
+    ctx.strokeRect(X(r.x1), Y(r.y1), (r.x2 - r.x1) * s, (r.y2 - r.y1) * s);
+  }
+  for (const a of agents) {
+    if (a.floor != floor) continue;
+    ctx.fillStyle = a.status === 3 ? '#212121' : AGENT_COLORS[a.id % AGENT_COLORS.length];
+    ctx.beginPath(); ctx.arc(X(a.x), Y(a.y), 6, 0, 2 * Math.PI); ctx.fill();
+  }
+  document.getElementById('info').firstChild.textContent =
+    `tick ${tick}  t=${simTime.toFixed(1)}s${complete ? '  (complete)' : ''}  |  ${log[0] || ''} `;
+}
+
+async function poll() {
+  while (true) {
+    try {
+      const res = await fetch('/frames?after=' + seq);
+      const buf = await res.arrayBuffer();
+      if (buf.byteLength) { applyFrames(buf); draw(); }
+      if (complete) break;
+    } catch (e) { await new Promise(r => setTimeout(r, 1000)); }
+  }
+}
+
+fetch('/layout').then(r => r.json()).then(l => {
+  layout = l;
+  cells = new Uint8Array(l.cell_floor.length);
+  for (const f of Object.keys(l.bounds)) floorSelect.add(new Option('Floor ' + (+f + 1), f));
+  floorSelect.onchange = draw;
+  poll();
+});
+</script></body></html>
+"""
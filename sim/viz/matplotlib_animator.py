@@ -1,17 +1,25 @@
 """Matplotlib-based animation for the simulation - Modern UI"""
 
+import os
 import matplotlib
-matplotlib.use('TkAgg')  # Use interactive backend
+if 'MPLBACKEND' not in os.environ:
+    matplotlib.use('TkAgg')  # Use interactive backend
 
 # Suppress all warnings to prevent animation freeze
+import math
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.animation import FuncAnimation
+from matplotlib.backend_bases import ResizeEvent
+from matplotlib.collections import EllipseCollection, PatchCollection, PolyCollection
 import numpy as np
+from collections import deque
 from typing import Optional
+from .geometry import LayoutGeometry
 from .wall_renderer import WallRenderer
 
 # Modern corporate styling - Clean sans-serif
@@ -104,29 +112,58 @@ class MatplotlibAnimator:
         # Initialize artists
         self.room_patches = {}
         self.room_labels = []
-        self.priority_labels = []
-        self.cell_heatmap_patches = []
-        self.agent_dots = []
-        self.occupant_dots = []
-        self.agent_trails = []
-        self.persistent_trails = []  # Never cleared - shows full path
+        self.priority_labels = {}  # room_id -> Text, updated in place
+        self.heatmap_mesh = None
+        self.heatmap_glow = None
+        self._heatmap_keys = None
+        self._heatmap_floor = None
+        self._heatmap_cell_count = 0
+        self._priority_cache = {}
+        self._priority_cache_tick = None
+        self.agent_artists = {}  # agent_id -> dict of artists, updated in place
+        self.occupant_glows = None
+        self.occupant_bodies = None
         self.grid_lines = []
         
+        # Level of detail (D key): draw every k-th tick to hold the target
+        # FPS, hide labels/trails when zoomed out, coarsen the hazard grid
+        viz_params = self.sim.params.get('visualization', {})
+        self.lod_enabled = viz_params.get('lod', False)
+        self.lod_min_label_px = viz_params.get('lod_min_label_px', 8.0)  # px per metre
+        self.lod_min_cell_px = viz_params.get('lod_min_cell_px', 3.0)
+        self.verbose = viz_params.get('verbose', False)  # Periodic fire stats on stdout
+        self.ticks_per_frame = 1
+        self._frame_interval = 1.0 / self.fps
+        self._last_frame_time = None
+        self._show_details = True
+        self._heatmap_factor = 1
+        self._tps_ticks = 0
+        self._tps_start = time.perf_counter()
+        self.sim_ticks_per_sec = 0.0
+        
+        # Room rects, walls and doors per floor - computed once per layout
+        self.geometry = LayoutGeometry(self.sim.env, self.grid_resolution)
+        
         self._update_bounds()
         self._draw_cell_heatmap()  # Draw cell-level danger heatmap
         self._draw_rooms()
         
         # Draw walls with door openings
         layout_dict = self.sim.env.layout
-        self.wall_renderer = WallRenderer(self.ax, layout_dict, self.current_floor)
+        self.wall_renderer = WallRenderer(self.ax, layout_dict, self.current_floor,
+                                          self.grid_resolution, geometry=self.geometry)
         self.wall_renderer.draw_walls()
         
         # Legends removed - cleaner UI
         
         # Agent trail history
         self.trail_length = 30
-        self.agent_positions = {i: [] for i in range(len(self.sim.agent_manager.agents))}
-        self.full_agent_positions = {i: [] for i in range(len(self.sim.agent_manager.agents))}  # Never cleared
+        self.agent_positions = {i: deque(maxlen=self.trail_length)
+                                for i in range(len(self.sim.agent_manager.agents))}
+        # Never cleared - shows full path. Growable (N, 2) buffers + fill counts
+        self.full_agent_positions = {i: np.empty((256, 2))
+                                     for i in range(len(self.sim.agent_manager.agents))}
+        self.full_agent_counts = {i: 0 for i in range(len(self.sim.agent_manager.agents))}
         
         # Modern info panel - lower position to avoid title overlap
         info_bbox = dict(boxstyle='round,pad=0.8', facecolor=self.COLORS['white'], 
@@ -264,131 +301,187 @@ class MatplotlibAnimator:
                             patch.set_fill(False)
                             patch.set_alpha(1.0)
     
-    def _draw_cell_heatmap(self):
-        """Draw cell-level danger heatmap (white = safe, RED = FIRE!)"""
-        # Clear previous heatmap
-        for patch in self.cell_heatmap_patches:
-            patch.remove()
-        self.cell_heatmap_patches = []
-        
-        # Get cells from grid hazard system
-        if hasattr(self.sim.env.hazard_system, 'cells'):
-            cells = self.sim.env.hazard_system.cells
-            
-            # Get rooms with priority = 0 for LIGHT GREEN cells (using stable reference)
-            zero_priority_rooms = set()
+    def _office_priorities(self):
+        """Priority index of every office, computed once per tick and shared"""
+        if self._priority_cache_tick != self.sim.tick:
+            priorities = {}
             if self.sim.env.exits:
+                # Stable reference point (first exit)
                 reference_room = self.sim.env.exits[0]
                 for room_id, room in self.sim.env.rooms.items():
                     if hasattr(room, 'type') and room.type == 'office':
-                        priority = self.sim.decision_engine.calculate_priority_index(
+                        priorities[room_id] = self.sim.decision_engine.calculate_priority_index(
                             room_id, reference_room
                         )
-                        if priority == 0.0:
-                            zero_priority_rooms.add(room_id)
-            
-            # Debug: Print fire info
-            burning = sum(1 for c in cells.values() if c.is_burning)
-            drawn_count = 0
-            
-            for (x, y), cell in cells.items():
-                # Check if cell is on current floor
-                room_at_cell = self.sim.env.rooms.get(cell.room_id)
-                if not room_at_cell or room_at_cell.floor != self.current_floor:
-                    continue
-                
-                # LIGHT GREEN for priority ~0 rooms (not burning)
-                if cell.room_id in zero_priority_rooms and not cell.is_burning:
-                    cell_size = self.grid_resolution
-                    rect = patches.Rectangle(
-                        (x - cell_size/2, y - cell_size/2),
-                        cell_size,
-                        cell_size,
-                        facecolor='#C8E6C9',  # Super light green
-                        edgecolor='none',
-                        alpha=0.85,
-                        zorder=11
-                    )
-                    self.cell_heatmap_patches.append(rect)
-                    self.ax.add_patch(rect)
-                    drawn_count += 1
-                    continue
-                
-                # WHITE -> RED COLORMAP with SHADERS
-                if cell.is_burning:
-                    # BURNING = BRIGHT RED with pulsing glow effect
-                    # Add subtle animation based on burn time
-                    pulse = 0.9 + 0.1 * (self.sim.tick % 10) / 10.0
-                    
-                    # Glow layer (larger, semi-transparent)
-                    glow_size = self.grid_resolution * 1.3
-                    glow = patches.Rectangle(
-                        (x - glow_size/2, y - glow_size/2),
-                        glow_size,
-                        glow_size,
-                        facecolor='#FF6600',  # Orange glow
-                        edgecolor='none',
-                        alpha=0.3 * pulse,
-                        zorder=9
-                    )
-                    self.cell_heatmap_patches.append(glow)
-                    self.ax.add_patch(glow)
-                    
-                    # Core fire (bright red)
-                    color = '#FF0000'
-                    alpha = 1.0
-                    edge_glow = '#FFAA00'  # Yellow-orange edge
-                    draw_it = True
-                elif cell.danger_level > 0.001:
-                    # Smooth danger gradient with shader
-                    d = cell.danger_level
-                    if d < 0.25:
-                        # White -> Pale yellow
-                        r, g, b = 1.0, 1.0, 0.95 - d * 0.6
-                    elif d < 0.5:
-                        # Yellow -> Orange
-                        r, g, b = 1.0, 0.95 - (d - 0.25) * 2.0, 0.0
-                    elif d < 0.75:
-                        # Orange -> Red-orange
-                        r, g, b = 1.0, 0.45 - (d - 0.5), 0.0
-                    else:
-                        # Red-orange -> Dark red
-                        r, g, b = 0.9 + d * 0.1, 0.1 - d * 0.1, 0.0
-                    
-                    color = (r, g, b)
-                    alpha = 0.5 + d * 0.5
-                    edge_glow = None
-                    draw_it = True
-                else:
-                    draw_it = False
-                    edge_glow = None
-                
-                if draw_it:
-                    drawn_count += 1
-                    # Draw cell with shader effect
-                    cell_size = self.grid_resolution
-                    rect = patches.Rectangle(
-                        (x - cell_size/2, y - cell_size/2),
-                        cell_size,
-                        cell_size,
-                        facecolor=color,
-                        edgecolor=edge_glow if edge_glow else 'none',
-                        linewidth=0.5 if edge_glow else 0,
-                        alpha=alpha,
-                        zorder=10  # HIGH z-order - on TOP!
-                    )
-                    self.cell_heatmap_patches.append(rect)
-                    self.ax.add_patch(rect)
-            
-            # Debug print
-            if self.sim.tick % 20 == 0:  # Every 20 ticks
-                print(f'[FIRE] Tick {self.sim.tick}: {burning} burning, {drawn_count} drawn, {len(self.cell_heatmap_patches)} patches')
+            self._priority_cache = priorities
+            self._priority_cache_tick = self.sim.tick
+        return self._priority_cache
+    
+    def _build_heatmap_index(self):
+        """Map each hazard cell on the current floor to a face of the heatmap mesh"""
+        cells = self.sim.env.hazard_system.cells
+        res = self.grid_resolution
+        
+        keys = []
+        for pos, cell in cells.items():
+            room_at_cell = self.sim.env.rooms.get(cell.room_id)
+            if room_at_cell and room_at_cell.floor == self.current_floor:
+                keys.append(pos)
+        
+        self._heatmap_keys = keys
+        self._heatmap_floor = self.current_floor
+        self._heatmap_cell_count = len(cells)
+        if not keys:
+            return
+        
+        # Cells are centred at 0.25, 0.75, ... so floor(x / res) is the column
+        xy = np.array(keys, dtype=float)
+        self._heatmap_xy = xy
+        cols = np.floor(xy[:, 0] / res).astype(int)
+        rows = np.floor(xy[:, 1] / res).astype(int)
+        col0, row0 = cols.min(), rows.min()
+        self._heatmap_cols = cols - col0
+        self._heatmap_rows = rows - row0
+        self._heatmap_shape = (rows.max() - row0 + 1, cols.max() - col0 + 1)
+        self._heatmap_extent = (col0 * res, (cols.max() + 1) * res,
+                                row0 * res, (rows.max() + 1) * res)
+        
+        room_ids = [cells[k].room_id for k in keys]
+        self._heatmap_room_order = sorted(set(room_ids))
+        room_index = {room_id: i for i, room_id in enumerate(self._heatmap_room_order)}
+        self._heatmap_room_idx = np.array([room_index[r] for r in room_ids], dtype=int)
+    
+    def _draw_cell_heatmap(self):
+        """Draw cell-level danger heatmap (white = safe, RED = FIRE!)
+        
+        The whole floor is a single QuadMesh whose per-cell RGBA colours are
+        rebuilt with NumPy each frame, and the glows of burning cells share
+        one PolyCollection, instead of one Rectangle (plus glow) per cell.
+        """
+        if not hasattr(self.sim.env.hazard_system, 'cells'):
+            return
+        cells = self.sim.env.hazard_system.cells
+        
+        if (self._heatmap_keys is None or self._heatmap_floor != self.current_floor
+                or self._heatmap_cell_count != len(cells)):
+            self._build_heatmap_index()
+            self._remove_heatmap()
+        
+        # LOD: merge cells that would be only a pixel or two wide on screen
+        factor = 1
+        if self.lod_enabled:
+            cell_px = self.grid_resolution * self._pixels_per_metre()
+            if cell_px > 0:
+                factor = max(1, math.ceil(self.lod_min_cell_px / cell_px))
+        if factor != self._heatmap_factor:
+            self._heatmap_factor = factor
+            self._remove_heatmap()
+        if not self._heatmap_keys:
+            return
+        
+        n = len(self._heatmap_keys)
+        frame_cells = [cells[k] for k in self._heatmap_keys]
+        burning = np.fromiter((c.is_burning for c in frame_cells), dtype=bool, count=n)
+        d = np.fromiter((c.danger_level for c in frame_cells), dtype=float, count=n)
+        
+        # WHITE -> RED COLORMAP (same piecewise gradient as the per-cell shader)
+        rgba = np.zeros((n, 4))
+        rgba[:, 0] = np.where(d < 0.75, 1.0, 0.9 + d * 0.1)
+        rgba[:, 1] = np.select([d < 0.25, d < 0.5, d < 0.75],
+                               [1.0, 0.95 - (d - 0.25) * 2.0, 0.45 - (d - 0.5)],
+                               0.1 - d * 0.1)
+        rgba[:, 2] = np.where(d < 0.25, 0.95 - d * 0.6, 0.0)
+        rgba[:, 3] = np.where(d > 0.001, 0.5 + d * 0.5, 0.0)
+        
+        # BURNING = BRIGHT RED
+        rgba[burning] = (1.0, 0.0, 0.0, 1.0)
+        
+        # LIGHT GREEN for priority ~0 rooms (not burning)
+        priorities = self._office_priorities()
+        zero_rooms = [i for i, room_id in enumerate(self._heatmap_room_order)
+                      if priorities.get(room_id) == 0.0]
+        if zero_rooms:
+            green = np.isin(self._heatmap_room_idx, zero_rooms) & ~burning
+            rgba[green] = (0xC8 / 255, 0xE6 / 255, 0xC9 / 255, 0.85)
+        
+        colors = np.zeros(self._heatmap_shape + (4,))
+        colors[self._heatmap_rows, self._heatmap_cols] = rgba
+        
+        if factor > 1:
+            colors = self._downsample_colors(colors, factor)
+        
+        # One face per cell: a QuadMesh draws in time proportional to the
+        # cells, where an image is resampled to every screen pixel each frame
+        if self.heatmap_mesh is None:
+            x_min, _, y_min, _ = self._heatmap_extent
+            rows, cols = colors.shape[:2]
+            step = self.grid_resolution * factor
+            self.heatmap_mesh = self.ax.pcolormesh(
+                x_min + np.arange(cols + 1) * step,
+                y_min + np.arange(rows + 1) * step,
+                np.zeros((rows, cols)),
+                shading='flat', edgecolors='none',
+                zorder=10  # HIGH z-order - on TOP!
+            )
+            self.heatmap_mesh.set_array(None)  # Colours come from facecolors only
+        self.heatmap_mesh.set_facecolor(colors.reshape(-1, 4))
+        
+        # Orange glow under burning cells (1.3x the cell), pulsing with tick;
+        # one collection for every burning cell, below the mesh
+        pulse = 0.9 + 0.1 * (self.sim.tick % 10) / 10.0
+        half = self.grid_resolution * 1.3 / 2
+        corners = np.array([(-half, -half), (half, -half), (half, half), (-half, half)])
+        verts = self._heatmap_xy[burning][:, None, :] + corners
+        if self.heatmap_glow is None:
+            self.heatmap_glow = PolyCollection(
+                verts, facecolors='#FF6600', edgecolors='none', zorder=9
+            )
+            self.ax.add_collection(self.heatmap_glow, autolim=False)
+        else:
+            self.heatmap_glow.set_verts(verts)
+        self.heatmap_glow.set_alpha(0.3 * pulse)
+        
+        if self.verbose and self.sim.tick % 20 == 0:  # Every 20 ticks
+            drawn_count = int(np.count_nonzero(colors[..., 3]))
+            print(f'[FIRE] Tick {self.sim.tick}: {int(burning.sum())} burning, {drawn_count} drawn')
+    
+    @staticmethod
+    def _downsample_colors(colors, factor):
+        """Reduce a (rows, cols, 4) colour grid by `factor`, keeping the most opaque cell per block
+        
+        Taking the strongest cell rather than the mean keeps isolated
+        burning cells visible at low detail.
+        """
+        rows, cols = colors.shape[:2]
+        pad_rows = -rows % factor
+        pad_cols = -cols % factor
+        padded = np.pad(colors, ((0, pad_rows), (0, pad_cols), (0, 0)))
+        r, c = padded.shape[0] // factor, padded.shape[1] // factor
+        blocks = padded.reshape(r, factor, c, factor, 4).transpose(0, 2, 1, 3, 4).reshape(r, c, -1, 4)
+        strongest = np.argmax(blocks[..., 3], axis=2)
+        return np.take_along_axis(blocks, strongest[..., None, None], axis=2)[:, :, 0]
+    
+    def _remove_heatmap(self):
+        """Drop the heatmap mesh and glow (axes cleared or floor changed)"""
+        for artist in (self.heatmap_mesh, self.heatmap_glow):
+            if artist is not None and artist.axes is not None:
+                artist.remove()
+        self.heatmap_mesh = None
+        self.heatmap_glow = None
+    
+    def _heatmap_artists(self):
+        """Heatmap artists currently on the axes"""
+        return [a for a in (self.heatmap_glow, self.heatmap_mesh) if a is not None]
         
     def _draw_rooms(self):
         """Draw rooms with modern, clean styling"""
-        for room_id, room in self.sim.env.rooms.items():
-            if room.floor != self.current_floor:
-                continue
+        floor_geometry = self.geometry.floor(self.current_floor)
+        if floor_geometry is None:
+            return
+        
+        for i, room_id in enumerate(floor_geometry.room_ids):
+            room = self.sim.env.rooms[room_id]
+            x1, y1, x2, y2 = floor_geometry.rects[i]
             
             # Determine room styling and fill based on evacuees
             if not room.is_exit and not room.is_stair and hasattr(room, 'type') and room.type == 'office':
@@ -400,14 +493,8 @@ class MatplotlibAnimator:
                     fill = True
                     alpha = 0.90  # Very visible
                 elif room.evacuees_remaining > 0:
-                    # Calculate priority to check if blocked (using stable reference)
-                    if self.sim.env.exits:
-                        reference_room = self.sim.env.exits[0]
-                        priority = self.sim.decision_engine.calculate_priority_index(
-                            room.id, reference_room
-                        )
-                    else:
-                        priority = 1
+                    # Priority to check if blocked (using stable reference)
+                    priority = self._office_priorities().get(room.id, 1)
                     
                     if priority == 0.0:
                         # BLOCKED: LIGHT BLUE
@@ -458,9 +545,9 @@ class MatplotlibAnimator:
             
             # Draw room rectangle
             rect = patches.Rectangle(
-                (room.x1, room.y1),
-                room.width,
-                room.height,
+                (x1, y1),
+                x2 - x1,
+                y2 - y1,
                 linewidth=edge_width,
                 edgecolor=edge_color,
                 facecolor=facecolor,
@@ -473,48 +560,24 @@ class MatplotlibAnimator:
             
             # Room label
             label_color = self.COLORS['success'] if room.is_exit else self.COLORS['text_dark']
-            label_text = self.ax.text(room.x, room.y - 2, room.id,
+            cx, cy = floor_geometry.centers[i]
+            label_text = self.ax.text(cx, cy - 2, room.id,
                                      ha='center', va='center',
                                      fontsize=11, fontweight='600',
                                      fontfamily='sans-serif',
                                      color=label_color, zorder=2)
+            label_text.set_visible(self._show_details)
             self.room_labels.append(label_text)
-            
-            # Priority index (ONLY for offices - NOT hallway, exit, or stairs)
-            if (not room.is_exit and not room.is_stair and 
-                hasattr(room, 'type') and room.type == 'office'):
-                # Calculate priority using stable reference point
-                if self.sim.env.exits:
-                    reference_room = self.sim.env.exits[0]
-                    priority = self.sim.decision_engine.calculate_priority_index(
-                        room.id, reference_room
-                    )
-                    
-                    # Display priority with room subscript (2 decimals for granularity)
-                    room_num = room.id[-1]  # Get last character (1, 2, 3, etc.)
-                    priority_text = self.ax.text(
-                        room.x, room.y + 3, 
-                        f'$P_{{{room_num}}}$ = {priority:.2f}',  # LaTeX subscript
-                        ha='center', va='center',
-                        fontsize=11, fontweight='600',
-                        fontfamily='sans-serif',
-                        color=self.COLORS['primary'],
-                        bbox=dict(boxstyle='round,pad=0.5', 
-                                 facecolor='white', 
-                                 edgecolor=self.COLORS['primary'], 
-                                 linewidth=2, 
-                                 alpha=0.95),
-                        zorder=20  # Very high - always visible
-                    )
-                    self.priority_labels.append(priority_text)
     
     def _update_priority_labels(self):
-        """Update priority index labels on OFFICES ONLY - using stable reference point"""
+        """Update priority index labels on OFFICES ONLY - using stable reference point
+        
+        Labels are created on first use and only have their text updated afterwards.
+        """
         # Use a fixed reference point (first exit) instead of moving agent
         # This makes priorities stable and easier to interpret
-        reference_room = None
-        if self.sim.env.exits:
-            reference_room = self.sim.env.exits[0]
+        priorities = self._office_priorities()
+        hidden = hasattr(self, '_end_screen_shown')  # Prevent overlap with end screen
         
         for room_id, room in self.sim.env.rooms.items():
             if room.floor != self.current_floor:
@@ -523,17 +586,17 @@ class MatplotlibAnimator:
             if room.is_exit or room.is_stair or (hasattr(room, 'type') and room.type != 'office'):
                 continue
             
-            # Calculate priority using stable reference point
-            if reference_room:
-                priority = self.sim.decision_engine.calculate_priority_index(
-                    room.id, reference_room
-                )
-                
-                # Display priority with room subscript (2 decimals for granularity)
-                room_num = room.id[-1]  # Get last character (1, 2, 3, etc.)
-                priority_text = self.ax.text(
-                    room.x, room.y + 2, 
-                    f'$P_{{{room_num}}}$ = {priority:.2f}',  # LaTeX subscript
+            priority = priorities.get(room.id)
+            if priority is None:
+                continue
+            
+            # Display priority with room subscript (2 decimals for granularity)
+            room_num = room.id[-1]  # Get last character (1, 2, 3, etc.)
+            text = f'$P_{{{room_num}}}$ = {priority:.2f}'  # LaTeX subscript
+            label = self.priority_labels.get(room_id)
+            if label is None:
+                label = self.ax.text(
+                    room.x, room.y + 2, text,
                     ha='center', va='center',
                     fontsize=10, fontweight='500',
                     fontfamily='sans-serif',
@@ -545,15 +608,16 @@ class MatplotlibAnimator:
                              alpha=0.9),
                     zorder=3
                 )
-                self.priority_labels.append(priority_text)
+                self.priority_labels[room_id] = label
+            elif label.get_text() != text:
+                label.set_text(text)
+            label.set_visible(not hidden and self._show_details)
     
     def _update_room_colors(self):
         """Update room colors based on hazard and status"""
-        for room_id, room in self.sim.env.rooms.items():
-            if room.floor != self.current_floor or room_id not in self.room_patches:
-                continue
-            
-            rect = self.room_patches[room_id]
+        rooms = self.sim.env.rooms
+        for room_id, rect in self.room_patches.items():
+            room = rooms[room_id]
             hazard = room.hazard
             
             # Hazard gradient
@@ -616,6 +680,9 @@ class MatplotlibAnimator:
                 next_layout, next_agents = self.layouts[self.current_layout_idx]
                 print(f'\n[LAYOUT] Next: {next_layout} with {next_agents} agents', flush=True)
                 print(f'[LAYOUT] Close window and run: python3 main.py --layout {next_layout} --agents {next_agents}\n', flush=True)
+            elif event.key == 'd':
+                # Toggle level-of-detail mode
+                self.lod_enabled = not self.lod_enabled  # Shown in the info panel next frame
             elif event.key == 'f':
                 # Toggle fire on/off
                 self.fire_enabled = not self.fire_enabled
@@ -625,9 +692,10 @@ class MatplotlibAnimator:
                 # Spawn or extinguish fire dynamically
                 if hasattr(self.sim.env, 'hazard_system') and hasattr(self.sim.env.hazard_system, 'spawn_fire'):
                     if self.fire_enabled:
-                        self.sim.env.hazard_system.spawn_fire()
+                        self.sim.spawn_fire()
                     else:
-                        self.sim.env.hazard_system.extinguish_fire()
+                        self.sim.extinguish_fire()
+                    self._priority_cache_tick = None  # hazards changed without a tick
                 
                 print(f'[FIRE] {"Fire spread and hazards active" if self.fire_enabled else "Testing pathfinding without fire - all hazards frozen"}\n', flush=True)
         except Exception as e:
@@ -649,55 +717,50 @@ class MatplotlibAnimator:
         self.ax.spines['bottom'].set_color('#E0E0E0')
         self.ax.tick_params(colors=self.COLORS['text_light'])
         
+        # Artists from the previous floor went with ax.clear()
+        self.grid_lines = []
+        self.heatmap_mesh = None
+        self.heatmap_glow = None
+        self.agent_artists = {}
+        self.occupant_glows = None
+        self.occupant_bodies = None
+        self.priority_labels = {}
+        
         self._update_bounds()
         
         self.room_patches = {}
         self.room_labels = []
         self._draw_rooms()
         
+        self.wall_renderer.current_floor = self.current_floor
+        self.wall_renderer.wall_patches = []
+        self.wall_renderer.draw_walls()
+        
         info_bbox = dict(boxstyle='round,pad=1.0', facecolor=self.COLORS['white'], 
                         edgecolor='#E0E0E0', linewidth=2, alpha=0.98)
         self.info_text = self.ax.text(0.02, 0.98, '', transform=self.ax.transAxes,
                                      verticalalignment='top', fontsize=10,
                                      fontfamily='sans-serif', color=self.COLORS['text_dark'],
                                      bbox=info_bbox, linespacing=1.6)
+        
+        self._refresh_background()
     
     def _update_frame(self, frame):
         """Update animation frame"""
-        # Run simulation - SIMPLE integer speed
+        self._update_lod()
+        
+        # Run simulation - speed ticks per frame, more in LOD mode when drawing lags
         if not self.paused and not self.sim.complete:
-            for _ in range(self.speed):
+            for _ in range(self.ticks_per_frame):
                 if not self.sim.complete:
                     # Pass fire_enabled flag to simulator
                     self.sim.step(fire_enabled=self.fire_enabled)
-        
-        # Clear dynamic elements
-        for dot in self.agent_dots:
-            dot.remove()
-        for dot in self.occupant_dots:
-            dot.remove()
-        for line in self.agent_trails:
-            line.remove()
-        for line in self.persistent_trails:
-            line.remove()
-        
-        self.agent_dots = []
-        self.occupant_dots = []
-        self.agent_trails = []
-        self.persistent_trails = []
-        
-        # Clear and redraw priority labels
-        for label in self.priority_labels:
-            label.remove()
-        self.priority_labels = []
+                    self._tps_ticks += 1
+        self._update_tick_rate()
         
         # Update cell heatmap (MUST BE VISIBLE!)
         self._draw_cell_heatmap()
         
-        # Redraw walls with door openings
-        if hasattr(self, 'wall_renderer'):
-            self.wall_renderer.draw_walls()
-        
         # UPDATE ROOM COLORS EVERY FRAME (for green evacuated rooms!)
         self._update_room_colors()
         
@@ -706,152 +769,68 @@ class MatplotlibAnimator:
         
         # Draw agents with modern styling
         for agent in self.sim.agent_manager.agents:
+            artists = self._get_agent_artists(agent)
             if agent.floor != self.current_floor:
+                for artist in artists.values():
+                    artist.set_visible(False)
                 continue
             
-            color = self.COLORS['agent_colors'][agent.id % len(self.COLORS['agent_colors'])]
-            
             # Update trails
             current_pos = (agent.x, agent.y)
-            self.agent_positions[agent.id].append(current_pos)
-            self.full_agent_positions[agent.id].append(current_pos)
-            
-            if len(self.agent_positions[agent.id]) > self.trail_length:
-                self.agent_positions[agent.id].pop(0)
-            
-            # Draw persistent thin trail (FULL PATH - never fades)
-            if len(self.full_agent_positions[agent.id]) > 1:
-                full_trail = np.array(self.full_agent_positions[agent.id])
-                persistent_line, = self.ax.plot(full_trail[:, 0], full_trail[:, 1], 
-                                    color=color, alpha=0.15, 
-                                    linewidth=0.8, solid_capstyle='round', 
-                                    zorder=7)
-                self.persistent_trails.append(persistent_line)
-            
-            # Draw fading trail (recent movement only)
-            if len(self.agent_positions[agent.id]) > 1:
-                trail = np.array(self.agent_positions[agent.id])
-                line, = self.ax.plot(trail[:, 0], trail[:, 1], 
-                                    color=color, alpha=0.3, 
-                                    linewidth=2.5, solid_capstyle='round', 
-                                    zorder=8)
-                self.agent_trails.append(line)
+            trail = self.agent_positions[agent.id]
+            trail.append(current_pos)
+            full_trail = self._append_full_trail(agent.id, current_pos)
             
-            # Agent glow effect (larger, softer)
-            outer_glow = patches.Circle((agent.x, agent.y), 1.8, 
-                                       facecolor=color, alpha=0.1, 
-                                       edgecolor='none', zorder=9)
-            self.agent_dots.append(outer_glow)
-            self.ax.add_patch(outer_glow)
+            # Persistent thin trail (FULL PATH - never fades)
+            details = self._show_details
+            if details:
+                artists['persistent'].set_data(full_trail[:, 0], full_trail[:, 1])
+            artists['persistent'].set_visible(details and len(full_trail) > 1)
             
-            mid_glow = patches.Circle((agent.x, agent.y), 1.2, 
-                                     facecolor=color, alpha=0.2, 
-                                     edgecolor='none', zorder=9.5)
-            self.agent_dots.append(mid_glow)
-            self.ax.add_patch(mid_glow)
+            # Fading trail (recent movement only)
+            if details:
+                xs, ys = zip(*trail)
+                artists['trail'].set_data(xs, ys)
+            artists['trail'].set_visible(details and len(trail) > 1)
             
-            # Agent body (with white border for contrast)
-            body = patches.Circle((agent.x, agent.y), 0.9, 
-                                 facecolor=color, 
-                                 edgecolor='white',
-                                 linewidth=2.5, zorder=10)
-            self.agent_dots.append(body)
-            self.ax.add_patch(body)
+            # Agent glow + body (with white border for contrast)
+            for key in ('outer_glow', 'mid_glow', 'body'):
+                artists[key].set_center(current_pos)
+                artists[key].set_visible(True)
             
             # Show evacuee if carrying
-            if agent.carrying_evacuee:
-                # Draw evacuee icon overlapping agent
-                evacuee_circle = patches.Circle((agent.x + 0.5, agent.y - 0.5), 0.5, 
-                                               facecolor='#F44336',  # Red
-                                               edgecolor='white',
-                                               linewidth=2, zorder=11)
-                self.agent_dots.append(evacuee_circle)
-                self.ax.add_patch(evacuee_circle)
-                
-                # Small label
-                evac_label = self.ax.text(agent.x + 0.5, agent.y - 0.5, '👤',
-                                         ha='center', va='center',
-                                         fontsize=8, zorder=12,
-                                         color='white')
-                self.agent_dots.append(evac_label)
+            carrying = bool(agent.carrying_evacuee)
+            artists['evacuee'].set_center((agent.x + 0.5, agent.y - 0.5))
+            artists['evacuee_label'].set_position((agent.x + 0.5, agent.y - 0.5))
+            artists['evacuee'].set_visible(carrying)
+            artists['evacuee_label'].set_visible(carrying and details)
             
-            # Agent label or death marker
-            if agent.is_dead:
-                # Draw large red X over dead agent
-                x_mark1 = self.ax.plot([agent.x - 1, agent.x + 1], 
-                                      [agent.y - 1, agent.y + 1],
-                                      color='#D32F2F', linewidth=4, zorder=12)[0]
-                x_mark2 = self.ax.plot([agent.x - 1, agent.x + 1], 
-                                      [agent.y + 1, agent.y - 1],
-                                      color='#D32F2F', linewidth=4, zorder=12)[0]
-                self.agent_dots.append(x_mark1)
-                self.agent_dots.append(x_mark2)
-                
-                # Death label
-                death_label = self.ax.text(
-                    agent.x, agent.y - 2, 'DECEASED',
-                    ha='center', va='center',
-                    fontsize=9, fontweight='700',
-                    fontfamily='sans-serif',
-                    color='white', zorder=13,
-                    bbox=dict(boxstyle='round,pad=0.4', 
-                             facecolor='#D32F2F', 
-                             edgecolor='none', alpha=0.95)
-                )
-                self.agent_dots.append(death_label)
-            elif agent.escaped:
-                # Draw green checkmark over escaped agent
-                check_mark = self.ax.plot([agent.x - 0.8, agent.x - 0.2, agent.x + 1], 
-                                        [agent.y, agent.y - 0.5, agent.y + 1],
-                                        color='#43A047', linewidth=4, zorder=12)[0]
-                self.agent_dots.append(check_mark)
-                
-                # Escaped label
-                escape_label = self.ax.text(
-                    agent.x, agent.y - 2, 'ESCAPED',
-                    ha='center', va='center',
-                    fontsize=9, fontweight='700',
-                    fontfamily='sans-serif',
-                    color='white', zorder=13,
-                    bbox=dict(boxstyle='round,pad=0.4', 
-                             facecolor='#43A047', 
-                             edgecolor='none', alpha=0.95)
-                )
-                self.agent_dots.append(escape_label)
-            else:
-                label = self.ax.text(agent.x, agent.y - 1.6, f'R{agent.id}',
-                                   ha='center', va='center',
-                                   fontsize=9, fontweight='600',
-                                   fontfamily='sans-serif',
-                                   color='white', zorder=11,
-                                   bbox=dict(boxstyle='round,pad=0.3', 
-                                            facecolor=color, 
-                                            edgecolor='none', alpha=0.95))
-                self.agent_dots.append(label)
+            # Agent label or death / escape marker
+            artists['death_mark'].set_data([agent.x - 1, agent.x + 1, np.nan, agent.x - 1, agent.x + 1],
+                                           [agent.y - 1, agent.y + 1, np.nan, agent.y + 1, agent.y - 1])
+            artists['death_label'].set_position((agent.x, agent.y - 2))
+            artists['check_mark'].set_data([agent.x - 0.8, agent.x - 0.2, agent.x + 1],
+                                           [agent.y, agent.y - 0.5, agent.y + 1])
+            artists['escape_label'].set_position((agent.x, agent.y - 2))
+            artists['label'].set_position((agent.x, agent.y - 1.6))
+            
+            dead = bool(agent.is_dead)
+            escaped = bool(agent.escaped) and not dead
+            artists['death_mark'].set_visible(dead)
+            artists['death_label'].set_visible(dead and details)
+            artists['check_mark'].set_visible(escaped)
+            artists['escape_label'].set_visible(escaped and details)
+            artists['label'].set_visible(not dead and not escaped and details)
         
         # Draw occupants with random positions
+        positions = []
         for room_id, room in self.sim.env.rooms.items():
             if room.floor != self.current_floor:
                 continue
             if room.evacuees_remaining > 0:
                 # Get random positions for evacuees
-                positions = room.get_evacuee_positions()
-                
-                for pos_x, pos_y in positions:
-                    # Glow
-                    glow = patches.Circle((pos_x, pos_y), 0.6,
-                                         facecolor=self.COLORS['danger'], 
-                                         alpha=0.15, edgecolor='none', zorder=5)
-                    self.occupant_dots.append(glow)
-                    self.ax.add_patch(glow)
-                    
-                    # Body
-                    person = patches.Circle((pos_x, pos_y), 0.4,
-                                           facecolor=self.COLORS['danger'], 
-                                           edgecolor='white',
-                                           linewidth=1.2, zorder=6)
-                    self.occupant_dots.append(person)
-                    self.ax.add_patch(person)
+                positions.extend(room.get_evacuee_positions())
+        self._update_occupants(positions)
         
         # Update info panel with clean design
         results = self.sim.get_results()
@@ -880,9 +859,10 @@ class MatplotlibAnimator:
             f"Occupants Rescued: {results['evacuees_rescued']}/{results['total_evacuees']} ({rescued_pct:.0f}%)\n"
             f"Rooms Cleared: {results['rooms_cleared']}/{results['total_rooms']} ({cleared_pct:.0f}%)  |  "
             f"Score: {results['success_score']:.3f}  |  Speed: {self.speed}x  |  {fire_status}{fire_color}\n"
-            f"Status: {status}\n"
+            f"Status: {status}  |  Sim: {self.sim_ticks_per_sec:.1f} ticks/s"
+            f"  |  LOD: {f'ON, {self.ticks_per_frame} ticks/frame' if self.lod_enabled else 'OFF'}\n"
             f"{'─' * 60}\n"
-            f"Controls: SPACE=Play/Pause  |  J/L=Speed  |  F=Toggle Fire  |  ESC=Quit"
+            f"Controls: SPACE=Play/Pause  |  J/L=Speed  |  F=Toggle Fire  |  D=Toggle LOD  |  ESC=Quit"
         )
         
         # Show end screen only when PAUSED and complete
@@ -891,7 +871,179 @@ class MatplotlibAnimator:
         
         self.info_text.set_text(info)
         
-        return self.agent_dots + self.occupant_dots + self.persistent_trails + self.agent_trails + [self.info_text]
+        return self._animated_artists()
+    
+    def _pixels_per_metre(self):
+        """Current horizontal zoom of the map in screen pixels per metre"""
+        (x0, _), (x1, _) = self.ax.transData.transform([(0, 0), (1, 0)])
+        return abs(x1 - x0)
+    
+    def _update_lod(self):
+        """Choose ticks per frame and detail level for the coming frame"""
+        now = time.perf_counter()
+        if self._last_frame_time is not None:
+            # Smoothed wall time per frame, draw included (long stalls capped)
+            interval = min(now - self._last_frame_time, 1.0)
+            self._frame_interval += 0.2 * (interval - self._frame_interval)
+        self._last_frame_time = now
+        
+        if self.lod_enabled:
+            # When frames take longer than 1/fps, step more ticks per frame so
+            # the simulation still advances speed * fps ticks per second
+            self.ticks_per_frame = max(self.speed,
+                                       round(self.speed * self.fps * self._frame_interval))
+            show_details = self._pixels_per_metre() >= self.lod_min_label_px
+        else:
+            self.ticks_per_frame = self.speed
+            show_details = True
+        
+        if show_details != self._show_details:
+            self._show_details = show_details
+            for label in self.room_labels:
+                label.set_visible(show_details)
+            self._refresh_background()  # Room names are part of the static layer
+    
+    def _update_tick_rate(self):
+        """Refresh the achieved simulation ticks per second about once a second"""
+        elapsed = time.perf_counter() - self._tps_start
+        if elapsed >= 1.0:
+            self.sim_ticks_per_sec = self._tps_ticks / elapsed
+            self._tps_ticks = 0
+            self._tps_start += elapsed
+    
+    def _get_agent_artists(self, agent):
+        """Artists for one responder, created on first use and reused every frame"""
+        artists = self.agent_artists.get(agent.id)
+        if artists is not None:
+            return artists
+        
+        color = self.COLORS['agent_colors'][agent.id % len(self.COLORS['agent_colors'])]
+        origin = (agent.x, agent.y)
+        artists = {
+            'persistent': self.ax.plot([], [], color=color, alpha=0.15, 
+                                       linewidth=0.8, solid_capstyle='round', 
+                                       zorder=7)[0],
+            'trail': self.ax.plot([], [], color=color, alpha=0.3, 
+                                  linewidth=2.5, solid_capstyle='round', 
+                                  zorder=8)[0],
+            # Agent glow effect (larger, softer)
+            'outer_glow': patches.Circle(origin, 1.8, facecolor=color, alpha=0.1, 
+                                         edgecolor='none', zorder=9),
+            'mid_glow': patches.Circle(origin, 1.2, facecolor=color, alpha=0.2, 
+                                       edgecolor='none', zorder=9.5),
+            'body': patches.Circle(origin, 0.9, facecolor=color, edgecolor='white',
+                                   linewidth=2.5, zorder=10),
+            # Carried evacuee overlapping agent
+            'evacuee': patches.Circle(origin, 0.5, facecolor='#F44336',  # Red
+                                      edgecolor='white', linewidth=2, zorder=11),
+            'evacuee_label': self.ax.text(*origin, '👤', ha='center', va='center',
+                                          fontsize=8, zorder=12, color='white'),
+            # Large red X over dead agent
+            'death_mark': self.ax.plot([], [], color='#D32F2F', linewidth=4, zorder=12)[0],
+            'death_label': self.ax.text(
+                *origin, 'DECEASED',
+                ha='center', va='center',
+                fontsize=9, fontweight='700',
+                fontfamily='sans-serif',
+                color='white', zorder=13,
+                bbox=dict(boxstyle='round,pad=0.4', 
+                         facecolor='#D32F2F', 
+                         edgecolor='none', alpha=0.95)
+            ),
+            # Green checkmark over escaped agent
+            'check_mark': self.ax.plot([], [], color='#43A047', linewidth=4, zorder=12)[0],
+            'escape_label': self.ax.text(
+                *origin, 'ESCAPED',
+                ha='center', va='center',
+                fontsize=9, fontweight='700',
+                fontfamily='sans-serif',
+                color='white', zorder=13,
+                bbox=dict(boxstyle='round,pad=0.4', 
+                         facecolor='#43A047', 
+                         edgecolor='none', alpha=0.95)
+            ),
+            'label': self.ax.text(*origin, f'R{agent.id}',
+                                  ha='center', va='center',
+                                  fontsize=9, fontweight='600',
+                                  fontfamily='sans-serif',
+                                  color='white', zorder=11,
+                                  bbox=dict(boxstyle='round,pad=0.3', 
+                                           facecolor=color, 
+                                           edgecolor='none', alpha=0.95)),
+        }
+        for key in ('outer_glow', 'mid_glow', 'body', 'evacuee'):
+            self.ax.add_patch(artists[key])
+        self.agent_artists[agent.id] = artists
+        return artists
+    
+    def _append_full_trail(self, agent_id, pos):
+        """Append to an agent's full path and return the filled view
+        
+        Stationary frames are skipped (they add nothing to the drawn line) and
+        the buffer grows by doubling, so each frame costs O(1) however long
+        the run is.
+        """
+        buf = self.full_agent_positions[agent_id]
+        n = self.full_agent_counts[agent_id]
+        if n and buf[n - 1, 0] == pos[0] and buf[n - 1, 1] == pos[1]:
+            return buf[:n]
+        if n == len(buf):
+            buf = np.concatenate([buf, np.empty_like(buf)])
+            self.full_agent_positions[agent_id] = buf
+        buf[n] = pos
+        self.full_agent_counts[agent_id] = n + 1
+        return buf[:n + 1]
+    
+    def _update_occupants(self, positions):
+        """Move the occupant glow/body collections to this frame's positions"""
+        offsets = np.array(positions, dtype=float).reshape(-1, 2)
+        if self.occupant_glows is None:
+            # Sizes in data units (metres), like the Circle patches they replace
+            self.occupant_glows = EllipseCollection(
+                1.2, 1.2, 0.0, units='xy', offsets=offsets,
+                offset_transform=self.ax.transData,
+                facecolors=self.COLORS['danger'], alpha=0.15,
+                edgecolors='none', zorder=5)
+            self.occupant_bodies = EllipseCollection(
+                0.8, 0.8, 0.0, units='xy', offsets=offsets,
+                offset_transform=self.ax.transData,
+                facecolors=self.COLORS['danger'], edgecolors='white',
+                linewidths=1.2, zorder=6)
+            self.ax.add_collection(self.occupant_glows, autolim=False)
+            self.ax.add_collection(self.occupant_bodies, autolim=False)
+        else:
+            self.occupant_glows.set_offsets(offsets)
+            self.occupant_bodies.set_offsets(offsets)
+    
+    def _animated_artists(self):
+        """Everything that can change between frames (drawn over the blit background)
+        
+        Walls are included so they stay on top of the heatmap and agents, but
+        are a single cached collection. Grid lines, room names and the axes
+        themselves make up the static background.
+        """
+        artists = self._heatmap_artists() + list(self.room_patches.values())
+        artists += list(self.priority_labels.values())
+        if hasattr(self, 'wall_renderer'):
+            artists += self.wall_renderer.wall_patches
+        for agent_artists in self.agent_artists.values():
+            artists += agent_artists.values()
+        if self.occupant_glows is not None:
+            artists += [self.occupant_glows, self.occupant_bodies]
+        artists.append(self.info_text)
+        return artists
+    
+    def _refresh_background(self):
+        """Re-capture the blit background after the static layer changed
+        
+        Goes through the same path as a window resize: FuncAnimation drops its
+        cached background and grabs a new one after the next full draw.
+        """
+        if self.anim is None:
+            return
+        self.fig.canvas.callbacks.process('resize_event',
+                                          ResizeEvent('resize_event', self.fig.canvas))
+        self.fig.canvas.draw_idle()
     
     def _show_end_screen(self, results):
         """Display beautiful end screen with full statistics"""
@@ -899,16 +1051,15 @@ class MatplotlibAnimator:
         if not hasattr(self, '_end_screen_shown'):
             self._end_screen_shown = True
             
-            # Remove priority labels to prevent overlap
-            for label in self.priority_labels:
-                label.remove()
-            self.priority_labels.clear()
+            # Hide priority labels to prevent overlap
+            for label in self.priority_labels.values():
+                label.set_visible(False)
             
             # Dim all patches
             for patch in self.room_patches.values():
                 patch.set_alpha(0.15)
-            for patch in self.cell_heatmap_patches:
-                patch.set_alpha(0.2)
+            for mesh in self._heatmap_artists():
+                mesh.set_alpha(0.2)
             if hasattr(self, 'wall_renderer'):
                 for patch in self.wall_renderer.wall_patches:
                     patch.set_alpha(0.15)
@@ -936,6 +1087,10 @@ class MatplotlibAnimator:
             title_color = '#FF69B4'  # Hot pink
             trapped = end_event_data.get('trapped', 0)
             outcome = f'All remaining rooms blocked by fire ({trapped} trapped)'
+        elif reason == 'stalled':
+            title = 'MISSION STALLED'
+            title_color = '#FB8C00'
+            outcome = 'No responder can make further progress'
         else:
             title = 'TIME LIMIT'
             title_color = '#FB8C00'
@@ -946,7 +1101,7 @@ class MatplotlibAnimator:
         cleared_pct = (results['rooms_cleared'] / results['total_rooms'] * 100) if results['total_rooms'] > 0 else 0
         
         # Count deaths
-        deaths = sum(1 for a in self.sim.agent_manager.agents if a.is_dead)
+        deaths = self.sim.agent_manager.num_dead
         
         # Beautiful end stats with CORRECT SUCCESS SCORE FORMULA
         survivors = results['evacuees_rescued']
@@ -1003,8 +1158,8 @@ class MatplotlibAnimator:
             # Restore full opacity to all patches
             for patch in self.room_patches.values():
                 patch.set_alpha(0.2)
-            for patch in self.cell_heatmap_patches:
-                patch.set_alpha(1.0)
+            for mesh in self._heatmap_artists():
+                mesh.set_alpha(None)
             if hasattr(self, 'wall_renderer'):
                 for patch in self.wall_renderer.wall_patches:
                     patch.set_alpha(1.0)
@@ -1023,7 +1178,7 @@ class MatplotlibAnimator:
             self.fig,
             self._update_frame,
             interval=interval,
-            blit=False,
+            blit=True,  # Only animated artists are redrawn; see _animated_artists
             cache_frame_data=False
         )
         
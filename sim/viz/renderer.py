@@ -2,12 +2,16 @@
 
 import pygame
 import math
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, TYPE_CHECKING
 import numpy as np
 
-from ..env.environment import Environment
 from ..agents.agent_manager import AgentManager
 from ..agents.agent import AgentState
+from .geometry import LayoutGeometry
+from .snapshot import HazardSnapshot, take_hazard_snapshot
+
+if TYPE_CHECKING:
+    from ..env.environment import Environment
 
 
 class Renderer:
@@ -23,6 +27,7 @@ class Renderer:
     COLOR_EVACUEE = (220, 50, 50)
     COLOR_HAZARD_LOW = (255, 255, 200)
     COLOR_HAZARD_HIGH = (255, 100, 0)
+    COLOR_HAZARD_BURNING = (220, 30, 30)
     COLOR_AGENT = [(70, 130, 180), (220, 120, 50), (150, 80, 180), (50, 180, 130)]
     COLOR_TRAIL = (200, 200, 200)
     COLOR_TEXT = (30, 30, 30)
@@ -68,20 +73,30 @@ class Renderer:
         # Event annotations
         self.annotations: List[dict] = []
         
+        # Static floor geometry (set by the owner, or built on first render)
+        self.geometry: Optional[LayoutGeometry] = None
+        
         # Heatmap surface cache
         self.heatmap_surface = None
         self.heatmap_alpha = 0.6
+        self.grid_resolution = 0.5
+        self._hazard_cells: Optional[HazardSnapshot] = None
+        self._hazard_index = None
+        self._hazard_index_key = None
+        self._hazard_grid = None      # One pixel per cell, re-uploaded per hazard version
+        self._hazard_version = None
+        self._heatmap_key = None
     
     def clear(self):
         """Clear screen"""
         self.screen.fill(self.COLOR_BG)
     
-    def render_map(self, env: Environment, agent_manager: AgentManager, tick: int):
+    def render_map(self, env: 'Environment', agent_manager: AgentManager, tick: int):
         """
         Render the building map for current floor
         
         Args:
-            env: Environment to render
+            env: 'Environment' to render
             agent_manager: Agent manager
             tick: Current simulation tick
         """
@@ -89,33 +104,23 @@ class Renderer:
         pygame.draw.rect(self.screen, (255, 255, 255), self.map_rect)
         pygame.draw.rect(self.screen, self.COLOR_ROOM_BORDER, self.map_rect, 2)
         
-        # Calculate view transform
-        if self.current_floor in env.bounds:
-            x_min, y_min, x_max, y_max = env.bounds[self.current_floor]
-            world_width = x_max - x_min
-            world_height = y_max - y_min
-            
-            # Calculate scale to fit
-            scale_x = self.map_rect.width / world_width if world_width > 0 else 1
-            scale_y = self.map_rect.height / world_height if world_height > 0 else 1
-            scale = min(scale_x, scale_y) * 0.9 * self.zoom
-            
-            offset_x = self.map_rect.x + self.map_rect.width / 2 - (x_min + x_max) / 2 * scale
-            offset_y = self.map_rect.y + self.map_rect.height / 2 - (y_min + y_max) / 2 * scale
+        if self.geometry is None:
+            self.geometry = LayoutGeometry(env)
+        floor_geometry = self.geometry.floor(self.current_floor)
+        
+        # View transform and room rects in pixels, cached per map rect/zoom
+        if floor_geometry is not None and floor_geometry.bounds is not None:
+            transform, room_rects, room_centers = floor_geometry.fit(tuple(self.map_rect), self.zoom)
+            world_to_screen = transform.to_screen
+            scale = transform.scale
             
-            def world_to_screen(x, y):
-                sx = offset_x + x * scale
-                sy = offset_y + y * scale
-                return int(sx), int(sy)
+            # Render rooms
+            for i, room_id in enumerate(floor_geometry.room_ids):
+                self._render_room(env.rooms[room_id], room_rects[i], room_centers[i])
             
-            # Render hazard heatmap
+            # Render hazard heatmap (over the opaque room fills)
             if self.show_hazard:
-                self._render_hazard_heatmap(env, self.current_floor, world_to_screen, scale)
-            
-            # Render rooms
-            for room_id in env.floors.get(self.current_floor, []):
-                room = env.rooms[room_id]
-                self._render_room(room, world_to_screen, scale)
+                self._render_hazard_heatmap(env, self.current_floor, world_to_screen, scale, tick)
             
             # Render connections (optional)
             # self._render_connections(env, self.current_floor, world_to_screen)
@@ -132,13 +137,15 @@ class Renderer:
             # Render annotations
             self._render_annotations(tick, world_to_screen, env)
     
-    def _render_room(self, room, world_to_screen, scale):
-        """Render a single room"""
-        x1, y1 = world_to_screen(room.x1, room.y1)
-        x2, y2 = world_to_screen(room.x2, room.y2)
+    def _render_room(self, room, screen_rect, screen_center):
+        """Render a single room
         
-        w = x2 - x1
-        h = y2 - y1
+        Args:
+            room: Room (or RoomSnapshot) providing the dynamic state
+            screen_rect: Precomputed (x, y, w, h) in pixels
+            screen_center: Precomputed room centre in pixels
+        """
+        x1, y1, w, h = (int(v) for v in screen_rect)
         
         rect = pygame.Rect(x1, y1, max(1, w), max(1, h))
         
@@ -161,7 +168,7 @@ class Renderer:
         
         # Room label
         if w > 30 and h > 20:
-            cx, cy = world_to_screen(room.x, room.y)
+            cx, cy = (int(v) for v in screen_center)
             label = self.font_small.render(room.id, True, self.COLOR_TEXT)
             label_rect = label.get_rect(center=(cx, cy - 5))
             self.screen.blit(label, label_rect)
@@ -173,8 +180,99 @@ class Renderer:
                 evac_rect = evac_label.get_rect(center=(cx, cy + 8))
                 self.screen.blit(evac_label, evac_rect)
     
-    def _render_hazard_heatmap(self, env, floor, world_to_screen, scale):
-        """Render hazard heatmap overlay"""
+    def _render_hazard_heatmap(self, env, floor, world_to_screen, scale, tick):
+        """Render hazard heatmap overlay
+        
+        With the grid hazard model every 0.5m cell is one pixel of a small
+        RGBA surface, filled with NumPy through pygame.surfarray and scaled
+        to the map once. Hazards only change inside Simulator.step, so the
+        tick is the hazard version: cells are re-read and re-uploaded only
+        when it changes, otherwise the cached scaled surface is blitted.
+        """
+        if tick != self._hazard_version or self._hazard_cells is None:
+            hazard = getattr(env, 'hazard_cells', None)  # Carried by FrameSnapshot
+            if hazard is None and hasattr(env, 'hazard_system'):
+                hazard = take_hazard_snapshot(env, self._hazard_cells)
+            if hazard is None:
+                self._render_room_hazard(env, floor, world_to_screen)
+                return
+            self._hazard_cells = hazard
+            self._hazard_version = tick
+            self._heatmap_key = None
+        
+        index = self._get_hazard_index(env, floor)
+        if index is None:
+            return
+        rows, cols, mask, (x_min, y_min, x_max, y_max) = index
+        
+        x1, y1 = world_to_screen(x_min, y_min)
+        x2, y2 = world_to_screen(x_max, y_max)
+        if x2 - x1 < 1 or y2 - y1 < 1:
+            return
+        
+        key = (self._hazard_version, floor, x1, y1, x2, y2)
+        if key != self._heatmap_key:
+            self._upload_hazard_grid(rows, cols, mask)
+            self.heatmap_surface = pygame.transform.scale(self._hazard_grid, (x2 - x1, y2 - y1))
+            self._heatmap_key = key
+        self.screen.blit(self.heatmap_surface, (x1, y1))
+    
+    def _get_hazard_index(self, env, floor):
+        """Grid row/column of each hazard cell on `floor`, plus the floor extent"""
+        hazard = self._hazard_cells
+        key = self._hazard_index_key
+        if key is not None and key[0] == floor and key[1] is hazard.positions:
+            return self._hazard_index
+        
+        self._hazard_index_key = (floor, hazard.positions)
+        self._hazard_index = None
+        self._hazard_grid = None
+        
+        rooms = env.rooms
+        mask = np.fromiter((room_id in rooms and rooms[room_id].floor == floor
+                            for room_id in hazard.room_ids),
+                           dtype=bool, count=len(hazard.room_ids))
+        if not mask.any():
+            return None
+        
+        # Cells are centred at 0.25, 0.75, ... so floor(x / res) is the column
+        res = self.grid_resolution
+        xy = np.array(hazard.positions, dtype=float)[mask]
+        cols = np.floor(xy[:, 0] / res).astype(int)
+        rows = np.floor(xy[:, 1] / res).astype(int)
+        col0, row0 = cols.min(), rows.min()
+        extent = (col0 * res, row0 * res, (cols.max() + 1) * res, (rows.max() + 1) * res)
+        
+        self._hazard_grid = pygame.Surface((cols.max() - col0 + 1, rows.max() - row0 + 1),
+                                           pygame.SRCALPHA)
+        self._hazard_index = (rows - row0, cols - col0, mask, extent)
+        return self._hazard_index
+    
+    def _upload_hazard_grid(self, rows, cols, mask):
+        """Colour every cell with NumPy and copy the pixels into the grid surface"""
+        hazard = self._hazard_cells
+        t = np.clip(hazard.danger[mask], 0.0, 1.0)[:, None]
+        burning = hazard.burning[mask]
+        
+        low = np.array(self.COLOR_HAZARD_LOW, dtype=float)
+        high = np.array(self.COLOR_HAZARD_HIGH, dtype=float)
+        rgb = low * (1 - t) + high * t
+        rgb[burning] = self.COLOR_HAZARD_BURNING
+        alpha = np.where(t[:, 0] >= 0.05, t[:, 0] * 180 * self.heatmap_alpha, 0.0)
+        alpha[burning] = 255 * self.heatmap_alpha
+        
+        # surfarray views are indexed [x, y]
+        pixels = pygame.surfarray.pixels3d(self._hazard_grid)
+        pixels[...] = 0
+        pixels[cols, rows] = rgb.astype(np.uint8)
+        del pixels
+        alphas = pygame.surfarray.pixels_alpha(self._hazard_grid)
+        alphas[...] = 0
+        alphas[cols, rows] = alpha.astype(np.uint8)
+        del alphas
+    
+    def _render_room_hazard(self, env, floor, world_to_screen):
+        """Room-average hazard overlay, for environments without hazard cells"""
         for room_id in env.floors.get(floor, []):
             room = env.rooms[room_id]
             
@@ -307,7 +405,7 @@ class Renderer:
         instr_label = self.font_small.render(instr, True, self.COLOR_TEXT)
         self.screen.blit(instr_label, (self.control_rect.x + 10, self.control_rect.y + 60))
     
-    def render_info_panel(self, env: Environment, agent_manager: AgentManager, 
+    def render_info_panel(self, env: 'Environment', agent_manager: AgentManager, 
                          results: dict, tick: int):
         """Render information panel"""
         pygame.draw.rect(self.screen, self.COLOR_UI_BG, self.info_rect)
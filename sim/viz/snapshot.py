@@ -0,0 +1,231 @@
+"""Immutable frame snapshots and incrementally maintained live metrics"""
+
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from ..engine.simulator import SimulationEvent, EventType
+
+
+class RoomSnapshot(NamedTuple):
+    """Drawable state of one room at a given tick"""
+    id: str
+    floor: int
+    x: float
+    y: float
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    is_exit: bool
+    is_stair: bool
+    cleared: bool
+    hazard: float
+    evacuees_remaining: int
+    discovered_evacuees: bool
+
+
+class AgentSnapshot(NamedTuple):
+    """Drawable state of one agent at a given tick"""
+    id: int
+    x: float
+    y: float
+    floor: int
+    state: object
+    current_room: Optional[str]
+    path: Tuple[str, ...]
+    path_index: int
+    trail: Tuple[Tuple[float, float, int], ...]
+
+    def get_trail(self, length: int = 20) -> List[Tuple[float, float, int]]:
+        """Recent position trail (same contract as Agent.get_trail)"""
+        return list(self.trail[-length:])
+
+
+class HazardSnapshot(NamedTuple):
+    """Per-cell hazard state; danger/burning are aligned with positions"""
+    positions: Tuple[Tuple[float, float], ...]
+    room_ids: Tuple[str, ...]
+    danger: np.ndarray
+    burning: np.ndarray
+
+
+class FrameSnapshot(NamedTuple):
+    """
+    Everything the renderer needs for one frame, detached from the simulator
+
+    Exposes the environment attributes (rooms, floors, bounds) and agent
+    manager methods (agents, get_agents_on_floor) the Renderer reads, so it
+    can be passed in place of either.
+    """
+    tick: int
+    time: float
+    complete: bool
+    rooms: Dict[str, RoomSnapshot]
+    floors: dict
+    bounds: dict
+    agents: Tuple[AgentSnapshot, ...]
+    metrics: dict
+    hazard_cells: Optional[HazardSnapshot] = None
+
+    def get_agents_on_floor(self, floor: int) -> List[AgentSnapshot]:
+        """Agents on a specific floor"""
+        return [a for a in self.agents if a.floor == floor]
+
+
+class LiveMetrics:
+    """
+    Info-panel metrics maintained from simulation events
+
+    Room totals are adjusted only for rooms touched by an event since the last
+    read, instead of rescanning every room and agent like Simulator.get_results.
+    """
+
+    # Events after which a room's cleared flag or evacuee count may have changed
+    ROOM_EVENTS = (EventType.ROOM_CLEARED, EventType.EVACUEE_FOUND, EventType.EVACUEE_RESCUED)
+
+    def __init__(self, simulator):
+        """
+        Initialize counters from the simulator's current state
+
+        Args:
+            simulator: Simulator instance (events are subscribed to)
+        """
+        self.sim = simulator
+        self._dirty_rooms: Set[str] = set()
+        self.resync()
+        simulator.add_event_callback(self._on_event)
+
+    def resync(self):
+        """Recount everything from scratch (e.g. after Simulator.reset)"""
+        env = self.sim.env
+        self.total_evacuees = env.get_total_evacuees()
+        self.total_rooms = len([r for r in env.rooms.values()
+                                if not r.is_exit and not r.is_stair])
+        self._room_state = {room_id: (room.cleared, room.evacuees_remaining)
+                            for room_id, room in env.rooms.items()}
+        self.rooms_cleared = sum(1 for cleared, _ in self._room_state.values() if cleared)
+        self.evacuees_remaining = sum(n for _, n in self._room_state.values())
+        self._dirty_rooms.clear()
+
+    def _on_event(self, event: SimulationEvent):
+        """Remember which rooms may have changed"""
+        if event.event_type in self.ROOM_EVENTS and event.room_id is not None:
+            self._dirty_rooms.add(event.room_id)
+
+    def _apply_dirty_rooms(self):
+        """Fold changes of touched rooms into the running totals"""
+        rooms = self.sim.env.rooms
+        for room_id in self._dirty_rooms:
+            room = rooms.get(room_id)
+            if room is None:
+                continue
+            was_cleared, was_remaining = self._room_state[room_id]
+            self.rooms_cleared += int(room.cleared) - int(was_cleared)
+            self.evacuees_remaining += room.evacuees_remaining - was_remaining
+            self._room_state[room_id] = (room.cleared, room.evacuees_remaining)
+        self._dirty_rooms.clear()
+
+    def results(self) -> dict:
+        """Subset of Simulator.get_results() shown in the info panel"""
+        self._apply_dirty_rooms()
+        sim = self.sim
+        agents = sim.agent_manager.agents
+
+        rescued = self.total_evacuees - self.evacuees_remaining
+        num_agents = sim.params.get('agents', {}).get('count', 2)
+        num_alive = sum(1 for a in agents if not a.is_dead)
+        responder_survival_pct = (num_alive / num_agents * 100) if num_agents > 0 else 100.0
+
+        if sim.time > 0 and num_agents > 0:
+            success_score = (rescued * responder_survival_pct) / (sim.time * num_agents)
+        else:
+            success_score = 0.0
+
+        percent_rescued = rescued / self.total_evacuees if self.total_evacuees > 0 else 1.0
+        percent_cleared = self.rooms_cleared / self.total_rooms if self.total_rooms > 0 else 1.0
+
+        return {
+            'time': sim.time,
+            'ticks': sim.tick,
+            'total_evacuees': self.total_evacuees,
+            'evacuees_rescued': rescued,
+            'percent_rescued': percent_rescued * 100,
+            'total_rooms': self.total_rooms,
+            'rooms_cleared': self.rooms_cleared,
+            'percent_cleared': percent_cleared * 100,
+            'success_score': success_score,
+            'responder_survival_pct': responder_survival_pct,
+            'num_responders': num_agents,
+            'avg_hazard_exposure': sim.agent_manager.get_average_hazard_exposure(),
+            'max_hazard': sim.env.hazard_system.get_max_hazard(),
+        }
+
+
+def take_hazard_snapshot(env, previous: Optional[HazardSnapshot] = None) -> Optional[HazardSnapshot]:
+    """
+    Copy the grid hazard cells into flat arrays (None without a grid model)
+
+    Args:
+        env: Environment to read
+        previous: Earlier snapshot whose cell order is reused while the
+            cell count is unchanged
+    """
+    cells = getattr(env.hazard_system, 'cells', None)
+    if not cells:
+        return None
+
+    if previous is not None and len(previous.positions) == len(cells):
+        positions, room_ids = previous.positions, previous.room_ids
+    else:
+        positions = tuple(cells.keys())
+        room_ids = tuple(cell.room_id for cell in cells.values())
+
+    frame_cells = [cells[pos] for pos in positions]
+    n = len(frame_cells)
+    return HazardSnapshot(
+        positions, room_ids,
+        np.fromiter((c.danger_level for c in frame_cells), dtype=np.float32, count=n),
+        np.fromiter((c.is_burning for c in frame_cells), dtype=bool, count=n),
+    )
+
+
+def take_snapshot(simulator, metrics: LiveMetrics, trail_length: int = 20,
+                  previous: Optional[FrameSnapshot] = None) -> FrameSnapshot:
+    """
+    Copy the drawable simulator state into an immutable FrameSnapshot
+
+    Args:
+        simulator: Simulator to read
+        metrics: LiveMetrics providing the info-panel numbers
+        trail_length: Number of trail points kept per agent
+        previous: Last snapshot taken, to reuse the hazard cell order
+    """
+    env = simulator.env
+    rooms = {
+        room_id: RoomSnapshot(
+            room.id, room.floor, room.x, room.y, room.x1, room.y1, room.x2, room.y2,
+            room.is_exit, room.is_stair, room.cleared, room.hazard,
+            room.evacuees_remaining, room.discovered_evacuees
+        )
+        for room_id, room in env.rooms.items()
+    }
+    agents = tuple(
+        AgentSnapshot(
+            agent.id, agent.x, agent.y, agent.floor, agent.state, agent.current_room,
+            tuple(agent.path), agent.path_index, tuple(agent.get_trail(trail_length))
+        )
+        for agent in simulator.agent_manager.agents
+    )
+    return FrameSnapshot(
+        tick=simulator.tick,
+        time=simulator.time,
+        complete=simulator.complete,
+        rooms=rooms,
+        floors=env.floors,
+        bounds=env.bounds,
+        agents=agents,
+        metrics=metrics.results(),
+        hazard_cells=take_hazard_snapshot(
+            env, previous.hazard_cells if previous is not None else None),
+    )
@@ -0,0 +1,132 @@
+"""Streaming video export - raw RGB frames piped to ffmpeg"""
+
+import io
+import json
+import shutil
+import subprocess
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+
+class VideoWriter:
+    """
+    Writes frames as they are produced, so memory stays constant
+
+    Frames go straight into an ffmpeg subprocess's stdin as raw RGB24. When
+    ffmpeg is not installed, frames are written as PNGs into a
+    ``<name>.frames.zip`` archive (with a manifest.json) that can be encoded
+    later, e.g. ``ffmpeg -framerate 30 -i frame_%06d.png out.mp4`` after
+    unzipping.
+    """
+
+    def __init__(self, output_path: str, width: int, height: int, fps: int = 30,
+                 ffmpeg: Optional[str] = None):
+        """
+        Initialize writer and start the encoder
+
+        Args:
+            output_path: Video file to create (e.g. outputs/run.mp4, .gif)
+            width, height: Frame size in pixels
+            fps: Playback frame rate
+            ffmpeg: ffmpeg executable (default: looked up on PATH)
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_count = 0
+        self.frame_bytes = width * height * 3
+
+        output = Path(output_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+        self._process = None
+        self._archive = None
+        ffmpeg = ffmpeg or shutil.which('ffmpeg')
+        self._use_ffmpeg = bool(ffmpeg)
+
+        if ffmpeg:
+            self.output_path = output
+            self._stderr = tempfile.TemporaryFile()
+            self._process = subprocess.Popen(
+                [ffmpeg, '-y', '-loglevel', 'error',
+                 '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                 '-s', f'{width}x{height}', '-framerate', str(fps),
+                 '-i', '-'] + self._codec_args(output) + [str(output)],
+                stdin=subprocess.PIPE, stderr=self._stderr
+            )
+        else:
+            self.output_path = output.with_suffix('.frames.zip')
+            self._archive = zipfile.ZipFile(self.output_path, 'w', zipfile.ZIP_STORED)
+
+    @staticmethod
+    def _codec_args(output: Path) -> list:
+        """Encoder arguments for the output container"""
+        if output.suffix.lower() == '.gif':
+            return []
+        # Even dimensions are required by yuv420p
+        return ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                '-c:v', 'libx264', '-pix_fmt', 'yuv420p']
+
+    @property
+    def uses_ffmpeg(self) -> bool:
+        """True when frames are piped to ffmpeg rather than archived"""
+        return self._use_ffmpeg
+
+    def write(self, rgb: bytes):
+        """
+        Append one frame
+
+        Args:
+            rgb: Row-major RGB24 pixels, width * height * 3 bytes
+        """
+        if len(rgb) != self.frame_bytes:
+            raise ValueError(f"Expected {self.frame_bytes} bytes per frame, got {len(rgb)}")
+
+        if self._process is not None:
+            try:
+                self._process.stdin.write(rgb)
+            except BrokenPipeError:
+                raise RuntimeError(f"ffmpeg exited early: {self._read_stderr()}") from None
+        else:
+            from PIL import Image
+            buf = io.BytesIO()
+            Image.frombuffer('RGB', (self.width, self.height), rgb, 'raw', 'RGB', 0, 1).save(
+                buf, format='PNG', compress_level=1)
+            self._archive.writestr(f'frame_{self.frame_count:06d}.png', buf.getvalue())
+        self.frame_count += 1
+
+    def _read_stderr(self) -> str:
+        """ffmpeg's error output so far"""
+        self._stderr.seek(0)
+        return self._stderr.read().decode(errors='replace').strip()
+
+    def close(self) -> Path:
+        """Finish encoding and return the path actually written"""
+        if self._process is not None:
+            process, self._process = self._process, None
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            if process.wait() != 0:
+                message = self._read_stderr()
+                self._stderr.close()
+                raise RuntimeError(f"ffmpeg failed: {message}")
+            self._stderr.close()
+        elif self._archive is not None:
+            archive, self._archive = self._archive, None
+            archive.writestr('manifest.json', json.dumps({
+                'width': self.width, 'height': self.height,
+                'fps': self.fps, 'frames': self.frame_count,
+                'pattern': 'frame_%06d.png',
+            }))
+            archive.close()
+        return self.output_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,13 +1,127 @@
 """Main visualizer class coordinating pygame UI"""
 
 import pygame
+import queue
+import threading
+import time
+import traceback
+from collections import deque
 from typing import Optional
 from pathlib import Path
 
+from .geometry import LayoutGeometry
 from .renderer import Renderer
+from .snapshot import FrameSnapshot, LiveMetrics, take_snapshot
+from .video import VideoWriter
 from ..engine.simulator import Simulator, SimulationEvent, EventType
 
 
+class SimulationWorker(threading.Thread):
+    """
+    Producer side of the decoupled visualizer
+
+    Steps the simulator on its own thread at ``speed * rate`` ticks per
+    second and publishes FrameSnapshots to a small bounded queue. When the
+    renderer falls behind, the oldest snapshot is dropped, so the renderer
+    always gets recent state and the simulator never waits on drawing.
+    """
+    
+    def __init__(self, simulator: Simulator, metrics: LiveMetrics, 
+                 rate: float, max_queued: int = 2):
+        """
+        Initialize worker
+        
+        Args:
+            simulator: Simulator to step (owned by this thread once started)
+            metrics: LiveMetrics attached to the simulator
+            rate: Ticks per second at speed 1.0
+            max_queued: Snapshots buffered before the oldest is dropped
+        """
+        super().__init__(name='simulation-worker', daemon=True)
+        self.sim = simulator
+        self.metrics = metrics
+        self.rate = rate
+        self.frames: queue.Queue = queue.Queue(maxsize=max_queued)
+        
+        # Written by the render thread, read here
+        self.paused = True
+        self.speed = 1.0
+        
+        self.error: Optional[BaseException] = None
+        self._last_snapshot: Optional[FrameSnapshot] = None
+        self._step_requests = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+    
+    def request_step(self):
+        """Advance one tick (works while paused)"""
+        with self._lock:
+            self._step_requests += 1
+    
+    def stop(self):
+        """Ask the worker to exit after its current step"""
+        self._stop_event.set()
+    
+    def latest(self) -> Optional[FrameSnapshot]:
+        """Most recent published snapshot, or None if nothing new"""
+        snapshot = None
+        while True:
+            try:
+                snapshot = self.frames.get_nowait()
+            except queue.Empty:
+                return snapshot
+    
+    def _publish(self):
+        """Push a snapshot, dropping the oldest one if the queue is full"""
+        snapshot = take_snapshot(self.sim, self.metrics, previous=self._last_snapshot)
+        self._last_snapshot = snapshot
+        while True:
+            try:
+                self.frames.put_nowait(snapshot)
+                return
+            except queue.Full:
+                try:
+                    self.frames.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def run(self):
+        try:
+            self._publish()
+            budget = 0.0
+            last = time.perf_counter()
+            
+            while not self._stop_event.is_set():
+                with self._lock:
+                    steps = self._step_requests
+                    self._step_requests = 0
+                
+                now = time.perf_counter()
+                if not self.paused and not self.sim.complete:
+                    # Carry fractional ticks over so 0.5x speed still advances
+                    budget += (now - last) * self.speed * self.rate
+                    steps += int(budget)
+                    budget -= int(budget)
+                else:
+                    budget = 0.0
+                last = now
+                
+                stepped = False
+                for _ in range(steps):
+                    if self.sim.complete or self._stop_event.is_set():
+                        break
+                    self.sim.step()
+                    stepped = True
+                
+                if stepped:
+                    self._publish()
+                else:
+                    self._stop_event.wait(1.0 / self.rate)
+        except Exception as e:  # Surface to the render thread instead of dying silently
+            self.error = e
+            traceback.print_exc()
+
+
 class Visualizer:
     """Main visualization controller"""
     
@@ -27,6 +141,7 @@ class Visualizer:
         self.fps_target = params.get('fps_target', 30)
         
         self.renderer = Renderer(width, height)
+        self.renderer.geometry = LayoutGeometry(simulator.env)  # Shared by live and snapshot frames
         self.clock = pygame.time.Clock()
         
         # Playback state
@@ -35,9 +150,20 @@ class Visualizer:
         self.speed_options = [0.5, 1.0, 2.0, 4.0]
         self.speed_index = 1
         
-        # Frame capture for video
+        # Frame capture for video (streamed to the encoder, not kept in RAM)
         self.recording = params.get('save_video', False)
-        self.frames = []
+        self.video_path = params.get('video_path', 'outputs/run.mp4')
+        self.video: Optional[VideoWriter] = None
+        
+        # Run the simulator on a worker thread (see run_decoupled)
+        self.decoupled = params.get('decoupled', False)
+        
+        # Info panel counters, updated from events instead of get_results()
+        self.metrics = LiveMetrics(simulator)
+        
+        # Annotations may be produced on the worker thread; the render
+        # thread drains this (deque append/popleft are thread-safe)
+        self._pending_annotations = deque()
         
         # Register for events
         simulator.add_event_callback(self._handle_simulation_event)
@@ -46,79 +172,133 @@ class Visualizer:
         """Handle simulation events for visualization"""
         # Add annotations for key events
         if event.event_type == EventType.ROOM_CLEARED:
-            self.renderer.add_annotation("✓", event.room_id, event.tick, 
-                                        duration=60, color=(0, 150, 0))
+            self._pending_annotations.append(("✓", event.room_id, event.tick, 
+                                              60, (0, 150, 0)))
         
         elif event.event_type == EventType.EVACUEE_FOUND:
             count = event.data.get('count', 1)
-            self.renderer.add_annotation(f"Found {count}!", event.room_id, 
-                                        event.tick, duration=90, color=(200, 0, 0))
+            self._pending_annotations.append((f"Found {count}!", event.room_id, 
+                                              event.tick, 90, (200, 0, 0)))
         
         elif event.event_type == EventType.EVACUEE_RESCUED:
-            self.renderer.add_annotation("Rescued!", event.room_id, 
-                                        event.tick, duration=60, color=(0, 100, 200))
+            self._pending_annotations.append(("Rescued!", event.room_id, 
+                                              event.tick, 60, (0, 100, 200)))
+    
+    def _flush_annotations(self):
+        """Hand queued annotations to the renderer (render thread only)"""
+        while self._pending_annotations:
+            text, room_id, tick, duration, color = self._pending_annotations.popleft()
+            self.renderer.add_annotation(text, room_id, tick, 
+                                        duration=duration, color=color)
+    
+    def _handle_input(self, step_once) -> bool:
+        """
+        Process pygame events
+        
+        Args:
+            step_once: Callable advancing the simulation by one tick
+            
+        Returns:
+            False once the user asked to quit
+        """
+        running = True
+        
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                
+                elif event.key == pygame.K_SPACE:
+                    self.paused = not self.paused
+                
+                elif event.key == pygame.K_RIGHT:
+                    # Step forward
+                    step_once()
+                
+                elif event.key == pygame.K_EQUALS or event.key == pygame.K_PLUS:
+                    # Increase speed
+                    self.speed_index = min(self.speed_index + 1, 
+                                          len(self.speed_options) - 1)
+                    self.speed = self.speed_options[self.speed_index]
+                
+                elif event.key == pygame.K_MINUS:
+                    # Decrease speed
+                    self.speed_index = max(self.speed_index - 1, 0)
+                    self.speed = self.speed_options[self.speed_index]
+                
+                elif event.key == pygame.K_UP:
+                    # Next floor
+                    max_floor = max(self.sim.env.floors.keys())
+                    self.renderer.current_floor = min(
+                        self.renderer.current_floor + 1, max_floor)
+                
+                elif event.key == pygame.K_DOWN:
+                    # Previous floor
+                    self.renderer.current_floor = max(
+                        self.renderer.current_floor - 1, 0)
+                
+                elif event.key >= pygame.K_1 and event.key <= pygame.K_9:
+                    # Direct floor selection
+                    floor = event.key - pygame.K_1
+                    if floor in self.sim.env.floors:
+                        self.renderer.current_floor = floor
+                
+                elif event.key == pygame.K_h:
+                    # Toggle hazard
+                    self.renderer.show_hazard = not self.renderer.show_hazard
+                
+                elif event.key == pygame.K_t:
+                    # Toggle trails
+                    self.renderer.show_trails = not self.renderer.show_trails
+                
+                elif event.key == pygame.K_e:
+                    # Toggle evacuees
+                    self.renderer.show_evacuees = not self.renderer.show_evacuees
+        
+        return running
+    
+    def _render_frame(self, env, agent_manager, tick: int, sim_time: float, results: dict):
+        """Draw one frame from live objects or a FrameSnapshot"""
+        self._flush_annotations()
+        self.renderer.clear()
+        self.renderer.render_map(env, agent_manager, tick)
+        self.renderer.render_controls(self.paused, self.speed, tick, sim_time)
+        self.renderer.render_info_panel(env, agent_manager, results, tick)
+        self.renderer.flip()
+        
+        # Capture frame if recording
+        if self.recording and tick % 2 == 0:  # Every other frame
+            self._capture_frame()
+    
+    def _capture_frame(self):
+        """Stream the current screen into the video encoder"""
+        try:
+            if self.video is None:
+                width, height = self.renderer.screen.get_size()
+                self.video = VideoWriter(self.video_path, width, height,
+                                         fps=self.params.get('video_fps', 30))
+            self.video.write(pygame.image.tobytes(self.renderer.screen, 'RGB'))
+        except Exception as e:
+            print(f"Warning: Could not record video: {e}")
+            self.recording = False
+            self._save_video()
     
     def run(self):
         """Run visualization with interactive controls"""
+        if self.decoupled:
+            return self.run_decoupled()
+        
+        def step_once():
+            if not self.sim.complete:
+                self.sim.step()
+        
         running = True
         
         while running:
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-                    
-                    elif event.key == pygame.K_SPACE:
-                        self.paused = not self.paused
-                    
-                    elif event.key == pygame.K_RIGHT:
-                        # Step forward
-                        if not self.sim.complete:
-                            self.sim.step()
-                    
-                    elif event.key == pygame.K_EQUALS or event.key == pygame.K_PLUS:
-                        # Increase speed
-                        self.speed_index = min(self.speed_index + 1, 
-                                              len(self.speed_options) - 1)
-                        self.speed = self.speed_options[self.speed_index]
-                    
-                    elif event.key == pygame.K_MINUS:
-                        # Decrease speed
-                        self.speed_index = max(self.speed_index - 1, 0)
-                        self.speed = self.speed_options[self.speed_index]
-                    
-                    elif event.key == pygame.K_UP:
-                        # Next floor
-                        max_floor = max(self.sim.env.floors.keys())
-                        self.renderer.current_floor = min(
-                            self.renderer.current_floor + 1, max_floor)
-                    
-                    elif event.key == pygame.K_DOWN:
-                        # Previous floor
-                        self.renderer.current_floor = max(
-                            self.renderer.current_floor - 1, 0)
-                    
-                    elif event.key >= pygame.K_1 and event.key <= pygame.K_9:
-                        # Direct floor selection
-                        floor = event.key - pygame.K_1
-                        if floor in self.sim.env.floors:
-                            self.renderer.current_floor = floor
-                    
-                    elif event.key == pygame.K_h:
-                        # Toggle hazard
-                        self.renderer.show_hazard = not self.renderer.show_hazard
-                    
-                    elif event.key == pygame.K_t:
-                        # Toggle trails
-                        self.renderer.show_trails = not self.renderer.show_trails
-                    
-                    elif event.key == pygame.K_e:
-                        # Toggle evacuees
-                        self.renderer.show_evacuees = not self.renderer.show_evacuees
+            running = self._handle_input(step_once)
             
             # Update simulation if not paused
             if not self.paused and not self.sim.complete:
@@ -129,20 +309,8 @@ class Visualizer:
                         self.sim.step()
             
             # Render
-            self.renderer.clear()
-            self.renderer.render_map(self.sim.env, self.sim.agent_manager, self.sim.tick)
-            self.renderer.render_controls(self.paused, self.speed, 
-                                         self.sim.tick, self.sim.time)
-            
-            results = self.sim.get_results()
-            self.renderer.render_info_panel(self.sim.env, self.sim.agent_manager, 
-                                           results, self.sim.tick)
-            
-            self.renderer.flip()
-            
-            # Capture frame if recording
-            if self.recording and self.sim.tick % 2 == 0:  # Every other frame
-                self.frames.append(self.renderer.capture_frame())
+            self._render_frame(self.sim.env, self.sim.agent_manager, 
+                               self.sim.tick, self.sim.time, self.metrics.results())
             
             # Check if simulation complete
             if self.sim.complete:
@@ -153,53 +321,68 @@ class Visualizer:
         
         pygame.quit()
         
-        # Save video if recorded
-        if self.recording and self.frames:
-            self._save_video()
+        # Finish video if recorded
+        self._save_video()
     
-    def _save_video(self):
-        """Save captured frames as video"""
-        print(f"Saving video with {len(self.frames)} frames...")
+    def run_decoupled(self):
+        """
+        Run with the simulator on a worker thread
         
-        try:
-            import subprocess
-            from PIL import Image
-            import tempfile
-            
-            # Save frames as images
-            temp_dir = Path(tempfile.mkdtemp())
-            
-            for i, surface in enumerate(self.frames):
-                # Convert pygame surface to PIL Image
-                frame_data = pygame.surfarray.array3d(surface)
-                frame_data = frame_data.swapaxes(0, 1)  # Pygame uses (width, height)
-                img = Image.fromarray(frame_data)
-                img.save(temp_dir / f"frame_{i:06d}.png")
-            
-            # Use ffmpeg to create video
-            output_path = "outputs/run.mp4"
-            Path("outputs").mkdir(exist_ok=True)
+        The render loop only draws the latest FrameSnapshot at fps_target, so
+        heavy rendering no longer slows the simulation and high speed
+        multipliers no longer stall the display.
+        """
+        worker = SimulationWorker(self.sim, self.metrics, rate=self.fps_target)
+        worker.start()
+        
+        snapshot = None
+        running = True
+        
+        while running:
+            running = self._handle_input(worker.request_step)
+            worker.paused = self.paused
+            worker.speed = self.speed
             
-            cmd = [
-                'ffmpeg', '-y',
-                '-framerate', str(self.params.get('video_fps', 30)),
-                '-i', str(temp_dir / 'frame_%06d.png'),
-                '-c:v', 'libx264',
-                '-pix_fmt', 'yuv420p',
-                output_path
-            ]
+            if worker.error is not None:
+                print(f"Simulation worker failed: {worker.error}")
+                break
             
-            subprocess.run(cmd, check=True, capture_output=True)
-            print(f"Video saved to {output_path}")
+            latest = worker.latest()
+            if latest is not None:
+                snapshot = latest
             
-            # Clean up temp files
-            for f in temp_dir.glob("*.png"):
-                f.unlink()
-            temp_dir.rmdir()
+            if snapshot is not None:
+                # The snapshot stands in for both env and agent_manager
+                self._render_frame(snapshot, snapshot, snapshot.tick, 
+                                   snapshot.time, snapshot.metrics)
+                
+                # Check if simulation complete
+                if snapshot.complete:
+                    self.paused = True
             
+            # Frame rate limit
+            self.clock.tick(self.fps_target)
+        
+        worker.stop()
+        worker.join()
+        pygame.quit()
+        
+        # Finish video if recorded
+        self._save_video()
+    
+    def _save_video(self):
+        """Finish the streamed video, if one was started"""
+        if self.video is None:
+            return
+        
+        video, self.video = self.video, None
+        try:
+            output_path = video.close()
+            print(f"Video saved to {output_path} ({video.frame_count} frames)")
+            if not video.uses_ffmpeg:
+                print("ffmpeg not found - frames archived as PNGs for later encoding.")
         except Exception as e:
             print(f"Warning: Could not save video: {e}")
-            print("Frames captured but ffmpeg may not be available.")
     
     def run_headless(self, output_path: Optional[str] = None):
         """
@@ -215,9 +398,8 @@ class Visualizer:
             # Render final state
             self.renderer.clear()
             self.renderer.render_map(self.sim.env, self.sim.agent_manager, self.sim.tick)
-            results = self.sim.get_results()
             self.renderer.render_info_panel(self.sim.env, self.sim.agent_manager,
-                                           results, self.sim.tick)
+                                           self.metrics.results(), self.sim.tick)
             
             pygame.image.save(self.renderer.screen, output_path)
             print(f"Final state saved to {output_path}")
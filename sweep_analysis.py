@@ -93,6 +93,7 @@ class SweepAnalyzer:
             step_count += 1
         
         elapsed = time.time() - start_time
+        sim.close()
         results = sim.get_results()
         
         # Calculate path metrics
@@ -193,12 +193,14 @@ def test_latency():
     print(f"  Time: {results['time']:.1f}s")
     print(f"  Rooms cleared: {results['rooms_cleared']}/{results['total_rooms']}")
     print(f"  Success score: {results['success_score']:.3f}")
+    print(f"  Reports delivered: {sim.message_bus.delivered}/{sim.message_bus.sent}")
     
-    # Note: Latency is enabled in params but not fully implemented in MVP
-    # This test verifies the system still runs with latency flag on
+    # Agent reports reach the decision engine through the delayed message bus
+    assert sim.message_bus is not None, "Latency should route reports through the message bus"
+    assert sim.message_bus.delivered > 0, "Delayed reports should be delivered"
     assert results['rooms_cleared'] > 0, "Should clear some rooms despite latency"
     
-    print("✓ TEST PASSED (latency parameter accepted)")
+    print("✓ TEST PASSED")
     return True
 
 
@@ -0,0 +1,125 @@
+"""MatplotlibAnimator frame loop, heatmap and level-of-detail display (Agg backend)"""
+
+import os
+os.environ.setdefault('MPLBACKEND', 'Agg')  # Headless - must precede the animator import
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+plt = pytest.importorskip('matplotlib.pyplot')
+
+from sim.engine.simulator import Simulator
+from sim.viz.matplotlib_animator import MatplotlibAnimator
+
+
+@pytest.fixture
+def animator(params, make_env):
+    params['agents']['count'] = 3
+    sim = Simulator(make_env(params), params)
+    for _ in range(40):
+        sim.step(fire_enabled=True)
+    anim = MatplotlibAnimator(sim)
+    yield anim
+    plt.close(anim.fig)
+
+
+def _burning(anim):
+    cells = anim.sim.env.hazard_system.cells
+    return np.array([cells[k].is_burning for k in anim._heatmap_keys])
+
+
+def test_burning_cells_glow_at_1_3x_under_the_mesh(animator):
+    animator._draw_cell_heatmap()
+    burning = _burning(animator)
+    assert burning.any()
+
+    res = animator.grid_resolution
+    paths = animator.heatmap_glow.get_paths()
+    assert len(paths) == burning.sum()
+    for path, (x, y) in zip(paths, animator._heatmap_xy[burning]):
+        extent = path.get_extents()
+        assert extent.width == pytest.approx(1.3 * res)
+        assert (extent.x0 + extent.x1) / 2 == pytest.approx(x)
+        assert (extent.y0 + extent.y1) / 2 == pytest.approx(y)
+    assert animator.heatmap_glow.get_zorder() < animator.heatmap_mesh.get_zorder()
+
+    cols = animator._heatmap_shape[1]
+    faces = animator.heatmap_mesh.get_facecolor()
+    flat = animator._heatmap_rows * cols + animator._heatmap_cols
+    np.testing.assert_array_equal(faces[flat[burning]], [[1.0, 0.0, 0.0, 1.0]] * burning.sum())
+
+
+def test_fire_stats_are_printed_only_when_verbose(animator, capsys):
+    animator.sim.tick = 40
+    animator._draw_cell_heatmap()
+    assert capsys.readouterr().out == ''
+
+    animator.verbose = True
+    animator._draw_cell_heatmap()
+    assert '[FIRE] Tick 40' in capsys.readouterr().out
+
+
+def test_coarse_heatmap_keeps_burning_cells(animator):
+    animator.lod_enabled = True
+    cell_px = animator.grid_resolution * animator._pixels_per_metre()
+    animator.lod_min_cell_px = 1.5 * cell_px  # Merge 2x2 blocks
+    animator._draw_cell_heatmap()
+
+    rows, cols = animator._heatmap_shape
+    faces = animator.heatmap_mesh.get_facecolor()
+    assert animator._heatmap_factor == 2
+    assert len(faces) == -(-rows // 2) * -(-cols // 2)
+    burning = _burning(animator)
+    blocks = {(r // 2, c // 2) for r, c in zip(animator._heatmap_rows[burning],
+                                               animator._heatmap_cols[burning])}
+    for r, c in blocks:
+        np.testing.assert_array_equal(faces[r * -(-cols // 2) + c], [1.0, 0.0, 0.0, 1.0])
+
+
+def test_lod_toggle_is_shown_in_the_info_panel(animator, capsys):
+    animator._update_frame(0)
+    assert 'LOD: OFF' in animator.info_text.get_text()
+
+    animator._on_key(SimpleNamespace(key='d'))
+    animator._update_frame(1)
+    assert f'LOD: ON, {animator.ticks_per_frame} ticks/frame' in animator.info_text.get_text()
+    assert capsys.readouterr().out == ''
+
+
+def test_frames_update_retained_artists(animator):
+    animator.paused = False
+    animator.speed = 2
+    returned = animator._update_frame(0)
+    children = animator.ax.get_children()
+    agent_artists = {i: dict(a) for i, a in animator.agent_artists.items()}
+    tick = animator.sim.tick
+
+    for frame in range(1, 6):
+        returned = animator._update_frame(frame)
+        assert animator.ax.get_children() == children  # Nothing added or dropped
+    assert animator.sim.tick == tick + 10
+    assert animator.agent_artists == agent_artists
+    for i, artists in agent_artists.items():
+        assert all(a is animator.agent_artists[i][k] for k, a in artists.items())
+
+    assert len(returned) == len(set(map(id, returned)))
+    assert all(artist in children for artist in returned)
+    assert animator.heatmap_mesh in returned and animator.info_text in returned
+
+
+def test_floor_change_rebuilds_artists(params, make_env):
+    params['agents']['count'] = 2
+    anim = MatplotlibAnimator(Simulator(make_env(params, 'office_3f.json'), params))
+    try:
+        anim._update_frame(0)
+        anim._on_key(SimpleNamespace(key='up'))
+        assert anim.current_floor == 1 and anim.heatmap_mesh is None
+        returned = anim._update_frame(1)
+        children = anim.ax.get_children()
+        assert all(artist in children for artist in returned)
+        floor_rooms = set(anim.sim.env.floors[1])
+        assert anim.room_patches and set(anim.room_patches) <= floor_rooms
+    finally:
+        plt.close(anim.fig)
@@ -0,0 +1,60 @@
+"""Recorded runs and the offline batch renderer"""
+
+import io
+import pickle
+import zipfile
+
+import numpy as np
+
+from conftest import run_to_end
+from sim.engine.simulator import Simulator
+from sim.viz import video as video_module
+from sim.viz.batch_renderer import BatchRenderer, RunRecorder
+
+
+def _recorded(params, make_env, max_ticks=None, every=1):
+    params['agents']['count'] = 2
+    recorder = RunRecorder(Simulator(make_env(params), params), every=every)
+    results = recorder.run(max_ticks=max_ticks)
+    return recorder, results
+
+
+def test_recording_follows_the_run(params, make_env):
+    recorder, results = _recorded(params, make_env, max_ticks=150, every=5)
+    expected = run_to_end(Simulator(make_env(params), params), max_ticks=150)
+    assert results['ticks'] == expected['ticks']
+    assert results['evacuees_rescued'] == expected['evacuees_rescued']
+
+    ticks = [frame.tick for frame in recorder.frames]
+    assert ticks[0] == 0 and ticks[-1] == results['ticks']
+    assert all(t % 5 == 0 for t in ticks[:-1]) and ticks == sorted(set(ticks))
+    last = recorder.frames[-1]
+    assert last.rescued == results['evacuees_rescued']
+    assert last.cell_burning.any() and len(last.cell_danger) == len(recorder.cell_xy)
+
+    copy = pickle.loads(pickle.dumps(recorder))
+    assert copy.sim is None and len(copy.frames) == len(recorder.frames)
+
+
+def _png_frames(path):
+    from PIL import Image
+    with zipfile.ZipFile(path) as archive:
+        names = sorted(n for n in archive.namelist() if n.endswith('.png'))
+        return [np.asarray(Image.open(io.BytesIO(archive.read(n)))) for n in names]
+
+
+def test_parallel_chunks_match_a_single_worker(params, make_env, tmp_path, monkeypatch):
+    monkeypatch.setattr(video_module.shutil, 'which', lambda name: None)
+    recorder, _ = _recorded(params, make_env, max_ticks=7)
+    assert len(recorder.frames) == 8
+
+    kwargs = dict(width=160, height=120, dpi=40)
+    serial = BatchRenderer(recorder, workers=1, chunk_size=100, **kwargs).render(str(tmp_path / 'a.mp4'))
+    parallel = BatchRenderer(recorder, workers=2, chunk_size=3, **kwargs).render(str(tmp_path / 'b.mp4'))
+
+    assert serial == tmp_path / 'a.frames.zip' and parallel == tmp_path / 'b.frames.zip'
+    a, b = _png_frames(serial), _png_frames(parallel)
+    assert len(a) == len(b) == 8 and a[0].shape == (120, 160, 3)
+    for frame_a, frame_b in zip(a, b):
+        np.testing.assert_array_equal(frame_a, frame_b)
+    assert any((f != a[0]).any() for f in a[1:])  # The run actually moves
@@ -0,0 +1,78 @@
+"""DecisionEngine joint assignment and route cache"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from sim.engine.simulator import Simulator
+
+
+def _engine(params, make_env, count, layout='office_correct_dimensions.json'):
+    params['agents']['count'] = count
+    env = make_env(params, layout)
+    sim = Simulator(env, params)
+    return sim, sim.decision_engine
+
+
+def _brute_force(scores):
+    """Best (reachable matches, total score) over all injective agent -> room maps"""
+    agents, rooms = scores.shape
+    best = (0, 0.0)
+    for cols in itertools.permutations(range(rooms), agents):
+        picked = [scores[i, j] for i, j in enumerate(cols) if not np.isnan(scores[i, j])]
+        best = max(best, (len(picked), float(np.sum(picked))))
+    return best
+
+
+@pytest.mark.parametrize('count,seed', [(2, 0), (3, 1), (4, 2), (5, 3)])
+def test_hungarian_matches_brute_force(params, make_env, count, seed):
+    sim, engine = _engine(params, make_env, count)
+    rng = np.random.default_rng(seed)
+    room_ids = engine.env.get_uncleared_rooms()
+    for agent in sim.agent_manager.agents:
+        agent.current_room = str(rng.choice(list(engine.env.rooms)))
+    for room in engine.env.rooms.values():
+        room.hazard = float(rng.random()) * 0.5
+    if count > 3:  # Some pairs unreachable
+        engine.env.graph.remove_edge('HALL', 'O3')
+        engine.refresh_routes()
+
+    agents = sorted(sim.agent_manager.agents, key=lambda a: a.id)
+    scores, _ = engine.score_matrix(agents, room_ids)
+    assignments = engine._select_rooms_hungarian(agents)
+
+    rooms = [assignments[a.id].room_id for a in agents if a.id in assignments]
+    assert len(set(rooms)) == len(rooms)
+    total = sum(assignments[a.id].score for a in agents if a.id in assignments)
+    matches, best = _brute_force(scores)
+    assert len(rooms) == matches
+    assert total == pytest.approx(best, rel=1e-12)
+
+
+def test_routes_follow_graph_changes(params, make_env):
+    sim, engine = _engine(params, make_env, 1)
+    agent = sim.agent_manager.agents[0]
+    agent.current_room = 'HALL'
+    assert engine.calculate_priority_index('O3', 'HALL') > 0
+    assert engine.score_room(agent, 'O3') is not None
+
+    engine.env.graph.remove_edge('HALL', 'O3')
+    assert engine.refresh_routes()
+    assert not engine.refresh_routes()  # Unchanged since
+    assert engine.env.get_shortest_path('HALL', 'O3') is None
+    assert engine.calculate_priority_index('O3', 'HALL') == 0.0
+    assert engine.calculate_priority_indices(['O3'], 'HALL')[0] == 0.0
+    assert engine.score_room(agent, 'O3') is None
+
+    engine.env.graph.add_edge('HALL', 'O3', weight=50)
+    assert engine.refresh_routes()
+    assert engine.score_room(agent, 'O3') is not None
+
+
+def test_simulator_refreshes_routes_every_tick(params, make_env):
+    sim, engine = _engine(params, make_env, 2)
+    sim.step()
+    engine.env.graph.remove_edge('HALL', 'O3')
+    sim.step()
+    assert engine._route('HALL', 'O3') is None
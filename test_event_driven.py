@@ -0,0 +1,83 @@
+"""Simulator.advance (next-event time advance) against per-tick stepping"""
+
+import math
+
+import pytest
+
+from conftest import run_to_end, trace
+from sim.engine.simulator import Simulator
+
+
+def _run(params, make_env, event_driven, layout='office_correct_dimensions.json',
+         count=3, latency=False, dt=1.0, room_graph=False, warmup=0):
+    params['agents']['count'] = count
+    params['latency']['enabled'] = latency
+    params['simulation']['tick_duration'] = dt
+    params['simulation']['time_cap'] = 1000
+    params['simulation']['debug_checks'] = event_driven
+    env = make_env(params, layout)
+    if room_graph:  # No hazard cells: agents walk room to room
+        del env.hazard_system.cells
+        env.hazard_system.get_max_hazard = lambda: 0.0
+    sim = Simulator(env, params)
+    for _ in range(warmup):  # Let the fire grow, then freeze it
+        sim.step()
+    results = run_to_end(sim, fire_enabled=False, max_ticks=10000, event_driven=event_driven)
+    return sim, results, env.update_calls
+
+
+def _assert_same_run(stepped, advanced):
+    (sim0, results0, _), (sim1, results1, _) = stepped, advanced
+    assert trace(sim0) == trace(sim1)
+    assert (sim0.tick, sim0.time) == (sim1.tick, sim1.time)
+    for key in results0:
+        if key != 'agents':
+            assert results0[key] == pytest.approx(results1[key], rel=1e-9), key
+    for a, b in zip(sim0.agent_manager.agents, sim1.agent_manager.agents):
+        assert (a.state, a.current_room, a.current_waypoint) == (b.state, b.current_room, b.current_waypoint)
+        assert (a.x, a.y) == pytest.approx((b.x, b.y), abs=1e-9)
+        assert a.cumulative_hazard_exposure == pytest.approx(b.cumulative_hazard_exposure, rel=1e-9)
+        assert len(a.position_history) == len(b.position_history)
+        for p, q in zip(a.position_history, b.position_history):
+            assert p == pytest.approx(q, abs=1e-9)
+
+
+@pytest.mark.parametrize('layout,latency,room_graph,dt', [
+    ('office_correct_dimensions.json', False, False, 1.0),
+    ('office_correct_dimensions.json', True, False, 1.0),
+    ('office_correct_dimensions.json', False, True, 1.0),
+    ('office_correct_dimensions.json', True, True, 0.5),
+    ('office_correct_dimensions.json', False, False, 0.1),  # Rounding ties in moves and timers
+    ('office_3f.json', False, True, 1.0),  # Stairs
+    ('office_3f.json', True, True, 1.0),
+])
+def test_advance_matches_stepping(params, make_env, layout, latency, room_graph, dt):
+    stepped = _run(params, make_env, False, layout, latency=latency, room_graph=room_graph, dt=dt)
+    advanced = _run(params, make_env, True, layout, latency=latency, room_graph=room_graph, dt=dt)
+    _assert_same_run(stepped, advanced)
+    assert advanced[2] < stepped[2]  # Quiet ticks skip the hazard update
+
+
+def test_advance_accumulates_frozen_hazard_exposure(params, make_env):
+    stepped = _run(params, make_env, False, count=6, warmup=40)
+    advanced = _run(params, make_env, True, count=6, warmup=40)
+    assert any(a.cumulative_hazard_exposure > 0 for a in advanced[0].agent_manager.agents)
+    _assert_same_run(stepped, advanced)
+
+
+def test_advance_with_fire_is_one_step(params, make_env):
+    params['agents']['count'] = 2
+    sim = Simulator(make_env(params), params)
+    assert sim.advance(fire_enabled=True) == 1
+    assert math.isclose(sim.time, sim.dt)
+
+
+def test_debug_check_catches_a_changing_hazard_field(params, make_env):
+    params['agents']['count'] = 2
+    params['simulation']['debug_checks'] = True
+    env = make_env(params)
+    sim = Simulator(env, params)
+    sim.step(fire_enabled=False)
+    env.update_hazards = lambda tick, dt, fire_enabled=True: env.hazard_system.update()
+    with pytest.raises(RuntimeError):
+        run_to_end(sim, fire_enabled=False, max_ticks=400, event_driven=True)
@@ -0,0 +1,68 @@
+"""EventTable columns and the chart series built from them"""
+
+import numpy as np
+
+from conftest import run_to_end
+from sim.engine.event_table import EventTable
+from sim.engine.simulator import EventType, SimulationEvent, Simulator
+from sim.viz.charts import ChartGenerator
+
+
+def _columns(events):
+    return (
+        [EventTable.TYPE_CODES[e.event_type] for e in events],
+        [e.tick for e in events],
+        [e.time for e in events],
+        [-1 if e.agent_id is None else e.agent_id for e in events],
+        [e.room_id for e in events],
+    )
+
+
+def _table_columns(table):
+    rooms = [None if r < 0 else table.room_ids[r] for r in table.rooms.tolist()]
+    return (table.type_codes.tolist(), table.ticks.tolist(), table.times.tolist(),
+            table.agents.tolist(), rooms)
+
+
+def test_live_table_matches_the_event_list(params, make_env):
+    params['agents']['count'] = 3
+    sim = Simulator(make_env(params), params)
+    live = EventTable(capacity=2)  # Forces several doublings
+    sim.add_event_callback(live.append)
+    run_to_end(sim)
+
+    assert len(live) == len(sim.events) > 2
+    assert _table_columns(live) == _columns(sim.events)
+    assert _table_columns(EventTable.from_events(sim.events)) == _columns(sim.events)
+
+
+def test_empty_table():
+    table = EventTable.from_events([])
+    assert len(table) == 0
+    assert list(table.to_dataframe().columns) == ['tick', 'time', 'type', 'agent', 'room']
+
+
+def test_cumulative_counts_per_type(tmp_path):
+    kinds = [EventType.ROOM_CLEARED, EventType.AGENT_MOVE, EventType.EVACUEE_RESCUED,
+             EventType.ROOM_CLEARED, EventType.EVACUEE_RESCUED, EventType.ROOM_CLEARED]
+    events = [SimulationEvent(i, i * 0.5, kind, 0, 'O1', {}) for i, kind in enumerate(kinds)]
+    df = EventTable.from_events(events).to_dataframe()
+    series = ChartGenerator(str(tmp_path))._cumulative_counts(
+        df, [EventType.ROOM_CLEARED, EventType.EVACUEE_RESCUED, EventType.AGENT_ARRIVE])
+
+    for kind, (times, counts) in series.items():
+        expected = [e.time for e in events if e.event_type == kind]
+        np.testing.assert_array_equal(times, expected)
+        np.testing.assert_array_equal(counts, np.arange(1, len(expected) + 1))
+    assert len(series[EventType.AGENT_ARRIVE][0]) == 0
+
+
+def test_summary_charts_accept_a_table_or_a_list(params, make_env, tmp_path):
+    params['agents']['count'] = 2
+    sim = Simulator(make_env(params), params)
+    results = run_to_end(sim)
+    charts = ChartGenerator(str(tmp_path))
+    charts.generate_summary_charts(EventTable.from_events(sim.events), results, 'table.png')
+    charts.generate_summary_charts(sim.events, results, 'list.png')
+    assert (tmp_path / 'table.png').stat().st_size > 0
+    assert (tmp_path / 'list.png').stat().st_size > 0
@@ -0,0 +1,94 @@
+"""Per-floor geometry shared by the renderers, and the per-floor hazard heatmap"""
+
+import json
+
+import matplotlib.image
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from sim.viz.charts import ChartGenerator
+from sim.viz.geometry import LayoutGeometry, build_walls
+
+LAYOUTS = sorted(p.name for p in (ROOT / 'layouts').glob('*.json'))
+
+
+def _load(name):
+    with open(ROOT / 'layouts' / name) as f:
+        return json.load(f)
+
+
+def _stepped_walls(layout, floor, res=0.5):
+    """Wall cells as the per-patch WallRenderer laid them, stepping res at a time"""
+    rooms = {r['id']: r for r in layout['rooms'] if r.get('floor', 0) == floor}
+    cells = []
+
+    def line(start, end, fixed, horizontal):
+        pos = start
+        while pos < end:
+            cells.append((pos, fixed - res / 2) if horizontal else (fixed - res / 2, pos))
+            pos += res
+
+    for room_id, room in rooms.items():
+        if room.get('type', 'office') == 'hallway' or room.get('is_exit'):
+            continue
+        xc, yc, w, h = room['x'], room['y'], room['width'], room['height']
+        x1, y1, x2, y2 = xc - w / 2, yc - h / 2, xc + w / 2, yc + h / 2
+        sides = set()
+        for conn in layout.get('connections', []):
+            if room_id in (conn['from'], conn['to']):
+                other = rooms.get(conn['to'] if conn['from'] == room_id else conn['from'])
+                if other and other.get('type') == 'hallway':
+                    sides.add('top' if other['y'] < yc else 'bottom')
+        for y, side in ((y1, 'top'), (y2, 'bottom')):
+            if side in sides:
+                line(x1, xc - 1.5 * res, y, True)
+                line(xc + 1.5 * res, x2, y, True)
+            else:
+                line(x1, x2, y, True)
+        line(y1, y2, x1, False)
+        line(y1, y2, x2, False)
+    return np.array(cells, dtype=float).reshape(-1, 2)
+
+
+@pytest.mark.parametrize('name', LAYOUTS)
+def test_wall_cells_match_the_stepped_walls(name):
+    layout = _load(name)
+    for floor in {r.get('floor', 0) for r in layout['rooms']}:
+        cells, doors = build_walls(layout, floor)
+        expected = _stepped_walls(layout, floor)
+        assert len(cells) == len(expected)
+        np.testing.assert_allclose(cells, expected, atol=1e-9)
+        assert np.all(doors[:, 2] - doors[:, 0] == pytest.approx(1.5))
+
+
+def test_floor_geometry_fits_and_caches(params, make_env):
+    env = make_env(params, 'office_3f.json')
+    geometry = LayoutGeometry(env)
+    assert set(geometry.floors) == set(env.floors) and geometry.floor(9) is None
+
+    floor = geometry.floor(1)
+    assert floor.room_ids == env.floors[1]
+    transform, rects, centers = floor.fit((10, 20, 800, 600))
+    assert floor.fit((10, 20, 800, 600))[0] is transform
+    x_min, y_min, x_max, y_max = env.bounds[1]
+    middle = transform.to_screen((x_min + x_max) / 2, (y_min + y_max) / 2)
+    assert middle == pytest.approx((410, 320), abs=1)
+    for room_id, (x, y, w, h), center in zip(floor.room_ids, rects, centers):
+        room = env.rooms[room_id]
+        assert (x, y) == transform.to_screen(room.x1, room.y1)
+        assert tuple(center) == transform.to_screen(room.x, room.y)
+
+
+def test_parallel_heatmap_matches_serial(params, make_env, tmp_path):
+    env = make_env(params, 'office_3f.json')
+    for i, room in enumerate(env.rooms.values()):
+        room.hazard = (i % 7) / 6
+    charts = ChartGenerator(str(tmp_path))
+    charts.generate_hazard_heatmap(env, 'serial.png', workers=1)
+    charts.generate_hazard_heatmap(env, 'parallel.png', workers=3)
+
+    serial = matplotlib.image.imread(tmp_path / 'serial.png')
+    parallel = matplotlib.image.imread(tmp_path / 'parallel.png')
+    assert serial.shape[1] > serial.shape[0]  # Three panels side by side
+    np.testing.assert_array_equal(serial, parallel)
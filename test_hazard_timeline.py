@@ -0,0 +1,72 @@
+"""Hazard timeline replay against live hazard updates"""
+
+import numpy as np
+
+from sim.engine.hazard_timeline import _cell_list, _read_cells
+from sim.engine.simulator import Simulator
+from sim.policy.priority import PriorityPolicy
+
+
+class _DrawingPolicy(PriorityPolicy):
+    """PriorityPolicy that also draws from the global RNG (like rollouts or noisy policies)"""
+
+    def assign(self, sim, agents, rooms):
+        np.random.random(7)
+        return super().assign(sim, agents, rooms)
+
+
+def _fire_trace(params, make_env, ticks, fire_off_at=None, policy=None, count=3):
+    """Danger of every cell after each tick"""
+    params['agents']['count'] = count
+    env = make_env(params)
+    sim = Simulator(env, params, policy=policy)
+    trace = []
+    for tick in range(ticks):
+        sim.step(fire_enabled=tick != fire_off_at)
+        trace.append(_read_cells(_cell_list(env))[0])
+    sim.close()
+    return sim, np.array(trace)
+
+
+def test_fire_does_not_depend_on_agent_draws(params, make_env):
+    _, plain = _fire_trace(params, make_env, 40)
+    _, drawing = _fire_trace(params, make_env, 40, policy=_DrawingPolicy())
+    assert np.array_equal(plain, drawing)
+
+
+def test_replay_matches_live_run(params, make_env, tmp_path):
+    live_sim, live = _fire_trace(params, make_env, 40, count=2)
+
+    params['simulation']['hazard_cache'] = str(tmp_path)
+    _fire_trace(params, make_env, 40, count=3)  # Records (agent count is not part of the key)
+    replay_sim, replay = _fire_trace(params, make_env, 40, count=2)
+
+    assert replay_sim.hazard_driver.replaying
+    assert np.array_equal(live, replay)
+    assert replay_sim.get_results() == live_sim.get_results()
+
+
+def test_switch_to_live_continues_the_same_fire(params, make_env, tmp_path):
+    # A fire-disabled tick ends replay; the rebuilt fire must continue
+    # exactly like a run that was live all along, whatever the agents drew
+    _, live = _fire_trace(params, make_env, 40, fire_off_at=15, policy=_DrawingPolicy())
+
+    params['simulation']['hazard_cache'] = str(tmp_path)
+    _fire_trace(params, make_env, 40)
+    sim, resumed = _fire_trace(params, make_env, 40, fire_off_at=15, policy=_DrawingPolicy())
+
+    assert not sim.hazard_driver.replaying
+    assert np.array_equal(live, resumed)
+
+
+def test_spawn_fire_during_replay_goes_live(params, make_env, tmp_path):
+    params['simulation']['hazard_cache'] = str(tmp_path)
+    _fire_trace(params, make_env, 10)
+
+    env = make_env(params)
+    sim = Simulator(env, params)
+    sim.step()
+    assert sim.hazard_driver.replaying
+    sim.extinguish_fire()
+    assert not sim.hazard_driver.replaying
+    assert env.hazard_system.get_max_hazard() == 0.0
@@ -0,0 +1,54 @@
+"""Communication latency channel (MessageBus, ObservedEnvironment)"""
+
+from sim.engine.latency import Message, MessageBus, ObservedEnvironment
+from sim.engine.simulator import Simulator
+
+
+def _message(sent, deliver, room_id='O1', value=(True, 0), kind='room'):
+    return Message(sent, deliver, kind, 0, room_id, value)
+
+
+def test_bus_delivers_due_messages_in_delivery_then_send_order():
+    bus = MessageBus()
+    late, first, second, early = (_message(0.0, 3.0), _message(0.0, 2.0),
+                                  _message(1.0, 2.0), _message(1.0, 1.5))
+    for message in (late, first, second, early):
+        bus.send(message)
+
+    assert bus.deliver(1.0) == []
+    assert bus.deliver(2.0) == [early, first, second]
+    assert bus.next_delivery() == 3.0 and len(bus) == 1
+    assert bus.deliver(10.0) == [late]
+    assert (bus.sent, bus.delivered) == (4, 4)
+
+
+def test_observed_environment_drops_overtaken_reports(make_env, params):
+    observed = ObservedEnvironment(make_env(params))
+    assert not observed.rooms['O1'].cleared
+
+    assert observed.apply(_message(2.0, 3.0, value=(True, 0)))
+    assert not observed.apply(_message(1.0, 4.0, value=(False, 5)))  # Older, arrived later
+    assert observed.rooms['O1'].cleared
+    assert 'O1' not in observed.get_uncleared_rooms()
+    assert observed.rooms['O1'].area == observed._env.rooms['O1'].area  # Geometry is the real room's
+
+
+def test_decisions_see_clears_after_the_comm_delay(params, make_env):
+    params['agents']['count'] = 3
+    params['latency'].update(enabled=True, comm_delay_mean=5.0, comm_delay_std=0.0)
+    env = make_env(params, burning=False)
+    sim = Simulator(env, params)
+
+    seen = {room_id: None for room_id, room in env.rooms.items() if room.cleared}
+    while not sim.complete and sim.tick < 400:
+        sim.step(fire_enabled=False)
+        for room_id, room in sim.observed_env.rooms.items():
+            if room.cleared and room_id not in seen:
+                seen[room_id] = sim.tick - 1
+    cleared = {room_id: room.cleared_tick for room_id, room in env.rooms.items()
+               if room.cleared_tick is not None}
+
+    seen = {room_id: tick for room_id, tick in seen.items() if tick is not None}
+    assert seen and set(seen) <= set(cleared)
+    for room_id, tick in seen.items():
+        assert tick == cleared[room_id] + 5, room_id
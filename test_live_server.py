@@ -0,0 +1,123 @@
+"""LiveViewServer delta frames, decoded the way the browser viewer does"""
+
+import json
+import struct
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from sim.engine.simulator import Simulator
+from sim.viz.live_server import (AGENT_DTYPE, EVENT_DTYPE, EVENT_TYPES, FLAG_COMPLETE,
+                                 FLAG_KEYFRAME, HEADER, MAGIC, LiveViewServer)
+
+
+class Viewer:
+    """Client-side state rebuilt from frames (mirrors applyFrames in VIEWER_HTML)"""
+
+    def __init__(self, n_cells):
+        self.cells = np.zeros(n_cells, dtype=np.uint8)
+        self.seq = self.tick = 0
+        self.agents = None
+        self.events = []
+        self.flags = []
+        self.cells_received = 0
+
+    def apply(self, buf):
+        off = 0
+        while off < len(buf):
+            (length,) = struct.unpack_from('<I', buf, off)
+            off += 4
+            magic, seq, tick, _, flags, n_agents, n_cells, n_events = HEADER.unpack_from(buf, off)
+            assert magic == MAGIC
+            p = off + HEADER.size
+            self.agents = np.frombuffer(buf, AGENT_DTYPE, n_agents, p)
+            p += n_agents * AGENT_DTYPE.itemsize
+            indices = np.frombuffer(buf, '<u4', n_cells, p)
+            values = np.frombuffer(buf, 'u1', n_cells, p + 4 * n_cells)
+            p += 5 * n_cells
+            self.events += np.frombuffer(buf, EVENT_DTYPE, n_events, p).tolist()
+            assert p + n_events * EVENT_DTYPE.itemsize == off + length
+            if flags & FLAG_KEYFRAME:
+                self.cells[:] = 0
+            self.cells[indices] = values
+            self.cells_received += n_cells
+            self.seq, self.tick = seq, tick
+            self.flags.append(flags)
+            off += length
+
+
+@pytest.fixture
+def server(params, make_env):
+    params['agents']['count'] = 3
+    return LiveViewServer(Simulator(make_env(params), params), port=0, history=8)
+
+
+def test_deltas_rebuild_the_published_state(server):
+    sim = server.sim
+    viewer = Viewer(len(server._cell_keys))
+    server.publish(force=True)
+    while not sim.complete and sim.tick < 120:
+        sim.step()
+        assert server.publish(force=True)
+        viewer.apply(server.frames_after(viewer.seq))
+        assert viewer.tick == sim.tick
+        np.testing.assert_array_equal(viewer.cells, server._quantise_cells())
+        np.testing.assert_array_equal(viewer.agents['x'], [a.x for a in sim.agent_manager.agents])
+
+    assert viewer.cells.any() and viewer.cells_received < len(viewer.cells) * sim.tick / 2
+    expected = [(EVENT_TYPES.index(e.event_type), -1 if e.agent_id is None else e.agent_id,
+                 server.room_ids.index(e.room_id) if e.room_id in server.room_ids else -1)
+                for e in sim.events]
+    assert viewer.events == expected
+    assert server.frames_after(viewer.seq) == b''
+
+
+def test_late_viewers_get_a_keyframe(server):
+    sim = server.sim
+    for _ in range(20):
+        sim.step()
+        server.publish(force=True)
+    sim.complete = True
+    server.publish(force=True)
+
+    viewer = Viewer(len(server._cell_keys))
+    viewer.apply(server.frames_after(0))  # Frame 1 left the history long ago
+    assert viewer.flags == [FLAG_KEYFRAME | FLAG_COMPLETE] and viewer.seq == 21
+    np.testing.assert_array_equal(viewer.cells, server._quantise_cells())
+    assert viewer.events == []
+
+    recent = Viewer(len(server._cell_keys))
+    recent.apply(server.frames_after(16))
+    assert [f & FLAG_KEYFRAME for f in recent.flags] == [0] * 5
+
+
+def test_publishing_is_rate_limited(server):
+    server.max_fps = 0.001
+    assert server.publish()
+    server.sim.step()
+    assert not server.publish()
+    assert server.publish(force=True)
+
+
+def test_http_endpoints(server):
+    server.start()
+    try:
+        base = f'http://{server.host}:{server.port}'
+        layout = json.loads(urllib.request.urlopen(f'{base}/layout', timeout=10).read())
+        assert [r['id'] for r in layout['rooms']] == server.room_ids
+        assert len(layout['cell_xy']) == 2 * len(server._cell_keys)
+
+        server.sim.step()
+        server.publish(force=True)
+        viewer = Viewer(len(server._cell_keys))
+        viewer.apply(urllib.request.urlopen(f'{base}/frames?after=0', timeout=10).read())
+        assert viewer.seq == 1 and viewer.tick == 1
+
+        assert b'<canvas' in urllib.request.urlopen(base + '/', timeout=10).read()
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f'{base}/nope', timeout=10)
+        assert error.value.code == 404
+    finally:
+        server.stop()
@@ -0,0 +1,51 @@
+"""LockstepRunner - policies side by side on one shared fire"""
+
+import copy
+import json
+
+from conftest import ROOT, run_to_end
+from sim.engine.hazard_timeline import _cell_list, _read_cells
+from sim.engine.lockstep import LockstepRunner
+from sim.engine.simulator import Simulator
+
+
+def _assignment(name):
+    def factory(env, params):
+        params = copy.deepcopy(params)
+        params['policy']['assignment'] = name
+        return Simulator(env, params)
+    return factory
+
+
+def _layout():
+    with open(ROOT / 'layouts' / 'office_correct_dimensions.json') as f:
+        return json.load(f)
+
+
+def test_each_policy_runs_as_if_alone(params, make_env, fake_environment_module):
+    params['agents']['count'] = 3
+    runner = LockstepRunner(_layout(), params)
+    for name in ('greedy', 'hungarian'):
+        runner.add_policy(name, _assignment(name))
+    results = runner.run(max_ticks=400)
+
+    for name in ('greedy', 'hungarian'):
+        alone = _assignment(name)(make_env(params), params)
+        expected = run_to_end(alone)
+        together = {k: v for k, v in results[name].items() if k != 'real_time'}
+        assert together == expected, name
+
+
+def test_fire_is_computed_once_and_seen_by_all(params, fake_environment_module):
+    params['agents']['count'] = 2
+    runner = LockstepRunner(_layout(), params)
+    for name in ('greedy', 'hungarian'):
+        runner.add_policy(name, _assignment(name))
+    runner.run(max_ticks=30)
+
+    leader, follower = (sim.env for sim in runner.controllers.values())
+    assert follower.hazard_system is leader.hazard_system
+    assert follower.update_calls == 0 and leader.update_calls == 30
+    danger, _ = _read_cells(_cell_list(leader))
+    assert danger.max() > 0
+    assert [r.hazard for r in leader.rooms.values()] == [r.hazard for r in follower.rooms.values()]
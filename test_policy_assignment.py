@@ -0,0 +1,41 @@
+"""Idle agent assignment order within a tick (Policy interface)"""
+
+from sim.agents.agent import AgentState
+from sim.engine.simulator import Simulator
+
+
+def _one_room_sim(params, make_env, assignment):
+    """Agent 0 finishes searching O2 (the only occupied room) this tick; agent 1 is idle"""
+    params['agents']['count'] = 2
+    params['policy']['assignment'] = assignment
+    env = make_env(params, burning=False)
+    for room in env.rooms.values():
+        room.evacuee_count = room.evacuees_remaining = 1 if room.id == 'O2' else 0
+    sim = Simulator(env, params)
+    searcher = sim.agent_manager.agents[0]
+    o2 = env.rooms['O2']
+    searcher.x, searcher.y, searcher.current_room = o2.x, o2.y, 'O2'
+    searcher.target_room = 'O2'
+    searcher.start_searching(sim.dt)
+    return sim
+
+
+def test_idle_agent_sees_rooms_cleared_earlier_in_tick(params, make_env):
+    sim = _one_room_sim(params, make_env, 'greedy')
+    sim.step(fire_enabled=False)
+
+    searcher, idle = sim.agent_manager.agents
+    assert searcher.state == AgentState.DRAGGING
+    moves = [e.data for e in sim.events if e.event_type.value == 'agent_move' and e.agent_id == idle.id]
+    assert all(move.get('target') != 'O2' for move in moves)
+    assert idle.state == AgentState.ESCAPING
+
+
+def test_joint_assignment_reassigns_cleared_target(params, make_env):
+    sim = _one_room_sim(params, make_env, 'hungarian')
+    sim.step(fire_enabled=False)
+
+    idle = sim.agent_manager.agents[1]
+    moves = [e.data for e in sim.events if e.event_type.value == 'agent_move' and e.agent_id == idle.id]
+    assert moves[0]['target'] == 'O2'  # Chosen jointly before O2 was cleared
+    assert idle.target_room != 'O2'
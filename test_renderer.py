@@ -0,0 +1,85 @@
+"""Cell-level hazard heatmap in the pygame Renderer"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Headless - must precede pygame.init
+
+import numpy as np
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from sim.engine.simulator import Simulator
+from sim.viz.geometry import LayoutGeometry
+from sim.viz.renderer import Renderer
+
+
+@pytest.fixture
+def scene(params, make_env):
+    params['agents']['count'] = 2
+    sim = Simulator(make_env(params), params)
+    for _ in range(30):
+        sim.step()
+    renderer = Renderer(800, 600)
+    renderer.geometry = LayoutGeometry(sim.env)
+    return sim, renderer
+
+
+def test_grid_pixels_follow_the_cells(scene):
+    sim, renderer = scene
+    renderer.render_map(sim.env, sim.agent_manager, sim.tick)
+    rows, cols, mask, _ = renderer._hazard_index
+    cells = list(sim.env.hazard_system.cells.values())
+    danger = np.array([c.danger_level for c in cells])[mask]
+    burning = np.array([c.is_burning for c in cells])[mask]
+    assert burning.any()
+
+    pixels = pygame.surfarray.array3d(renderer._hazard_grid)[cols, rows]
+    alphas = pygame.surfarray.array_alpha(renderer._hazard_grid)[cols, rows]
+    np.testing.assert_array_equal(pixels[burning], [Renderer.COLOR_HAZARD_BURNING] * burning.sum())
+    assert np.all(alphas[burning] == int(255 * renderer.heatmap_alpha))
+    assert np.all(alphas[~burning & (danger < 0.05)] == 0)
+    faint = ~burning & (danger >= 0.05)
+    np.testing.assert_array_equal(alphas[faint], (danger[faint] * 180 * renderer.heatmap_alpha).astype(np.uint8))
+
+
+def test_grid_is_uploaded_once_per_tick(scene, monkeypatch):
+    sim, renderer = scene
+    uploads = []
+    upload = renderer._upload_hazard_grid
+    monkeypatch.setattr(renderer, '_upload_hazard_grid', lambda *a: (uploads.append(1), upload(*a)))
+
+    for _ in range(3):
+        renderer.render_map(sim.env, sim.agent_manager, sim.tick)
+    assert len(uploads) == 1
+    sim.step()
+    renderer.render_map(sim.env, sim.agent_manager, sim.tick)
+    assert len(uploads) == 2
+    renderer.zoom = 1.5  # New screen extent: the cached grid is rescaled
+    renderer.render_map(sim.env, sim.agent_manager, sim.tick)
+    assert len(uploads) == 3
+
+
+def test_room_overlay_without_hazard_cells(scene):
+    sim, renderer = scene
+    sim.env.hazard_system.cells = {}
+    for room in sim.env.rooms.values():
+        room.hazard = 0.0
+
+    def draw(tick):
+        renderer.clear()
+        renderer.render_map(sim.env, sim.agent_manager, tick)
+        return pygame.surfarray.array3d(renderer.screen)
+
+    calm = draw(sim.tick)
+    room = next(r for r in sim.env.rooms.values() if r.floor == 0 and not r.is_exit)
+    room.hazard = 0.8
+    hot = draw(sim.tick + 1)
+    assert renderer._hazard_grid is None
+
+    floor = renderer.geometry.floor(0)
+    _, rects, _ = floor.fit(renderer.map_rect, renderer.zoom)
+    x, y, w, h = rects[floor.room_index[room.id]]
+    changed = (hot != calm).any(axis=2)
+    assert changed[x + 2:x + w - 2, y + 2:y + h - 2].mean() > 0.9  # Label and agents drawn on top
+    changed[x:x + w, y:y + h] = False
+    assert not changed.any()
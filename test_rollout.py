@@ -0,0 +1,81 @@
+"""RolloutPolicy forks and failure accounting"""
+
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+from sim.engine.simulator import Simulator
+from sim.policy import rollout
+from sim.policy.priority import PriorityPolicy
+from sim.policy.rollout import RolloutPolicy
+
+
+class _ForkingPolicy:
+    """Joint policy that forks the simulator like RolloutPolicy, then assigns by priority"""
+
+    joint = True
+
+    def __init__(self):
+        self.base = PriorityPolicy()
+        self.forks = []
+
+    def assign(self, sim, agents, rooms):
+        state = sim.fork_state()
+        assignments = self.base.assign(sim, agents, rooms)
+        self.forks.append((state, assignments))
+        return assignments
+
+
+def test_fork_finishes_its_tick_like_the_simulator(params, make_env):
+    params['agents']['count'] = 3
+    policy = _ForkingPolicy()
+    sim = Simulator(make_env(params), params, policy=policy)
+    sim.step()
+
+    state, assignments = policy.forks[0]
+    fork = pickle.loads(state)
+    for agent in fork.agent_manager.agents:
+        if agent.id in assignments:
+            fork.apply_assignment(agent, assignments[agent.id])
+    fork._finish_tick(set(assignments), start=fork._agent_turn)
+
+    assert (fork.tick, fork.time) == (sim.tick, sim.time) == (1, sim.dt)
+    for ours, theirs in zip(sim.agent_manager.agents, fork.agent_manager.agents):
+        assert (ours.x, ours.y, ours.state, ours.target_room) == \
+            (theirs.x, theirs.y, theirs.state, theirs.target_room)
+        assert ours.cumulative_hazard_exposure == theirs.cumulative_hazard_exposure
+
+
+def _jobs(params, make_env):
+    params['agents']['count'] = 2
+    policy = _ForkingPolicy()
+    sim = Simulator(make_env(params), params, policy=policy)
+    sim.step()
+    state, assignments = policy.forks[0]
+    jobs = list(assignments.items())
+    return jobs, (state, 5, True, np.random.get_state(), RolloutPolicy()._weights())
+
+
+def test_failed_rollouts_are_counted_and_raised_under_debug(params, make_env, monkeypatch):
+    jobs, args = _jobs(params, make_env)
+
+    def broken(*_):
+        raise ValueError('broken rollout')
+    monkeypatch.setattr(rollout, '_rollout', broken)
+
+    policy = RolloutPolicy(workers=0)
+    deadline = time.time() + 60
+    assert policy._run(jobs, args + (deadline,), deadline) == [None] * len(jobs)
+    assert (policy.failures, policy.timeouts) == (len(jobs), 0)
+    with pytest.raises(ValueError):
+        policy._run(jobs, args + (deadline,), deadline, debug=True)
+
+
+def test_rollouts_past_the_deadline_count_as_timeouts(params, make_env):
+    jobs, args = _jobs(params, make_env)
+    policy = RolloutPolicy(workers=0)
+    deadline = time.time() - 1
+    assert policy._run(jobs, args + (deadline,), deadline) == [None] * len(jobs)
+    assert (policy.failures, policy.timeouts) == (0, len(jobs))
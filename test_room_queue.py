@@ -0,0 +1,47 @@
+"""RoomQueue ranking against calculate_priority_indices"""
+
+import numpy as np
+
+from sim.engine.simulator import Simulator
+
+
+def _expected(engine, region):
+    """Stable descending sort of calculate_priority_indices, positive only"""
+    room_ids = engine.env.get_uncleared_rooms()
+    priorities = engine.calculate_priority_indices(room_ids, region)
+    order = sorted(range(len(room_ids)), key=lambda i: -priorities[i])
+    return [(room_ids[i], priorities[i]) for i in order if priorities[i] > 0]
+
+
+def _assert_ranking(engine):
+    engine.room_queue.refresh(engine.env.get_uncleared_rooms())
+    for region in engine.env.rooms:
+        ranked = list(engine.room_queue.ranked(region))
+        expected = _expected(engine, region)
+        assert [room_id for room_id, _ in ranked] == [room_id for room_id, _ in expected]
+        assert np.allclose([p for _, p in ranked], [p for _, p in expected], rtol=1e-12)
+
+
+def test_ranking_matches_priority_indices_during_a_run(params, make_env):
+    params['agents']['count'] = 3
+    sim = Simulator(make_env(params), params)
+    for _ in range(60):
+        sim.step()
+        _assert_ranking(sim.decision_engine)
+
+
+def test_ranking_follows_graph_changes(params, make_env):
+    params['agents']['count'] = 2
+    sim = Simulator(make_env(params), params)
+    engine = sim.decision_engine
+    sim.step()
+    _assert_ranking(engine)
+
+    engine.env.graph.remove_edge('HALL', 'O3')
+    sim.step()
+    assert all(room_id != 'O3' for room_id, _ in engine.room_queue.ranked('HALL'))
+    _assert_ranking(engine)
+
+    engine.env.graph.add_edge('HALL', 'O3', weight=1)
+    engine.refresh_routes()
+    _assert_ranking(engine)
@@ -0,0 +1,30 @@
+"""RoomTally running counts against the environment's own queries"""
+
+import pytest
+
+from conftest import run_to_end
+from sim.engine.simulator import Simulator
+
+
+def test_tally_matches_environment_every_tick(params, make_env):
+    params['agents']['count'] = 3
+    params['simulation']['debug_checks'] = True  # check() recounts after every tick
+    env = make_env(params)
+    sim = Simulator(env, params)
+    results = run_to_end(sim)
+    tally = sim.room_tally
+    assert tally.remaining_evacuees == env.get_remaining_evacuees()
+    assert tally.uncleared_rooms() == env.get_uncleared_rooms()
+    assert results['evacuees_rescued'] == env.get_total_evacuees() - env.get_remaining_evacuees()
+
+
+def test_completion_cross_checks_the_environment(params, make_env):
+    params['agents']['count'] = 2
+    env = make_env(params, burning=False)
+    for room in env.rooms.values():
+        room.evacuee_count = room.evacuees_remaining = 1 if room.id == 'O2' else 0
+    sim = Simulator(env, params)
+    env.rooms['HALL'].evacuees_remaining = 1  # Behind the simulator's back, in a cleared room
+
+    with pytest.raises(RuntimeError, match='environment has 1'):
+        run_to_end(sim, fire_enabled=False)
@@ -0,0 +1,72 @@
+"""Early termination of runs where nothing can change any more ('stalled')"""
+
+import numpy as np
+
+from conftest import run_to_end
+from sim.engine.simulator import Simulator
+
+
+def _stuck_sim(params, make_env, fire_ticks, keep_drawing=False):
+    """Two agents with no exit and no reachable room; the fire changes for `fire_ticks` updates"""
+    params['agents']['count'] = 2
+    env = make_env(params)
+    env.graph.remove_edges_from(list(env.graph.edges))
+    for room in env.rooms.values():
+        room.is_exit = False
+    env.exits = []
+
+    system = env.hazard_system
+    burning = [key for key, cell in system.cells.items() if cell.is_burning]
+    system.updates = 0
+
+    def update():
+        # Grows around the origin, then stays put (still drawing if keep_drawing)
+        if system.updates < fire_ticks:
+            for neighbour in system._neighbours[burning[0]]:
+                system.cells[neighbour].danger_level += 0.01 * np.random.random()
+            system._room_hazards()
+        elif keep_drawing:
+            np.random.random()
+        system.updates += 1
+    system.update = update
+    return Simulator(env, params)
+
+
+def _end(sim):
+    end = sim.events[-1]
+    return end.event_type.value, end.data.get('reason'), sim.tick
+
+
+def test_steady_fire_ends_a_stalled_run(params, make_env):
+    sim = _stuck_sim(params, make_env, fire_ticks=20)
+    run_to_end(sim, max_ticks=400)
+    # The update of tick 20 is the first to change nothing
+    assert _end(sim) == ('simulation_end', 'stalled', 21)
+
+
+def test_fire_still_drawing_is_not_steady(params, make_env):
+    sim = _stuck_sim(params, make_env, fire_ticks=20, keep_drawing=True)
+    run_to_end(sim, max_ticks=100)
+    assert not sim.complete and sim.tick == 100
+
+
+def test_fire_off_ends_a_stalled_run(params, make_env):
+    sim = _stuck_sim(params, make_env, fire_ticks=20)
+    for _ in range(5):
+        sim.step()
+    run_to_end(sim, fire_enabled=False, max_ticks=400)
+    assert _end(sim)[:2] == ('simulation_end', 'stalled') and sim.tick < 10
+
+
+def test_replayed_fire_stalls_like_a_live_one(params, make_env, tmp_path):
+    live = _stuck_sim(params, make_env, fire_ticks=20)
+    run_to_end(live, max_ticks=400)
+
+    params['simulation']['hazard_cache'] = str(tmp_path)
+    recording = _stuck_sim(params, make_env, fire_ticks=20)
+    run_to_end(recording, max_ticks=400)
+    recording.close()
+    replay = _stuck_sim(params, make_env, fire_ticks=20)
+    assert replay.hazard_driver.replaying
+    run_to_end(replay, max_ticks=400)
+    assert _end(replay) == _end(live)
@@ -0,0 +1,80 @@
+"""VideoWriter - frames piped to ffmpeg, or archived as PNGs without it"""
+
+import io
+import json
+import stat
+import sys
+import zipfile
+
+import numpy as np
+import pytest
+
+from sim.viz import video as video_module
+from sim.viz.video import VideoWriter
+
+WIDTH, HEIGHT = 6, 4
+
+
+def _frames(n):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8) for _ in range(n)]
+
+
+def _fake_ffmpeg(tmp_path, body):
+    """Executable standing in for ffmpeg; `body` runs with args = sys.argv[1:]"""
+    script = tmp_path / 'ffmpeg'
+    script.write_text(f'#!{sys.executable}\nimport sys\nargs = sys.argv[1:]\n{body}\n')
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+def test_frames_are_piped_raw_to_ffmpeg(tmp_path):
+    ffmpeg = _fake_ffmpeg(tmp_path, '\n'.join([
+        "open(args[-1], 'wb').write(sys.stdin.buffer.read())",
+        "open(args[-1] + '.args', 'w').write(' '.join(args))",
+    ]))
+    frames = _frames(3)
+    with VideoWriter(str(tmp_path / 'out' / 'run.mp4'), WIDTH, HEIGHT, fps=12, ffmpeg=ffmpeg) as video:
+        assert video.uses_ffmpeg
+        for frame in frames:
+            video.write(frame.tobytes())
+
+    assert video.output_path == tmp_path / 'out' / 'run.mp4' and video.frame_count == 3
+    assert video.output_path.read_bytes() == b''.join(f.tobytes() for f in frames)
+    args = (tmp_path / 'out' / 'run.mp4.args').read_text().split()
+    assert args[args.index('-s') + 1] == f'{WIDTH}x{HEIGHT}'
+    assert args[args.index('-framerate') + 1] == '12' and 'libx264' in args
+
+
+def test_ffmpeg_failure_is_reported(tmp_path):
+    ffmpeg = _fake_ffmpeg(tmp_path, "sys.stdin.buffer.read(); sys.stderr.write('bad codec'); sys.exit(1)")
+    video = VideoWriter(str(tmp_path / 'run.gif'), WIDTH, HEIGHT, ffmpeg=ffmpeg)
+    video.write(_frames(1)[0].tobytes())
+    with pytest.raises(RuntimeError, match='ffmpeg failed: bad codec'):
+        video.close()
+
+
+def test_without_ffmpeg_frames_go_to_a_png_archive(tmp_path, monkeypatch):
+    from PIL import Image
+    monkeypatch.setattr(video_module.shutil, 'which', lambda name: None)
+    frames = _frames(4)
+    with VideoWriter(str(tmp_path / 'run.mp4'), WIDTH, HEIGHT, fps=5) as video:
+        assert not video.uses_ffmpeg
+        for frame in frames:
+            video.write(frame.tobytes())
+
+    assert video.output_path == tmp_path / 'run.frames.zip'
+    with zipfile.ZipFile(video.output_path) as archive:
+        manifest = json.loads(archive.read('manifest.json'))
+        assert manifest == {'width': WIDTH, 'height': HEIGHT, 'fps': 5, 'frames': 4,
+                            'pattern': 'frame_%06d.png'}
+        for i, frame in enumerate(frames):
+            png = Image.open(io.BytesIO(archive.read(f'frame_{i:06d}.png')))
+            np.testing.assert_array_equal(np.asarray(png), frame)
+
+
+def test_frame_size_is_checked(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_module.shutil, 'which', lambda name: None)
+    with VideoWriter(str(tmp_path / 'run.mp4'), WIDTH, HEIGHT) as video:
+        with pytest.raises(ValueError, match='Expected 72 bytes'):
+            video.write(b'\0' * 10)
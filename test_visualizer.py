@@ -0,0 +1,117 @@
+"""Decoupled pygame visualizer: snapshots, live metrics and the simulation worker"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Headless - must precede pygame.init
+
+import time
+
+import numpy as np
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from sim.engine.simulator import Simulator
+from sim.viz.geometry import LayoutGeometry
+from sim.viz.renderer import Renderer
+from sim.viz.snapshot import LiveMetrics, take_snapshot
+from sim.viz.visualizer import SimulationWorker
+
+
+@pytest.fixture
+def sim(params, make_env):
+    params['agents']['count'] = 3
+    return Simulator(make_env(params), params)
+
+
+def _wait_for(worker, condition, timeout=10.0):
+    """Latest snapshot satisfying condition (drains the queue while waiting)"""
+    deadline = time.monotonic() + timeout
+    snapshot = None
+    while time.monotonic() < deadline:
+        snapshot = worker.latest() or snapshot
+        if snapshot is not None and condition(snapshot):
+            return snapshot
+        time.sleep(0.005)
+    raise AssertionError(f'worker did not get there (last tick {snapshot and snapshot.tick})')
+
+
+def test_live_metrics_match_get_results(sim):
+    metrics = LiveMetrics(sim)
+    while not sim.complete:
+        sim.step()
+        expected = sim.get_results()
+        for key, value in metrics.results().items():
+            assert value == pytest.approx(expected[key]), (sim.tick, key)
+    assert metrics.rooms_cleared > 0
+
+
+def test_snapshot_is_detached_from_the_simulator(sim):
+    metrics = LiveMetrics(sim)
+    for _ in range(30):
+        sim.step()
+    snapshot = take_snapshot(sim, metrics)
+    rooms = {room_id: (room.cleared, room.hazard, room.evacuees_remaining)
+             for room_id, room in sim.env.rooms.items()}
+    agents = [(a.x, a.y, a.floor, tuple(a.path)) for a in sim.agent_manager.agents]
+    danger = snapshot.hazard_cells.danger.copy()
+
+    for _ in range(30):
+        sim.step()
+    assert snapshot.tick == 30
+    assert {r.id: (r.cleared, r.hazard, r.evacuees_remaining) for r in snapshot.rooms.values()} == rooms
+    assert [(a.x, a.y, a.floor, a.path) for a in snapshot.agents] == agents
+    np.testing.assert_array_equal(snapshot.hazard_cells.danger, danger)
+    assert snapshot.metrics['ticks'] == 30
+
+    later = take_snapshot(sim, metrics, previous=snapshot)
+    assert later.hazard_cells.positions is snapshot.hazard_cells.positions
+    assert (later.hazard_cells.danger != danger).any()
+
+
+def test_worker_steps_on_request_and_at_speed(sim):
+    worker = SimulationWorker(sim, LiveMetrics(sim), rate=200)
+    worker.start()
+    try:
+        assert _wait_for(worker, lambda s: True).tick == 0
+        for _ in range(3):
+            worker.request_step()
+        _wait_for(worker, lambda s: s.tick == 3)
+        time.sleep(0.05)
+        assert sim.tick == 3  # Paused: only the requested steps
+
+        worker.speed = 4.0
+        worker.paused = False
+        assert _wait_for(worker, lambda s: s.complete).tick == sim.tick
+    finally:
+        worker.stop()
+        worker.join(timeout=10)
+    assert not worker.is_alive() and worker.error is None
+
+
+def test_worker_surfaces_simulation_errors(sim, monkeypatch):
+    def broken_step(*args, **kwargs):
+        raise ValueError('boom')
+    monkeypatch.setattr(sim, 'step', broken_step)
+    worker = SimulationWorker(sim, LiveMetrics(sim), rate=200)
+    worker.start()
+    worker.request_step()
+    worker.join(timeout=10)
+    assert isinstance(worker.error, ValueError)
+
+
+def test_snapshot_draws_like_the_live_state(sim):
+    metrics = LiveMetrics(sim)
+    for _ in range(40):
+        sim.step()
+    renderer = Renderer(800, 600)
+    renderer.geometry = LayoutGeometry(sim.env)
+
+    def draw(env, agents):
+        renderer.clear()
+        renderer.render_map(env, agents, sim.tick)
+        return pygame.surfarray.array3d(renderer.screen)
+
+    live = draw(sim.env, sim.agent_manager)
+    renderer._hazard_version = None  # Force the snapshot's cells to be read
+    snapshot = take_snapshot(sim, metrics)
+    np.testing.assert_array_equal(draw(snapshot, snapshot), live)
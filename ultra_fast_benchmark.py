@@ -20,8 +20,9 @@ def run_fast(layout, responders):
     sim = Simulator(env, params)
     
     while not sim.complete and sim.tick < 5000:  # SHORTER CAP
-        sim.step(fire_enabled=False)
+        sim.advance(fire_enabled=False, max_ticks=5000)
     
+    sim.close()
     r = sim.get_results()
     return {
         'resp': responders,